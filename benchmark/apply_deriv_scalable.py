@@ -1,5 +1,9 @@
 """
 A component with a large number of inputs is finite differenced.
+
+Pass '-direct' to use the direct (factor once, block solve) linear solver
+instead of the default scipy_gmres, and '-assemble' to assemble the
+Jacobian into a sparse matrix before the linear solve.
 """
 
 import numpy as np
@@ -16,6 +20,7 @@ class Model(Assembly):
 
         self.add('comp', Discipline(prob_size=N))
         self.comp.C_y = np.random.random((N, N))
+        self.driver.workflow.add('comp')
 
 if __name__ == "__main__":
 
@@ -31,6 +36,13 @@ if __name__ == "__main__":
 
 
     import sys
+    if '-direct' in sys.argv:
+        sys.argv.remove('-direct')
+        top.driver.gradient_options.lin_solver = 'direct'
+    if '-assemble' in sys.argv:
+        sys.argv.remove('-assemble')
+        top.driver.gradient_options.assemble_jacobian = True
+
     if len(sys.argv) > 1 and '-prof' in sys.argv:
         import cProfile
         import pstats
@@ -1,7 +1,13 @@
 """
 A component with a large number of inputs is finite differenced.
+
+Pass '-workers N' to evaluate the finite difference steps in N worker
+processes, and '-delay T' to make each execution of the component take an
+extra T seconds, as an external code would.
 """
 
+import time as _time
+
 import numpy as np
 
 from openmdao.lib.optproblems.scalable import Discipline
@@ -10,18 +16,37 @@ from openmdao.main.api import Assembly, Component, set_as_top
 N = 100
 np.random.seed(12345)
 
+class SlowDiscipline(Discipline):
+    """ Discipline with an artificial execution cost. """
+
+    delay = 0.0
+
+    def execute(self):
+        super(SlowDiscipline, self).execute()
+        _time.sleep(self.delay)
+
+
 class Model(Assembly):
 
     def configure(self):
 
-        self.add('comp', Discipline(prob_size=N))
+        self.add('comp', SlowDiscipline(prob_size=N))
         self.comp.C_y = np.random.random((N, N))
+        self.driver.workflow.add('comp')
 
 if __name__ == "__main__":
 
+    import sys
     from time import time
 
+    workers = 1
+    if '-workers' in sys.argv:
+        workers = int(sys.argv[sys.argv.index('-workers')+1])
+    if '-delay' in sys.argv:
+        SlowDiscipline.delay = float(sys.argv[sys.argv.index('-delay')+1])
+
     top = set_as_top(Model())
+    top.driver.gradient_options.fd_workers = workers
     top.run()
 
     inputs = ['comp.y_in']
@@ -0,0 +1,14 @@
+C     -*- fortran -*-
+C     This file is autogenerated with f2py (version:2)
+C     It contains Fortran 77 wrappers to fortran functions.
+
+      subroutine f2pyinitforces(setupfunc)
+      external setupfunc
+      double precision force1
+      double precision force2
+      double precision force3
+      common /forces/ force1,force2,force3
+      call setupfunc(force1,force2,force3)
+      end
+
+
@@ -0,0 +1,456 @@
+/* File: bar3module.c
+ * This file is auto-generated with f2py (version:2).
+ * f2py is a Fortran to Python Interface Generator (FPIG), Second Edition,
+ * written by Pearu Peterson <pearu@cens.ioc.ee>.
+ * Generation date: Sat Oct 17 04:41:54 2026
+ * Do not edit this file directly unless you know what you are doing!!!
+ */
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/*********************** See f2py2e/cfuncs.py: includes ***********************/
+#include "Python.h"
+#include <stdarg.h>
+#include "fortranobject.h"
+/*need_includes0*/
+
+/**************** See f2py2e/rules.py: mod_rules['modulebody'] ****************/
+static PyObject *bar3_error;
+static PyObject *bar3_module;
+
+/*********************** See f2py2e/cfuncs.py: typedefs ***********************/
+/*need_typedefs*/
+
+/****************** See f2py2e/cfuncs.py: typedefs_generated ******************/
+/*need_typedefs_generated*/
+
+/********************** See f2py2e/cfuncs.py: cppmacros **********************/
+#if defined(PREPEND_FORTRAN)
+#if defined(NO_APPEND_FORTRAN)
+#if defined(UPPERCASE_FORTRAN)
+#define F_FUNC(f,F) _##F
+#else
+#define F_FUNC(f,F) _##f
+#endif
+#else
+#if defined(UPPERCASE_FORTRAN)
+#define F_FUNC(f,F) _##F##_
+#else
+#define F_FUNC(f,F) _##f##_
+#endif
+#endif
+#else
+#if defined(NO_APPEND_FORTRAN)
+#if defined(UPPERCASE_FORTRAN)
+#define F_FUNC(f,F) F
+#else
+#define F_FUNC(f,F) f
+#endif
+#else
+#if defined(UPPERCASE_FORTRAN)
+#define F_FUNC(f,F) F##_
+#else
+#define F_FUNC(f,F) f##_
+#endif
+#endif
+#endif
+#if defined(UNDERSCORE_G77)
+#define F_FUNC_US(f,F) F_FUNC(f##_,F##_)
+#else
+#define F_FUNC_US(f,F) F_FUNC(f,F)
+#endif
+
+#define rank(var) var ## _Rank
+#define shape(var,dim) var ## _Dims[dim]
+#define old_rank(var) (PyArray_NDIM((PyArrayObject *)(capi_ ## var ## _tmp)))
+#define old_shape(var,dim) PyArray_DIM(((PyArrayObject *)(capi_ ## var ## _tmp)),dim)
+#define fshape(var,dim) shape(var,rank(var)-dim-1)
+#define len(var) shape(var,0)
+#define flen(var) fshape(var,0)
+#define old_size(var) PyArray_SIZE((PyArrayObject *)(capi_ ## var ## _tmp))
+/* #define index(i) capi_i ## i */
+#define slen(var) capi_ ## var ## _len
+#define size(var, ...) f2py_size((PyArrayObject *)(capi_ ## var ## _tmp), ## __VA_ARGS__, -1)
+
+#ifdef DEBUGCFUNCS
+#define CFUNCSMESS(mess) fprintf(stderr,"debug-capi:"mess);
+#define CFUNCSMESSPY(mess,obj) CFUNCSMESS(mess) \
+    PyObject_Print((PyObject *)obj,stderr,Py_PRINT_RAW);\
+    fprintf(stderr,"\n");
+#else
+#define CFUNCSMESS(mess)
+#define CFUNCSMESSPY(mess,obj)
+#endif
+
+#ifndef max
+#define max(a,b) ((a > b) ? (a) : (b))
+#endif
+#ifndef min
+#define min(a,b) ((a < b) ? (a) : (b))
+#endif
+#ifndef MAX
+#define MAX(a,b) ((a > b) ? (a) : (b))
+#endif
+#ifndef MIN
+#define MIN(a,b) ((a < b) ? (a) : (b))
+#endif
+
+
+/************************ See f2py2e/cfuncs.py: cfuncs ************************/
+static int f2py_size(PyArrayObject* var, ...)
+{
+  npy_int sz = 0;
+  npy_int dim;
+  npy_int rank;
+  va_list argp;
+  va_start(argp, var);
+  dim = va_arg(argp, npy_int);
+  if (dim==-1)
+    {
+      sz = PyArray_SIZE(var);
+    }
+  else
+    {
+      rank = PyArray_NDIM(var);
+      if (dim>=1 && dim<=rank)
+        sz = PyArray_DIM(var, dim-1);
+      else
+        fprintf(stderr, "f2py_size: 2nd argument value=%d fails to satisfy 1<=value<=%d. Result will be 0.\n", dim, rank);
+    }
+  va_end(argp);
+  return sz;
+}
+
+static int double_from_pyobj(double* v,PyObject *obj,const char *errmess) {
+    PyObject* tmp = NULL;
+    if (PyFloat_Check(obj)) {
+#ifdef __sgi
+        *v = PyFloat_AsDouble(obj);
+#else
+        *v = PyFloat_AS_DOUBLE(obj);
+#endif
+        return 1;
+    }
+    tmp = PyNumber_Float(obj);
+    if (tmp) {
+#ifdef __sgi
+        *v = PyFloat_AsDouble(tmp);
+#else
+        *v = PyFloat_AS_DOUBLE(tmp);
+#endif
+        Py_DECREF(tmp);
+        return 1;
+    }
+    if (PyComplex_Check(obj))
+        tmp = PyObject_GetAttrString(obj,"real");
+    else if (PyString_Check(obj) || PyUnicode_Check(obj))
+        /*pass*/;
+    else if (PySequence_Check(obj))
+        tmp = PySequence_GetItem(obj,0);
+    if (tmp) {
+        PyErr_Clear();
+        if (double_from_pyobj(v,tmp,errmess)) {Py_DECREF(tmp); return 1;}
+        Py_DECREF(tmp);
+    }
+    {
+        PyObject* err = PyErr_Occurred();
+        if (err==NULL) err = bar3_error;
+        PyErr_SetString(err,errmess);
+    }
+    return 0;
+}
+
+
+/********************* See f2py2e/cfuncs.py: userincludes *********************/
+/*need_userincludes*/
+
+/********************* See f2py2e/capi_rules.py: usercode *********************/
+
+
+/* See f2py2e/rules.py */
+extern void F_FUNC(runbar3truss,RUNBAR3TRUSS)(double*,double*,double*,double*,double*,double*,double*,double*,double*,double*,double*,double*,double*,double*,double*);
+/*eof externroutines*/
+
+/******************** See f2py2e/capi_rules.py: usercode1 ********************/
+
+
+/******************* See f2py2e/cb_rules.py: buildcallback *******************/
+/*need_callbacks*/
+
+/*********************** See f2py2e/rules.py: buildapi ***********************/
+
+/******************************** runbar3truss ********************************/
+static char doc_f2py_rout_bar3_runbar3truss[] = "\
+s1,s2,s3,u,v,ff,obj = runbar3truss(pvec,m0,a1,a2,a3,e,el,rho)\n\nWrapper for ``runbar3truss``.\
+\n\nParameters\n----------\n"
+"pvec : input rank-1 array('d') with bounds (2)\n"
+"m0 : input float\n"
+"a1 : input float\n"
+"a2 : input float\n"
+"a3 : input float\n"
+"e : input float\n"
+"el : input float\n"
+"rho : input float\n"
+"\nReturns\n-------\n"
+"s1 : float\n"
+"s2 : float\n"
+"s3 : float\n"
+"u : float\n"
+"v : float\n"
+"ff : float\n"
+"obj : float";
+/* extern void F_FUNC(runbar3truss,RUNBAR3TRUSS)(double*,double*,double*,double*,double*,double*,double*,double*,double*,double*,double*,double*,double*,double*,double*); */
+static PyObject *f2py_rout_bar3_runbar3truss(const PyObject *capi_self,
+                           PyObject *capi_args,
+                           PyObject *capi_keywds,
+                           void (*f2py_func)(double*,double*,double*,double*,double*,double*,double*,double*,double*,double*,double*,double*,double*,double*,double*)) {
+  PyObject * volatile capi_buildvalue = NULL;
+  volatile int f2py_success = 1;
+/*decl*/
+
+  double *pvec = NULL;
+  npy_intp pvec_Dims[1] = {-1};
+  const int pvec_Rank = 1;
+  PyArrayObject *capi_pvec_tmp = NULL;
+  int capi_pvec_intent = 0;
+  PyObject *pvec_capi = Py_None;
+  double m0 = 0;
+  PyObject *m0_capi = Py_None;
+  double a1 = 0;
+  PyObject *a1_capi = Py_None;
+  double a2 = 0;
+  PyObject *a2_capi = Py_None;
+  double a3 = 0;
+  PyObject *a3_capi = Py_None;
+  double e = 0;
+  PyObject *e_capi = Py_None;
+  double el = 0;
+  PyObject *el_capi = Py_None;
+  double rho = 0;
+  PyObject *rho_capi = Py_None;
+  double s1 = 0;
+  double s2 = 0;
+  double s3 = 0;
+  double u = 0;
+  double v = 0;
+  double ff = 0;
+  double obj = 0;
+  static char *capi_kwlist[] = {"pvec","m0","a1","a2","a3","e","el","rho",NULL};
+
+/*routdebugenter*/
+#ifdef F2PY_REPORT_ATEXIT
+f2py_start_clock();
+#endif
+  if (!PyArg_ParseTupleAndKeywords(capi_args,capi_keywds,\
+    "OOOOOOOO:bar3.runbar3truss",\
+    capi_kwlist,&pvec_capi,&m0_capi,&a1_capi,&a2_capi,&a3_capi,&e_capi,&el_capi,&rho_capi))
+    return NULL;
+/*frompyobj*/
+  /* Processing variable el */
+    f2py_success = double_from_pyobj(&el,el_capi,"bar3.runbar3truss() 7th argument (el) can't be converted to double");
+  if (f2py_success) {
+  /* Processing variable rho */
+    f2py_success = double_from_pyobj(&rho,rho_capi,"bar3.runbar3truss() 8th argument (rho) can't be converted to double");
+  if (f2py_success) {
+  /* Processing variable v */
+  /* Processing variable a1 */
+    f2py_success = double_from_pyobj(&a1,a1_capi,"bar3.runbar3truss() 3rd argument (a1) can't be converted to double");
+  if (f2py_success) {
+  /* Processing variable a3 */
+    f2py_success = double_from_pyobj(&a3,a3_capi,"bar3.runbar3truss() 5th argument (a3) can't be converted to double");
+  if (f2py_success) {
+  /* Processing variable a2 */
+    f2py_success = double_from_pyobj(&a2,a2_capi,"bar3.runbar3truss() 4th argument (a2) can't be converted to double");
+  if (f2py_success) {
+  /* Processing variable ff */
+  /* Processing variable obj */
+  /* Processing variable pvec */
+  pvec_Dims[0]=2;
+  capi_pvec_intent |= F2PY_INTENT_IN;
+  capi_pvec_tmp = array_from_pyobj(NPY_DOUBLE,pvec_Dims,pvec_Rank,capi_pvec_intent,pvec_capi);
+  if (capi_pvec_tmp == NULL) {
+    if (!PyErr_Occurred())
+      PyErr_SetString(bar3_error,"failed in converting 1st argument `pvec' of bar3.runbar3truss to C/Fortran array" );
+  } else {
+    pvec = (double *)(PyArray_DATA(capi_pvec_tmp));
+
+  /* Processing variable e */
+    f2py_success = double_from_pyobj(&e,e_capi,"bar3.runbar3truss() 6th argument (e) can't be converted to double");
+  if (f2py_success) {
+  /* Processing variable s3 */
+  /* Processing variable s2 */
+  /* Processing variable s1 */
+  /* Processing variable u */
+  /* Processing variable m0 */
+    f2py_success = double_from_pyobj(&m0,m0_capi,"bar3.runbar3truss() 2nd argument (m0) can't be converted to double");
+  if (f2py_success) {
+/*end of frompyobj*/
+#ifdef F2PY_REPORT_ATEXIT
+f2py_start_call_clock();
+#endif
+/*callfortranroutine*/
+        (*f2py_func)(pvec,&m0,&a1,&a2,&a3,&e,&el,&rho,&s1,&s2,&s3,&u,&v,&ff,&obj);
+if (PyErr_Occurred())
+  f2py_success = 0;
+#ifdef F2PY_REPORT_ATEXIT
+f2py_stop_call_clock();
+#endif
+/*end of callfortranroutine*/
+    if (f2py_success) {
+/*pyobjfrom*/
+/*end of pyobjfrom*/
+    CFUNCSMESS("Building return value.\n");
+    capi_buildvalue = Py_BuildValue("ddddddd",s1,s2,s3,u,v,ff,obj);
+/*closepyobjfrom*/
+/*end of closepyobjfrom*/
+    } /*if (f2py_success) after callfortranroutine*/
+/*cleanupfrompyobj*/
+  } /*if (f2py_success) of m0*/
+  /* End of cleaning variable m0 */
+  /* End of cleaning variable u */
+  /* End of cleaning variable s1 */
+  /* End of cleaning variable s2 */
+  /* End of cleaning variable s3 */
+  } /*if (f2py_success) of e*/
+  /* End of cleaning variable e */
+  if((PyObject *)capi_pvec_tmp!=pvec_capi) {
+    Py_XDECREF(capi_pvec_tmp); }
+  }  /*if (capi_pvec_tmp == NULL) ... else of pvec*/
+  /* End of cleaning variable pvec */
+  /* End of cleaning variable obj */
+  /* End of cleaning variable ff */
+  } /*if (f2py_success) of a2*/
+  /* End of cleaning variable a2 */
+  } /*if (f2py_success) of a3*/
+  /* End of cleaning variable a3 */
+  } /*if (f2py_success) of a1*/
+  /* End of cleaning variable a1 */
+  /* End of cleaning variable v */
+  } /*if (f2py_success) of rho*/
+  /* End of cleaning variable rho */
+  } /*if (f2py_success) of el*/
+  /* End of cleaning variable el */
+/*end of cleanupfrompyobj*/
+  if (capi_buildvalue == NULL) {
+/*routdebugfailure*/
+  } else {
+/*routdebugleave*/
+  }
+  CFUNCSMESS("Freeing memory.\n");
+/*freemem*/
+#ifdef F2PY_REPORT_ATEXIT
+f2py_stop_clock();
+#endif
+  return capi_buildvalue;
+}
+/**************************** end of runbar3truss ****************************/
+/*eof body*/
+
+/******************* See f2py2e/f90mod_rules.py: buildhooks *******************/
+/*need_f90modhooks*/
+
+/************** See f2py2e/rules.py: module_rules['modulebody'] **************/
+
+/******************* See f2py2e/common_rules.py: buildhooks *******************/
+
+static FortranDataDef f2py_forces_def[] = {
+  {"force1",0,{{-1}},NPY_DOUBLE},
+  {"force2",0,{{-1}},NPY_DOUBLE},
+  {"force3",0,{{-1}},NPY_DOUBLE},
+  {NULL}
+};
+static void f2py_setup_forces(char *force1,char *force2,char *force3) {
+  int i_f2py=0;
+  f2py_forces_def[i_f2py++].data = force1;
+  f2py_forces_def[i_f2py++].data = force2;
+  f2py_forces_def[i_f2py++].data = force3;
+}
+extern void F_FUNC(f2pyinitforces,F2PYINITFORCES)(void(*)(char*,char*,char*));
+static void f2py_init_forces(void) {
+  F_FUNC(f2pyinitforces,F2PYINITFORCES)(f2py_setup_forces);
+}
+
+/*need_commonhooks*/
+
+/**************************** See f2py2e/rules.py ****************************/
+
+static FortranDataDef f2py_routine_defs[] = {
+  {"runbar3truss",-1,{{-1}},0,(char *)F_FUNC(runbar3truss,RUNBAR3TRUSS),(f2py_init_func)f2py_rout_bar3_runbar3truss,doc_f2py_rout_bar3_runbar3truss},
+
+/*eof routine_defs*/
+  {NULL}
+};
+
+static PyMethodDef f2py_module_methods[] = {
+
+  {NULL,NULL}
+};
+
+#if PY_VERSION_HEX >= 0x03000000
+static struct PyModuleDef moduledef = {
+  PyModuleDef_HEAD_INIT,
+  "bar3",
+  NULL,
+  -1,
+  f2py_module_methods,
+  NULL,
+  NULL,
+  NULL,
+  NULL
+};
+#endif
+
+#if PY_VERSION_HEX >= 0x03000000
+#define RETVAL m
+PyMODINIT_FUNC PyInit_bar3(void) {
+#else
+#define RETVAL
+PyMODINIT_FUNC initbar3(void) {
+#endif
+  int i;
+  PyObject *m,*d, *s;
+#if PY_VERSION_HEX >= 0x03000000
+  m = bar3_module = PyModule_Create(&moduledef);
+#else
+  m = bar3_module = Py_InitModule("bar3", f2py_module_methods);
+#endif
+  Py_TYPE(&PyFortran_Type) = &PyType_Type;
+  import_array();
+  if (PyErr_Occurred())
+    {PyErr_SetString(PyExc_ImportError, "can't initialize module bar3 (failed to import numpy)"); return RETVAL;}
+  d = PyModule_GetDict(m);
+  s = PyString_FromString("$Revision: $");
+  PyDict_SetItemString(d, "__version__", s);
+#if PY_VERSION_HEX >= 0x03000000
+  s = PyUnicode_FromString(
+#else
+  s = PyString_FromString(
+#endif
+    "This module 'bar3' is auto-generated with f2py (version:2).\nFunctions:\n"
+"  s1,s2,s3,u,v,ff,obj = runbar3truss(pvec,m0,a1,a2,a3,e,el,rho)\n"
+"COMMON blocks:\n""  /forces/ force1,force2,force3\n"".");
+  PyDict_SetItemString(d, "__doc__", s);
+  bar3_error = PyErr_NewException ("bar3.error", NULL, NULL);
+  Py_DECREF(s);
+  for(i=0;f2py_routine_defs[i].name!=NULL;i++)
+    PyDict_SetItemString(d, f2py_routine_defs[i].name,PyFortranObject_NewAsAttr(&f2py_routine_defs[i]));
+
+/*eof initf2pywraphooks*/
+/*eof initf90modhooks*/
+
+  F2PyDict_SetItemString(d, "forces", PyFortranObject_New(f2py_forces_def,f2py_init_forces));
+/*eof initcommonhooks*/
+
+
+#ifdef F2PY_REPORT_ATEXIT
+  if (! PyErr_Occurred())
+    on_exit(f2py_report_on_exit,(void*)"bar3");
+#endif
+
+  return RETVAL;
+}
+#ifdef __cplusplus
+}
+#endif
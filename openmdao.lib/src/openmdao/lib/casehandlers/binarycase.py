@@ -0,0 +1,186 @@
+"""
+Binary Case Recording of numeric data in a fixed layout.
+"""
+
+import cStringIO
+import StringIO
+import json
+import time
+
+from struct import Struct
+
+import numpy
+
+from openmdao.lib.casehandlers.jsoncase import _BaseRecorder, _Encoder, \
+                                               _flush_if_due
+
+# File signature.
+MAGIC = 'OMDAOBIN'
+
+# Record header: tag, payload length. Payloads are padded to a multiple of
+# 8 bytes so that every case's float64 block is aligned in the file.
+RECORD = Struct('<4sL')
+
+# Case payload header: _driver_id, length of _id, length of _parent_id,
+# length of the JSON tail.
+CASE = Struct('<qHHL')
+
+# Record tags.
+SIMULATION_INFO = 'SIMI'
+DRIVER_INFO = 'DRVI'
+LAYOUT = 'LAYO'
+ITERATION_CASE = 'CASE'
+
+
+class BinaryCaseRecorder(_BaseRecorder):
+    """
+    Dumps a run in binary form to `out`, which may be a string or a
+    file-like object opened in binary mode. If `out` is a string, then a
+    file with that name will be opened in the current directory.
+    If `out` is None, cases will be ignored.
+
+    Numeric values (scalars and arrays of bool, int or float) are written as
+    a contiguous float64 block per case. The layout of the block for each
+    driver is fixed by the sizes of the values in its first case, and later
+    values must have the same size. Other values, such as strings, are
+    written as JSON following the block. The file can be read with
+    :class:`CaseDataset` using format ``'binary'``, which memory-maps it so
+    that columnar queries of numeric variables are returned without
+    decoding each case.
+
+    `out` is flushed after each case unless `flush_interval` is nonzero, in
+    which case it's flushed at most every `flush_interval` seconds (and on
+    :meth:`close`).
+    """
+
+    def __init__(self, out='cases.bin', flush_interval=0.):
+        super(BinaryCaseRecorder, self).__init__()
+        if isinstance(out, basestring):
+            out = open(out, 'wb')
+        self.out = out
+        self.flush_interval = flush_interval
+        self._last_flush = time.time()
+        self._layouts = {}
+
+    def startup(self):
+        """ Prepare for new run. """
+        self._layouts = {}
+
+    def record_constants(self, constants):
+        """ Record constant data. """
+        if not self.out:
+            return
+
+        self.out.write(MAGIC)
+        self._write_json(SIMULATION_INFO, self.get_simulation_info(constants))
+        for info in self.get_driver_info():
+            self._write_json(DRIVER_INFO, info)
+        self.flush()
+
+    def record(self, driver, inputs, outputs, exc, case_uuid, parent_uuid,
+               timestamp=None):
+        """ Dump the given run data. """
+        if not self.out:
+            return
+
+        info = self.get_case_info(driver, inputs, outputs, exc,
+                                  case_uuid, parent_uuid, timestamp)
+        data = info['data']
+        layout = self._layouts.get(driver)
+        if layout is None:
+            layout = self._layouts[driver] = _layout(id(driver), data)
+            self._write_json(LAYOUT, layout)
+
+        block = numpy.empty(layout['size'], dtype='<f8')
+        block[0] = info['timestamp']
+        for name, start, shape, kind in layout['numeric']:
+            value = numpy.asarray(data.pop(name), dtype=float)
+            size = _size(shape)
+            if value.size != size:
+                raise ValueError("Size of '%s' changed from %s to %s"
+                                 % (name, size, value.size))
+            block[start:start+size] = value.ravel()
+
+        self._cases += 1
+        _id = str(info['_id'])
+        parent = str(info['_parent_id'])
+        tail = json.dumps(dict(error_message=info['error_message'],
+                               data=data),
+                          cls=_Encoder, check_circular=False,
+                          separators=(',', ':'))
+        payload = ''.join((CASE.pack(info['_driver_id'], len(_id),
+                                     len(parent), len(tail)),
+                           block.tostring(), _id, parent, tail))
+        self._write(ITERATION_CASE, payload, '\0')
+        _flush_if_due(self)
+
+    def flush(self):
+        """ Flush `out`. """
+        if self.out:
+            self.out.flush()
+            self._last_flush = time.time()
+
+    def _write_json(self, tag, info):
+        """ Write `info` as JSON. """
+        self._write(tag, json.dumps(info, cls=_Encoder, check_circular=False,
+                                    separators=(',', ':')), ' ')
+
+    def _write(self, tag, payload, pad):
+        """ Write record, padding `payload` to a multiple of 8 bytes. """
+        payload += pad * (-len(payload) % 8)
+        self.out.write(RECORD.pack(tag, len(payload)))
+        self.out.write(payload)
+
+    def close(self):
+        """
+        Closes `out`. Note that a closed recorder will do nothing in
+        :meth:`record`.
+        """
+        self.flush()
+        if self.out is not None:
+            if not isinstance(self.out,
+                              (StringIO.StringIO, cStringIO.OutputType)):
+                # Closing a StringIO deletes its contents.
+                self.out.close()
+            self.out = None
+
+        self._cases = None
+
+    def get_iterator(self):
+        """ Just returns None. """
+        return None
+
+
+def _size(shape):
+    """ Return number of elements in an array of `shape`. """
+    size = 1
+    for dim in shape:
+        size *= dim
+    return size
+
+
+def _layout(driver_id, data):
+    """
+    Return layout dictionary for the numeric values in `data`, a case's
+    data from the driver with id `driver_id`. 'numeric' lists
+    ``(name, start, shape, kind)`` for each value stored in the float64
+    block, where `kind` is 'b', 'i' or 'f'. The first element of the block
+    is the case's timestamp.
+    """
+    numeric = []
+    start = 1
+    for name in sorted(data):
+        value = data[name]
+        if isinstance(value, (basestring, dict)) or value is None:
+            continue
+        try:
+            array = numpy.asarray(value)
+        except Exception:
+            continue
+        kind = array.dtype.kind
+        if kind not in 'biuf':
+            continue
+        numeric.append((name, start, list(array.shape),
+                        'i' if kind == 'u' else kind))
+        start += array.size
+    return dict(_driver_id=driver_id, numeric=numeric, size=start)
@@ -123,7 +123,8 @@ class CaseArray(object):
         """Record constant data - currently ignored."""
         pass
 
-    def record(self, driver, inputs, outputs, exc, case_uuid, parent_uuid):
+    def record(self, driver, inputs, outputs, exc, case_uuid, parent_uuid,
+               timestamp=None):
         """Record the given run data."""
         if not self._values:
             self._record_first_case(driver, inputs, outputs)
@@ -228,7 +228,8 @@ class CSVCaseRecorder(object):
         """Record constant data - currently ignored."""
         pass
 
-    def record(self, driver, inputs, outputs, exc, case_uuid, parent_uuid):
+    def record(self, driver, inputs, outputs, exc, case_uuid, parent_uuid,
+               timestamp=None):
         """Store the case in a csv file. The format for a line of data
         follows:
 
@@ -303,7 +304,7 @@ class CSVCaseRecorder(object):
 
         msg = '' if exc is None else str(exc)
 
-        data = [time.time()]
+        data = [time.time() if timestamp is None else timestamp]
         data.append('')
         data.extend(sorted_input_values)
         data.append('')
@@ -12,8 +12,12 @@ except ImportError:
 
 import time
 from cPickle import dumps, loads, HIGHEST_PROTOCOL, UnpicklingError
+from cStringIO import StringIO
 from optparse import OptionParser
 
+from numpy import ndarray
+from numpy.lib.format import MAGIC_PREFIX, read_array, write_array
+
 from traits.trait_handlers import TraitListObject, TraitDictObject
 
 # pylint: disable=E0611,F0401
@@ -38,6 +42,83 @@ def _query_split(query):
     raise ValueError("No allowable operator found in query '%s'" % query)
 
 
+def _column(col_id):
+    """Return the name of the wide table column with id `col_id`. Variable
+    names aren't used as column names since SQLite compares identifiers
+    case-insensitively, so 'comp.X' and 'comp.x' would collide.
+    """
+    return 'c%d' % col_id
+
+
+def _encode_value(value, raw_arrays=False):
+    """Return `value` in a form that can be stored in the DB. Floats, ints
+    and strings are stored directly. If `raw_arrays` is True, numeric arrays
+    are stored as raw buffers (in ``.npy`` format, which records dtype and
+    shape). Anything else is pickled.
+    """
+    if isinstance(value, (float, int, str)):
+        if not raw_arrays or value == value:
+            return value
+        # sqlite stores NaN as NULL, which in the wide layout means 'not
+        # recorded', so keep NaN as a pickle there.
+    elif isinstance(value, TraitDictObject):
+        value = dict(value)
+    elif isinstance(value, TraitListObject):
+        value = list(value)
+    elif raw_arrays and isinstance(value, ndarray) and not value.dtype.hasobject:
+        buf = StringIO()
+        write_array(buf, value, allow_pickle=False)
+        return sqlite3.Binary(buf.getvalue())
+    return sqlite3.Binary(dumps(value, HIGHEST_PROTOCOL))
+
+
+def _decode_value(value):
+    """Return the object represented by the DB blob `value`."""
+    data = str(value)
+    if data.startswith(MAGIC_PREFIX):
+        return read_array(StringIO(data), allow_pickle=False)
+    return loads(data)
+
+
+def _wide_layout(connection):
+    """Return True if the DB on `connection` uses the wide layout."""
+    cur = connection.execute("SELECT name FROM sqlite_master"
+                             " WHERE type='table' AND name='casewide'")
+    return cur.fetchone() is not None
+
+
+def _wide_columns(connection):
+    """Return a list of (col_id, name, sense) for the columns of the wide
+    table on `connection`, in the order they were added."""
+    return connection.execute("SELECT col_id, name, sense FROM casecolumns"
+                              " ORDER BY col_id").fetchall()
+
+
+def _literal(value):
+    """Return `value` as an SQL string literal, or NULL if it is None."""
+    if value is None:
+        return 'NULL'
+    return "'%s'" % value.replace("'", "''")
+
+
+def _wide_values(columns, var_sql=''):
+    """Return SQL expressions selecting each of `columns` from the wide
+    table. If `var_sql` is given, it is evaluated for each value as if it
+    were a row of the narrow `casevars` table, and the value is selected
+    only where it holds (NULL otherwise).
+    """
+    exprs = []
+    for col_id, name, sense in columns:
+        col = 'casewide.%s' % _column(col_id)
+        if var_sql:
+            col = "(SELECT value FROM (SELECT NULL AS var_id, %s AS name," \
+                  " casewide.case_id AS case_id, %s AS sense, %s AS value)" \
+                  " WHERE %s)" % (_literal(name), _literal(sense), col,
+                                  var_sql)
+        exprs.append(col)
+    return exprs
+
+
 class DBCaseIterator(object):
     """Pulls Cases from a relational DB (sqlite). It doesn't support
     general sql queries, but it does allow for a series of boolean
@@ -76,8 +157,10 @@ class DBCaseIterator(object):
 
     def _next_case(self):
         """ Generator which returns Cases one at a time. """
+
         # figure out which selectors are for cases and which are for variables
         sql = ["SELECT * FROM cases"]
+        var_sql = []
         if self.selectors is not None:
             for sel in self.selectors:
                 rhs, rel, lhs = _query_split(sel)
@@ -86,57 +169,118 @@ class DBCaseIterator(object):
                         sql.append("WHERE %s%s%s" % (rhs, rel, lhs))
                     else:
                         sql.append("AND %s%s%s" % (rhs, rel, lhs))
+                elif rhs in _vartable_attrs:
+                    var_sql.append("%s%s%s" % (rhs, rel, lhs))
+
+        if _wide_layout(self._connection):
+            for case in self._next_wide_case(sql[1:], var_sql):
+                yield case
+            return
 
         casecur = self._connection.cursor()
         casecur.execute(' '.join(sql))
 
         sql = ['SELECT var_id,name,case_id,sense,value from casevars WHERE case_id=%s']
-        if self.selectors is not None:
-            for sel in self.selectors:
-                rhs, rel, lhs = _query_split(sel)
-                if rhs in _vartable_attrs:
-                    sql.append("AND %s%s%s" % (rhs, rel, lhs))
+        sql.extend(["AND %s" % sel for sel in var_sql])
         combined = ' '.join(sql)
         varcur = self._connection.cursor()
 
         for cid, text_id, parent, msg, model_id, timeEnter in casecur:
             varcur.execute(combined % cid)
-            inputs = []
-            outputs = []
+            variables = []
             for var_id, vname, case_id, sense, value in varcur:
-                if isinstance(value, (float, int, str)):
-                    pass
-                elif value is None:  # Result when recorded value was NaN.
+                if value is None:  # Result when recorded value was NaN.
                     value = float('NaN')
-                else:
-                    try:
-                        value = loads(str(value))
-                    except UnpicklingError as err:
-                        print 'value', type(value), repr(value)
-                        raise UnpicklingError("can't unpickle value '%s' for"
-                                              " case '%s' from database: %s"
-                                              % (vname, text_id, str(err)))
-                if sense == 'i':
-                    inputs.append((vname, value))
-                elif sense == 'o':
-                    outputs.append((vname, value))
-            if len(inputs) > 0 or len(outputs) > 0:
-                exc = Exception(msg) if msg else None
-                yield Case(inputs=inputs, outputs=outputs, exc=exc,
-                           case_uuid=text_id, parent_uuid=parent)
+                variables.append((vname, sense, value))
+            case = self._make_case(text_id, parent, msg, variables)
+            if case is not None:
+                yield case
+
+    def _next_wide_case(self, case_sql, var_sql):
+        """ Generator which returns Cases one at a time from the wide
+        layout. Each case and all of its variables come from one row of a
+        single join of the cases and casewide tables. A NULL column is a
+        variable that wasn't recorded for that case (or that failed one of
+        the variable selectors)."""
+
+        columns = _wide_columns(self._connection)
+        values = _wide_values(columns, ' AND '.join(var_sql))
+        sql = ["SELECT %s FROM cases"
+               " LEFT JOIN casewide ON casewide.case_id = cases.id"
+               % ', '.join(['cases.uuid', 'cases.parent', 'cases.msg'] +
+                           values)]
+        sql.extend(case_sql)
+
+        cur = self._connection.cursor()
+        cur.execute(' '.join(sql))
+        for row in cur:
+            text_id, parent, msg = row[:3]
+            variables = [(name, sense, value)
+                         for (col_id, name, sense), value in zip(columns,
+                                                                 row[3:])
+                         if value is not None]
+            case = self._make_case(text_id, parent, msg, variables)
+            if case is not None:
+                yield case
+
+    def _make_case(self, text_id, parent, msg, variables):
+        """Return a Case built from a list of (name, sense, value) read from
+        the DB, or None if it has no inputs or outputs."""
+        inputs = []
+        outputs = []
+        for vname, sense, value in variables:
+            if not isinstance(value, (float, int, str)):
+                try:
+                    value = _decode_value(value)
+                except UnpicklingError as err:
+                    print 'value', type(value), repr(value)
+                    raise UnpicklingError("can't unpickle value '%s' for"
+                                          " case '%s' from database: %s"
+                                          % (vname, text_id, str(err)))
+            if sense == 'i':
+                inputs.append((vname, value))
+            elif sense == 'o':
+                outputs.append((vname, value))
+        if len(inputs) > 0 or len(outputs) > 0:
+            exc = Exception(msg) if msg else None
+            return Case(inputs=inputs, outputs=outputs, exc=exc,
+                        case_uuid=text_id, parent_uuid=parent)
 
 
 class DBCaseRecorder(object):
     """Records Cases to a relational DB (sqlite). Values other than floats,
     ints or strings are pickled and are opaque to SQL queries.
+
+    Cases are buffered in memory and written in bulk. The buffer is
+    committed to the DB every `commit_cases` cases, when `commit_interval`
+    seconds have passed since the last commit (checked as each case is
+    recorded), and on :meth:`close` or :meth:`get_iterator`.
+
+    The default `layout`, ``'narrow'``, stores one row per variable per case
+    in a `casevars` table. The ``'wide'`` layout stores one row per case in
+    a `casewide` table with a column per variable (listed in the
+    `casecolumns` table), and stores numeric arrays as raw buffers rather
+    than pickles. In the wide layout a variable that is both an input and
+    an output of a case is stored once. :class:`DBCaseIterator`,
+    :func:`case_db_to_dict` and :func:`list_db_vars` read either layout.
     """
 
     implements(ICaseRecorder)
 
-    def __init__(self, dbfile=':memory:', model_id='', append=False):
+    def __init__(self, dbfile=':memory:', model_id='', append=False,
+                 commit_cases=1, commit_interval=None, layout='narrow'):
+        if layout not in ('narrow', 'wide'):
+            raise ValueError("layout must be 'narrow' or 'wide', not %r"
+                             % layout)
         self.dbfile = dbfile  # this creates the connection
         self.model_id = model_id
+        self.commit_cases = commit_cases
+        self.commit_interval = commit_interval
+        self.layout = layout
         self._cfg_map = {}
+        self._pending = []
+        self._last_commit = time.time()
+        self._columns = {}  # variable name -> wide table column id
 
         if append:
             exstr = 'if not exists'
@@ -153,14 +297,26 @@ class DBCaseRecorder(object):
          timeEnter TEXT
          )""" % exstr)
 
-        self._connection.execute("""
-        create table %s casevars(
-         var_id INTEGER PRIMARY KEY,
-         name TEXT,
-         case_id INTEGER,
-         sense TEXT,
-         value BLOB
-         )""" % exstr)
+        if layout == 'narrow':
+            self._connection.execute("""
+            create table %s casevars(
+             var_id INTEGER PRIMARY KEY,
+             name TEXT,
+             case_id INTEGER,
+             sense TEXT,
+             value BLOB
+             )""" % exstr)
+        else:
+            self._connection.execute("""
+            create table %s casecolumns(
+             col_id INTEGER PRIMARY KEY,
+             name TEXT UNIQUE,
+             sense TEXT
+             )""" % exstr)
+            self._connection.execute("""
+            create table %s casewide(
+             case_id INTEGER PRIMARY KEY
+             )""" % exstr)
 
     @property
     def dbfile(self):
@@ -173,7 +329,9 @@ class DBCaseRecorder(object):
     def dbfile(self, value):
         """Set the DB file and connect to it."""
         self._dbfile = value
-        self._connection = sqlite3.connect(value)
+        # Cases may be recorded by a background thread (see the
+        # 'asynchronous' recording option).
+        self._connection = sqlite3.connect(value, check_same_thread=False)
         self._iter_conn = sqlite3.connect(value)
 
     def startup(self):
@@ -188,63 +346,112 @@ class DBCaseRecorder(object):
         """Record constant data - currently ignored."""
         pass
 
-    def record(self, driver, inputs, outputs, exc, case_uuid, parent_uuid):
+    def record(self, driver, inputs, outputs, exc, case_uuid, parent_uuid,
+               timestamp=None):
         """Record the given run data."""
         if self._connection is None:
             raise RuntimeError('Attempt to record on closed recorder')
 
-        cur = self._connection.cursor()
-
+        now = time.time() if timestamp is None else timestamp
         msg = '' if exc is None else str(exc)
-        cur.execute("""insert into cases(id,uuid,parent,msg,model_id,timeEnter)
-                           values (?,?,?,?,?,DATETIME('NOW'))""",
-                    (None, case_uuid, parent_uuid, msg, self.model_id))
-
-        case_id = cur.lastrowid
-        # insert the inputs and outputs into the vars table.  Pickle them if
-        # they're not one of the built-in types int, float, or str.
-
-        v = (None, 'timestamp', case_id, None, time.time())
-        cur.execute("insert into casevars(var_id,name,case_id,sense,value) values(?,?,?,?,?)",
-                    v)
+        case = (case_uuid, parent_uuid, msg, self.model_id,
+                time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(now)))
 
+        # Values are converted now since the objects they refer to may
+        # change before the buffer is written.
+        raw = self.layout == 'wide'
         in_names, out_names = self._cfg_map[driver]
-
-        for name, value in zip(in_names, inputs):
-            if isinstance(value, (float, int, str)):
-                v = (None, name, case_id, 'i', value)
-            else:
-                if isinstance(value, TraitDictObject):
-                    value = dict(value)
-                elif isinstance(value, TraitListObject):
-                    value = list(value)
-                v = (None, name, case_id, 'i',
-                     sqlite3.Binary(dumps(value, HIGHEST_PROTOCOL)))
-            cur.execute("insert into casevars(var_id,name,case_id,sense,value) values(?,?,?,?,?)",
-                        v)
-        for name, value in zip(out_names, outputs):
-            if isinstance(value, (float, int, str)):
-                v = (None, name, case_id, 'o', value)
+        data = [('timestamp', None, now)]
+        data.extend([(name, 'i', _encode_value(value, raw))
+                     for name, value in zip(in_names, inputs)])
+        data.extend([(name, 'o', _encode_value(value, raw))
+                     for name, value in zip(out_names, outputs)])
+        self._pending.append((case, data))
+
+        if len(self._pending) >= self.commit_cases or \
+           (self.commit_interval is not None and
+            now - self._last_commit >= self.commit_interval):
+            self.flush()
+
+    def flush(self):
+        """Write any buffered cases to the DB and commit."""
+        if self._connection is None:
+            return
+        if self._pending:
+            if self.layout == 'wide':
+                self._add_columns()
+
+            cur = self._connection.cursor()
+            rows = {}
+            for case, data in self._pending:
+                cur.execute("""insert into cases(id,uuid,parent,msg,model_id,timeEnter)
+                                   values (?,?,?,?,?,?)""", (None,)+case)
+                case_id = cur.lastrowid
+
+                if self.layout == 'narrow':
+                    rows.setdefault(None, []).extend(
+                        [(case_id, name, sense, value)
+                         for name, sense, value in data])
+                else:
+                    col_ids = []
+                    values = [case_id]
+                    for name, sense, value in data:
+                        col_id = self._columns[name]
+                        if col_id not in col_ids:
+                            col_ids.append(col_id)
+                            values.append(value)
+                    rows.setdefault(tuple(col_ids), []).append(values)
+
+            if self.layout == 'narrow':
+                cur.executemany("insert into casevars(case_id,name,sense,value)"
+                                " values(?,?,?,?)", rows[None])
             else:
-                if isinstance(value, TraitDictObject):
-                    value = dict(value)
-                elif isinstance(value, TraitListObject):
-                    value = list(value)
-                v = (None, name, case_id, 'o',
-                     sqlite3.Binary(dumps(value, HIGHEST_PROTOCOL)))
-            cur.execute("insert into casevars(var_id,name,case_id,sense,value) values(?,?,?,?,?)",
-                        v)
+                for col_ids, values in rows.items():
+                    cur.executemany("insert into casewide(case_id,%s) values(%s)"
+                                    % (','.join([_column(c) for c in col_ids]),
+                                       ','.join(['?']*(len(col_ids)+1))),
+                                    values)
+            self._pending = []
+
+        self._connection.commit()
+        self._last_commit = time.time()
+
+    def _add_columns(self):
+        """Add columns to the wide table for any new variables in the
+        buffered cases, and record the column id of each variable.
+        """
+        new = []
+        for case, data in self._pending:
+            for name, sense, value in data:
+                if name not in self._columns:
+                    self._columns[name] = None
+                    new.append((name, sense))
+        if not new:
+            return
+
+        # Another recorder may be appending to the same DB.
+        cur = self._connection.execute("SELECT name, col_id FROM casecolumns")
+        self._columns.update(cur.fetchall())
+        for name, sense in new:
+            if self._columns[name] is None:
+                cur = self._connection.execute("insert into casecolumns"
+                                               "(name,sense) values(?,?)",
+                                               (name, sense))
+                self._columns[name] = cur.lastrowid
+                self._connection.execute("alter table casewide add column %s"
+                                         % _column(cur.lastrowid))
         self._connection.commit()
 
     def close(self):
         """Commit and close DB connection if not using ``:memory:``."""
+        self.flush()
         if self._connection is not None and self._dbfile != ':memory:':
-            self._connection.commit()
             self._connection.close()
             self._connection = None
 
     def get_iterator(self):
         """Return a DBCaseIterator that points to our current DB."""
+        self.flush()
         return DBCaseIterator(dbfile=self._dbfile, connection=self._connection)
 
 
@@ -261,6 +468,9 @@ def list_db_vars(dbname):
         The name of the sqlite DB file.
     """
     connection = sqlite3.connect(dbname)
+    if _wide_layout(connection):
+        return set([(name,) for col_id, name, sense
+                    in _wide_columns(connection)])
     varcur = connection.cursor()
     varcur.execute("SELECT name from casevars")
     varnames = set([v for v in varcur])
@@ -307,6 +517,9 @@ def case_db_to_dict(dbname, varnames, case_sql='', var_sql='', include_errors=Fa
     if qlist:
         sql.append("WHERE %s" % ' AND '.join(qlist))
 
+    if _wide_layout(connection):
+        return _wide_db_to_dict(connection, vardict, sql[1:], var_sql)
+
     casecur = connection.cursor()
     casecur.execute(' '.join(sql))
 
@@ -334,7 +547,7 @@ def case_db_to_dict(dbname, varnames, case_sql='', var_sql='', include_errors=Fa
         for vname, value in varcur:
             if not isinstance(value, (float, int, str)):
                 try:
-                    value = loads(str(value))
+                    value = _decode_value(value)
                 except UnpicklingError as err:
                     raise UnpicklingError("can't unpickle value '%s' from"
                                           " database: %s" % (vname, str(err)))
@@ -350,6 +563,39 @@ def case_db_to_dict(dbname, varnames, case_sql='', var_sql='', include_errors=Fa
     return vardict
 
 
+def _wide_db_to_dict(connection, vardict, case_sql, var_sql):
+    """Fill `vardict` from the wide layout on `connection` with one query
+    over the cases and casewide tables (see :func:`case_db_to_dict`)."""
+
+    columns = [(col_id, name, sense)
+               for col_id, name, sense in _wide_columns(connection)
+               if name in vardict]
+    if not columns or len(columns) != len(vardict):
+        return vardict  # no case can contain all of the specified vars
+
+    sql = ["SELECT %s FROM cases JOIN casewide ON casewide.case_id = cases.id"
+           % ', '.join(_wide_values(columns, var_sql))]
+    sql.extend(case_sql)
+
+    cur = connection.cursor()
+    cur.execute(' '.join(sql))
+    for row in cur:
+        if None in row:
+            continue   # case doesn't contain a complete set of specified vars,
+                       # so skip it to avoid data mismatches
+
+        for (col_id, vname, sense), value in zip(columns, row):
+            if not isinstance(value, (float, int, str)):
+                try:
+                    value = _decode_value(value)
+                except UnpicklingError as err:
+                    raise UnpicklingError("can't unpickle value '%s' from"
+                                          " database: %s" % (vname, str(err)))
+            vardict[vname].append(value)
+
+    return vardict
+
+
 def _get_lines(dbname, xnames, ynames, case_sql=None, var_sql=None):
     """Return a list of lines which will be fed to the plot function."""
 
@@ -1,6 +1,6 @@
 import sys
 
-from query import DictList, ListResult
+from query import ColumnResult, DictList, ListResult
 
 
 def caseset_query_dump(data, out=None):
@@ -12,7 +12,7 @@ def caseset_query_dump(data, out=None):
 
     cds = data.cds
     by_variable = False
-    if isinstance(data, DictList):
+    if isinstance(data, (DictList, ColumnResult)):
         by_variable = True
         keys = data.keys()
     elif isinstance(data, list) and hasattr(data[0], 'keys'):
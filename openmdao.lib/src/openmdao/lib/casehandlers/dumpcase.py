@@ -48,7 +48,8 @@ class DumpCaseRecorder(object):
         for path in sorted(constants.keys()):
             write("   %s: %s\n" % (path, constants[path]))
 
-    def record(self, driver, inputs, outputs, exc, case_uuid, parent_uuid):
+    def record(self, driver, inputs, outputs, exc, case_uuid, parent_uuid,
+               timestamp=None):
         """Dump the given run data in a "pretty" form."""
         if not self.out:  # if self.out is None, just do nothing
             return
@@ -60,7 +61,9 @@ class DumpCaseRecorder(object):
         write = self.out.write
         write("Case:\n")
         write("   uuid: %s\n" % case_uuid)
-        write("   timestamp: %15f\n" % time.time())
+        if timestamp is None:
+            timestamp = time.time()
+        write("   timestamp: %15f\n" % timestamp)
         if parent_uuid:
             write("   parent_uuid: %s\n" % parent_uuid)
 
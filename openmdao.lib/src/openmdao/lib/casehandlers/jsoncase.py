@@ -158,8 +158,10 @@ class _BaseRecorder(object):
         return driver_info
 
     def get_case_info(self, driver, inputs, outputs, exc,
-                      case_uuid, parent_uuid):
+                      case_uuid, parent_uuid, timestamp=None):
         """ Return case info dictionary. """
+        if timestamp is None:
+            timestamp = time.time()
         in_names, out_names = self._cfg_map[driver]
         data = dict(zip(in_names, inputs))
         data.update(zip(out_names, outputs))
@@ -169,7 +171,7 @@ class _BaseRecorder(object):
                     _driver_id=id(driver),
                     error_status=None,
                     error_message=str(exc) if exc else '',
-                    timestamp=time.time(),
+                    timestamp=timestamp,
                     data=data)
 
 
@@ -180,9 +182,15 @@ class JSONCaseRecorder(_BaseRecorder):
     then that standard stream is used. Otherwise, if `out` is a string, then
     a file with that name will be opened in the current directory.
     If `out` is None, cases will be ignored.
+
+    If `indent` is None, cases are written without whitespace between
+    items. `out` is flushed after each case unless `flush_interval` is
+    nonzero, in which case it's flushed at most every `flush_interval`
+    seconds (and on :meth:`close`).
     """
 
-    def __init__(self, out='cases.json', indent=4, sort_keys=True):
+    def __init__(self, out='cases.json', indent=4, sort_keys=True,
+                 flush_interval=0.):
         super(JSONCaseRecorder, self).__init__()
         if isinstance(out, basestring):
             if out == 'stdout':
@@ -194,6 +202,8 @@ class JSONCaseRecorder(_BaseRecorder):
         self.out = out
         self.indent = indent
         self.sort_keys = sort_keys
+        self.flush_interval = flush_interval
+        self._last_flush = time.time()
         self._count = 0
 
     def record_constants(self, constants):
@@ -222,13 +232,14 @@ class JSONCaseRecorder(_BaseRecorder):
 
         self.out.flush()
 
-    def record(self, driver, inputs, outputs, exc, case_uuid, parent_uuid):
+    def record(self, driver, inputs, outputs, exc, case_uuid, parent_uuid,
+               timestamp=None):
         """ Dump the given run data. """
         if not self.out:
             return
 
         info = self.get_case_info(driver, inputs, outputs, exc,
-                                  case_uuid, parent_uuid)
+                                  case_uuid, parent_uuid, timestamp)
         self._cases += 1
         category = 'iteration_case_%s' % self._cases
         data = self._dump(info, category, ('data',))
@@ -237,13 +248,20 @@ class JSONCaseRecorder(_BaseRecorder):
                        % (self._count, len(data), category))
         self.out.write(data)
         self.out.write('\n')
-        self.out.flush()
+        _flush_if_due(self)
+
+    def flush(self):
+        """ Flush `out`. """
+        if self.out:
+            self.out.flush()
+            self._last_flush = time.time()
 
     def _dump(self, info, category, subcategories=None):
         """ Return JSON data, report any bad keys & values encountered. """
+        separators = (',', ':') if self.indent is None else None
         try:
             return json.dumps(info, indent=self.indent,
-                              sort_keys=self.sort_keys,
+                              sort_keys=self.sort_keys, separators=separators,
                               cls=_Encoder, check_circular=False)
         except Exception as exc:
             # Log bad keys & values.
@@ -285,6 +303,7 @@ class JSONCaseRecorder(_BaseRecorder):
         """
         if self.out is not None and self._cases is not None:
             self.out.write('}\n')
+        self.flush()
 
         if self.out not in (None, sys.stdout, sys.stderr):
             if not isinstance(self.out,
@@ -300,6 +319,13 @@ class JSONCaseRecorder(_BaseRecorder):
         return None
 
 
+def _flush_if_due(recorder):
+    """ Flush `recorder` if its `flush_interval` has elapsed. """
+    if not recorder.flush_interval or \
+       time.time() - recorder._last_flush >= recorder.flush_interval:
+        recorder.flush()
+
+
 class _Encoder(json.JSONEncoder):
     """ Special encoder to deal with types not handled by default encoder. """
 
@@ -338,6 +364,9 @@ class BSONCaseRecorder(_BaseRecorder):
     Dumps a run in BSON form to `out`, which may be a string or a file-like
     object. If `out` is a string, then a file with that name will be opened
     in the current directory. If `out` is None, cases will be ignored.
+    `out` is flushed after each case unless `flush_interval` is nonzero,
+    in which case it's flushed at most every `flush_interval` seconds (and
+    on :meth:`close`).
 
     The resulting file can be read by code similar to this::
 
@@ -367,11 +396,13 @@ class BSONCaseRecorder(_BaseRecorder):
 
     """
 
-    def __init__(self, out='cases.bson'):
+    def __init__(self, out='cases.bson', flush_interval=0.):
         super(BSONCaseRecorder, self).__init__()
         if isinstance(out, basestring):
             out = open(out, 'w')
         self.out = out
+        self.flush_interval = flush_interval
+        self._last_flush = time.time()
 
     def record_constants(self, constants):
         """ Record constant data. """
@@ -391,18 +422,25 @@ class BSONCaseRecorder(_BaseRecorder):
 
         self.out.flush()
 
-    def record(self, driver, inputs, outputs, exc, case_uuid, parent_uuid):
+    def record(self, driver, inputs, outputs, exc, case_uuid, parent_uuid,
+               timestamp=None):
         """ Dump the given run data in a "pretty" form. """
         if not self.out:
             return
 
         info = self.get_case_info(driver, inputs, outputs, exc,
-                                  case_uuid, parent_uuid)
+                                  case_uuid, parent_uuid, timestamp)
         data = self._dump(info)
         reclen = pack('<L', len(data))
         self.out.write(reclen)
         self.out.write(data)
-        self.out.flush()
+        _flush_if_due(self)
+
+    def flush(self):
+        """ Flush `out`. """
+        if self.out:
+            self.out.flush()
+            self._last_flush = time.time()
 
     def _dump(self, info):
         """ Return BSON data, report any bad keys & values encountered. """
@@ -413,6 +451,7 @@ class BSONCaseRecorder(_BaseRecorder):
         Closes `out`. Note that a closed recorder will do nothing in
         :meth:`record`.
         """
+        self.flush()
         if self.out is not None:
             if not isinstance(self.out,
                               (StringIO.StringIO, cStringIO.OutputType)):
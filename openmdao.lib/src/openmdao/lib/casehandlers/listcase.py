@@ -47,11 +47,15 @@ class ListCaseRecorder(object):
         """Record constant data - currently ignored."""
         pass
 
-    def record(self, driver, inputs, outputs, exc, case_uuid, parent_uuid):
+    def record(self, driver, inputs, outputs, exc, case_uuid, parent_uuid,
+               timestamp=None):
         """Store the case in our internal list."""
         in_names, out_names = self._cfg_map[driver]
-        self.cases.append(Case(zip(in_names, inputs), zip(out_names, outputs),
-                               exc, case_uuid, parent_uuid))
+        case = Case(zip(in_names, inputs), zip(out_names, outputs),
+                    exc, case_uuid, parent_uuid)
+        if timestamp is not None:
+            case.timestamp = timestamp
+        self.cases.append(case)
 
     def close(self):
         """Does nothing."""
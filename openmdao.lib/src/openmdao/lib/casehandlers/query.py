@@ -1,23 +1,35 @@
 import bson
 import json
 import logging
+import mmap
+import numpy
+import re
 
 import StringIO
 
+from json.decoder import scanstring
+from numpy.lib.stride_tricks import as_strided
 from struct import pack, unpack
 from weakref import ref
 
 from openmdao.main.api import Assembly, VariableTree
+from openmdao.lib.casehandlers.binarycase import MAGIC, RECORD, CASE, \
+                                                 LAYOUT, ITERATION_CASE
+from openmdao.lib.casehandlers.jsoncase import _Encoder, _fixup
 
 _GLOBAL_DICT = dict(__builtins__=None)
 
+# Case metadata, selectable along with variables.
+_METADATA_NAMES = ('_id', '_parent_id', '_driver_id', 'error_status',
+                   'error_message', 'timestamp')
+
 
 class CaseDataset(object):
     """
     Reads case data from `filename` and allows queries on it.
-    `format` should be ``bson`` or ``json``, indicating a
-    :class:`BSONCaseRecorder` file or :class:`JSONCaseRecorder` file
-    respectively.
+    `format` should be ``bson``, ``json`` or ``binary``, indicating a
+    :class:`BSONCaseRecorder`, :class:`JSONCaseRecorder` or
+    :class:`BinaryCaseRecorder` file respectively.
 
     To get all case data::
 
@@ -48,6 +60,15 @@ class CaseDataset(object):
 
         cases = cds.data.driver(driver_name).parent_case(parent_id).fetch()
 
+    To get NumPy arrays of selected variables, one entry per case::
+
+        columns = cds.data.vars('top.sub.comp.x', 'top.sub.comp.y').columnar().fetch()
+        x = columns['top.sub.comp.x']
+
+    For a ``binary`` dataset, columns of numeric variables recorded by a
+    single driver are read directly from the memory-mapped file. They are
+    read-only, and are views of the file if its cases are evenly spaced.
+
     Other possibilities exist, see :class:`Query`.
 
     To restore from the last recorded case::
@@ -62,8 +83,11 @@ class CaseDataset(object):
             self._reader = _BSONReader(filename)
         elif format == 'json':
             self._reader = _JSONReader(filename)
+        elif format == 'binary':
+            self._reader = _BinaryReader(filename)
         else:
-            raise ValueError("dataset format must be 'json' or 'bson'")
+            raise ValueError("dataset format must be 'json', 'bson' or"
+                             " 'binary'")
 
         self._query_id = self._parent_id = self._driver_id = None
         self._case_ids = self._drivers = None
@@ -87,8 +111,7 @@ class CaseDataset(object):
         """ Return data based on `query`. """
         self._setup(query)
 
-        metadata_names = ['_id', '_parent_id', '_driver_id', 'error_status',
-                          'error_message', 'timestamp']
+        metadata_names = list(_METADATA_NAMES)
         if query.vnames:
             tmp = []
             for name in metadata_names:
@@ -114,56 +137,38 @@ class CaseDataset(object):
             # Returning single row, not list of rows.
             return names
 
+        if query.columns:
+            return self._fetch_columns(query, names, metadata_names)
+
         nan = float('NaN')
         rows = ListResult()
         state = {}  # Retains last seen values.
-        for case_data in self._reader.cases():
-            data = case_data['data']
-            case_id = case_data['_id']
+        for case_data, data in self._select(query, names, state):
             case_driver_id = case_data['_driver_id']
-
             prefix = self._drivers[case_driver_id]['prefix']
-            if prefix:
-                # Make names absolute.
-                data = dict([(prefix+name, value)
-                             for name, value in data.items()])
-            else:
-                data = data.copy()  # Don't modify reader version.
 
-            state.update(data)
-
-            # Filter on driver.
-            if self._driver_id is not None and \
-               case_driver_id != self._driver_id:
-                continue
-
-            # Filter on case.
-            if self._case_ids is None or case_id in self._case_ids:
-                for name in metadata_names:
-                    data[name] = case_data[name]
+            for name in metadata_names:
+                data[name] = case_data[name]
 
-                row = DictList(names)
-                for name in names:
-                    if query.local_only:
-                        if name in metadata_names:
-                            row.append(data[name])
-                        else:
-                            driver = self._drivers[case_driver_id]
-                            lnames = [prefix+rec for rec in driver['recording']]
-                            if name in lnames:
-                                row.append(data[name])
-                            else:
-                                row.append(nan)
-                    elif name in state:
-                        row.append(state[name])
-                    elif name in data:
+            row = DictList(names)
+            for name in names:
+                if query.local_only:
+                    if name in metadata_names:
                         row.append(data[name])
                     else:
-                        row.append(nan)
-                rows.append(row)
-
-            if case_id == self._query_id or case_id == self._parent_id:
-                break  # Parent is last case recorded.
+                        driver = self._drivers[case_driver_id]
+                        lnames = [prefix+rec for rec in driver['recording']]
+                        if name in lnames:
+                            row.append(data[name])
+                        else:
+                            row.append(nan)
+                elif name in state:
+                    row.append(state[name])
+                elif name in data:
+                    row.append(data[name])
+                else:
+                    row.append(nan)
+            rows.append(row)
 
         if self._query_id and not rows:
             raise ValueError('No case with _id %s' % self._query_id)
@@ -180,6 +185,171 @@ class CaseDataset(object):
         rows.cds = self
         return rows
 
+    def _fetch_columns(self, query, names, metadata_names):
+        """
+        Return :class:`ColumnResult` for `query`, built in a single pass
+        over the selected cases.
+        """
+        if hasattr(self._reader, 'read_columns'):
+            result = self._fetch_mapped_columns(query, names, metadata_names)
+            if result is not None:
+                return result
+
+        missing = _MISSING
+        columns = dict([(name, _Column()) for name in names])
+        recorded = {}  # Absolute names recorded, keyed by driver id.
+        state = {}  # Retains last seen values.
+        ncases = 0
+        for case_data, data in self._select(query, names, state):
+            ncases += 1
+            case_driver_id = case_data['_driver_id']
+            if query.local_only:
+                local = recorded.get(case_driver_id)
+                if local is None:
+                    driver = self._drivers[case_driver_id]
+                    local = set([driver['prefix']+rec
+                                 for rec in driver['recording']])
+                    recorded[case_driver_id] = local
+
+            for name in names:
+                if name in metadata_names:
+                    value = case_data[name]
+                elif query.local_only:
+                    value = data.get(name, missing) if name in local \
+                                                    else missing
+                elif name in state:
+                    value = state[name]
+                else:
+                    value = data.get(name, missing)
+                columns[name].append(value)
+
+        if self._query_id and not ncases:
+            raise ValueError('No case with _id %s' % self._query_id)
+
+        result = ColumnResult(names, [(name, columns[name].result())
+                                      for name in names])
+        result.cds = self
+        return result
+
+    def _fetch_mapped_columns(self, query, names, metadata_names):
+        """
+        Return :class:`ColumnResult` for `query` read directly from the
+        reader's fixed-layout data, or None if that isn't possible. It's
+        possible if all selected cases are from one driver, which recorded
+        all of `names` other than the case ids and timestamp as numeric
+        values.
+        """
+        if query.local_only or self._case_ids is not None:
+            return None
+
+        driver_id = self._driver_id
+        if driver_id is None:
+            ids = set([entry[2] for entry in self._reader.index()])
+            if len(ids) != 1:
+                return None
+            driver_id = ids.pop()
+
+        prefix = self._drivers[driver_id]['prefix']
+        local = []
+        for name in names:
+            if name in metadata_names:
+                if name not in ('_id', '_parent_id', '_driver_id',
+                                'timestamp'):
+                    return None
+                local.append(name)
+            elif name.startswith(prefix):
+                local.append(name[len(prefix):])
+            else:
+                return None
+
+        columns = self._reader.read_columns(driver_id, local)
+        if columns is None:
+            return None
+        result = ColumnResult(names, zip(names, columns))
+        result.cds = self
+        return result
+
+    def _select(self, query, names, state):
+        """
+        Yield ``(case_data, data)`` for each case selected by `query`, where
+        `data` contains the case's values keyed by absolute name.
+        Unless the query is local, `state` is kept updated with the last
+        seen value of each variable in `names`.
+        Cases are located via the reader's index, so only the cases needed
+        are read, and only the variables in `query.vnames` are decoded.
+        """
+        index = self._reader.index()
+        wanted = {}  # Local names to read, keyed by driver id.
+        for _id, driver_info in self._drivers.items():
+            if query.vnames is None:
+                wanted[_id] = None
+            else:
+                prefix = driver_info['prefix']
+                wanted[_id] = set([name[len(prefix):] for name in query.vnames
+                                   if name.startswith(prefix)])
+                wanted[_id] &= set(driver_info['recording'])
+
+        start = 0
+        stop = len(index)
+        if self._case_ids is not None:
+            last = self._query_id or self._parent_id
+            for i, entry in enumerate(index):
+                if entry[1] == last:
+                    stop = i + 1  # Parent is last case recorded.
+                    break
+            selected = [i for i in range(stop)
+                        if index[i][1] in self._case_ids]
+            if not selected:
+                return
+            start = selected[0]
+            if not query.local_only:
+                self._backfill(index[:start], names, state)
+
+        for offset, case_id, case_driver_id, parent_id in index[start:stop]:
+            # Filter on driver and case.
+            selected = (self._driver_id is None or
+                        case_driver_id == self._driver_id) and \
+                       (self._case_ids is None or case_id in self._case_ids)
+            if not selected and query.local_only:
+                continue
+
+            case_data = self._reader.read_case(offset, wanted[case_driver_id])
+            prefix = self._drivers[case_driver_id]['prefix']
+            # Make names absolute.
+            data = dict([(prefix+name, value)
+                         for name, value in case_data['data'].items()])
+            if not query.local_only:
+                state.update(data)
+            if selected:
+                yield case_data, data
+
+    def _backfill(self, index, names, state):
+        """
+        Set `state` to the last values of `names` recorded in the cases
+        of `index`, reading backwards until all have been found.
+        """
+        recorded = set()
+        for driver_info in self._drivers.values():
+            prefix = driver_info['prefix']
+            recorded.update([prefix+name for name in driver_info['recording']])
+        missing = set(names) & recorded
+
+        for offset, case_id, case_driver_id, parent_id in reversed(index):
+            if not missing:
+                break
+            driver_info = self._drivers[case_driver_id]
+            prefix = driver_info['prefix']
+            local = set([name[len(prefix):] for name in missing
+                         if name.startswith(prefix)])
+            local &= set(driver_info['recording'])
+            if not local:
+                continue
+
+            data = self._reader.read_case(offset, local)['data']
+            for name, value in data.items():
+                state[prefix+name] = value
+                missing.discard(prefix+name)
+
     def _write(self, query, out, format):
         """ Write data based on `query` to `out`. """
         if query.local_only:
@@ -188,6 +358,8 @@ class CaseDataset(object):
             raise ValueError('data.var_names() invalid for write()')
         if query.transpose:
             raise ValueError('data.by_variable() invalid for write()')
+        if query.columns:
+            raise ValueError('data.columnar() invalid for write()')
 
         self._setup(query)
 
@@ -272,7 +444,7 @@ class CaseDataset(object):
             bad = []
             metadata = self.simulation_info['variable_metadata']
             for name in query.vnames:
-                if name not in metadata:
+                if name not in metadata and name not in _METADATA_NAMES:
                     bad.append(name)
             if bad:
                 raise RuntimeError('Names not found in the dataset: %s' % bad)
@@ -306,11 +478,7 @@ class CaseDataset(object):
             # Collect tree of cases.
             self._parent_id = query.parent_id
             cases = {}
-            for case_data in self._reader.cases():
-                _id = case_data['_id']
-                _driver_id = case_data['_driver_id']
-                _parent_id = case_data['_parent_id']
-
+            for offset, _id, _driver_id, _parent_id in self._reader.index():
                 if _id in cases:
                     node = cases[_id]
                     node.driver_id = _driver_id
@@ -435,6 +603,7 @@ class Query(object):
         self.local_only = False
         self.names = False
         self.transpose = False
+        self.columns = False
 
     def fetch(self):
         """ Return a list of rows of data, one for each selected case. """
@@ -493,6 +662,7 @@ class Query(object):
         Have :meth:`fetch` return data as ``[case][var]`` (the default).
         """
         self.transpose = False
+        self.columns = False
         return self
 
     def by_variable(self):
@@ -501,6 +671,16 @@ class Query(object):
         default of ``[case][var]``.
         """
         self.transpose = True
+        self.columns = False
+        return self
+
+    def columnar(self):
+        """
+        Have :meth:`fetch` return a :class:`ColumnResult`, a dictionary of
+        NumPy arrays indexed as ``[var][case]``.
+        """
+        self.columns = True
+        self.transpose = False
         return self
 
     def var_names(self):
@@ -545,6 +725,114 @@ class ListResult(list):
     pass
 
 
+class ColumnResult(dict):
+    """
+    Dictionary of NumPy arrays keyed by variable name, each with one entry
+    per case. Values of array-valued variables with a fixed shape are
+    stacked, giving an array of shape ``(ncases,) + shape``. Variables with
+    values missing from some cases are returned as masked arrays. `names`
+    lists the variable names in query order.
+    """
+
+    def __init__(self, names, columns):
+        super(ColumnResult, self).__init__(columns)
+        self.names = names
+        self.cds = None
+
+
+# Placeholder for a value missing from a case.
+_MISSING = object()
+
+
+class _Column(object):
+    """
+    Accumulates the values of a variable, one per case. Numeric values of a
+    fixed shape are copied into a growing NumPy buffer as they arrive, so
+    per-case Python objects aren't retained. Other values are kept in a
+    list.
+    """
+
+    def __init__(self):
+        self._size = 0
+        self._missing = []
+        self._buffer = None
+        self._count = 0
+        self._values = None
+
+    def append(self, value):
+        """ Append `value`, which may be :data:`_MISSING`. """
+        index = self._size
+        self._size += 1
+        if value is _MISSING:
+            self._missing.append(index)
+            return
+
+        if self._values is None:
+            if isinstance(value, (dict, basestring)):
+                array = None
+            else:
+                array = numpy.asarray(value)
+                if array.dtype.kind not in 'biuf':
+                    array = None
+
+            buf = self._buffer
+            if array is None or \
+               (buf is not None and array.shape != buf.shape[1:]):
+                self._values = [] if buf is None \
+                                  else buf[:self._count].tolist()
+                self._buffer = None
+            else:
+                if buf is None:
+                    buf = numpy.empty((16,) + array.shape, array.dtype)
+                elif self._count == len(buf):
+                    new = numpy.empty((2*len(buf),) + buf.shape[1:],
+                                      numpy.result_type(buf, array))
+                    new[:self._count] = buf
+                    buf = new
+                elif array.dtype != buf.dtype and \
+                     numpy.result_type(buf, array) != buf.dtype:
+                    buf = buf.astype(numpy.result_type(buf, array))
+                buf[self._count] = array
+                self._count += 1
+                self._buffer = buf
+                return
+
+        self._values.append(value)
+
+    def result(self):
+        """
+        Return array of values. If any are missing, a masked array is
+        returned. Values which can't be stacked into a regular array are
+        returned in a one-dimensional object array.
+        """
+        if self._buffer is not None:
+            array = self._buffer[:self._count].copy()
+        elif not self._values:
+            array = numpy.empty(0)
+        else:
+            array = None
+            values = self._values
+            if not isinstance(values[0], dict):
+                try:
+                    array = numpy.array(values)
+                except ValueError:  # Ragged.
+                    pass
+            if array is None or array.dtype == object:
+                array = numpy.empty(len(values), dtype=object)
+                for i, value in enumerate(values):
+                    array[i] = value
+
+        if not self._missing:
+            return array
+
+        masked = numpy.ma.masked_all((self._size,) + array.shape[1:],
+                                     dtype=array.dtype)
+        present = numpy.ones(self._size, dtype=bool)
+        present[self._missing] = False
+        masked[present] = array
+        return masked
+
+
 class _CaseNode(object):
     """ Represents a node in a tree of cases. """
 
@@ -589,16 +877,65 @@ class _Reader(object):
         self._simulation_info = self._next()
         self._state = 'drivers'
         self._info = None
+        self._index = None
 
     def _next(self):
         """ Return next dictionary of data. """
         raise NotImplementedError('_next')
 
+    def _next_selected(self, names):
+        """
+        Return next dictionary of data, with only `names` decoded from
+        its 'data' dictionary.
+        """
+        raise NotImplementedError('_next_selected')
+
+    def _skip(self, size):
+        """
+        Skip over the next record, returning ``(offset, ids)``, where `ids`
+        is ``(_id, _driver_id, _parent_id)`` for a case and None otherwise.
+        Returns None at the end of data or on a truncated record. `size` is
+        the size of the file.
+        """
+        raise NotImplementedError('_skip')
+
     @property
     def simulation_info(self):
         """ Simulation info dictionary. """
         return self._simulation_info
 
+    def index(self):
+        """
+        Return list of ``(offset, _id, _driver_id, _parent_id)``, one for each
+        case in recorded order. The index is built on the first call by
+        scanning record headers; case data isn't decoded.
+        """
+        if self._index is None:
+            self._state = 'index'
+            self._inp.seek(0, 2)
+            size = self._inp.tell()
+            self._inp.seek(0)
+            self._index = []
+            entry = self._skip(size)
+            while entry is not None:
+                offset, ids = entry
+                if ids is not None:
+                    self._index.append((offset,) + ids)
+                entry = self._skip(size)
+        return self._index
+
+    def read_case(self, offset, names=None):
+        """
+        Return the 'iteration_case' dictionary at `offset` (from
+        :meth:`index`). If `names` is not None, only those variables are
+        included in its 'data' dictionary.
+        """
+        self._state = 'index'
+        self._inp.seek(offset)
+        if names is None:
+            return self._next()
+        return self._next_selected(names)
+
     def drivers(self):
         """ Return list of 'driver_info' dictionaries. """
         if self._state != 'drivers':
@@ -643,6 +980,17 @@ class _JSONReader(_Reader):
 
     def _next(self):
         """ Return next dictionary of data. """
+        header = self._next_header()
+        if header is None:
+            return None
+        category, reclen = header
+        return json.loads(self._inp.read(reclen))
+
+    def _next_header(self):
+        """
+        Return ``(category, length)`` for the next record, leaving the input
+        at the start of its data, or None at the end of data.
+        """
         data = self._inp.readline()
         while '__length_' not in data:
             if not data:
@@ -650,10 +998,72 @@ class _JSONReader(_Reader):
             data = self._inp.readline()
 
         key, _, value = data.partition(':')  # '"__length_1": NNN'
-        reclen = int(value) - 1
-        data = self._inp.readline()  # ', "dictname": {'
-        data = '{\n' + self._inp.read(reclen)
-        return json.loads(data)
+
+        # The data follows ', "dictname": ' on the same line.
+        start = self._inp.tell()
+        header = self._inp.read(256)
+        end = header.find('": ')
+        while end < 0:
+            data = self._inp.read(256)
+            if not data:
+                return None
+            header += data
+            end = header.find('": ')
+        self._inp.seek(start + end + 3)
+        return (json.loads(header[:end+1].lstrip(', ')), int(value))
+
+    def _next_selected(self, names):
+        """
+        Return next dictionary of data, with only `names` decoded from
+        its 'data' dictionary.
+        """
+        header = self._next_header()
+        if header is None:
+            return None
+        category, reclen = header
+        body = self._inp.read(reclen)
+
+        info = {}
+        for name, start, end in _json_members(body):
+            if name == 'data':
+                sub = body[start:end]
+                info[name] = dict([(sub_name, json.loads(sub[sub_start:sub_end]))
+                                   for sub_name, sub_start, sub_end
+                                   in _json_members(sub)
+                                   if sub_name in names])
+            else:
+                info[name] = json.loads(body[start:end])
+        return info
+
+    def _skip(self, size):
+        """
+        Skip over the next record, returning ``(offset, ids)``, where `ids`
+        is ``(_id, _driver_id, _parent_id)`` for a case and None otherwise.
+        Returns None at the end of data or on a truncated record.
+        """
+        offset = self._inp.tell()
+        header = self._next_header()
+        if header is None:
+            return None
+        category, reclen = header
+        start = self._inp.tell()
+        if start + reclen > size:
+            return None
+
+        ids = None
+        if category.startswith('iteration_case_'):
+            keys = ('_id', '_driver_id', '_parent_id')
+            body = self._inp.read(reclen)
+            info = {}
+            for name, value_start, value_end in _json_members(body):
+                if name in keys:
+                    info[name] = json.loads(body[value_start:value_end])
+                    if len(info) == len(keys):
+                        break  # With sorted keys, the ids come first.
+            ids = tuple([info[key] for key in keys])
+
+        self._inp.seek(start + reclen)
+        return (offset, ids)
 
 
 class _BSONReader(_Reader):
@@ -670,6 +1080,337 @@ class _BSONReader(_Reader):
         reclen = unpack('<L', data)[0]
         return bson.loads(self._inp.read(reclen))
 
+    def _next_selected(self, names):
+        """
+        Return next dictionary of data, with only `names` decoded from
+        its 'data' dictionary.
+        """
+        data = self._inp.read(4)
+        if not data:
+            return None
+        reclen = unpack('<L', data)[0]
+        data = self._inp.read(reclen)
+
+        elements = []
+        for name, etype, start, end in _bson_elements(data):
+            if name == 'data' and etype == 0x03:
+                sub = data[start+len('data')+2:end]
+                sub = _bson_document([sub[sub_start:sub_end]
+                                      for sub_name, sub_type, sub_start, sub_end
+                                      in _bson_elements(sub)
+                                      if sub_name in names])
+                elements.append('\x03data\x00' + sub)
+            else:
+                elements.append(data[start:end])
+        return bson.loads(_bson_document(elements))
+
+    def _skip(self, size):
+        """
+        Skip over the next record, returning ``(offset, ids)``, where `ids`
+        is ``(_id, _driver_id, _parent_id)`` for a case and None otherwise.
+        Returns None at the end of data or on a truncated record.
+        """
+        offset = self._inp.tell()
+        data = self._inp.read(4)
+        if len(data) < 4:
+            return None
+        reclen = unpack('<L', data)[0]
+        data = self._inp.read(reclen)
+        if len(data) < reclen:
+            return None
+
+        keys = ('_id', '_driver_id', '_parent_id')
+        elements = [data[start:end]
+                    for name, etype, start, end in _bson_elements(data)
+                    if name in keys]
+        info = bson.loads(_bson_document(elements))
+        if '_driver_id' not in info:
+            return (offset, None)
+        return (offset, tuple([info[key] for key in keys]))
+
+
+class _BinaryReader(_Reader):
+    """ Reads a :class:`BinaryCaseRecorder` file. """
+
+    def __init__(self, filename):
+        self._layouts = {}
+        self._flat = None
+        super(_BinaryReader, self).__init__(filename, 'rb')
+
+    def _next_record(self):
+        """
+        Return ``(offset, tag, length)`` for the next record, or None at the
+        end of data.
+        """
+        if self._inp.tell() == 0:
+            if self._inp.read(len(MAGIC)) != MAGIC:
+                raise ValueError('Not a BinaryCaseRecorder file')
+        offset = self._inp.tell()
+        header = self._inp.read(RECORD.size)
+        if len(header) < RECORD.size:
+            return None
+        tag, length = RECORD.unpack(header)
+        return (offset, tag, length)
+
+    def _next(self, names=None):
+        """ Return next dictionary of data. """
+        while True:
+            record = self._next_record()
+            if record is None:
+                return None
+            offset, tag, length = record
+            payload = self._inp.read(length)
+            if len(payload) < length:
+                return None  # Truncated.
+            if tag == LAYOUT:
+                self._add_layout(payload)
+            elif tag == ITERATION_CASE:
+                return self._decode_case(payload, names)
+            else:
+                return json.loads(payload)
+
+    def _next_selected(self, names):
+        """
+        Return next dictionary of data, with only `names` decoded from
+        its 'data' dictionary.
+        """
+        return self._next(names)
+
+    def _skip(self, size):
+        """
+        Skip over the next record, returning ``(offset, ids)``, where `ids`
+        is ``(_id, _driver_id, _parent_id)`` for a case and None otherwise.
+        Returns None at the end of data or on a truncated record.
+        """
+        record = self._next_record()
+        if record is None:
+            return None
+        offset, tag, length = record
+        start = self._inp.tell()
+        if start + length > size:
+            return None
+
+        ids = None
+        if tag == LAYOUT:
+            self._add_layout(self._inp.read(length))
+        elif tag == ITERATION_CASE:
+            driver_id, id_len, parent_len, tail_len = \
+                CASE.unpack(self._inp.read(CASE.size))
+            self._inp.seek(8*self._layouts[driver_id]['size'], 1)
+            ids = (self._inp.read(id_len), driver_id,
+                   self._inp.read(parent_len))
+
+        self._inp.seek(start + length)
+        return (offset, ids)
+
+    def _add_layout(self, payload):
+        """ Save the layout of a driver's cases. """
+        layout = json.loads(payload)
+        layout['numeric'] = dict([(name, (start, tuple(shape), kind))
+                                  for name, start, shape, kind
+                                  in layout['numeric']])
+        self._layouts[layout['_driver_id']] = layout
+
+    def _decode_case(self, payload, names):
+        """ Return case dictionary, with only `names` in its 'data'. """
+        driver_id, id_len, parent_len, tail_len = CASE.unpack_from(payload)
+        layout = self._layouts[driver_id]
+        pos = CASE.size
+        block = numpy.frombuffer(payload, '<f8', layout['size'], pos)
+        pos += block.nbytes
+        _id = payload[pos:pos+id_len]
+        pos += id_len
+        parent_id = payload[pos:pos+parent_len]
+        pos += parent_len
+        tail = json.loads(payload[pos:pos+tail_len])
+
+        data = {}
+        for name, (start, shape, kind) in layout['numeric'].items():
+            if names is None or name in names:
+                data[name] = _unpack_value(block, start, shape, kind)
+        for name, value in tail['data'].items():
+            if names is None or name in names:
+                data[name] = value
+
+        return dict(_id=_id, _parent_id=parent_id, _driver_id=driver_id,
+                    error_status=None, error_message=tail['error_message'],
+                    timestamp=float(block[0]), data=data)
+
+    def read_columns(self, driver_id, names):
+        """
+        Return list of arrays of the values of `names` in the cases recorded
+        by driver `driver_id`, or None if any name isn't a numeric variable
+        or case metadata. Values are taken directly from the memory-mapped
+        file.
+        """
+        index = [entry for entry in self.index() if entry[2] == driver_id]
+        layout = self._layouts.get(driver_id)  # Read by index().
+        if layout is None:
+            return None
+        numeric = layout['numeric']
+        for name in names:
+            if name not in numeric and \
+               name not in ('_id', '_parent_id', '_driver_id', 'timestamp'):
+                return None
+
+        flat = self._mapped()
+        # Index of each case's block in `flat`.
+        first = (numpy.array([entry[0] for entry in index], dtype=int)
+                 + RECORD.size + CASE.size) // 8
+        stride = first[1] - first[0] if len(first) > 1 else 1
+        regular = len(first) > 0 and \
+                  numpy.all(numpy.diff(first) == stride)
+
+        columns = []
+        for name in names:
+            if name == '_id':
+                columns.append(numpy.array([entry[1] for entry in index]))
+                continue
+            elif name == '_parent_id':
+                columns.append(numpy.array([entry[3] for entry in index]))
+                continue
+            elif name == '_driver_id':
+                columns.append(numpy.array([entry[2] for entry in index]))
+                continue
+            elif name == 'timestamp':
+                start, shape, kind = 0, (), 'f'
+            else:
+                start, shape, kind = numeric[name]
+
+            size = 1
+            for dim in shape:
+                size *= dim
+            if regular:
+                column = as_strided(flat[first[0]+start:],
+                                    shape=(len(first), size),
+                                    strides=(8*stride, 8))
+            else:
+                column = flat[(first+start)[:, None] + numpy.arange(size)]
+            column = column.reshape((len(first),) + shape)
+            if kind != 'f':
+                column = column.astype(bool if kind == 'b' else int)
+            columns.append(column)
+        return columns
+
+    def _mapped(self):
+        """ Return the file as a read-only float64 array. """
+        self._inp.seek(0, 2)
+        size = self._inp.tell() // 8
+        if self._flat is None or len(self._flat) < size:
+            if isinstance(self._inp, StringIO.StringIO):
+                data = self._inp.getvalue()
+            else:
+                data = mmap.mmap(self._inp.fileno(), 0,
+                                 access=mmap.ACCESS_READ)
+            self._flat = numpy.frombuffer(data, '<f8', size)
+        return self._flat
+
+
+def _unpack_value(block, start, shape, kind):
+    """ Return value stored in `block` at `start`. """
+    if not shape:
+        value = block[start]
+        if kind == 'b':
+            return bool(value)
+        elif kind == 'i':
+            return int(value)
+        return float(value)
+
+    size = 1
+    for dim in shape:
+        size *= dim
+    value = block[start:start+size].reshape(shape)
+    if kind == 'b':
+        return value.astype(bool)
+    elif kind == 'i':
+        return value.astype(int)
+    return value.copy()
+
+
+# Sizes of fixed-length BSON element values, keyed by element type.
+_BSON_SIZES = {0x01: 8, 0x07: 12, 0x08: 1, 0x09: 8, 0x0A: 0,
+               0x10: 4, 0x11: 8, 0x12: 8, 0xFF: 0, 0x7F: 0}
+
+def _bson_elements(doc):
+    """
+    Yield ``(name, type, start, end)`` for each top-level element of BSON
+    document `doc` without decoding element values.
+    """
+    pos = 4
+    end = len(doc) - 1  # Trailing null.
+    while pos < end:
+        etype = ord(doc[pos])
+        name_end = doc.index('\x00', pos+1)
+        value_start = name_end + 1
+        if etype in _BSON_SIZES:
+            size = _BSON_SIZES[etype]
+        elif etype in (0x02, 0x0D, 0x0E):  # String, code, symbol.
+            size = 4 + unpack('<l', doc[value_start:value_start+4])[0]
+        elif etype in (0x03, 0x04):  # Document, array.
+            size = unpack('<l', doc[value_start:value_start+4])[0]
+        elif etype == 0x05:  # Binary.
+            size = 5 + unpack('<l', doc[value_start:value_start+4])[0]
+        else:
+            raise ValueError('Unsupported BSON element type %#x' % etype)
+        yield (doc[pos+1:name_end], etype, pos, value_start+size)
+        pos = value_start + size
+
+_JSON_WS = re.compile(r'[ \t\n\r]*')
+_JSON_TOKENS = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[][{}]')
+_JSON_SCALAR_END = re.compile(r'[ \t\n\r]*[],}]|$')
+
+def _json_value_end(text, pos):
+    """ Return the end of the JSON value starting at `text[pos]`. """
+    char = text[pos]
+    if char == '"':
+        return scanstring(text, pos+1)[1]
+    if char in '{[':
+        depth = 0
+        for match in _JSON_TOKENS.finditer(text, pos):
+            token = match.group()
+            if token in '{[':
+                depth += 1
+            elif token in '}]':
+                depth -= 1
+                if depth == 0:
+                    return match.end()
+        raise ValueError('Unterminated JSON value at %d' % pos)
+    return _JSON_SCALAR_END.search(text, pos).start()
+
+def _json_members(text):
+    """
+    Yield ``(name, start, end)`` for each member of the JSON object in `text`,
+    where ``text[start:end]`` is the member's value, without decoding values.
+    Only the structure matters, not the formatting.
+    """
+    pos = _JSON_WS.match(text).end()
+    if text[pos:pos+1] != '{':
+        raise ValueError('Expecting JSON object at %d' % pos)
+    pos = _JSON_WS.match(text, pos+1).end()
+    if text[pos:pos+1] == '}':
+        return
+    while True:
+        if text[pos:pos+1] != '"':
+            raise ValueError('Expecting property name at %d' % pos)
+        name, pos = scanstring(text, pos+1)
+        pos = _JSON_WS.match(text, pos).end()
+        if text[pos:pos+1] != ':':
+            raise ValueError("Expecting ':' at %d" % pos)
+        pos = _JSON_WS.match(text, pos+1).end()
+        end = _json_value_end(text, pos)
+        yield (name, pos, end)
+        pos = _JSON_WS.match(text, end).end()
+        if text[pos:pos+1] == '}':
+            return
+        if text[pos:pos+1] != ',':
+            raise ValueError("Expecting ',' at %d" % pos)
+        pos = _JSON_WS.match(text, pos+1).end()
+
+def _bson_document(elements):
+    """ Return BSON document containing encoded `elements`. """
+    body = ''.join(elements)
+    return pack('<l', len(body)+5) + body + '\x00'
+
 
 class _JSONWriter(object):
     """ Writes case data as JSON. """
@@ -690,7 +1431,8 @@ class _JSONWriter(object):
 
     def write(self, category, data):
         """ Write `data` under `category`. """
-        data = json.dumps(data, indent=self._indent, sort_keys=self._sort_keys)
+        data = json.dumps(data, indent=self._indent, sort_keys=self._sort_keys,
+                          cls=_Encoder)
         self._count += 1
         prefix = '{\n' if self._count == 1 else ', '
         self._out.write('%s"__length_%s": %s\n, "%s": '
@@ -722,7 +1464,7 @@ class _BSONWriter(object):
 
     def write(self, category, data):
         """ Write `data` under `category`. """
-        data = bson.dumps(data)
+        data = bson.dumps(_fixup(data))
         self._out.write(pack('<L', len(data)))
         self._out.write(data)
 
@@ -94,13 +94,16 @@ Constants:
    directory:
    driver.directory:
    driver.force_fd: False
+   driver.gradient_options.assemble_jacobian: False
    driver.gradient_options.atol: 1e-09
    driver.gradient_options.derivative_direction: auto
    driver.gradient_options.directional_fd: False
    driver.gradient_options.fd_blocks: []
+   driver.gradient_options.fd_coloring: False
    driver.gradient_options.fd_form: forward
    driver.gradient_options.fd_step: 1e-06
    driver.gradient_options.fd_step_type: absolute
+   driver.gradient_options.fd_workers: 1
    driver.gradient_options.force_fd: False
    driver.gradient_options.lin_solver: scipy_gmres
    driver.gradient_options.maxiter: 100
@@ -131,42 +134,54 @@ Constants:
    nested.doublenest.directory:
    nested.doublenest.driver.directory:
    nested.doublenest.driver.force_fd: False
+   nested.doublenest.driver.gradient_options.assemble_jacobian: False
    nested.doublenest.driver.gradient_options.atol: 1e-09
    nested.doublenest.driver.gradient_options.derivative_direction: auto
    nested.doublenest.driver.gradient_options.directional_fd: False
    nested.doublenest.driver.gradient_options.fd_blocks: []
+   nested.doublenest.driver.gradient_options.fd_coloring: False
    nested.doublenest.driver.gradient_options.fd_form: forward
    nested.doublenest.driver.gradient_options.fd_step: 1e-06
    nested.doublenest.driver.gradient_options.fd_step_type: absolute
+   nested.doublenest.driver.gradient_options.fd_workers: 1
    nested.doublenest.driver.gradient_options.force_fd: False
    nested.doublenest.driver.gradient_options.lin_solver: scipy_gmres
    nested.doublenest.driver.gradient_options.maxiter: 100
    nested.doublenest.driver.gradient_options.rtol: 1e-09
    nested.doublenest.force_fd: False
    nested.doublenest.missing_deriv_policy: assume_zero
+   nested.doublenest.recording_options.asynchronous: False
    nested.doublenest.recording_options.excludes: []
    nested.doublenest.recording_options.includes: ['*']
+   nested.doublenest.recording_options.queue_size: 100
    nested.doublenest.recording_options.save_problem_formulation: True
    nested.driver.directory:
    nested.driver.force_fd: False
+   nested.driver.gradient_options.assemble_jacobian: False
    nested.driver.gradient_options.atol: 1e-09
    nested.driver.gradient_options.derivative_direction: auto
    nested.driver.gradient_options.directional_fd: False
    nested.driver.gradient_options.fd_blocks: []
+   nested.driver.gradient_options.fd_coloring: False
    nested.driver.gradient_options.fd_form: forward
    nested.driver.gradient_options.fd_step: 1e-06
    nested.driver.gradient_options.fd_step_type: absolute
+   nested.driver.gradient_options.fd_workers: 1
    nested.driver.gradient_options.force_fd: False
    nested.driver.gradient_options.lin_solver: scipy_gmres
    nested.driver.gradient_options.maxiter: 100
    nested.driver.gradient_options.rtol: 1e-09
    nested.force_fd: False
    nested.missing_deriv_policy: assume_zero
+   nested.recording_options.asynchronous: False
    nested.recording_options.excludes: []
    nested.recording_options.includes: ['*']
+   nested.recording_options.queue_size: 100
    nested.recording_options.save_problem_formulation: True
+   recording_options.asynchronous: False
    recording_options.excludes: []
    recording_options.includes: ['*']
+   recording_options.queue_size: 100
    recording_options.save_problem_formulation: True
 Case:
    uuid: d3f91eee-5bc0-11e4-8005-080027a1f086
@@ -316,21 +331,26 @@ Constants:
    directory:
    driver.directory:
    driver.force_fd: False
+   driver.gradient_options.assemble_jacobian: False
    driver.gradient_options.atol: 1e-09
    driver.gradient_options.derivative_direction: auto
    driver.gradient_options.directional_fd: False
    driver.gradient_options.fd_blocks: []
+   driver.gradient_options.fd_coloring: False
    driver.gradient_options.fd_form: forward
    driver.gradient_options.fd_step: 1e-06
    driver.gradient_options.fd_step_type: absolute
+   driver.gradient_options.fd_workers: 1
    driver.gradient_options.force_fd: False
    driver.gradient_options.lin_solver: scipy_gmres
    driver.gradient_options.maxiter: 100
    driver.gradient_options.rtol: 1e-09
    force_fd: False
    missing_deriv_policy: assume_zero
+   recording_options.asynchronous: False
    recording_options.excludes: []
    recording_options.includes: ['*']
+   recording_options.queue_size: 100
    recording_options.save_problem_formulation: True
 Case:
    uuid: 0a159cf8-5bc1-11e4-8001-080027a1f086
@@ -379,21 +399,26 @@ Constants:
    directory:
    driver.directory:
    driver.force_fd: False
+   driver.gradient_options.assemble_jacobian: False
    driver.gradient_options.atol: 1e-09
    driver.gradient_options.derivative_direction: auto
    driver.gradient_options.directional_fd: False
    driver.gradient_options.fd_blocks: []
+   driver.gradient_options.fd_coloring: False
    driver.gradient_options.fd_form: forward
    driver.gradient_options.fd_step: 1e-06
    driver.gradient_options.fd_step_type: absolute
+   driver.gradient_options.fd_workers: 1
    driver.gradient_options.force_fd: False
    driver.gradient_options.lin_solver: scipy_gmres
    driver.gradient_options.maxiter: 100
    driver.gradient_options.rtol: 1e-09
    force_fd: False
    missing_deriv_policy: assume_zero
+   recording_options.asynchronous: False
    recording_options.excludes: []
    recording_options.includes: ['*']
+   recording_options.queue_size: 100
    recording_options.save_problem_formulation: True
 Case:
    uuid: 22e98e75-5bc1-11e4-8002-080027a1f086
@@ -8,11 +8,15 @@ import StringIO
 import os
 import logging
 import shutil
+import sqlite3
+
+import numpy
 
 from openmdao.main.api import Assembly, Case, set_as_top
 from openmdao.test.execcomp import ExecComp
 from openmdao.lib.casehandlers.api import DBCaseIterator, DBCaseRecorder, \
                                           DumpCaseRecorder, case_db_to_dict
+from openmdao.lib.casehandlers.dbcase import list_db_vars
 from openmdao.lib.drivers.api import SimpleCaseIterDriver, CaseIteratorDriver
 from openmdao.main.uncertain_distributions import NormalDistribution
 from openmdao.main.datatypes.api import List, Dict, Str
@@ -230,6 +234,164 @@ class DBCaseRecorderTestCase(unittest.TestCase):
             except OSError:
                 logging.error("problem removing directory %s", tmpdir)
 
+    def test_buffered(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            dfile = os.path.join(tmpdir, 'junk.db')
+            recorder = DBCaseRecorder(dfile, commit_cases=4)
+            recorder.register(self, ['comp1.x'], ['comp1.z'])
+            connection = sqlite3.connect(dfile)
+
+            def count():
+                cur = connection.execute("SELECT COUNT(*) FROM cases")
+                return cur.fetchone()[0]
+
+            for i in range(10):
+                recorder.record(self, [float(i)], [i*2.], None, '', '')
+                self.assertEqual(count(), 4*((i+1)//4))
+
+            recorder.close()
+            self.assertEqual(count(), 10)
+            varinfo = case_db_to_dict(dfile, ['comp1.x', 'comp1.z'])
+            self.assertEqual(varinfo['comp1.x'], [float(i) for i in range(10)])
+            self.assertEqual(varinfo['comp1.z'], [i*2. for i in range(10)])
+            connection.close()
+        finally:
+            try:
+                shutil.rmtree(tmpdir, onerror=onerror)
+            except OSError:
+                logging.error("problem removing directory %s", tmpdir)
+
+        # Buffered cases are visible through the iterator.
+        recorder = DBCaseRecorder(commit_cases=100, commit_interval=3600.)
+        recorder.register(self, ['comp1.x'], ['comp1.z'])
+        for i in range(10):
+            recorder.record(self, [float(i)], [i*2.], None, '', '')
+        self.assertEqual(len(recorder._pending), 10)
+        self.assertEqual(len(list(recorder.get_iterator())), 10)
+        self.assertEqual(len(recorder._pending), 0)
+
+        # A zero interval commits every case.
+        recorder = DBCaseRecorder(commit_cases=100, commit_interval=0.)
+        recorder.register(self, ['comp1.x'], ['comp1.z'])
+        recorder.record(self, [1.], [2.], None, '', '')
+        self.assertEqual(len(recorder._pending), 0)
+
+    def test_wide_layout(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            dfile = os.path.join(tmpdir, 'junk.db')
+            recorder = DBCaseRecorder(dfile, layout='wide', commit_cases=3)
+            inputs = ['comp1.x', 'comp1.y', 'comp1.a']
+            outputs = ['comp1.z', 'comp2.normal', 'comp2.nan']
+            recorder.register(self, inputs, outputs)
+            for i in range(10):
+                inputs = [i, 'str%d' % i, numpy.arange(6.).reshape((2, 3))*i]
+                outputs = [i*1.5, NormalDistribution(float(i), 0.5),
+                           float('NaN')]
+                recorder.record(self, inputs, outputs, None, '', '')
+
+            # A second driver recording a different set of variables.
+            recorder.register('other', ['comp1.x'], ['comp3.z'])
+            recorder.record('other', [99], [-1.], None, '', '')
+            recorder.close()
+
+            connection = sqlite3.connect(dfile)
+            cur = connection.execute("SELECT COUNT(*) FROM casewide")
+            self.assertEqual(cur.fetchone()[0], 11)
+            cur = connection.execute("SELECT name FROM sqlite_master"
+                                     " WHERE name='casevars'")
+            self.assertEqual(cur.fetchone(), None)
+            connection.close()
+
+            self.assertEqual(list_db_vars(dfile),
+                             set([(n,) for n in ['timestamp', 'comp1.x',
+                                                 'comp1.y', 'comp1.a',
+                                                 'comp1.z', 'comp2.normal',
+                                                 'comp2.nan', 'comp3.z']]))
+
+            cases = list(DBCaseIterator(dfile))
+            self.assertEqual(len(cases), 11)
+            for i, case in enumerate(cases[:10]):
+                self.assertEqual(case['comp1.x'], i)
+                self.assertEqual(case['comp1.y'], 'str%d' % i)
+                self.assertEqual(case['comp1.z'], i*1.5)
+                self.assertEqual(case['comp1.a'].shape, (2, 3))
+                self.assertTrue(numpy.all(case['comp1.a'] ==
+                                          numpy.arange(6.).reshape((2, 3))*i))
+                self.assertEqual(case['comp2.normal'].mu, float(i))
+                self.assertTrue(numpy.isnan(case['comp2.nan']))
+            self.assertEqual(dict(cases[10].items()),
+                             {'comp1.x': 99, 'comp3.z': -1.})
+
+            varinfo = case_db_to_dict(dfile, ['comp1.x', 'comp1.z'])
+            self.assertEqual(varinfo['comp1.x'], range(10))
+            self.assertEqual(varinfo['comp1.z'], [i*1.5 for i in range(10)])
+
+            iterator = DBCaseIterator(dfile, selectors=["value>=0", "value<3"])
+            count = 0
+            for case in iterator:
+                count += 1
+                for value in case.values():
+                    self.assertTrue(value >= 0 and value < 3)
+            self.assertEqual(count, 3)
+
+            iterator = DBCaseIterator(dfile, selectors=["name='comp1.z'",
+                                                        "id<4"])
+            self.assertEqual([dict(case.items()) for case in iterator],
+                             [{'comp1.z': 0.}, {'comp1.z': 1.5},
+                              {'comp1.z': 3.}])
+
+            varinfo = case_db_to_dict(dfile, ['comp1.x', 'comp1.z'],
+                                      case_sql='id>8', var_sql='value<13')
+            self.assertEqual(varinfo, {'comp1.x': [8], 'comp1.z': [12.]})
+
+            # The wide table is read directly, not copied into a temporary
+            # narrow table.
+            self.assertEqual(iterator._connection.execute(
+                "SELECT name FROM sqlite_temp_master").fetchall(), [])
+
+            # Appending to an existing wide DB.
+            recorder = DBCaseRecorder(dfile, layout='wide', append=True)
+            recorder.register(self, ['comp1.x', 'comp4.x'], [])
+            recorder.record(self, [100, 1.], [], None, '', '')
+            recorder.close()
+            cases = list(DBCaseIterator(dfile))
+            self.assertEqual(len(cases), 12)
+            self.assertEqual(dict(cases[11].items()),
+                             {'comp1.x': 100, 'comp4.x': 1.})
+
+            # Names differing only in case get separate columns.
+            dfile = os.path.join(tmpdir, 'case.db')
+            recorder = DBCaseRecorder(dfile, layout='wide')
+            recorder.register(self, ['comp.X', 'comp.x'], ['comp.y'])
+            recorder.record(self, [1., 2.], [3.], None, '', '')
+            recorder.close()
+            cases = list(DBCaseIterator(dfile))
+            self.assertEqual(dict(cases[0].items()),
+                             {'comp.X': 1., 'comp.x': 2., 'comp.y': 3.})
+            self.assertEqual(case_db_to_dict(dfile, ['comp.X', 'comp.x']),
+                             {'comp.X': [1.], 'comp.x': [2.]})
+        finally:
+            try:
+                shutil.rmtree(tmpdir, onerror=onerror)
+            except OSError:
+                logging.error("problem removing directory %s", tmpdir)
+
+        # In-memory wide DB read through the recorder's own connection.
+        recorder = DBCaseRecorder(layout='wide', commit_cases=5)
+        recorder.register(self, ['comp1.x'], ['comp1.z'])
+        for i in range(3):
+            recorder.record(self, [i], [i*2], None, '', '')
+        self.assertEqual([case['comp1.z'] for case in recorder.get_iterator()],
+                         [0, 2, 4])
+        recorder.record(self, [3], [6], None, '', '')
+        self.assertEqual([case['comp1.z'] for case in recorder.get_iterator()],
+                         [0, 2, 4, 6])
+
+        assert_raises(self, "DBCaseRecorder(layout='tall')", globals(), locals(),
+                      ValueError, "layout must be 'narrow' or 'wide', not 'tall'")
+
 
 class NestedCaseTestCase(unittest.TestCase):
 
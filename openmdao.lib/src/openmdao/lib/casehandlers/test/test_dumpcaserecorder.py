@@ -61,13 +61,16 @@ Constants:
    driver.case_inputs.comp1.y: [0.0, 2.0, 4.0, 6.0, 8.0, 10.0, 12.0, 14.0, 16.0, 18.0]
    driver.directory:
    driver.force_fd: False
+   driver.gradient_options.assemble_jacobian: False
    driver.gradient_options.atol: 1e-09
    driver.gradient_options.derivative_direction: auto
    driver.gradient_options.directional_fd: False
    driver.gradient_options.fd_blocks: []
+   driver.gradient_options.fd_coloring: False
    driver.gradient_options.fd_form: forward
    driver.gradient_options.fd_step: 1e-06
    driver.gradient_options.fd_step_type: absolute
+   driver.gradient_options.fd_workers: 1
    driver.gradient_options.force_fd: False
    driver.gradient_options.lin_solver: scipy_gmres
    driver.gradient_options.maxiter: 100
@@ -142,21 +145,26 @@ Constants:
    directory:
    driver.directory:
    driver.force_fd: False
+   driver.gradient_options.assemble_jacobian: False
    driver.gradient_options.atol: 1e-09
    driver.gradient_options.derivative_direction: auto
    driver.gradient_options.directional_fd: False
    driver.gradient_options.fd_blocks: []
+   driver.gradient_options.fd_coloring: False
    driver.gradient_options.fd_form: forward
    driver.gradient_options.fd_step: 1e-06
    driver.gradient_options.fd_step_type: absolute
+   driver.gradient_options.fd_workers: 1
    driver.gradient_options.force_fd: False
    driver.gradient_options.lin_solver: scipy_gmres
    driver.gradient_options.maxiter: 100
    driver.gradient_options.rtol: 1e-09
    force_fd: False
    missing_deriv_policy: assume_zero
+   recording_options.asynchronous: False
    recording_options.excludes: []
    recording_options.includes: ['*']
+   recording_options.queue_size: 100
    recording_options.save_problem_formulation: True
 Case:
    uuid: 766f9b47-5bc0-11e4-803d-080027a1f086
@@ -2,6 +2,7 @@ import bson
 import json
 import os.path
 import re
+import StringIO as pyStringIO
 import sys
 import unittest
 
@@ -12,7 +13,8 @@ from openmdao.main import __version__
 from openmdao.main.api import Assembly, Component, Case, VariableTree, set_as_top
 from openmdao.main.datatypes.api import Array, Instance, List, VarTree
 from openmdao.test.execcomp import ExecComp
-from openmdao.lib.casehandlers.api import JSONCaseRecorder, BSONCaseRecorder
+from openmdao.lib.casehandlers.api import JSONCaseRecorder, BSONCaseRecorder, \
+                                         CaseDataset
 from openmdao.lib.drivers.api import SensitivityDriver, CaseIteratorDriver, \
                                      SLSQPdriver
 from openmdao.util.testutil import assert_raises
@@ -181,6 +183,20 @@ class TestCase(unittest.TestCase):
             else:
                 self.assertEqual(oldname, newname) # just raises an exception
 
+    def test_compact(self):
+        # Verify unindented output can be read back.
+        sout = StringIO()
+        self.top.recorders = [JSONCaseRecorder(sout, indent=None,
+                                               flush_interval=60.)]
+        self.top.run()
+
+        cds = CaseDataset(pyStringIO.StringIO(sout.getvalue()), 'json')
+        cases = cds.data.vars('comp1.x', 'comp2.z').fetch()
+        self.assertEqual(len(cases), 10)
+        for i, case in enumerate(cases):
+            self.assertEqual(case['comp1.x'], i)
+            self.assertEqual(case['comp2.z'], 3*i+1)
+
     def test_close(self):
         sout = StringIO()
         self.top.recorders = [JSONCaseRecorder(sout)]
@@ -3,18 +3,25 @@ Test query of case recorder file.
 """
 
 import glob
+import json
 import os.path
+import StringIO
 import unittest
 
 from math import isnan
 
+import numpy
+
 from openmdao.main.api import Assembly, Component, VariableTree, set_as_top
 from openmdao.main.datatypes.api import Array, Float, VarTree
 from openmdao.lib.casehandlers.api import CaseDataset, \
-                                          JSONCaseRecorder, BSONCaseRecorder
-from openmdao.lib.drivers.api import FixedPointIterator, SLSQPdriver
+                                          JSONCaseRecorder, BSONCaseRecorder, \
+                                          BinaryCaseRecorder
+from openmdao.lib.casehandlers.query import ColumnResult, _Column, _MISSING
+from openmdao.lib.drivers.api import FixedPointIterator, SLSQPdriver, \
+                                     CaseIteratorDriver
 from openmdao.lib.optproblems import sellar
-from openmdao.util.testutil import assert_rel_error
+from openmdao.util.testutil import assert_rel_error, assert_raises
 
 
 class States(VariableTree):
@@ -34,6 +41,14 @@ class Half(Component):
         self.z2b = 0.5*self.z2a
 
 
+class Field(Component):
+    x = Float(0.0, iotype='in')
+    field = Array(numpy.zeros((50, 20)), iotype='out')
+
+    def execute(self):
+        self.field = self.x * numpy.arange(1000.).reshape((50, 20))
+
+
 class SellarMDF(Assembly):
     """ Optimization of the Sellar problem using MDF
     Disciplines coupled with FixedPointIterator.
@@ -191,6 +206,61 @@ class TestCase(unittest.TestCase):
             self.assertEqual(len(vars[name]), 142)
             assert_rel_error(self, vars[name][-1], iteration_case_142[name], 0.001)
 
+    def test_columnar(self):
+        names = ['half.z2a', 'sub.dis1.y1', 'sub.dis2.y2', 'sub.states',
+                 'sub.x1']
+        rows = self.cds.data.local().vars(names).by_variable().fetch()
+        columns = self.cds.data.local().vars(names).columnar().fetch()
+        self.assertTrue(isinstance(columns, ColumnResult))
+        self.assertEqual(columns.names, names)
+        self.assertTrue(columns.cds is self.cds)
+
+        # Masked where by_variable() pads with NaN.
+        for name in names:
+            column = columns[name]
+            self.assertEqual(len(column), 142)
+            for i, value in enumerate(rows[name]):
+                if isinstance(value, float) and isnan(value):
+                    self.assertTrue(column.mask[i])
+                else:
+                    self.assertFalse(column.mask[i])
+                    self.assertEqual(column[i], value)
+        self.assertEqual(columns['sub.states'].dtype, object)
+
+        # Always present: plain array.
+        columns = self.cds.data.vars(names).columnar().fetch()
+        column = columns['sub.dis1.y1']
+        self.assertFalse(isinstance(column, numpy.ma.MaskedArray))
+        self.assertEqual(column.dtype, numpy.float64)
+        rows = self.cds.data.vars(names).by_variable().fetch()
+        self.assertEqual(column.tolist(), rows['sub.dis1.y1'])
+
+        # Fixed-shape array values are stacked.
+        values = [[1, 2, 3], _MISSING, [4., 5., 6.]] + [[7., 8., 9.]]*20
+        column = self.to_array(values)
+        self.assertEqual(column.shape, (len(values), 3))
+        self.assertEqual(column.dtype, numpy.float64)
+        self.assertEqual(column[2].tolist(), values[2])
+        self.assertEqual(column[-1].tolist(), values[-1])
+        self.assertTrue(column.mask[1].all())
+        self.assertFalse(column.mask[2].any())
+
+        # Others are not.
+        column = self.to_array([[1., 2.], [3.], 'x'])
+        self.assertEqual(column.shape, (3,))
+        self.assertEqual(column.dtype, object)
+        self.assertEqual(column.tolist(), [[1., 2.], [3.], 'x'])
+
+        column = self.cds.data.vars('sub.x1').case('no_such_case')
+        assert_raises(self, 'column.columnar().fetch()', globals(), locals(),
+                      ValueError, 'No case with _id no_such_case')
+
+    def to_array(self, values):
+        column = _Column()
+        for value in values:
+            column.append(value)
+        return column.result()
+
     def test_parent(self):
         # Full dataset names by specifying a top-level case.
         parent = 'e52a477a-588e-11e4-8355-080027a1f086'  # iteration_case_6
@@ -319,6 +389,143 @@ class TestCase(unittest.TestCase):
         cases = CaseDataset(path, 'json').data.fetch()
         self.assertEqual(len(cases), 7)
 
+    def test_index(self):
+        # Indexed access matches sequential reading.
+        names = ['half.z2a', 'sub.dis1.y1', 'sub.states', 'sub.x1']
+        for filename, format in (('sellar.json', 'json'),
+                                 ('sellar.bson', 'bson')):
+            path = os.path.join(os.path.dirname(__file__), filename)
+            cds = CaseDataset(path, format)
+            reader = cds._reader
+            cases = list(reader.cases())
+            index = reader.index()
+            self.assertEqual(len(index), 142)
+            for case, entry in zip(cases, index):
+                self.assertEqual(entry[1:], (case['_id'], case['_driver_id'],
+                                             case['_parent_id']))
+
+            full = reader.read_case(index[5][0])
+            self.assertEqual(full, cases[5])
+            partial = reader.read_case(index[5][0], ['half.z2a', 'sub.states',
+                                                     'dis1.y1'])
+            self.assertEqual(sorted(partial['data']), ['half.z2a', 'sub.states'])
+            for name in partial['data']:
+                self.assertEqual(partial['data'][name], full['data'][name])
+            for name in full:
+                if name != 'data':
+                    self.assertEqual(partial[name], full[name])
+
+            # Single case lookup fills in values from earlier cases.
+            rows = cds.data.vars(names).fetch()
+            for i in (0, 5, 70, 141):
+                case = cds.data.vars(names).case(cases[i]['_id']).fetch()
+                self.assertEqual(len(case), 1)
+                for expected, value in zip(rows[i], case[0]):
+                    if isinstance(expected, float) and isnan(expected):
+                        self.assertTrue(isnan(value))
+                    else:
+                        self.assertEqual(value, expected)
+
+    def test_index_json_formatting(self):
+        # Indexed and selective reads of JSON don't depend on its formatting.
+        path = os.path.join(os.path.dirname(__file__), 'sellar.json')
+        reader = CaseDataset(path, 'json')._reader
+        records = [('simulation_info', reader.simulation_info)]
+        records.extend([('driver_info_%s' % (i+1), info)
+                        for i, info in enumerate(reader.drivers())])
+        cases = list(reader.cases())
+        records.extend([('iteration_case_%s' % (i+1), case)
+                        for i, case in enumerate(cases)])
+
+        for indent, sort_keys in ((None, False), (1, False), (None, True)):
+            chunks = []
+            for i, (category, info) in enumerate(records):
+                data = json.dumps(info, indent=indent, sort_keys=sort_keys)
+                chunks.append('%s"__length_%s": %s\n, "%s": %s\n'
+                              % ('{\n' if i == 0 else ', ', i+1, len(data),
+                                 category, data))
+            chunks.append('}\n')
+
+            cds = CaseDataset(StringIO.StringIO(''.join(chunks)), 'json')
+            index = cds._reader.index()
+            self.assertEqual([entry[1:] for entry in index],
+                             [(case['_id'], case['_driver_id'],
+                               case['_parent_id']) for case in cases])
+            partial = cds._reader.read_case(index[5][0], ['half.z2a',
+                                                          'sub.states'])
+            self.assertEqual(partial['data'],
+                             dict([(name, cases[5]['data'][name])
+                                   for name in ('half.z2a', 'sub.states')]))
+            self.assertEqual(partial['_id'], cases[5]['_id'])
+
+    def test_binary(self):
+        # Binary dataset matches JSON dataset from the same run.
+        top = set_as_top(SellarMDF())
+        top.name = 'top'
+        top.recorders = [JSONCaseRecorder('cases.json'),
+                         BinaryCaseRecorder('cases.bin')]
+        top.run()
+
+        json_cds = CaseDataset('cases.json', 'json')
+        bin_cds = CaseDataset('cases.bin', 'binary')
+        self.assertEqual(bin_cds.data.var_names().fetch(),
+                         json_cds.data.var_names().fetch())
+
+        json_cases = json_cds.data.fetch()
+        bin_cases = bin_cds.data.fetch()
+        self.assertEqual(len(bin_cases), len(json_cases))
+        parents = {}
+        for json_case, bin_case in zip(json_cases, bin_cases):
+            for name in json_case.keys():
+                json_val = json_case[name]
+                bin_val = bin_case[name]
+                if name == '_parent_id':
+                    # Top-level cases are parented by each recorder's own
+                    # simulation id, so only the structure has to match.
+                    self.assertEqual(parents.setdefault(json_val, bin_val),
+                                     bin_val)
+                elif name == 'timestamp':
+                    assert_rel_error(self, bin_val, json_val, 1e-9)
+                elif isinstance(json_val, float) and isnan(json_val):
+                    self.assertTrue(isnan(bin_val))
+                elif isinstance(bin_val, numpy.ndarray):
+                    self.assertEqual(bin_val.tolist(), json_val)
+                else:
+                    self.assertEqual(bin_val, json_val)
+
+        # Columns of a driver are read from the mapped file.
+        names = ['half.z2a', 'sub.x1', '_id']
+        json_cols = json_cds.data.driver('driver').vars(names).columnar().fetch()
+        bin_cols = bin_cds.data.driver('driver').vars(names).columnar().fetch()
+        for name in names:
+            self.assertEqual(bin_cols[name].tolist(), json_cols[name].tolist())
+
+    def test_binary_array(self):
+        # Array columns are (ncases x shape) and views if evenly spaced.
+        top = set_as_top(Assembly())
+        top.add('comp', Field())
+        driver = top.add('driver', CaseIteratorDriver())
+        driver.workflow.add('comp')
+        driver.add_parameter('comp.x')
+        driver.case_inputs.comp.x = [float(i) for i in range(8)]
+        top.recording_options.save_problem_formulation = False
+        top.recording_options.includes = ['comp.x', 'comp.field']
+        top.recorders = [BinaryCaseRecorder('cases.bin')]
+        top.run()
+
+        cds = CaseDataset('cases.bin', 'binary')
+        columns = cds.data.vars('comp.x', 'comp.field').columnar().fetch()
+        field = columns['comp.field']
+        self.assertEqual(field.shape, (8, 50, 20))
+        self.assertFalse(field.flags.writeable)  # View of the file.
+        self.assertEqual(columns['comp.x'].tolist(), range(8))
+        expected = numpy.arange(1000.).reshape((50, 20))
+        for i in range(8):
+            self.assertTrue((field[i] == i*expected).all())
+
+        cases = cds.data.vars('comp.field').fetch()
+        self.assertTrue((cases[3]['comp.field'] == field[3]).all())
+
     def test_restore(self):
         # Restore from case, run, verify outputs match expected.
         top = set_as_top(SellarMDF())
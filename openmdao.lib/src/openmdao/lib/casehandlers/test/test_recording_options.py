@@ -2,6 +2,7 @@
 Test for CaseRecorders.
 """
 
+import time
 import unittest
 import StringIO
 
@@ -70,21 +71,26 @@ Constants:
    directory:
    driver.directory:
    driver.force_fd: False
+   driver.gradient_options.assemble_jacobian: False
    driver.gradient_options.atol: 1e-09
    driver.gradient_options.derivative_direction: auto
    driver.gradient_options.directional_fd: False
    driver.gradient_options.fd_blocks: []
+   driver.gradient_options.fd_coloring: False
    driver.gradient_options.fd_form: forward
    driver.gradient_options.fd_step: 1e-06
    driver.gradient_options.fd_step_type: absolute
+   driver.gradient_options.fd_workers: 1
    driver.gradient_options.force_fd: False
    driver.gradient_options.lin_solver: scipy_gmres
    driver.gradient_options.maxiter: 100
    driver.gradient_options.rtol: 1e-09
    force_fd: False
    missing_deriv_policy: assume_zero
+   recording_options.asynchronous: False
    recording_options.excludes: []
    recording_options.includes: ['*']
+   recording_options.queue_size: 100
    recording_options.save_problem_formulation: True
 Case:
    uuid: 578b2d91-5b94-11e4-8001-08002764016b
@@ -135,6 +141,68 @@ Case:
         # print sout.getvalue()
         self.verify_case_dump(expected, sout)
 
+    def test_asynchronous(self):
+        # verify cases recorded from a background thread are all written
+        # by the end of the run.
+        sout = StringIO.StringIO()
+        self.top.recorders = [DumpCaseRecorder(sout)]
+        self.top.recording_options.includes = []
+        self.top.recording_options.asynchronous = True
+        self.top.recording_options.queue_size = 1
+        self.top.run()
+        self.assertEqual(self.top._rec_queue, None)
+
+        expected = """\
+Constants:
+Case:
+   uuid: ad4c1b76-64fb-11e0-95a8-001e8cf75fe
+   timestamp: 1383239074.309192
+   inputs:
+      comp1.x: 0.0
+   outputs:
+      Objective(comp1.z): 0.0
+      Objective(comp2.z): 1.0
+"""
+
+        # print sout.getvalue()
+        self.verify_case_dump(expected, sout)
+
+    def test_asynchronous_timestamp(self):
+        # verify cases are timestamped when queued, not when recorded.
+        class SlowRecorder(DumpCaseRecorder):
+            def record(self, *args, **kwargs):
+                time.sleep(0.5)
+                super(SlowRecorder, self).record(*args, **kwargs)
+
+        sout = StringIO.StringIO()
+        self.top.recorders = [SlowRecorder(sout)]
+        self.top.recording_options.asynchronous = True
+        self.top.run()
+        done = time.time()
+
+        for line in sout.getvalue().split('\n'):
+            if line.startswith('   timestamp:'):
+                timestamp = float(line.split()[1])
+                break
+        else:
+            self.fail('no timestamp recorded')
+        self.assertTrue(timestamp < done - 0.4)
+
+    def test_asynchronous_error(self):
+        # verify a recorder error is reported by the run.
+        class BadRecorder(DumpCaseRecorder):
+            def record(self, *args, **kwargs):
+                raise RuntimeError('bad recorder')
+
+        self.top.recorders = [BadRecorder(StringIO.StringIO())]
+        self.top.recording_options.asynchronous = True
+        try:
+            self.top.run()
+        except RuntimeError as exc:
+            self.assertEqual(str(exc), 'bad recorder')
+        else:
+            self.fail('RuntimeError expected')
+
     def test_includes_only(self):
         """ verify options with includes but not problem formulation:
                 save_problem_formulation = False
@@ -184,8 +252,10 @@ Case:
         expected = """\
 Constants:
    comp1.y: 0.0
+   recording_options.asynchronous: False
    recording_options.excludes: ['*directory', '*force_fd', '*missing_deriv_policy', '*gradient_options*']
    recording_options.includes: ['*']
+   recording_options.queue_size: 100
    recording_options.save_problem_formulation: True
 Case:
    uuid: 80dd42d1-5b94-11e4-8004-08002764016b
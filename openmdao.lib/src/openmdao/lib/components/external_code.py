@@ -2,6 +2,8 @@
 .. _`external_code.py`:
 """
 
+from collections import OrderedDict
+import fnmatch
 import glob
 import logging
 import os.path
@@ -18,7 +20,8 @@ from openmdao.main.exceptions import RunInterrupted, RunStopped
 from openmdao.main.rbac import AccessController, RoleError, rbac, remote_access
 from openmdao.main.resource import ResourceAllocationManager as RAM
 
-from openmdao.util.filexfer import filexfer, pack_zipfile, unpack_zipfile
+from openmdao.util.filexfer import file_digest, filexfer, \
+                                   pack_zipfile, unpack_zipfile
 from openmdao.util import shellproc
 
 from distutils.spawn import find_executable
@@ -43,12 +46,17 @@ class ExternalCode(Component):
     resources = Dict({}, iotype='in',
                      desc='Resources required to run this component.')
     poll_delay = Float(0., low=0., units='s', iotype='in',
-                       desc='Delay between polling for command completion.'
-                            ' A value of zero will use an internally computed'
-                            ' default.')
+                       desc='Delay between polling for command completion'
+                            ' (Windows only). A value of zero will use an'
+                            ' internally computed default.')
     timeout = Float(0., low=0., iotype='in', units='s',
                     desc='Maximum time to wait for command completion.'
                          ' A value of zero implies an infinite wait.')
+    cache_min_size = Int(1 << 20, low=0,
+                         desc='Binary input files at least this size are'
+                              ' cached on the remote server and only re-sent'
+                              ' if their contents change. A value of zero'
+                              ' disables caching.')
     timed_out = Bool(False, iotype='out', desc='True if the command timed-out.')
     return_code = Int(0, iotype='out', desc='Return code from the command.')
 
@@ -62,6 +70,9 @@ class ExternalCode(Component):
 
         self._process = None
         self._server = None
+        self._result = None
+        self._skipped = False
+        self._start_time = 0.
 
     # This gets used by remote server.
     def get_access_controller(self):  #pragma no cover
@@ -136,21 +147,95 @@ class ExternalCode(Component):
             such.
 
         """
+        self._start()
+        self._join()
+
+    def start(self):
+        """
+        Start the command without waiting for it to complete.
+        This allows a driver to have several external codes running at once,
+        for example::
+
+            for comp in comps:
+                comp.start()
+            for comp in comps:
+                comp.join()
+
+        Each :meth:`start` must be followed by a :meth:`join`, which takes
+        the place of :meth:`run`. Note that the command is taken as-is, so
+        subclasses which build `command` in :meth:`execute` should do so
+        before calling this. If `resources` have been specified, the remote
+        command has completed when this returns.
+        """
+        if self.directory:
+            self.push_dir()
+        try:
+            self._stop = False
+            self._skipped = not self._run_prologue()
+            if not self._skipped:
+                self._start()
+        except Exception:
+            info = sys.exc_info()
+            self._set_exec_state('INVALID')
+            raise info[0], info[1], info[2]
+        finally:
+            if self.directory:
+                self.pop_dir()
+
+    def join(self):
+        """
+        Wait for the command started by :meth:`start` to complete,
+        then check the results as :meth:`execute` would.
+        """
+        if self.directory:
+            self.push_dir()
+        try:
+            if self._skipped:  # inputs unchanged, nothing was started
+                self._skipped = False
+            else:
+                self._join()
+                self._run_epilogue()
+        except Exception:
+            info = sys.exc_info()
+            self._set_exec_state('INVALID')
+            raise info[0], info[1], info[2]
+        finally:
+            if self.directory:
+                self.pop_dir()
+
+    def _start(self):
+        """ Check inputs and start the command. """
         self.return_code = -12345678
         self.timed_out = False
+        self._result = None
 
         if not self.command:
             self.raise_exception('Empty command list', ValueError)
 
         self.check_files(inputs=True)
 
+        try:
+            if self.resources:
+                self._result = self._execute_remote()
+            else:
+                self._start_local()
+        except Exception:
+            self.return_code = -999999
+            raise
+
+    def _join(self):
+        """ Wait for the command to complete and check results. """
+        if self._process is None and self._result is None:
+            self.raise_exception('join() called without start()',
+                                 RuntimeError)
         return_code = None
         error_msg = ''
         try:
-            if self.resources:
-                return_code, error_msg = self._execute_remote()
+            if self._process is not None:
+                return_code, error_msg = self._wait_local()
             else:
-                return_code, error_msg = self._execute_local()
+                return_code, error_msg = self._result
+                self._result = None
 
             if return_code is None:
                 if self._stop:
@@ -238,10 +323,10 @@ class ExternalCode(Component):
                         self.raise_exception("missing 'out' file %r" % obj.path,
                                              RuntimeError)
 
-    def _execute_local(self):
-        """ Run command. """
+    def _start_local(self):
+        """ Start command. """
         self._logger.info('executing %s...', self.command)
-        start_time = time.time()
+        self._start_time = time.time()
 
         # check to make sure command exists
         if isinstance(self.command, basestring):
@@ -259,14 +344,20 @@ class ExternalCode(Component):
                                 self.stdout, self.stderr, self.env_vars)
         self._logger.debug('PID = %d', self._process.pid)
 
+    def _wait_local(self):
+        """ Wait for command started by :meth:`_start_local`. """
+        # Timeout is relative to the start of the command.
+        timeout = self.timeout
+        if timeout > 0:
+            timeout = max(timeout - (time.time() - self._start_time), 1e-6)
         try:
             return_code, error_msg = \
-                self._process.wait(self.poll_delay, self.timeout)
+                self._process.wait(self.poll_delay, timeout)
         finally:
             self._process.close_files()
             self._process = None
 
-        et = time.time() - start_time
+        et = time.time() - self._start_time
         if et >= 60:  #pragma no cover
             self._logger.info('elapsed time: %.1f sec.', et)
 
@@ -328,11 +419,14 @@ class ExternalCode(Component):
             # Send inputs.
             patterns = []
             textfiles = []
+            constants = []
             for metadata in self.external_files:
                 if metadata.get('input', False):
                     patterns.append(metadata.path)
                     if not metadata.binary:
                         textfiles.append(metadata.path)
+                    if metadata.get('constant', False):
+                        constants.append(metadata.path)
             for pathname, obj in self.items(iotype='in', recurse=True):
                 if isinstance(obj, FileRef):
                     local_path = self.get_metadata(pathname, 'local_path')
@@ -344,7 +438,7 @@ class ExternalCode(Component):
                 patterns.append(self.stdin)
                 textfiles.append(self.stdin)
             if patterns:
-                self._send_inputs(patterns, textfiles)
+                self._send_inputs(patterns, textfiles, constants)
             else:
                 self._logger.debug('No input files')
 
@@ -402,26 +496,67 @@ class ExternalCode(Component):
 
         return (return_code, error_msg)
 
-    def _send_inputs(self, patterns, textfiles):
-        """ Sends input files matching `patterns`. """
+    def _send_inputs(self, patterns, textfiles, constants=None):
+        """
+        Sends input files matching `patterns`. Binary files of at least
+        `cache_min_size` bytes are first looked up by content in the server's
+        file cache, only those not found are sent (and then cached).
+        Files matching `textfiles` are always sent, since they may need
+        newline translation on the server.
+        Cached files matching `constants` may be hard-linked by the server.
+        """
         self._logger.info('sending inputs...')
         start_time = time.time()
 
-        filename = 'inputs.zip'
-        pfiles, pbytes = pack_zipfile(patterns, filename, self._logger)
-        try:
-            filexfer(None, filename, self._server, filename, 'b', False)
-            ufiles, ubytes = self._server.unpack_zipfile(filename,
-                                                         textfiles=textfiles)
-        finally:
-            os.remove(filename)
-            self._server.remove(filename)
-
-        # Difficult to force file transfer error.
-        if ufiles != pfiles or ubytes != pbytes:  #pragma no cover
-            msg = 'Inputs xfer error: %d:%d vs. %d:%d' \
-                  % (ufiles, ubytes, pfiles, pbytes)
-            self.raise_exception(msg, RuntimeError)
+        paths = []
+        cacheable = {}
+        constants = constants or []
+        for pattern in patterns:
+            for path in glob.glob(pattern):
+                if self.cache_min_size and not os.path.isabs(path) and \
+                   os.path.isfile(path) and \
+                   os.path.getsize(path) >= self.cache_min_size and \
+                   not [text for text in textfiles
+                             if fnmatch.fnmatch(path, text)]:
+                    constant = pattern in constants
+                    cacheable[path] = (_get_digest(path), constant)
+                else:
+                    paths.append(path)
+
+        missing = []
+        if cacheable:
+            try:
+                missing = self._server.restore_cached_files(cacheable)
+            except Exception as exc:
+                self._logger.debug("can't use server file cache: %s", exc)
+                paths.extend(cacheable.keys())
+                cacheable = {}
+            else:
+                self._logger.debug('%d of %d files cached',
+                                   len(cacheable) - len(missing),
+                                   len(cacheable))
+                paths.extend(missing)
+
+        if paths:
+            filename = 'inputs.zip'
+            pfiles, pbytes = pack_zipfile(paths, filename, self._logger)
+            try:
+                filexfer(None, filename, self._server, filename, 'b', False)
+                ufiles, ubytes = \
+                    self._server.unpack_zipfile(filename, textfiles=textfiles)
+            finally:
+                os.remove(filename)
+                self._server.remove(filename)
+
+            # Difficult to force file transfer error.
+            if ufiles != pfiles or ubytes != pbytes:  #pragma no cover
+                msg = 'Inputs xfer error: %d:%d vs. %d:%d' \
+                      % (ufiles, ubytes, pfiles, pbytes)
+                self.raise_exception(msg, RuntimeError)
+
+        if missing:
+            self._server.cache_files(dict((path, cacheable[path])
+                                          for path in missing))
 
         et = time.time() - start_time
         if et >= 60:  #pragma no cover
@@ -530,6 +665,39 @@ class ExternalCode(Component):
                 os.chmod(dst_path, mode)
 
 
+# Maps from absolute path to (stat key, digest), least recently used first.
+_DIGESTS = OrderedDict()
+
+# Maximum number of digests remembered.
+_DIGESTS_SIZE = 1000
+
+# A file modified this recently (seconds) could be modified again without
+# changing its size or timestamps, so its digest isn't remembered.
+_DIGEST_SLOP = 2.
+
+
+def _get_digest(path):
+    """ Return content digest of `path`, only recomputed if changed. """
+    abspath = os.path.abspath(path)
+    info = os.stat(abspath)
+    key = (info.st_size, info.st_mtime, info.st_ctime, info.st_ino)
+    try:
+        old_key, digest = _DIGESTS.pop(abspath)
+    except KeyError:
+        pass
+    else:
+        if old_key == key:
+            _DIGESTS[abspath] = (key, digest)
+            return digest
+    now = time.time()
+    digest = file_digest(abspath)
+    if now - max(info.st_mtime, info.st_ctime) > _DIGEST_SLOP:
+        _DIGESTS[abspath] = (key, digest)
+        while len(_DIGESTS) > _DIGESTS_SIZE:
+            _DIGESTS.popitem(last=False)
+    return digest
+
+
 # This gets used by remote server.
 class _AccessController(AccessController):  #pragma no cover
     """ Don't allow setting of 'command' by remote client. """
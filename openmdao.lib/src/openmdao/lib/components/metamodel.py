@@ -6,6 +6,8 @@
 
 from copy import deepcopy
 
+from numpy import array, zeros
+
 from openmdao.main.api import Component
 from openmdao.main.datatypes.api import List, Bool, Dict, Float, Slot, Str, \
                                         VarTree
@@ -16,6 +18,20 @@ from openmdao.main.mp_support import has_interface
 from openmdao.main.vartree import VariableTree
 from openmdao.util.typegroups import int_types, real_types
 
+
+def _append_rows(buf, nrows, new):
+    """Store `new` after the first `nrows` rows of `buf` and return the
+    buffer, which is reallocated with doubled capacity when it is full."""
+
+    total = nrows + len(new)
+    if total > len(buf):
+        grown = zeros((max(total, 2*len(buf)),) + buf.shape[1:])
+        grown[:nrows] = buf[:nrows]
+        buf = grown
+    buf[nrows:total] = new
+    return buf
+
+
 class MetaModel(Component):
     """ Class that creates a reduced order model for a tuple of outputs from
     a tuple of inputs. Accepts surrogate models that adhere to ISurrogate.
@@ -46,7 +62,10 @@ class MetaModel(Component):
                              "retrains with the new dataset whenever the "
                              "training data values are changed. When set to "
                              "True, the new data is appended to the old data "
-                             "and all of the data is used to train.")
+                             "and all of the data is used to train. "
+                             "Surrogates that provide an update(X, Y) method "
+                             "are updated incrementally with just the new "
+                             "data instead.")
 
     def __init__(self, params=None, responses=None):
         super(MetaModel, self).__init__()
@@ -63,8 +82,11 @@ class MetaModel(Component):
 
         # Inputs and Outputs created immediately.
 
+        # Training data is kept in growing arrays; only the first
+        # _num_samples rows are valid.
         input_tree = self.get('params')
-        self._param_data = []
+        self._param_data = zeros((0, len(params)))
+        self._num_samples = 0
         for name in params:
             self.add(name, Float(0.0, iotype='in', desc='metamodel param'))
             input_tree.add(name, List([], desc='training param'))
@@ -74,13 +96,17 @@ class MetaModel(Component):
         for name in responses:
             self.add(name, Float(0.0, iotype='out', desc='metamodel response'))
             output_tree.add(name, List([], desc='training response'))
-            self._response_data[name] = []
+            self._response_data[name] = zeros(0)
             self.surrogates[name] = None
 
         self._surrogate_input_names = params
         self._surrogate_output_names = responses
 
         self._train = True
+        self._new_data = True
+
+        # number of samples each surrogate was last trained or updated with
+        self._num_trained = {}
 
         # keeps track of which sur_<name> slots are full
         self._surrogate_overrides = set()
@@ -101,6 +127,7 @@ class MetaModel(Component):
             if fullpath.startswith('params.') or \
                fullpath.startswith('responses.'):
                 self._train = True
+                self._new_data = True
 
         super(MetaModel, self)._input_updated(name.split('.',1)[0])
 
@@ -134,43 +161,46 @@ class MetaModel(Component):
         # Train first
         if self._train:
 
-            input_data = self._param_data
             if self.warm_restart is False:
-                input_data = []
-                base = 0
-            else:
-                base = len(input_data)
-
-            for name in self._surrogate_input_names:
-                train_name = "params.%s" % name
-                val = self.get(train_name)
-                num_sample = len(val)
-
-                for j in xrange(base, base + num_sample):
+                self._num_samples = 0
+                self._num_trained = {}
+                self._new_data = True
 
-                    if j > len(input_data) - 1:
-                        input_data.append([])
-                    input_data[j].append(val[j-base])
+            num_old = self._num_samples
 
-            # Surrogate models take an (m, n) list of lists
+            # Surrogate models take an (m, n) array
             # m = number of training samples
             # n = number of inputs
-            #
-            # TODO - Why not numpy array instead?
+            if self._new_data:
+                new_data = array([self.get("params.%s" % name)
+                                  for name in self._surrogate_input_names],
+                                 dtype=float).T
+                self._param_data = _append_rows(self._param_data, num_old,
+                                                new_data)
+                for name in self._surrogate_output_names:
+                    self._response_data[name] = \
+                        _append_rows(self._response_data[name], num_old,
+                                     self.get("responses.%s" % name))
+                self._num_samples += len(new_data)
+                self._new_data = False
+
+            num = self._num_samples
+            input_data = self._param_data[:num]
 
             for name in self._surrogate_output_names:
 
-                train_name = "responses.%s" % name
-                output_data = self._response_data[name]
-
-                if self.warm_restart is False:
-                    output_data = []
-
-                output_data.extend(self.get(train_name))
+                output_data = self._response_data[name][:num]
                 surrogate = self._get_surrogate(name)
 
                 if surrogate is not None:
-                    surrogate.train(input_data, output_data)
+                    if 0 < num_old < num and \
+                       self._num_trained.get(name) == num_old and \
+                       hasattr(surrogate, 'update'):
+                        surrogate.update(input_data[num_old:],
+                                         output_data[num_old:])
+                    else:
+                        surrogate.train(input_data, output_data)
+                    self._num_trained[name] = num
 
             self._train = False
 
@@ -217,6 +247,7 @@ class MetaModel(Component):
 
         self.config_changed()
         self._train = True
+        self._num_trained = {}
 
     def _def_surrogate_trait_modified(self, surrogate, name, old, new):
         # a trait inside of the default_surrogate was changed, so we need to
@@ -225,6 +256,7 @@ class MetaModel(Component):
         for name in self._default_surrogate_copies:
             surr_copy = deepcopy(self.default_surrogate)
             self._default_surrogate_copies[name] = surr_copy
+            self._num_trained.pop(name, None)
 
     def _surrogate_updated(self, obj, name, old, new):
         """Called when self.surrogates Dict is updated."""
@@ -250,6 +282,7 @@ class MetaModel(Component):
 
         self.config_changed()
         self._train = True
+        self._num_trained = {}
 
     def _update_var_for_surrogate(self, surrogate, varname):
         """Different surrogates have different types of output values, so create
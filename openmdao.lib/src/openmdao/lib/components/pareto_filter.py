@@ -1,7 +1,8 @@
 """ Pareto Filter -- finds non-dominated cases. """
 
 # pylint: disable-msg=E0611,F0401
-from numpy import array, zeros
+from numpy import array, concatenate, hstack, inf, isnan, lexsort, \
+                  maximum, minimum, newaxis, searchsorted, where, zeros
 
 from openmdao.main.datatypes.api import Array, List, VarTree
 from openmdao.main.api import Component
@@ -92,145 +93,115 @@ class ParetoFilter(Component):
         self.pareto_outputs = zeros((1, len(responses)))
         self.pareto_outcons = zeros((1, len(constraints)))
 
-    def _is_dominated(self, y1, y2):
-        """Tests to see if the point y1 is dominated by the point y2.
-        True if y1 is dominated by y2, False otherwise.
-        """
-        if y1 == y2:
-            return False
-        for a, b in zip(y1, y2):
-            if a is None:
-                return True
-            if b is None:
-                return False
-            if a < b:
-                return False
-
-        return True
-
-    def _is_constrained(self, c1, c2):
-        """ Tests to see if the point c1 is more or less constrained than
-        the point c2.
-        Constrained means value <= 0.0
-        return:
-            isLessConstrained,
-                True if some constraint values are more than c2
-                while the other same, False Otherwise
-            NeedCompareDominating
-                True if need furthermore comparison of dominating
-                False otherwise
-        """
-        c1 = array(c1)
-        c2 = array(c2)
-        b1 = (c1 <= 0).all()
-        b2 = (c2 <= 0).all()
-
-        if b1 and b2:
-            return False, True
-        if b1 and not b2:
-            return False, False
-        if not b1 and b2:
-            return True, False
-        if not b2 and not b1:
-            c1[c1<=0] = 0
-            c2[c2<=0] = 0
-            if (c1 == c2).all():
-                return False, True
-
-            if (c1 >= c2).all():
-                return True, False
-            else:
-                return False, False
-
     def execute(self):
         """Returns an araray of pareto optimal points and their response values.
         """
+        outputs = self._get_data('responses', self._response_names)
 
-        first_name = "responses.%s" % self._response_names[0]
-        n_param = len(self._param_names)
-        n_response = len(self._response_names)
-        n_constraint = len(self._constraint_names)
-        n_points = len(self.get(first_name))
-
-        # Get our output data once, then rearrange it after.
-        data = []
-        for varname in self._response_names:
-            name = "responses.%s" % varname
-            val = self.get(name)
-            data.append(val)
-
-        all_points = []
-        for j in xrange(0, n_points):
-            point = []
-            for i in xrange(0, n_response):
-                point.append(data[i][j])
-            all_points.append(point)
-
-        nondominated_output = list(all_points)
-
-        # Optionally, get our inputs data once, then rearrange it after.
-        if n_param > 0:
-
-            data = []
-            for varname in self._param_names:
-                name = "params.%s" % varname
-                val = self.get(name)
-                data.append(val)
-
-            nondominated_input = []
-            for j in xrange(0, n_points):
-                point = []
-                for i in xrange(0, n_param):
-                    point.append(data[i][j])
-                nondominated_input.append(point)
-
-        # Optionally, get our constraint data once, then rearrange it after.
-        if n_constraint > 0:
-
-            data = []
-            for varname in self._constraint_names:
-                name = "constraints.%s" % varname
-                val = self.get(name)
-                data.append(val)
-
-            all_cons = []
-            for j in xrange(0, n_points):
-                point = []
-                for i in xrange(0, n_constraint):
-                    point.append(data[i][j])
-                all_cons.append(point)
-            nondominated_constraint = list(all_cons)
-
-
-            # Find non-dominated points with constraint filtering
-            nd_input_list = []
-            for j, (point1, cons1) in enumerate(zip(all_points, all_cons)):
-                for point2, cons2 in zip(nondominated_output,
-                                  nondominated_constraint):
-                    is_less_cons, need_comp = self._is_constrained(cons1, cons2)
-                    if is_less_cons or \
-                       (need_comp and self._is_dominated(point1, point2)):
-                        nondominated_output.remove(point1)
-                        nondominated_constraint.remove(cons1)
-                        nd_input_list.append(j)
-                        break
+        if not self._constraint_names:
+            keep = _nondominated(_as_float(outputs))
         else:
-            # Find non-dominated points directly
-            nd_input_list = []
-            for j, point1 in enumerate(all_points):
-                for point2 in nondominated_output:
-                    if self._is_dominated(point1, point2):
-                        nondominated_output.remove(point1)
-                        nd_input_list.append(j)
-                        break
+            cons = self._get_data('constraints', self._constraint_names)
+            # Feasible points are better than infeasible ones. If there are
+            # none, smaller violations are better regardless of the responses,
+            # and responses are only compared between equal violations.
+            viol = maximum(_as_float(cons), 0.)
+            feasible = (viol == 0.).all(axis=1)
+            keep = zeros(len(outputs), dtype=bool)
+            if feasible.any():
+                keep[feasible] = _nondominated(_as_float(outputs[feasible]))
+            else:
+                cands = _nondominated(viol)
+                keep[cands] = _nondominated(
+                    hstack((viol[cands], _as_float(outputs[cands]))))
+            self.pareto_outcons = cons[keep]
+
+        self.pareto_outputs = outputs[keep]
 
-        self.pareto_outputs = array(nondominated_output)
+        if self._param_names:
+            inputs = self._get_data('params', self._param_names)
+            self.pareto_inputs = inputs[keep]
 
-        if n_param > 0:
-            data = [nondominated_input[j] for j in xrange(0, n_points) \
-                    if j not in nd_input_list]
-            self.pareto_inputs = array(data)
-        if n_constraint > 0:
-            self.pareto_outcons = array(nondominated_constraint)
+    def _get_data(self, tree, names):
+        """Returns an array with a row per case and a column for each of the
+        variables `names` in VarTree `tree`."""
+        return array([self.get('%s.%s' % (tree, name)) for name in names]).T
 
 
+# Number of rows checked together by _nondominated().
+_BLOCK = 512
+
+# Maximum number of elements in a temporary array of pairwise comparisons.
+_CHUNK = 1 << 22
+
+
+def _as_float(values):
+    """Returns `values` as a float array, with missing (None) values treated
+    as worse than any other."""
+    values = array(values, dtype=float)
+    values[isnan(values)] = inf
+    return values
+
+
+def _nondominated(points):
+    """Returns a boolean mask selecting the rows of the 2D array `points`
+    that aren't dominated by any other row. A row dominates another if it is
+    no greater in every column and not equal, so duplicates are all kept.
+    """
+    n_points, n_dims = points.shape
+    if n_points == 0:
+        return zeros(0, dtype=bool)
+    if n_dims == 1:
+        return points[:, 0] == points[:, 0].min()
+    if n_dims == 2:
+        return _nondominated_2d(points)
+
+    # Any dominating row has a sum no greater than the row it dominates, and
+    # comes first lexicographically, so after sorting rows can only be
+    # dominated by earlier rows. Each block is checked against the
+    # non-dominated rows found before it and then against itself.
+    keys = [points[:, i] for i in range(n_dims-1, -1, -1)]
+    keys.append(points.sum(axis=1))
+    order = lexsort(keys)
+    front = zeros(0, dtype=int)
+    for start in xrange(0, n_points, _BLOCK):
+        idx = order[start:start+_BLOCK]
+        idx = idx[~_dominated_by(points[front], points[idx])]
+        rows = points[idx]
+        front = concatenate((front, idx[~_dominated_by(rows, rows)]))
+
+    keep = zeros(n_points, dtype=bool)
+    keep[front] = True
+    return keep
+
+
+def _nondominated_2d(points):
+    """Sort-based sweep version of :func:`_nondominated` for two columns."""
+    order = lexsort((points[:, 1], points[:, 0]))
+    x = points[order, 0]
+    y = points[order, 1]
+
+    # A row is dominated by a row with smaller x and no greater y, or by a
+    # row with the same x and smaller y (the first row in its group).
+    first = searchsorted(x, x, side='left')
+    best_y = minimum.accumulate(y)
+    prev_y = where(first > 0, best_y[first-1], inf)
+    dominated = (prev_y <= y) | (y > y[first])
+
+    keep = zeros(len(points), dtype=bool)
+    keep[order] = ~dominated
+    return keep
+
+
+def _dominated_by(front, rows):
+    """Returns a boolean mask selecting the `rows` that are dominated by some
+    row of `front`."""
+    dominated = zeros(len(rows), dtype=bool)
+    if len(front) == 0:
+        return dominated
+    step = max(1, _CHUNK // (len(rows) * rows.shape[1]))
+    for start in xrange(0, len(front), step):
+        chunk = front[start:start+step, newaxis, :]
+        dominated |= ((chunk <= rows).all(axis=2) &
+                      (chunk < rows).any(axis=2)).any(axis=0)
+    return dominated
@@ -19,11 +19,13 @@ from openmdao.main.exceptions import RunInterrupted
 from openmdao.main.objserverfactory import ObjServerFactory
 from openmdao.main.rbac import Credentials, get_credentials
 
-from openmdao.lib.components.external_code import ExternalCode
+from openmdao.lib.components import external_code
+from openmdao.lib.components.external_code import ExternalCode, _get_digest
 from openmdao.main.datatypes.api import Int, File, FileRef, Str
 
 from openmdao.test.cluster import init_cluster
 
+from openmdao.util.filexfer import file_digest
 from openmdao.util.testutil import assert_raises
 from openmdao.util.fileutil import onerror
 
@@ -350,6 +352,111 @@ class TestCase(unittest.TestCase):
             if os.path.exists(extcode.stdout):
                 os.remove(extcode.stdout)
 
+    def test_start_join(self):
+        logging.debug('')
+        logging.debug('test_start_join')
+
+        # Run two external codes concurrently.
+        comps = []
+        for i in range(2):
+            comp = set_as_top(ExternalCode())
+            comp.command = ['python', '-c', 'import time; time.sleep(1)']
+            comp.stderr = 'sleep%d.err' % i
+            comps.append(comp)
+
+        start = time.time()
+        try:
+            for comp in comps:
+                comp.start()
+            for comp in comps:
+                comp.join()
+        finally:
+            for comp in comps:
+                if os.path.exists(comp.stderr):
+                    os.remove(comp.stderr)
+        et = time.time() - start
+        self.assertTrue(et < 1.9)
+        for comp in comps:
+            self.assertEqual(comp.return_code, 0)
+            self.assertEqual(comp.exec_count, 1)
+
+        # Timeout is relative to start().
+        comp = comps[0]
+        comp.timeout = 0.5
+        comp.start()
+        time.sleep(0.6)
+        try:
+            comp.join()
+        except RunInterrupted as exc:
+            self.assertEqual(str(exc), ': Timed out')
+            self.assertEqual(comp.timed_out, True)
+        else:
+            self.fail('Expected RunInterrupted')
+        finally:
+            if os.path.exists(comp.stderr):
+                os.remove(comp.stderr)
+
+        assert_raises(self, 'comp.join()', globals(), locals(), RuntimeError,
+                      ': join() called without start()')
+
+        # start() and join() do the same bookkeeping as run().
+        comp = comps[1]
+        comp.skip_unchanged = True
+        try:
+            for i in range(2):
+                comp.start()
+                comp.join()
+        finally:
+            if os.path.exists(comp.stderr):
+                os.remove(comp.stderr)
+        self.assertEqual(comp.exec_count, 2)
+        self.assertEqual(comp.skip_count, 1)
+
+    def test_digest(self):
+        logging.debug('')
+        logging.debug('test_digest')
+
+        # A file rewritten with the same size and timestamp doesn't get a
+        # stale digest.
+        path = 'digest.dat'
+        path2 = 'digest2.dat'
+        try:
+            mtime = int(time.time()) - 10
+            with open(path, 'w') as out:
+                out.write('aaaa')
+            os.utime(path, (mtime, mtime))
+            digest = _get_digest(path)
+            self.assertEqual(digest, file_digest(path))
+
+            with open(path, 'w') as out:
+                out.write('bbbb')
+            os.utime(path, (mtime, mtime))
+            self.assertNotEqual(_get_digest(path), digest)
+            self.assertEqual(_get_digest(path), file_digest(path))
+
+            # Only the most recently used digests are remembered.
+            with open(path2, 'w') as out:
+                out.write('cccc')
+            size = external_code._DIGESTS_SIZE
+            slop = external_code._DIGEST_SLOP
+            external_code._DIGESTS_SIZE = 2
+            external_code._DIGEST_SLOP = -1.
+            try:
+                _get_digest(path)
+                _get_digest(path2)
+                _get_digest(path)
+                _get_digest(__file__)
+                self.assertEqual(external_code._DIGESTS.keys(),
+                                 [os.path.abspath(path),
+                                  os.path.abspath(__file__)])
+            finally:
+                external_code._DIGESTS_SIZE = size
+                external_code._DIGEST_SLOP = slop
+        finally:
+            for name in (path, path2):
+                if os.path.exists(name):
+                    os.remove(name)
+
     def test_unique(self):
         logging.debug('')
         logging.debug('test_unique')
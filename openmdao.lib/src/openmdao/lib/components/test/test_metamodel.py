@@ -118,6 +118,42 @@ class MetaModelTestCase(unittest.TestCase):
         assert_rel_error(self, model.meta.y1, 2.0, .00001)
         assert_rel_error(self, model.meta.y2, 4.0, .00001)
 
+    def test_warm_start_update(self):
+
+        model = set_as_top(Assembly())
+        model.add('meta', MetaModel(params=('x1', 'x2'),
+                                    responses=('y1',)))
+        model.driver.workflow.add('meta')
+        model.meta.default_surrogate = KrigingSurrogate()
+        model.meta.warm_restart = True
+
+        model.meta.params.x1 = [1.0, 3.0, 2.0, 0.5]
+        model.meta.params.x2 = [1.0, 4.0, 2.5, 3.0]
+        model.meta.responses.y1 = [3.0, 1.0, 2.2, 2.4]
+        model.meta.run()
+
+        surrogate = model.meta._get_surrogate('y1')
+        surrogate.refit_threshold = float('inf')
+        thetas = surrogate.thetas.copy()
+
+        model.meta.params.x1 = [2.0]
+        model.meta.params.x2 = [3.0]
+        model.meta.responses.y1 = [2.0]
+        model.meta.x1 = 2.0
+        model.meta.x2 = 3.0
+        model.meta.run()
+
+        # Updated in place with the new point, keeping the thetas.
+        self.assertTrue(model.meta._get_surrogate('y1') is surrogate)
+        self.assertEqual(surrogate.n, 5)
+        self.assertTrue((surrogate.thetas == thetas).all())
+        assert_rel_error(self, model.meta.y1.mu, 2.0, .00001)
+
+        # Swapping the surrogate retrains on the accumulated data once.
+        model.meta.default_surrogate = KrigingSurrogate()
+        model.meta.run()
+        self.assertEqual(model.meta._get_surrogate('y1').n, 5)
+
     def test_multi_surrogate_models_bad_surrogate_dict(self):
 
         model = set_as_top(Assembly())
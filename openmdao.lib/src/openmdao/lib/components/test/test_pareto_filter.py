@@ -2,7 +2,17 @@
 
 import unittest
 
-from openmdao.lib.components.pareto_filter import ParetoFilter
+import numpy
+
+from openmdao.lib.components.pareto_filter import ParetoFilter, _nondominated
+
+
+def _brute_force(points):
+    keep = []
+    for point in points:
+        keep.append(not any((other <= point).all() and (other < point).any()
+                            for other in points))
+    return numpy.array(keep)
 
 
 class ParetoFilterTests(unittest.TestCase):
@@ -38,6 +48,26 @@ class ParetoFilterTests(unittest.TestCase):
         self.assertEqual(1, pf.pareto_outputs[1, 1])
         self.assertTrue(pf.pareto_outputs.shape == (2, 2))
 
+    def test_2d_ties(self):
+        pf = ParetoFilter(params=('i',), responses=('x', 'y'))
+        pf.params.i = [0, 1, 2, 3, 4, 5, 6]
+        pf.responses.x = [2, 1, 1, 3, 2, 1, 0]
+        pf.responses.y = [1, 3, 2, 0, 1, 2, 4]
+        pf.execute()
+
+        # Duplicates are kept, in their original order.
+        self.assertEqual(pf.pareto_inputs[:, 0].tolist(), [0, 2, 3, 4, 5, 6])
+        self.assertEqual(pf.pareto_outputs.tolist(),
+                         [[2, 1], [1, 2], [3, 0], [2, 1], [1, 2], [0, 4]])
+
+    def test_nondominated(self):
+        numpy.random.seed(10)
+        for n_dims in (1, 2, 3, 5):
+            # Enough points to need several blocks, with many ties.
+            points = numpy.random.randint(0, 8, (1200, n_dims)).astype(float)
+            self.assertEqual(_nondominated(points).tolist(),
+                             _brute_force(points).tolist())
+
     def test_2d_3(self):
         pf = ParetoFilter(responses=('x',), constraints=('c',))
         pf.responses.x = [1,1,1,2,2,2,3,3,3]
@@ -3,7 +3,7 @@ Support for calculating one or more scalar averages across one or more
 regions in a domain.
 """
 
-from math import cos, sin, sqrt
+import numpy
 
 from openmdao.lib.datatypes.domain.flow import CELL_CENTER
 from openmdao.lib.datatypes.domain.zone import CYLINDRICAL
@@ -228,285 +228,87 @@ def _get_dimension(region):
 
 def _calc_weights(scheme, domain, regions):
     """
-    Calculate averaging weights, updating `weights` and returning total value.
+    Calculate averaging weights, returning ``(weights, weight_total)``.
+    `weights` maps zone name to an array of weights for the items in the
+    zone's region.
     """
     weights = {}
     weight_total = 0.
     for region in regions:
+        zone_name = region[0]
+        zone = getattr(domain, zone_name)
         dim = _get_dimension(region)
 
         if dim == 3:
-            zone_weights = _volume_weights(scheme, domain, region)
+            zone_weights = _volume_weights(scheme, zone, region)
         elif dim == 2:
-            if len(region) == 7:
-                zone_weights = _surface_weights_3d(scheme, domain, region)
-            else:
-                zone_weights = _surface_weights_2d(scheme, domain, region)
+            zone_weights = _surface_weights(scheme, zone, region)
         elif dim == 1:
-            if len(region) == 7:
-                zone_weights = _curve_weights_3d(scheme, domain, region)
-            elif len(region) == 5:
-                zone_weights = _curve_weights_2d(scheme, domain, region)
-            else:
-                zone_weights = _curve_weights_1d(scheme, domain, region)
+            zone_weights = _curve_weights(scheme, zone, region)
         else:
-            zone_weights = [1.]
+            zone_weights = numpy.ones(1)
 
-        zone_name = region[0]
-        zone = getattr(domain, zone_name)
-        zone_weights *= zone.symmetry_instances  # Adjust for symmetry.
         if zone_name in weights:
             raise RuntimeError('Zone %r used more than once' % zone_name)
         else:
             weights[zone_name] = zone_weights
-        weight_total += sum(zone_weights)
+        # Adjust for symmetry.
+        weight_total += zone_weights.sum() * zone.symmetry_instances
 
     return (weights, weight_total)
 
 
-def _volume_weights(scheme, domain, region):
+def _volume_weights(scheme, zone, region):
     """ Returns weights for a mesh volume. """
     raise NotImplementedError('_volume_weights')
 
 
-def _surface_weights_3d(scheme, domain, region):
-    """ Returns 3D (index space) weights for a mesh surface. """
-    zone_name, imin, imax, jmin, jmax, kmin, kmax = region
-    zone = getattr(domain, zone_name)
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
-
-    if cylindrical:
-        c1 = grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = grid.z.item
+def _surface_weights(scheme, zone, region):
+    """ Returns weights for a 2D or 3D (index space) mesh surface. """
+    lows, highs, flat = _region_bounds(region)
+    cells, nodes, (diag_a, diag_b, scale) = _SURFACES[flat]
+    sc1, sc2, sc3 = _face_normals(zone, lows, highs, diag_a, diag_b, scale)
 
     if scheme == 'mass':
+        flow = zone.flow_solution
         try:
-            if cylindrical:
-                mom_c1 = flow.momentum.z.item
-                mom_c2 = flow.momentum.r.item
-                mom_c3 = flow.momentum.t.item
-            else:
-                mom_c1 = flow.momentum.x.item
-                mom_c2 = flow.momentum.y.item
-                mom_c3 = flow.momentum.z.item
+            momentum = flow.momentum
         except AttributeError:
             raise AttributeError("For mass averaging zone %s is missing"
-                                 " 'momentum'." % zone_name)
-    if imin == imax:
-        imax += 1
-        face_normal = _iface_normal
-        face_value = _iface_cell_value if cell_center else _iface_node_value
-    elif jmin == jmax:
-        jmax += 1
-        face_normal = _jface_normal
-        face_value = _jface_cell_value if cell_center else _jface_node_value
-    else:
-        kmax += 1
-        face_normal = _kface_normal
-        face_value = _kface_cell_value if cell_center else _kface_node_value
-
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
-                sc1, sc2, sc3 = face_normal(c1, c2, c3, i, j, k, cylindrical)
-                if scheme == 'mass':
-                    loc = (i, j, k)
-                    rvu = face_value(mom_c1, loc)
-                    rvv = face_value(mom_c2, loc)
-                    rvw = face_value(mom_c3, loc)
-                    weights.append(rvu*sc1 + rvv*sc2 + rvw*sc3)
-                else:
-                    weights.append(sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3))
-    return weights
-
-
-def _surface_weights_2d(scheme, domain, region):
-    """ Returns 2D (index space) weights for a mesh surface. """
-    zone_name, imin, imax, jmin, jmax = region
-    zone = getattr(domain, zone_name)
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
-
-    if cylindrical:
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = None if grid.z is None else grid.z.item
-
-    if scheme == 'mass':
-        try:
-            if cylindrical:
-                mom_c1 = None if flow.momentum.z is None else flow.momentum.z.item
-                mom_c2 = flow.momentum.r.item
-                mom_c3 = flow.momentum.t.item
-            else:
-                mom_c1 = flow.momentum.x.item
-                mom_c2 = flow.momentum.y.item
-                mom_c3 = None if flow.momentum.z is None else flow.momentum.z.item
-        except AttributeError:
-            raise AttributeError("For mass averaging zone %s is missing"
-                                 " 'momentum'." % zone_name)
+                                 " 'momentum'." % region[0])
+        if zone.coordinate_system == CYLINDRICAL:
+            components = (momentum.z, momentum.r, momentum.t)
+        else:
+            components = (momentum.x, momentum.y, momentum.z)
 
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-                sc1, sc2, sc3 = _cell_normal(c1, c2, c3, i, j, cylindrical)
-                if scheme == 'mass':
-                    ip1 = i + 1
-                    jp1 = j + 1
-                    if cell_center:
-                        # Cell value is value.
+        if flow.grid_location == CELL_CENTER:
 # FIXME: built-in ghosts
-                        rvu = 0. if mom_c1 is None else mom_c1(ip1, jp1)
-                        rvv = mom_c2(ip1, jp1)
-                        rvw = 0. if mom_c1 is None else mom_c3(ip1, jp1)
-                    else:
-                        # Average across vertices.
-                        if mom_c1 is None:
-                            rvu = 0.
-                        else:
-                            rvu = 0.25 * (mom_c1(i, j) + mom_c1(ip1, j) + \
-                                          mom_c1(i, jp1) + mom_c1(ip1, jp1))
-                        rvv = 0.25 * (mom_c2(i, j) + mom_c2(ip1, j) + \
-                                      mom_c2(i, jp1) + mom_c2(ip1, jp1))
-                        if mom_c3 is None:
-                            rvw = 0.
-                        else:
-                            rvw = 0.25 * (mom_c3(i, j) + mom_c3(ip1, j) + \
-                                          mom_c3(i, jp1) + mom_c3(ip1, jp1))
-                    weights.append(rvu*sc1 + rvv*sc2 + rvw*sc3)
-                else:
-                    weights.append(sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3))
-    return weights
-
-
-def _curve_weights_3d(scheme, domain, region):
-    """ Returns 3D (index space) weights for a mesh curve. """
-    zone_name, imin, imax, jmin, jmax, kmin, kmax = region
-    zone = getattr(domain, zone_name)
-    grid = zone.grid_coordinates
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-
-    if cylindrical:
-        raise NotImplementedError('curve weights for cylindrical coordinates')
-    else:
-        x = grid.x.item
-        y = grid.y.item
-        z = grid.z.item
-
-    if scheme == 'mass':
-        raise NotImplementedError('curve mass averaging')
-
-    along_i, along_j = False, False
-    if imin != imax:
-        along_i = True
-        jmax += 1
-        kmax += 1
-    elif jmin != jmax:
-        along_j = True
-        imax += 1
-        kmax += 1
-    else:
-        imax += 1
-        jmax += 1
-
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
-                if along_i:
-                    dx = x(i+1, j, k) - x(i, j, k)
-                    dy = y(i+1, j, k) - y(i, j, k)
-                    dz = z(i+1, j, k) - z(i, j, k)
-                elif along_j:
-                    dx = x(i, j+1, k) - x(i, j, k)
-                    dy = y(i, j+1, k) - y(i, j, k)
-                    dz = z(i, j+1, k) - z(i, j, k)
-                else:
-                    dx = x(i, j, k+1) - x(i, j, k)
-                    dy = y(i, j, k+1) - y(i, j, k)
-                    dz = z(i, j, k+1) - z(i, j, k)
-                weights.append(sqrt(dx*dx + dy*dy + dz*dz))
-    return weights
-
-
-def _curve_weights_2d(scheme, domain, region):
-    """ Returns 2D (index space) weights for a mesh curve. """
-    zone_name, imin, imax, jmin, jmax = region
-    zone = getattr(domain, zone_name)
-    grid = zone.grid_coordinates
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-
-    if cylindrical:
-        raise NotImplementedError('curve weights for cylindrical coordinates')
-    else:
-        x = grid.x.item
-        y = grid.y.item
-        z = None if grid.z is None else grid.z.item
-
-    if scheme == 'mass':
-        raise NotImplementedError('curve mass averaging')
+            # Average across cells sharing face.
+            offsets = cells
+        else:
+            # Average across vertices.
+            offsets = nodes
 
-    if imin != imax:
-        along_i = True
-        jmax += 1
+        rvu, rvv, rvw = [0. if mom is None else
+                         _average(mom, lows, highs, offsets)
+                         for mom in components]
+        weights = rvu*sc1 + rvv*sc2 + rvw*sc3
     else:
-        along_i = False
-        imax += 1
-
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-                if along_i:
-                    dx = x(i+1, j) - x(i, j)
-                    dy = y(i+1, j) - y(i, j)
-                    dz = 0. if z is None else z(i+1, j) - z(i, j)
-                else:
-                    dx = x(i, j+1) - x(i, j)
-                    dy = y(i, j+1) - y(i, j)
-                    dz = 0. if z is None else z(i, j+1) - z(i, j)
-                weights.append(sqrt(dx*dx + dy*dy + dz*dz))
-    return weights
+        weights = numpy.sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3)
+    return weights.ravel()
 
 
-def _curve_weights_1d(scheme, domain, region):
-    """ Returns 1D (index space) weights for a mesh curve. """
-    zone_name, imin, imax = region
-    zone = getattr(domain, zone_name)
-    grid = zone.grid_coordinates
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-
-    if cylindrical:
+def _curve_weights(scheme, zone, region):
+    """ Returns weights for a 1D, 2D, or 3D (index space) mesh curve. """
+    if zone.coordinate_system == CYLINDRICAL:
         raise NotImplementedError('curve weights for cylindrical coordinates')
-    else:
-        x = grid.x.item
-        y = None if grid.y is None else grid.y.item
-        z = None if grid.z is None else grid.z.item
 
     if scheme == 'mass':
         raise NotImplementedError('curve mass averaging')
 
-    weights = []
-    for i in range(imin, imax):
-        dx = x(i+1) - x(i)
-        dy = 0. if y is None else y(i+1) - y(i)
-        dz = 0. if z is None else z(i+1) - z(i)
-        weights.append(sqrt(dx*dx + dy*dy + dz*dz))
-    return weights
+    lows, highs, flat = _region_bounds(region)
+    cells, nodes, edge = _CURVES[flat]
+    return _edge_lengths(zone, lows, highs, edge).ravel()
 
 
 def _calc_metric(name, domain, region, weights, reference_state):
@@ -528,19 +330,11 @@ def _calc_metric(name, domain, region, weights, reference_state):
     elif dim == 2:
         if geometry not in ('surface', 'any'):
             raise RuntimeError('metric %r not applicable to surfaces')
-        if len(region) == 7:
-            total = _surface_3d(metric, integrate, zone, region, weights)
-        else:
-            total = _surface_2d(metric, integrate, zone, region, weights)
+        total = _surface(metric, integrate, zone, region, weights)
     elif dim == 1:
         if geometry not in ('curve', 'any'):
             raise RuntimeError('metric %r not applicable to curves')
-        if len(region) == 7:
-            total = _curve_3d(metric, integrate, zone, region, weights)
-        elif len(region) == 5:
-            total = _curve_2d(metric, integrate, zone, region, weights)
-        else:
-            total = _curve_1d(metric, integrate, zone, region, weights)
+        total = _curve(metric, integrate, zone, region, weights)
     else:
         if geometry != 'any':
             raise RuntimeError('metric %r not applicable to points')
@@ -606,316 +400,78 @@ def _volume(metric, integrate, zone, region, weights):
 '''
 
 
-def _surface_3d(metric, integrate, zone, region, weights):
-    """ Calculate metric on a 3D (index space) surface. """
-    zone_name, imin, imax, jmin, jmax, kmin, kmax = region
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
-
-    if cylindrical: 
-        c1 = grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = grid.z.item
-
-    if imin == imax: 
-        face = 'i'
-        imax += 1
-        get_normal = _iface_normal
-    elif jmin == jmax:
-        face = 'j'
-        jmax += 1 
-        get_normal = _jface_normal
-    else:
-        face = 'k'
-        kmax += 1
-        get_normal = _kface_normal
+def _surface(metric, integrate, zone, region, weights):
+    """ Calculate metric on a 2D or 3D (index space) surface. """
+    lows, highs, flat = _region_bounds(region)
+    cells, nodes, (diag_a, diag_b, scale) = _SURFACES[flat]
 
     normal = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
+    if integrate:
+        normal = _face_normals(zone, lows, highs, diag_a, diag_b, scale)
 
-                if integrate:
-                    normal = get_normal(c1, c2, c3, i, j, k, cylindrical)
-    
-                if cell_center:
-# FIXME: built-in ghosts
-                    # Average across cells sharing surface.
-                    val = metric.calculate((i+1, j+1, k+1), normal)
-                    if face == 'i':
-                        val += metric.calculate((i, j+1, k+1), normal)
-                    elif face == 'j':
-                        val += metric.calculate((i+1, j, k+1), normal)
-                    else:
-                        val += metric.calculate((i+1, j+1, k), normal)
-                    val *= 0.5
-                else:
-                    # Average across vertices.
-                    val = metric.calculate((i, j, k), normal)
-                    if face == 'i':
-                        val += metric.calculate((i, j+1, k), normal)
-                        val += metric.calculate((i, j+1, k+1), normal)
-                        val += metric.calculate((i, j, k+1), normal)
-                    elif face == 'j':
-                        val += metric.calculate((i+1, j, k), normal)
-                        val += metric.calculate((i+1, j, k+1), normal)
-                        val += metric.calculate((i, j, k+1), normal)
-                    else:
-                        val += metric.calculate((i+1, j, k), normal)
-                        val += metric.calculate((i+1, j+1, k), normal)
-                        val += metric.calculate((i, j+1, k), normal)
-                    val *= 0.25
+    return _accumulate(metric, integrate, zone, lows, highs, cells, nodes,
+                       normal, weights)
 
-                if integrate:
-                    total += val
-                else:
-                    weight = weights[weight_index]
-                    weight_index += 1
-                    total += val * weight
-    return total
 
-
-def _surface_2d(metric, integrate, zone, region, weights):
-    """ Calculate metric on a 2D (index space) surface. """
-    zone_name, imin, imax, jmin, jmax = region
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
-
-    if cylindrical: 
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = None if grid.z is None else grid.z.item
-
-    normal = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-
-            if integrate:
-                normal = _cell_normal(c1, c2, c3, i, j, cylindrical)
-    
-            if cell_center:
-# FIXME: built-in ghosts
-                # Cell value is value.
-                val = metric.calculate((i+1, j+1), normal)
-            else:
-                # Average across vertices.
-                val  = metric.calculate((i, j), normal)
-                val += metric.calculate((i, j+1), normal)
-                val += metric.calculate((i+1, j+1), normal)
-                val += metric.calculate((i+1, j), normal)
-                val *= 0.25
-
-            if integrate:
-                total += val
-            else:
-                weight = weights[weight_index]
-                weight_index += 1
-                total += val * weight
-    return total
-
-
-def _curve_3d(metric, integrate, zone, region, weights):
-    """ Calculate metric on a 3D (index space) curve. """
-    zone_name, imin, imax, jmin, jmax, kmin, kmax = region
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
-
-    if cylindrical: 
-        c1 = grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = grid.z.item
-
-    if imin != imax:
-        edge = 'i'
-        jmax += 1
-        kmax += 1
-        get_length = _iedge_length
-    elif jmin != jmax:
-        edge = 'j'
-        imax += 1
-        kmax += 1
-        get_length = _jedge_length
-    else:
-        edge = 'k'
-        imax += 1
-        jmax += 1
-        get_length = _kedge_length
+def _curve(metric, integrate, zone, region, weights):
+    """ Calculate metric on a 1D, 2D, or 3D (index space) curve. """
+    lows, highs, flat = _region_bounds(region)
+    cells, nodes, edge = _CURVES[flat]
 
     length = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
-
-                if integrate:
-                    length = get_length(c1, c2, c3, (i, j, k), cylindrical)
-
-                if cell_center:
-# FIXME: built-in ghosts
-                    # Average across cells sharing edge.
-                    val = metric.calculate((i+1, j+1, k+1), length)
-                    if edge == 'i':
-                        val += metric.calculate((i+1, j, k+1), length)
-                        val += metric.calculate((i+1, j+1, k), length)
-                        val += metric.calculate((i+1, j, k), length)
-                    elif edge == 'j':
-                        val += metric.calculate((i, j+1, k+1), length)
-                        val += metric.calculate((i+1, j+1, k), length)
-                        val += metric.calculate((i, j+1, k), length)
-                    else:
-                        val += metric.calculate((i, j+1, k+1), length)
-                        val += metric.calculate((i+1, j, k+1), length)
-                        val += metric.calculate((i, j, k+1), length)
-                    val *= 0.25
-                else:
-                    # Average across vertices.
-                    val = metric.calculate((i, j, k), length)
-                    if edge == 'i':
-                        val += metric.calculate((i+1, j, k), length)
-                    elif edge == 'j':
-                         val +=metric.calculate((i, j+1, k), length)
-                    else:
-                         val +=metric.calculate((i, j, k+1), length)
-                    val *= 0.5
-
-                if integrate:
-                    total += val
-                else:
-                    weight = weights[weight_index]
-                    weight_index += 1
-                    total += val * weight
-    return total
-
-
-def _curve_2d(metric, integrate, zone, region, weights):
-    """ Calculate metric on a 2D (index space) curve. """
-    zone_name, imin, imax, jmin, jmax = region
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
+    if integrate:
+        length = _edge_lengths(zone, lows, highs, edge)
 
-    if cylindrical: 
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = None if grid.z is None else grid.z.item
+    return _accumulate(metric, integrate, zone, lows, highs, cells, nodes,
+                       length, weights)
 
-    if imin != imax:
-        edge = 'i'
-        jmax += 1
-        get_length = _iedge_length
-    else:
-        edge = 'j'
-        imax += 1
-        get_length = _jedge_length
 
-    length = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-
-            if integrate:
-                length = get_length(c1, c2, c3, (i, j), cylindrical)
-
-            if cell_center:
+def _accumulate(metric, integrate, zone, lows, highs, cells, nodes, geom,
+                weights):
+    """
+    Return the integral, or weighted sum, of `metric` over the items
+    (faces or edges) from `lows` to `highs`. The value for an item is the
+    average across the cells sharing it, or across its vertices.
+    """
+    if zone.flow_solution.grid_location == CELL_CENTER:
 # FIXME: built-in ghosts
-                # Average across cells sharing edge.
-                val = metric.calculate((i+1, j+1), length)
-                if edge == 'i':
-                    val += metric.calculate((i+1, j), length)
-                else:
-                    val += metric.calculate((i, j+1), length)
-                val *= 0.5
-            else:
-                # Average across vertices.
-                val = metric.calculate((i, j), length)
-                if edge == 'i':
-                    val += metric.calculate((i+1, j), length)
-                else:
-                    val += metric.calculate((i, j+1), length)
-                val *= 0.5
-
-            if integrate:
-                total += val
-            else:
-                weight = weights[weight_index]
-                weight_index += 1
-                total += val * weight
-    return total
-
-
-def _curve_1d(metric, integrate, zone, region, weights):
-    """ Calculate metric on a 1D (index space) curve. """
-    zone_name, imin, imax = region
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
-
-    if cylindrical:
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+        offsets = cells
     else:
-        c1 = grid.x.item
-        c2 = None if grid.y is None else grid.y.item
-        c3 = None if grid.z is None else grid.z.item
-
-    get_length = _iedge_length
+        offsets = nodes
 
-    length = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
+    val = _evaluate(metric, _slices(lows, highs, offsets[0]), geom)
+    for offset in offsets[1:]:
+        val = val + _evaluate(metric, _slices(lows, highs, offset), geom)
+    val = val * (1. / len(offsets))
 
-        if integrate:
-            length = get_length(c1, c2, c3, (i,), cylindrical)
+    if integrate:
+        return float(val.sum())
+    else:
+        return float(numpy.dot(val.ravel(), weights))
 
-        if cell_center:
-# FIXME: built-in ghosts
-            # Cell value is value.
-            val = metric.calculate((i+1,), length)
-        else:
-            # Average across vertices.
-            val  = metric.calculate((i,), length)
-            val += metric.calculate((i+1,), length)
-            val *= 0.5
 
-        if integrate:
-            total += val
+def _evaluate(metric, loc, geom):
+    """
+    Return array of `metric` values for the block of items selected by the
+    slices in `loc`. `geom` is None, an array of the block's shape, or a
+    tuple of such arrays.
+    """
+    if getattr(metric, 'vectorized', False):
+        return metric.calculate(loc, geom)
+
+    # Metric only handles a single item at a time.
+    shape = tuple(s.stop - s.start for s in loc)
+    values = numpy.empty(shape)
+    for index in numpy.ndindex(*shape):
+        item = tuple(s.start + i for s, i in zip(loc, index))
+        if geom is None:
+            item_geom = None
+        elif isinstance(geom, tuple):
+            item_geom = tuple(float(arr[index]) for arr in geom)
         else:
-            weight = weights[weight_index]
-            weight_index += 1
-            total += val * weight
-    return total
+            item_geom = float(geom[index])
+        values[index] = metric.calculate(item, item_geom)
+    return values
 
 
 def _point(metric, zone, region):
@@ -937,294 +493,189 @@ def _point(metric, zone, region):
             val += metric.calculate((imin, jmin+1, kmin), None)
             val += metric.calculate((imin, jmin, kmin), None)
             val += metric.calculate((imin, jmin, kmin+1), None)
-            return 0.125 * val
+            return float(0.125 * val)
         elif len(region) == 5:
             zone_name, imin, imax, jmin, jmax = region
             val  = metric.calculate((imin+1, jmin+1), None)
             val += metric.calculate((imin, jmin+1), None)
             val += metric.calculate((imin, jmin), None)
             val += metric.calculate((imin+1, jmin), None)
-            return 0.25 * val
+            return float(0.25 * val)
         else:
             zone_name, imin, imax = region
             val  = metric.calculate((imin+1,), None)
             val += metric.calculate((imin,), None)
-            return 0.5 * val
+            return float(0.5 * val)
     else:
         # Vertex value is value.
         if len(region) == 7:
             zone_name, imin, imax, jmin, jmax, kmin, kmax = region
-            return metric.calculate((imin, jmin, kmin), None)
+            return float(metric.calculate((imin, jmin, kmin), None))
         elif len(region) == 5:
             zone_name, imin, imax, jmin, jmax = region
-            return metric.calculate((imin, jmin), None)
+            return float(metric.calculate((imin, jmin), None))
         else:
             zone_name, imin, imax = region
-            return metric.calculate((imin,), None)
+            return float(metric.calculate((imin,), None))
 
 
-def _iface_normal(c1, c2, c3, i, j, k, cylindrical):
+def _region_bounds(region):
     """
-    Return non-dimensional vector normal to I face with magnitude equal to area.
+    Return ``(lows, highs, flat)`` for `region`. `lows` and `highs` bound
+    the lowest vertex indices of the region's items (faces or edges), and
+    `flat` indicates which index directions the region is flat in.
     """
-# FIXME: built-in ghosts
-    jp1 = j + 1
-    kp1 = k + 1
+    mins = region[1::2]
+    maxs = region[2::2]
+    flat = tuple(low == high for low, high in zip(mins, maxs))
+    highs = tuple(high+1 if is_flat else high
+                  for high, is_flat in zip(maxs, flat))
+    return (mins, highs, flat)
 
-    # upper-left - lower-right.
-    diag_c11 = c1(i, jp1, k) - c1(i, j, kp1)
-    diag_c21 = c2(i, jp1, k) - c2(i, j, kp1)
-    diag_c31 = c3(i, jp1, k) - c3(i, j, kp1)
 
-    # upper-right - lower-left.
-    diag_c12 = c1(i, jp1, kp1) - c1(i, j, k)
-    diag_c22 = c2(i, jp1, kp1) - c2(i, j, k)
-    diag_c32 = c3(i, jp1, kp1) - c3(i, j, k)
-
-    if cylindrical:
-        r1 = (c2(i, j, kp1) + c2(i, jp1, k  )) / 2.
-        r2 = (c2(i, j, k  ) + c2(i, jp1, kp1)) / 2.
-    else:
-        r1 = 1.
-        r2 = 1.
-
-    sc1 = -0.5 * ( r2 * diag_c21 * diag_c32 - r1 * diag_c22 * diag_c31)
-    sc2 = -0.5 * (-r2 * diag_c11 * diag_c32 + r1 * diag_c12 * diag_c31)
-    sc3 = -0.5 * (      diag_c11 * diag_c22 -      diag_c12 * diag_c21)
-
-    return (sc1, sc2, sc3)
+def _slices(lows, highs, offset):
+    """ Return slices selecting `offset` from each item in `lows` to `highs`. """
+    return tuple(slice(low+delta, high+delta)
+                 for low, high, delta in zip(lows, highs, offset))
 
 
-def _jface_normal(c1, c2, c3, i, j, k, cylindrical):
+def _take(arr, lows, highs, offset):
     """
-    Return non-dimensional vector normal to J face with magnitude equal to area.
+    Return double precision copy of `arr` at `offset` from each item in
+    `lows` to `highs`.
     """
-# FIXME: built-in ghosts
-    ip1 = i + 1
-    kp1 = k + 1
+    return numpy.array(arr[_slices(lows, highs, offset)], dtype=float)
 
-    # upper-left - lower-right.
-    diag_c11 = c1(ip1, j, k) - c1(i, j, kp1)
-    diag_c21 = c2(ip1, j, k) - c2(i, j, kp1)
-    diag_c31 = c3(ip1, j, k) - c3(i, j, kp1)
 
-    # upper-right - lower-left.
-    diag_c12 = c1(ip1, j, kp1) - c1(i, j, k)
-    diag_c22 = c2(ip1, j, kp1) - c2(i, j, k)
-    diag_c32 = c3(ip1, j, kp1) - c3(i, j, k)
+def _difference(arr, lows, highs, upper, lower):
+    """ Return difference of `arr` at offsets `upper` and `lower`. """
+    return _take(arr, lows, highs, upper) - _take(arr, lows, highs, lower)
 
-    if cylindrical:
-        r1 = (c2(i, j, kp1) + c2(ip1, j, k  )) / 2.
-        r2 = (c2(i, j, k  ) + c2(ip1, j, kp1)) / 2.
-    else:
-        r1 = 1.
-        r2 = 1.
 
-    sc1 = 0.5 * ( r2 * diag_c21 * diag_c32 - r1 * diag_c22 * diag_c31)
-    sc2 = 0.5 * (-r2 * diag_c11 * diag_c32 + r1 * diag_c12 * diag_c31)
-    sc3 = 0.5 * (      diag_c11 * diag_c22 -      diag_c12 * diag_c21)
+def _average(arr, lows, highs, offsets):
+    """ Return average of `arr` at `offsets` from each item. """
+    total = _take(arr, lows, highs, offsets[0])
+    for offset in offsets[1:]:
+        total += arr[_slices(lows, highs, offset)]
+    return total * (1. / len(offsets))
 
-    return (sc1, sc2, sc3)
 
-
-def _kface_normal(c1, c2, c3, i, j, k, cylindrical):
+def _coordinates(zone):
     """
-    Return non-dimensional vector normal to K face with magnitude equal to area.
+    Return ``(c1, c2, c3, cylindrical)`` for `zone`. If there is no 'z'
+    coordinate, `c1` will be None in cylindrical coordinates, otherwise
+    `c3` will be None. In 1D Cartesian coordinates `c2` will also be None.
     """
-# FIXME: built-in ghosts
-    ip1 = i + 1
-    jp1 = j + 1
-
-    # upper-left - lower-right.
-    diag_c11 = c1(i, jp1, k) - c1(ip1, j, k)
-    diag_c21 = c2(i, jp1, k) - c2(ip1, j, k)
-    diag_c31 = c3(i, jp1, k) - c3(ip1, j, k)
-
-    # upper-right - lower-left.
-    diag_c12 = c1(ip1, jp1, k) - c1(i, j, k)
-    diag_c22 = c2(ip1, jp1, k) - c2(i, j, k)
-    diag_c32 = c3(ip1, jp1, k) - c3(i, j, k)
-
-    if cylindrical:
-        r1 = (c2(i, jp1, k) + c2(ip1, j,   k)) / 2.
-        r2 = (c2(i, j,   k) + c2(ip1, jp1, k)) / 2.
+    grid = zone.grid_coordinates
+    if zone.coordinate_system == CYLINDRICAL:
+        return (grid.z, grid.r, grid.t, True)
     else:
-        r1 = 1.
-        r2 = 1.
-
-    sc1 = 0.5 * ( r2 * diag_c21 * diag_c32 - r1 * diag_c22 * diag_c31)
-    sc2 = 0.5 * (-r2 * diag_c11 * diag_c32 + r1 * diag_c12 * diag_c31)
-    sc3 = 0.5 * (      diag_c11 * diag_c22 -      diag_c12 * diag_c21)
-
-    return (sc1, sc2, sc3)
-
-
-def _cell_normal(c1, c2, c3, i, j, cylindrical):
+        return (grid.x, grid.y, grid.z, False)
+
+
+# Surface item descriptions, keyed by the directions the surface is flat in:
+# offsets from a face's lowest vertex to the cells sharing the face, offsets
+# to the face's vertices, and the offsets and scale factor used by
+# _face_normals().
+_SURFACES = {
+    (True, False, False): (((1, 1, 1), (0, 1, 1)),
+                           ((0, 0, 0), (0, 1, 0), (0, 1, 1), (0, 0, 1)),
+                           ((0, 1, 0), (0, 0, 1), -0.5)),
+    (False, True, False): (((1, 1, 1), (1, 0, 1)),
+                           ((0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1)),
+                           ((1, 0, 0), (0, 0, 1), 0.5)),
+    (False, False, True): (((1, 1, 1), (1, 1, 0)),
+                           ((0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)),
+                           ((0, 1, 0), (1, 0, 0), 0.5)),
+    (False, False): (((1, 1),),
+                     ((0, 0), (0, 1), (1, 1), (1, 0)),
+                     ((0, 1), (1, 0), 0.5)),
+}
+
+# Curve item descriptions, keyed by the directions the curve is flat in:
+# offsets from an edge's lower vertex to the cells sharing the edge, offsets
+# to the edge's vertices, and the offset to the upper vertex.
+_CURVES = {
+    (False, True, True): (((1, 1, 1), (1, 0, 1), (1, 1, 0), (1, 0, 0)),
+                          ((0, 0, 0), (1, 0, 0)),
+                          (1, 0, 0)),
+    (True, False, True): (((1, 1, 1), (0, 1, 1), (1, 1, 0), (0, 1, 0)),
+                          ((0, 0, 0), (0, 1, 0)),
+                          (0, 1, 0)),
+    (True, True, False): (((1, 1, 1), (0, 1, 1), (1, 0, 1), (0, 0, 1)),
+                          ((0, 0, 0), (0, 0, 1)),
+                          (0, 0, 1)),
+    (False, True): (((1, 1), (1, 0)),
+                    ((0, 0), (1, 0)),
+                    (1, 0)),
+    (True, False): (((1, 1), (0, 1)),
+                    ((0, 0), (0, 1)),
+                    (0, 1)),
+    (False,): (((1,),),
+               ((0,), (1,)),
+               (1,)),
+}
+
+
+def _face_normals(zone, lows, highs, diag_a, diag_b, scale):
     """
-    Return non-dimensional vector normal with magnitude equal to area.
-    If there is no 'z' coordinate, `c1` will be None in cylindrical
-    coordinates, otherwise `c3` will be None.
+    Return non-dimensional vectors normal to the faces from `lows` to
+    `highs` with magnitude equal to area. The face diagonals run from
+    offset `diag_b` to `diag_a` and from the lowest vertex to
+    `diag_a` + `diag_b`. `scale` is 0.5 or -0.5 to orient the normals.
     """
 # FIXME: built-in ghosts
-    ip1 = i + 1
-    jp1 = j + 1
+    c1, c2, c3, cylindrical = _coordinates(zone)
+    origin = (0,) * len(lows)
+    diag_ab = tuple(a + b for a, b in zip(diag_a, diag_b))
 
     # upper-left - lower-right.
-    diag_c11 = 0. if c1 is None else c1(i, jp1) - c1(ip1, j)
-    diag_c21 = c2(i, jp1) - c2(ip1, j)
-    diag_c31 = 0. if c3 is None else c3(i, jp1) - c3(ip1, j)
+    diag_c11 = 0. if c1 is None else \
+               _difference(c1, lows, highs, diag_a, diag_b)
+    diag_c21 = _difference(c2, lows, highs, diag_a, diag_b)
+    diag_c31 = 0. if c3 is None else \
+               _difference(c3, lows, highs, diag_a, diag_b)
 
     # upper-right - lower-left.
-    diag_c12 = 0. if c1 is None else c1(ip1, jp1) - c1(i, j)
-    diag_c22 = c2(ip1, jp1) - c2(i, j)
-    diag_c32 = 0. if c3 is None else c3(ip1, jp1) - c3(i, j)
+    diag_c12 = 0. if c1 is None else \
+               _difference(c1, lows, highs, diag_ab, origin)
+    diag_c22 = _difference(c2, lows, highs, diag_ab, origin)
+    diag_c32 = 0. if c3 is None else \
+               _difference(c3, lows, highs, diag_ab, origin)
 
     if cylindrical:
-        r1 = (c2(i, jp1) + c2(ip1, j)) / 2.
-        r2 = (c2(i, j) + c2(ip1, jp1)) / 2.
+        r1 = (_take(c2, lows, highs, diag_b) +
+              _take(c2, lows, highs, diag_a)) / 2.
+        r2 = (_take(c2, lows, highs, origin) +
+              _take(c2, lows, highs, diag_ab)) / 2.
     else:
         r1 = 1.
         r2 = 1.
 
-    sc1 = 0.5 * ( r2 * diag_c21 * diag_c32 - r1 * diag_c22 * diag_c31)
-    sc2 = 0.5 * (-r2 * diag_c11 * diag_c32 + r1 * diag_c12 * diag_c31)
-    sc3 = 0.5 * (      diag_c11 * diag_c22 -      diag_c12 * diag_c21)
+    sc1 = scale * ( r2 * diag_c21 * diag_c32 - r1 * diag_c22 * diag_c31)
+    sc2 = scale * (-r2 * diag_c11 * diag_c32 + r1 * diag_c12 * diag_c31)
+    sc3 = scale * (      diag_c11 * diag_c22 -      diag_c12 * diag_c21)
 
     return (sc1, sc2, sc3)
 
 
-def _iedge_length(c1, c2, c3, loc, cylindrical):
-    """ Return length of edge along 'i'. """
-    if cylindrical:
-        if len(loc) > 2:
-            i, j, k = loc
-            ip1 = i + 1
-            theta = c3(ip1, j, k) - c3(i, j, k)
-            dx = c2(ip1, j, k) * cos(theta) - c2(i, j, k)
-            dy = c2(ip1, j, k) * sin(theta)
-            dz = c1(ip1, j, k) - c1(i, j, k)
-        elif len(loc) > 1:
-            i, j = loc
-            ip1 = i + 1
-            theta = c3(ip1, j) - c3(i, j)
-            dx = c2(ip1, j) * cos(theta) - c2(i, j)
-            dy = c2(ip1, j) * sin(theta)
-            dz = 0. if c1 is None else c1(ip1, j) - c1(i, j)
-        else:
-            i, = loc
-            ip1 = i + 1
-            theta = c3(ip1) - c3(i)
-            dx = c2(ip1) * cos(theta) - c2(i)
-            dy = c2(ip1) * sin(theta)
-            dz = 0. if c1 is None else c1(ip1) - c1(i)
-    else:
-        if len(loc) > 2:
-            i, j, k = loc
-            ip1 = i + 1
-            dx = c1(ip1, j, k) - c1(i, j, k)
-            dy = c2(ip1, j, k) - c2(i, j, k)
-            dz = c3(ip1, j, k) - c3(i, j, k)
-        elif len(loc) > 1:
-            i, j = loc
-            ip1 = i + 1
-            dx = c1(ip1, j) - c1(i, j)
-            dy = c2(ip1, j) - c2(i, j)
-            dz = 0. if c3 is None else c3(ip1, j) - c3(i, j)
-        else:
-            i, = loc
-            ip1 = i + 1
-            dx = c1(ip1) - c1(i)
-            dy = 0. if c2 is None else c2(ip1) - c2(i)
-            dz = 0. if c3 is None else c3(ip1) - c3(i)
-
-    return sqrt(dx*dx + dy*dy + dz*dz)
-
-
-def _jedge_length(c1, c2, c3, loc, cylindrical):
-    """ Return length of edge along 'j'. """
-    if cylindrical:
-        if len(loc) > 2:
-            i, j, k = loc
-            jp1 = j + 1
-            theta = c3(i, jp1, k) - c3(i, j, k)
-            dx = c2(i, jp1, k) * cos(theta) - c2(i, j, k)
-            dy = c2(i, jp1, k) * sin(theta)
-            dz = c1(i, jp1, k) - c1(i, j, k)
-        else:
-            i, j = loc
-            jp1 = j + 1
-            theta = c3(i, jp1) - c3(i, j)
-            dx = c2(i, jp1) * cos(theta) - c2(i, j)
-            dy = c2(i, jp1) * sin(theta)
-            dz = 0. if c1 is None else c1(i, jp1) - c1(i, j)
-    else:
-        if len(loc) > 2:
-            i, j, k = loc
-            jp1 = j + 1
-            dx = c1(i, jp1, k) - c1(i, j, k)
-            dy = c2(i, jp1, k) - c2(i, j, k)
-            dz = c3(i, jp1, k) - c3(i, j, k)
-        else:
-            i, j = loc
-            jp1 = j + 1
-            dx = c1(i, jp1) - c1(i, j)
-            dy = c2(i, jp1) - c2(i, j)
-            dz = 0. if c3 is None else c3(i, jp1) - c3(i, j)
-
-    return sqrt(dx*dx + dy*dy + dz*dz)
-
+def _edge_lengths(zone, lows, highs, edge):
+    """
+    Return lengths of the edges from `lows` to `highs`, where `edge` is
+    the offset from an edge's lower vertex to its upper vertex.
+    """
+    c1, c2, c3, cylindrical = _coordinates(zone)
+    origin = (0,) * len(lows)
 
-def _kedge_length(c1, c2, c3, loc, cylindrical):
-    """ Return length of edge along 'k'. """
-    i, j, k = loc
-    kp1 = k + 1
     if cylindrical:
-        theta = c3(i, j, kp1) - c3(i, j, k)
-        dx = c2(i, j, kp1) * cos(theta) - c2(i, j, k)
-        dy = c2(i, j, kp1) * sin(theta)
-        dz = c1(i, j, kp1) - c1(i, j, k)
+        theta = _difference(c3, lows, highs, edge, origin)
+        radius = _take(c2, lows, highs, edge)
+        dx = radius * numpy.cos(theta) - _take(c2, lows, highs, origin)
+        dy = radius * numpy.sin(theta)
+        dz = 0. if c1 is None else _difference(c1, lows, highs, edge, origin)
     else:
-        dx = c1(i, j, kp1) - c1(i, j, k)
-        dy = c2(i, j, kp1) - c2(i, j, k)
-        dz = c3(i, j, kp1) - c3(i, j, k)
-
-    return sqrt(dx*dx + dy*dy + dz*dz)
-
-
-def _iface_cell_value(arr, loc):
-    """ Returns I face value for cell-centered data. """
-    i, j, k = loc
-# FIXME: built-in ghosts
-    return 0.5 * (arr(i+1, j+1, k+1) + arr(i, j+1, k+1))
-
-def _jface_cell_value(arr, loc):
-    """ Returns J face value for cell-centered data. """
-    i, j, k = loc
-# FIXME: built-in ghosts
-    return 0.5 * (arr(i+1, j+1, k+1) + arr(i+1, j, k+1))
-
-def _kface_cell_value(arr, loc):
-    """ Returns K face value for cell-centered data. """
-    i, j, k = loc
-# FIXME: built-in ghosts
-    return 0.5 * (arr(i+1, j+1, k+1) + arr(i+1, j+1, k))
-
-
-def _iface_node_value(arr, loc):
-    """ Returns I face value for vertex data. """
-    i, j, k = loc
-    return 0.25 * (arr(i, j+1, k+1) + arr(i, j, k+1) +
-                   arr(i, j+1, k) + arr(i, j, k))
-
-def _jface_node_value(arr, loc):
-    """ Returns J face value for vertex data. """
-    i, j, k = loc
-    return 0.25 * (arr(i+1, j, k+1) + arr(i, j, k+1) +
-                   arr(i+1, j, k) + arr(i, j, k))
-
-def _kface_node_value(arr, loc):
-    """ Returns K face value for vertex data. """
-    i, j, k = loc
-    return 0.25 * (arr(i+1, j+1, k) + arr(i, j+1, k) +
-                   arr(i+1, j, k) + arr(i, j, k))
+        dx = _difference(c1, lows, highs, edge, origin)
+        dy = 0. if c2 is None else _difference(c2, lows, highs, edge, origin)
+        dz = 0. if c3 is None else _difference(c3, lows, highs, edge, origin)
 
+    return numpy.sqrt(dx*dx + dy*dy + dz*dz)
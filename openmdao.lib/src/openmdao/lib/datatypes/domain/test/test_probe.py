@@ -7,9 +7,10 @@ import os.path
 import pkg_resources
 import unittest
 
-from math import pi
+from math import pi, sqrt
 
 from openmdao.lib.datatypes.domain import mesh_probe
+from openmdao.lib.datatypes.domain.metrics import register_metric
 from openmdao.lib.datatypes.domain.test import restart, overflow
 from openmdao.lib.datatypes.domain.test.cube import create_cube
 from openmdao.lib.datatypes.domain.test.wedge import create_wedge_3d
@@ -19,6 +20,41 @@ from openmdao.util.testutil import assert_raises, assert_rel_error
 ORIG_DIR = os.getcwd()
 
 
+class ItemArea(object):
+    """ Computes area one face at a time. """
+
+    def __init__(self, zone, zone_name, reference_state):
+        pass
+
+    def calculate(self, loc, normal):
+        """ Return metric value. """
+        sc1, sc2, sc3 = normal
+        return sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3)
+
+    def dimensionalize(self, value):
+        """ Return dimensional `value`. """
+        raise NotImplementedError('Dimensional item_area')
+
+register_metric('item_area', ItemArea, True, 'surface')
+
+
+class ItemDensity(object):
+    """ Computes density one item at a time. """
+
+    def __init__(self, zone, zone_name, reference_state):
+        self.density = zone.flow_solution.density.item
+
+    def calculate(self, loc, geom):
+        """ Return metric value. """
+        return self.density(*loc)
+
+    def dimensionalize(self, value):
+        """ Return dimensional `value`. """
+        raise NotImplementedError('Dimensional item_density')
+
+register_metric('item_density', ItemDensity, False)
+
+
 class TestCase(unittest.TestCase):
     """ Test :class:`Domain` mesh_probe() operations. """
 
@@ -167,6 +203,34 @@ class TestCase(unittest.TestCase):
                       area, area / 144., expected)
         assert_rel_error(self, area, expected, 0.000001)
 
+    def test_item_metrics(self):
+        # Metrics which aren't vectorized are calculated one item at a time.
+        logging.debug('')
+        logging.debug('test_item_metrics')
+
+        cube = create_cube((41, 17, 9), 5., 4., 3.)
+        wedge = create_wedge_3d((30, 20, 100), 5., 0.5, 2., 30.)
+        variables = (('area', None), ('item_area', None),
+                     ('density', None), ('item_density', None))
+        for domain in (cube, wedge):
+            for region in (('xyzzy', 2, 2, 0, -1, 0, -1),
+                           ('xyzzy', 0, -1, -1, -1, 0, -1),
+                           ('xyzzy', 0, -1, 0, -1, 2, 2)):
+                for scheme in ('area', 'mass'):
+                    area, item_area, density, item_density = \
+                        mesh_probe(domain, (region,), variables, scheme)
+                    assert_rel_error(self, item_area, area, 1e-12)
+                    assert_rel_error(self, item_density, density, 1e-12)
+
+        variables = (('density', None), ('item_density', None))
+        regions = (('xyzzy', 5, 5, 0, -1, 5, 5),)
+        density, item_density = mesh_probe(cube, regions, variables)
+        assert_rel_error(self, item_density, density, 1e-12)
+
+        regions = (('xyzzy', 5, 5, 5, 5, 5, 5),)
+        density, item_density = mesh_probe(cube, regions, variables)
+        self.assertEqual(item_density, density)
+
     def test_adpac(self):
         # Verify correct metric values for data from real scenario.
         logging.debug('')
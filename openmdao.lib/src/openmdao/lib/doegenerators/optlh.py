@@ -21,8 +21,9 @@ import logging
 from random import randint, shuffle, seed
 
 # pylint: disable-msg=E0611,F0401
-from numpy import array, size, sum, floor, zeros
-from numpy.linalg import norm
+from numpy import array, size, sum, floor, zeros, errstate, fill_diagonal, \
+                  isfinite, newaxis, sqrt
+from scipy.spatial.distance import pdist, squareform
 
 from openmdao.main.datatypes.api import Int, Enum
 from openmdao.main.interfaces import implements, IDOEgenerator
@@ -78,6 +79,9 @@ class LHC_indivudal(object):
         self.p = p
         self.doe = doe
         self.phi = None # Morris-Mitchell sampling criterion
+        self._dist = None  # Distances between each pair of points.
+        self._total = None  # Sum of distance**-q over all pairs of points.
+        self._update = None  # (parent distances, changed rows, their distances)
 
     @property
     def shape(self):
@@ -88,27 +92,31 @@ class LHC_indivudal(object):
         """Returns the Morris-Mitchell sampling criterion for this Latin hypercube."""
 
         if self.phi is None:
-            n,m = self.doe.shape
-            distdict = {}
-
-            #calculate the norm between each pair of points in the DOE
-            # TODO: This norm takes up the majority of the computation time. It
-            # should be converted to C or ShedSkin.
-            arr = self.doe
-            for i in range(n):
-                for j in range(i+1, n):
-                    nrm = norm(arr[i]-arr[j], ord=self.p)
-                    distdict[nrm] = distdict.get(nrm, 0) + 1
-
-            distinct_d = array(distdict.keys())
-
-            #mutltiplicity array with a count of how many pairs of points have a given distance
-            J = array(distdict.values())
-
-            self.phi = sum(J*(distinct_d**(-self.q)))**(1.0/self.q)
+            if self._total is None:
+                self._total = _pair_terms(self._distances(), self.q).sum()/2.
+            self.phi = self._total**(1.0/self.q)
 
         return self.phi
 
+    def _distances(self):
+        """Returns the square matrix of distances between each pair of
+        points, applying any pending update from our parent's matrix."""
+        if self._dist is None:
+            if self._update is None:
+                metric = {1: 'cityblock', 2: 'euclidean'}.get(self.p)
+                if metric is None:
+                    dist = pdist(self.doe, 'minkowski', p=self.p)
+                else:
+                    dist = pdist(self.doe, metric)
+                self._dist = squareform(dist)
+            else:
+                parent, rows, dist = self._update
+                self._dist = parent.copy()
+                self._dist[rows, :] = dist
+                self._dist[:, rows] = dist.T
+                self._update = None
+        return self._dist
+
     def perturb(self, mutation_count):
         """ Interchanges pairs of randomly chosen elements within randomly chosen
         columns of a DOE a number of times. The result of this operation will also
@@ -116,6 +124,7 @@ class LHC_indivudal(object):
         """
         new_doe = self.doe.copy()
         n,k = self.doe.shape
+        changed = set()
         for count in range(mutation_count):
             col = randint(0, k-1)
 
@@ -127,8 +136,25 @@ class LHC_indivudal(object):
 
             new_doe[el1, col] = self.doe[el2, col]
             new_doe[el2, col] = self.doe[el1, col]
-
-        return LHC_indivudal(new_doe, self.q, self.p)
+            changed.update((el1, el2))
+
+        child = LHC_indivudal(new_doe, self.q, self.p)
+
+        # Only the distances to the changed points differ from ours, so the
+        # child's criterion is found by updating ours. The child's distance
+        # matrix is only built if it gets perturbed in turn.
+        if self._total is not None and isfinite(self._total):
+            rows = sorted(changed)
+            parent = self._distances()
+            dist = _row_distances(new_doe, rows, self.p)
+            added = _row_terms(dist, rows, self.q)
+            total = self._total - _row_terms(parent[rows], rows, self.q) + added
+            # Fall back to a full sum if cancellation lost too much precision.
+            if isfinite(total) and total > 1e-8*max(self._total, added):
+                child._total = total
+            child._update = (parent, rows, dist)
+
+        return child
 
     def __iter__(self):
         return self._get_rows()
@@ -147,6 +173,35 @@ class LHC_indivudal(object):
         return self.doe.__getitem__(*args)
 
 
+def _pair_terms(dist, q):
+    """Returns the Morris-Mitchell term distance**-q for each pair in the
+    square distance matrix `dist`, with zeros on the diagonal."""
+    with errstate(divide='ignore'):
+        terms = dist**-q
+    fill_diagonal(terms, 0.)
+    return terms
+
+
+def _row_terms(dist, rows, q):
+    """Returns the sum of distance**-q over the pairs of points including any
+    of the points `rows`, given their distances `dist` to all the points."""
+    with errstate(divide='ignore'):
+        terms = dist**-q
+    terms[range(len(rows)), rows] = 0.
+    return terms.sum() - terms[:, rows].sum()/2.
+
+
+def _row_distances(doe, rows, p):
+    """Returns the p-norm distances from each of the points `rows` to all the
+    points of `doe`."""
+    diff = abs(doe[rows][:, newaxis, :] - doe[newaxis, :, :])
+    if p == 1:
+        return diff.sum(axis=2)
+    if p == 2:
+        return sqrt((diff**2).sum(axis=2))
+    return ((diff**p).sum(axis=2))**(1.0/p)
+
+
 _norm_map = {"1-norm":1,"2-norm":2}
 
 
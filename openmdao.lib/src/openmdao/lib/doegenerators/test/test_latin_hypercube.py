@@ -24,6 +24,16 @@ class TestCase(unittest.TestCase):
         self.assertTrue(is_latin_hypercube(lh_opt))
         self.assertTrue(opt_phi < phi1)
         
+    def test_mmphi_update(self):
+        # Criteria of perturbed individuals are updated from their parent's.
+        for p in (1, 2, 3):
+            lh = LHC_indivudal(rand_latin_hypercube(30, 3), 5, p)
+            lh.mmphi()
+            for i in range(10):
+                lh = lh.perturb(3)
+                direct = LHC_indivudal(lh.doe, 5, p)
+                self.assertAlmostEqual(lh.mmphi()/direct.mmphi(), 1., 10)
+
     def test_OptLatinHypercube(self):
         olh = OptLatinHypercube()
         olh.num_samples = 10
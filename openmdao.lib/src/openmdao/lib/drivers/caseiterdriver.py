@@ -3,7 +3,9 @@
 
 """
 
+import atexit
 from cStringIO import StringIO
+import copy
 import gc
 import logging
 import os.path
@@ -12,8 +14,9 @@ import sys
 import thread
 import threading
 from uuid import uuid1, getnode
+import weakref
 
-from numpy import array
+from numpy import array, array_equal, ndarray
 
 from openmdao.main.api import Driver, VariableTree
 from openmdao.main.datatypes.api import Bool, Dict, Enum, Int
@@ -22,7 +25,7 @@ from openmdao.main.expreval import ExprEvaluator
 from openmdao.main.hasparameters import HasVarTreeParameters
 from openmdao.main.hasresponses import HasVarTreeResponses
 from openmdao.main.interfaces import IHasParameters, IHasResponses, implements
-from openmdao.main.rbac import get_credentials, set_credentials
+from openmdao.main.rbac import get_credentials, set_credentials, rbac
 from openmdao.main.resource import ResourceAllocationManager as RAM
 from openmdao.main.resource import LocalAllocator
 from openmdao.main.variable import is_legal_name, make_legal_path
@@ -36,6 +39,48 @@ _EMPTY     = 'empty'
 _LOADING   = 'loading'
 _EXECUTING = 'executing'
 
+# Drivers currently retaining servers due to `persistent_servers`.
+_RETAINING = weakref.WeakSet()
+
+
+@atexit.register
+def _release_retained():
+    """ Release servers and eggs still retained at exit. """
+    for driver in list(_RETAINING):
+        try:
+            driver.release_servers()
+        except Exception:
+            pass
+
+
+def _same(value, other):
+    """ Return True if `value` is known to be equal to `other`. """
+    try:
+        if isinstance(value, VariableTree):
+            if not isinstance(other, VariableTree):
+                return False
+            names = value.list_vars()
+            if sorted(names) != sorted(other.list_vars()):
+                return False
+            for name in names:
+                if not _same(getattr(value, name), getattr(other, name)):
+                    return False
+            return True
+        if isinstance(value, ndarray) or isinstance(other, ndarray):
+            return array_equal(value, other)
+        return bool(value == other)
+    except Exception:
+        return False
+
+
+def _copy_value(value):
+    """ Return a copy of `value` which won't change with the original. """
+    if isinstance(value, (ndarray, VariableTree)):
+        return value.copy()
+    elif isinstance(value, (list, dict)):
+        return copy.deepcopy(value)
+    return value
+
 
 class _Case(object):
     """ Input data and required outputs for a particular simulation run. """
@@ -91,12 +136,19 @@ class _Case(object):
                 self._exprs = {}
             self._exprs[name] = expr
 
-    def apply_inputs(self, scope, parent):
+    def apply_inputs(self, scope, parent, known=None):
         """
         Take the values of all of the inputs in this case and apply them
         to the specified scope.
+
+        If `known` is not None, it is a dictionary of input values already
+        in the (remote) `scope`. Only inputs whose values differ are set,
+        and `known` is updated.
         """
         for name, value in self._inputs.items():
+            if known is not None:
+                if name in known and _same(value, known[name]):
+                    continue
             if self._exprs is None:
                 expr = None
             else:
@@ -105,8 +157,11 @@ class _Case(object):
                 expr.set(value, scope) #, tovector=True)
             else:
                 scope.set(name, value)
+            if known is not None:
+                known[name] = _copy_value(value)
 
-        parent._system.vec.get('u').set_from_scope(scope)
+        if known is None:
+            parent._system.vec.get('u').set_from_scope(scope)
             
 
     def fetch_outputs(self, scope, extra=False, itername=''):
@@ -184,6 +239,10 @@ class _ServerData(object):
         self.in_use = False     # True if being used.
         self.load_failures = 0  # Load failure count.
 
+        self.model_version = None  # Configuration version of loaded model.
+        self.values = {}        # Case input values set in loaded model.
+        self.versions = {}      # Versions of model inputs set in loaded model.
+
 
 
 @add_delegate(HasVarTreeParameters, HasVarTreeResponses)
@@ -202,6 +261,14 @@ class CaseIteratorDriver(Driver):
     reload_model = Bool(True, iotype='in',
                         desc='If True, reload the model between executions.')
 
+    persistent_servers = Bool(False, iotype='in',
+                              desc='If True, keep concurrent servers and their'
+                                   ' loaded models between executions. Only'
+                                   ' changed inputs are sent to a server, and'
+                                   ' its model is reloaded only if the'
+                                   ' configuration changes or a case fails'
+                                   ' (reload_model is ignored).')
+
     error_policy = Enum(values=('ABORT', 'RETRY'), iotype='in',
                         desc='If ABORT, any error stops the evaluation of the'
                              ' whole set of cases.')
@@ -238,9 +305,35 @@ class CaseIteratorDriver(Driver):
         self._rerun = []  # Cases that failed and should be retried.
         self._generation = 0  # Used to keep worker names unique.
 
+        # Support for persistent_servers.
+        self._config_version = getattr(self, '_config_version', 0)
+        self._egg_version = None  # Configuration version of egg.
+        self._model_inputs = {}   # Values of model inputs not set by cases.
+        self._input_versions = {} # Versions of changed model inputs.
+
         # var wasn't showing up in parent depgraph without this
         self.error_policy = 'ABORT'
 
+    def __getstate__(self):
+        """ Return dict representing this driver's state. """
+        state = super(CaseIteratorDriver, self).__getstate__()
+        # Retained servers aren't part of the state.
+        state['_reply_q'] = None
+        state['_server_lock'] = None
+        state['_servers'] = {}
+        state['_egg_file'] = None
+        state['_egg_version'] = None
+        return state
+
+    def config_changed(self, update_parent=True):
+        """Call this whenever the configuration of this Component changes,
+        for example, children are added or removed or dependencies may have
+        changed.
+        """
+        super(CaseIteratorDriver, self).config_changed(update_parent)
+        # Retained servers need to reload the model.
+        self._config_version = getattr(self, '_config_version', 0) + 1
+
     def set_inputs(self, generator):
         """ Set case inputs from generator values. """
         inputs = array([vals for vals in generator])
@@ -303,40 +396,17 @@ class CaseIteratorDriver(Driver):
             while obj.parent is not None:
                 obj = obj.parent
             obj._setup()
-            
-        if not self.sequential:
-            # Save model to egg.
-            # Must do this before creating any locks or queues.
-            self._replicants += 1
-            version = 'replicant.%d' % (self._replicants)
-
-            # If only local host will be used, we can skip determining
-            # distributions required by the egg.
-            allocators = RAM.list_allocators()
-            need_reqs = False
-            if not self.ignore_egg_requirements:
-                for allocator in allocators:
-                    if not isinstance(allocator, LocalAllocator):
-                        need_reqs = True
-                        break
 
-            # Replicate and mutate model to run our workflow once.
-            # Originally this was done in-place, but that 'invalidated'
-            # various workflow quantities.
-            replicant = self.parent.copy()
-            workflow = replicant.get(self.name+'.workflow')
-            driver = replicant.add('driver', Driver())
-            workflow.parent = driver
-            workflow.scope = None
-            replicant.driver.workflow = workflow
-            egg_info = replicant.save_to_egg(self.name, version,
-                                             need_requirements=need_reqs)
-            replicant = workflow = driver = None  # Release objects.
-            gc.collect()  # Collect/compact before possible fork.
-
-            self._egg_file = egg_info[0]
-            self._egg_required_distributions = egg_info[1]
-            self._egg_orphan_modules = [name for name, path in egg_info[2]]
+        if self._servers and (self.sequential or not self.persistent_servers):
+            self.release_servers()
+
+        if not self.sequential:
+            if self.persistent_servers and self._egg_file and \
+               self._egg_version == self._config_version:
+                # Retained servers keep their model, just track changes.
+                self._update_model_inputs()
+            else:
+                self._save_model()
 
         inp_paths = []
         inp_values = []
@@ -365,6 +435,81 @@ class CaseIteratorDriver(Driver):
         self._iter = iter(cases)
         self._abort_exc = None
 
+    def _save_model(self):
+        """ Save model to egg for loading into concurrent servers. """
+        # Save model to egg.
+        # Must do this before creating any locks or queues.
+        self._replicants += 1
+        version = 'replicant.%d' % (self._replicants)
+
+        # If only local host will be used, we can skip determining
+        # distributions required by the egg.
+        allocators = RAM.list_allocators()
+        need_reqs = False
+        if not self.ignore_egg_requirements:
+            for allocator in allocators:
+                if not isinstance(allocator, LocalAllocator):
+                    need_reqs = True
+                    break
+
+        # Replicate and mutate model to run our workflow once.
+        # Originally this was done in-place, but that 'invalidated'
+        # various workflow quantities.
+        replicant = self.parent.copy()
+        workflow = replicant.get(self.name+'.workflow')
+        driver = replicant.add('driver', Driver())
+        workflow.parent = driver
+        workflow.scope = None
+        replicant.driver.workflow = workflow
+        egg_info = replicant.save_to_egg(self.name, version,
+                                         need_requirements=need_reqs)
+        replicant = workflow = driver = None  # Release objects.
+        gc.collect()  # Collect/compact before possible fork.
+
+        if self._egg_file and os.path.exists(self._egg_file):
+            os.remove(self._egg_file)
+        self._egg_file = egg_info[0]
+        self._egg_required_distributions = egg_info[1]
+        self._egg_orphan_modules = [name for name, path in egg_info[2]]
+        self._egg_version = self._config_version
+
+        if self.persistent_servers:
+            self._model_inputs = {}
+            self._input_versions = {}
+            for path in self._list_model_inputs():
+                try:
+                    value = self.parent.get(path)
+                except Exception:
+                    continue
+                self._model_inputs[path] = _copy_value(value)
+
+    def _list_model_inputs(self):
+        """
+        Return paths of model inputs which aren't set by the cases but may
+        change between executions: our parent's inputs and unconnected
+        inputs of workflow components.
+        """
+        parent = self.parent
+        connected = set([dst for src, dst in parent.list_connections()])
+        for param in self.get_parameters().values():
+            connected.update(param.targets)
+        paths = parent.list_inputs()
+        for comp in self.workflow:
+            for name in comp.list_inputs():
+                path = '%s.%s' % (comp.name, name)
+                if path not in connected:
+                    paths.append(path)
+        return paths
+
+    def _update_model_inputs(self):
+        """ Record which model inputs changed since the model was saved. """
+        for path, old in self._model_inputs.items():
+            value = self.parent.get(path)
+            if not _same(value, old):
+                self._model_inputs[path] = _copy_value(value)
+                self._input_versions[path] = \
+                    self._input_versions.get(path, 0) + 1
+
     def _start(self):
         """ Start evaluating cases concurrently. """
         # Need credentials in case we're using a PublicKey server.
@@ -385,10 +530,25 @@ class CaseIteratorDriver(Driver):
             self.raise_exception(msg, RuntimeError)
 
         # Kick off initial wave of cases.
-        self._server_lock = threading.Lock()
-        self._reply_q = Queue.Queue()
+        if self._reply_q is None:
+            self._server_lock = threading.Lock()
+            self._reply_q = Queue.Queue()
         self._generation += 1
         n_servers = 0
+
+        # Restart any retained servers.
+        for server in self._servers.values():
+            if not self._more_to_go():
+                break
+            n_servers += 1
+            server.exception = None
+            server.case = None
+            if server.model_version == self._egg_version:
+                server.state = _LOADING  # Model already loaded.
+            else:
+                server.state = _EMPTY
+            server.in_use = self._server_ready(server)
+
         while n_servers < max_servers:
             if not self._more_to_go():
                 break
@@ -486,7 +646,13 @@ class CaseIteratorDriver(Driver):
                 server = self._servers[name]
                 server.in_use = self._server_ready(server)
 
-        # Shut-down (started) servers.
+        if not self.persistent_servers:
+            self._shutdown_servers()
+
+    def _shutdown_servers(self):
+        """ Shut-down (started) servers. """
+        if self._reply_q is None:
+            return
         self._logger.debug('Shut-down (started) servers')
         n_queues = 0
         for server in self._servers.values():
@@ -521,16 +687,44 @@ class CaseIteratorDriver(Driver):
               for workers which haven't shut down by now.
         """
         self._iter = None
-        self._reply_q = None
-        self._server_lock = None
-        self._servers = {}
         self._seq_server.top = None  # Avoid leak.
         self._todo = []
         self._rerun = []
 
+        if self.persistent_servers and not self.sequential:
+            # Retain started servers and the egg their model came from.
+            self._servers = dict([(name, server)
+                                  for name, server in self._servers.items()
+                                  if server.queue is not None])
+            for server in self._servers.values():
+                server.in_use = False
+            _RETAINING.add(self)
+            return
+
+        self.release_servers()
+
+    def release_servers(self):
+        """
+        Shut-down servers retained due to `persistent_servers` and remove
+        the egg file their model was loaded from. This is also done by
+        :meth:`pre_delete` and when the process exits.
+        """
+        _RETAINING.discard(self)
+        self._shutdown_servers()
+        self._reply_q = None
+        self._server_lock = None
+        self._servers = {}
+
         if self._egg_file and os.path.exists(self._egg_file):
             os.remove(self._egg_file)
             self._egg_file = None
+        self._egg_version = None
+
+    @rbac('owner')
+    def pre_delete(self):
+        """ Release any retained servers before the model is deleted. """
+        self.release_servers()
+        super(CaseIteratorDriver, self).pre_delete()
 
     def _server_ready(self, server):
         """
@@ -580,6 +774,7 @@ class CaseIteratorDriver(Driver):
                 case.exc = server.exception
 
             if case.exc is not None:
+                server.model_version = None  # Force reload of model.
                 if self.error_policy == 'ABORT':
                     if self._abort_exc is None:
                         self._abort_exc = case.exc
@@ -643,7 +838,11 @@ class CaseIteratorDriver(Driver):
             if server.name is None:
                 in_use = self._start_next_case(server)
             elif reload:
-                if self.reload_model:
+                if self.persistent_servers:
+                    reload = server.model_version != self._egg_version
+                else:
+                    reload = self.reload_model
+                if reload:
                     self._logger.debug('    reload')
                     self._load_model(server)
                     server.state = _LOADING
@@ -697,7 +896,15 @@ class CaseIteratorDriver(Driver):
         case.parent_uuid = self._case_uuid
 
         try:
-            case.apply_inputs(server.top, self)
+            if server.name is not None and self.persistent_servers:
+                # Only send what the loaded model doesn't already have.
+                for path, version in self._input_versions.items():
+                    if server.versions.get(path) != version:
+                        server.top.set(path, self._model_inputs[path])
+                        server.versions[path] = version
+                case.apply_inputs(server.top, self, server.values)
+            else:
+                case.apply_inputs(server.top, self)
         except Exception:
             case.exc = sys.exc_info()
             msg = 'Exception setting case inputs: %s' % case.exc[1]
@@ -844,6 +1051,7 @@ class CaseIteratorDriver(Driver):
                 return
             else:
                 server.info['egg_file'] = self._egg_file
+        server.model_version = None
         try:
             tlo = server.server.load_model(self._egg_file)
         # Difficult to force load error.
@@ -854,6 +1062,9 @@ class CaseIteratorDriver(Driver):
             server.exception = sys.exc_info()
         else:
             server.top = tlo
+            server.model_version = self._egg_version
+            server.values = {}
+            server.versions = {}
 
     def _model_execute(self, server):
         """ Execute model in server. """
@@ -141,8 +141,11 @@ class COBYLAdriver(Driver):
 
         Note: n, m, f, and g are unused inputs."""
 
-        self.set_parameters(xnew)
-        super(COBYLAdriver, self).run_iteration()
+        return self.eval_at(xnew, 'func', self._eval_func)
+
+    def _eval_func(self):
+        """ Return the objective and constraints of the current model."""
+
         f = self.eval_objective()
 
         if isnan(f):
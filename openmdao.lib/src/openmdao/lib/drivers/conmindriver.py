@@ -375,27 +375,13 @@ class CONMINdriver(Driver):
         # calculate objective and constraints
         if self.cnmn1.info == 1:
 
-            # Note. CONMIN is driving the finite difference estimation of the
-            # gradient.
-            if self.cnmn1.igoto == 3:
-
-                # update the parameters in the model
-                self.set_parameters(self.design_vals[:-2])
-                super(CONMINdriver, self).run_iteration()
-
-            else:
-                # update the parameters in the model
-                self.set_parameters(self.design_vals[:-2])
-
-                # Run the model for this step
-                super(CONMINdriver, self).run_iteration()
-
-            # calculate objective
-            self.cnmn1.obj = self.eval_objective()
+            # Note. CONMIN may be driving the finite difference estimation of
+            # the gradient (igoto == 3).
+            self.cnmn1.obj, cons = self.eval_at(self.design_vals[:-2], 'func',
+                                                self._eval_func)
 
             # update constraint value array
-            self.constraint_vals[0:self.total_ineq_constraints()] = \
-                self.eval_ineq_constraints()
+            self.constraint_vals[0:self.total_ineq_constraints()] = cons
 
             #self._logger.debug('constraints = %s' % self.constraint_vals)
 
@@ -404,15 +390,15 @@ class CONMINdriver(Driver):
         # only return gradients of active/violated constraints.
         elif self.cnmn1.info == 2 and self.cnmn1.nfdg == 1:
 
-            # Sometimes, CONMIN wants the derivatives at a different point.
-            self.set_parameters(self.design_vals[:-2])
-            super(CONMINdriver, self).run_iteration()
-
             inputs = self.list_param_group_targets()
             obj = self.list_objective_targets()
             con = self.list_ineq_constraint_targets()
 
-            J = self.workflow.calc_gradient(inputs, obj + con)
+            # Sometimes, CONMIN wants the derivatives at a different point,
+            # in which case eval_at runs the model there first.
+            J = self.eval_at(self.design_vals[:-2], 'grad',
+                             lambda: self.workflow.calc_gradient(inputs,
+                                                                 obj + con))
 
             nobj = len(obj)
             self.d_obj[:-2] = J[0:nobj, :].ravel()
@@ -431,6 +417,11 @@ class CONMINdriver(Driver):
                                  ' from CONMIN.', RuntimeError)
 
 
+    def _eval_func(self):
+        """ Returns the objective and inequality constraints of the current
+        model."""
+        return self.eval_objective(), self.eval_ineq_constraints()
+
     def post_iteration(self):
         """ Checks CONMIN's return status and writes out cases."""
 
@@ -24,6 +24,7 @@ from openmdao.main.hasobjective import HasObjective
 from openmdao.main.hasevents import HasEvents
 from openmdao.main.interfaces import IHasParameters, IHasObjective, \
                                      implements, IOptimizer
+from openmdao.main.workerpool import WorkerPool, workers_available
 from openmdao.util.decorators import add_delegate
 from openmdao.util.typegroups import real_types, int_types, iterable_types
 
@@ -83,6 +84,24 @@ class Genetic(Driver):
                     "for repeatable results; otherwise leave as None for truly "
                     "random seeding.")
 
+    n_workers = Int(0, low=0, iotype="in",
+                    desc="Number of worker processes used to evaluate the "
+                         "members of each generation concurrently. Values "
+                         "less than 2 evaluate them serially. Cases run "
+                         "by workers are not recorded.")
+
+    cache_fitness = Bool(True, iotype="in",
+                         desc="If True, the score of each distinct chromosome "
+                              "is saved and reused rather than running the "
+                              "model again. Disable for models whose "
+                              "objective is not repeatable.")
+
+    def __init__(self):
+        super(Genetic, self).__init__()
+        self._scores = {}
+        self._pending = []
+        self._pool = None
+
     def _make_alleles(self):
         """ Returns a GAllelle.Galleles instance with alleles corresponding to
         the parameters specified by the user"""
@@ -128,10 +147,37 @@ class Genetic(Driver):
 
         genome = G1DList.G1DList(len(alleles))
         genome.setParams(allele=alleles)
-        genome.evaluator.set(self._run_model)
+        genome.evaluator.set(self._evaluate)
 
         genome.mutator.set(Mutators.G1DListMutatorAllele)
         genome.initializator.set(Initializators.G1DListInitializatorAllele)
+
+        # Every new individual passes through the initializator or the
+        # mutator before its generation is evaluated, so these collect the
+        # individuals to be evaluated concurrently by a pool of workers
+        # that is reused for every generation.
+        self._scores = {}
+        self._pending = []
+        if workers_available(self.n_workers):
+            genome.initializator.add(self._queue)
+            genome.mutator.add(self._queue)
+            self._pool = WorkerPool(self, '_run_model', self,
+                                    min(self.n_workers, self.population_size))
+        try:
+            self._evolve(genome)
+        finally:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+            self._scores = {}
+            self._pending = []
+
+        #run it once to get the model into the optimal state
+        self._run_model(self.best_individual)
+
+    def _evolve(self, genome):
+        """Run the genetic algorithm on `genome` and save the best
+        individual."""
         #TODO: fix tournament size settings
         #genome.setParams(tournamentPool=self.tournament_size)
 
@@ -161,8 +207,56 @@ class Genetic(Driver):
 
         self.best_individual = ga.bestIndividual()
 
-        #run it once to get the model into the optimal state
-        self._run_model(self.best_individual)
+    def _queue(self, genome, **args):
+        """Initializator/mutator that records `genome` as awaiting
+        evaluation. Returns the number of mutations made (none)."""
+        self._pending.append(genome)
+        return 0
+
+    @staticmethod
+    def _key(chromosome):
+        """Return hashable key for `chromosome`, or None."""
+        key = tuple(chromosome)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _evaluate(self, chromosome):
+        """Pyevolve evaluator. Returns the score of `chromosome`, running the
+        model only if the score isn't already known."""
+        key = self._key(chromosome)
+        if key is None:
+            return self._run_model(chromosome)
+
+        if self._pending:
+            self._evaluate_pending()
+        try:
+            return self._scores[key]
+        except KeyError:
+            score = self._run_model(chromosome)
+            if self.cache_fitness:
+                self._scores[key] = score
+            return score
+
+    def _evaluate_pending(self):
+        """Evaluate the distinct chromosomes awaiting evaluation in our pool
+        of worker processes and save their scores."""
+        if not self.cache_fitness:
+            self._scores = {}
+        keys = []
+        for genome in self._pending:
+            key = self._key(genome)
+            if key is not None and key not in self._scores and \
+               key not in keys:
+                keys.append(key)
+        self._pending = []
+        if len(keys) < 2:
+            return
+
+        scores = self._pool.map([(key,) for key in keys])
+        self._scores.update(zip(keys, scores))
 
     def _run_model(self, chromosome):
         self.set_parameters([val for val in chromosome])
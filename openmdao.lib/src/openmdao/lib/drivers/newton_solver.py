@@ -17,13 +17,20 @@ def norm(a, order=None):
 # pylint: disable=E0611, F0401
 from openmdao.main.case import Case
 from openmdao.main.driver import Driver
-from openmdao.main.datatypes.api import Float, Int, Enum
+from openmdao.main.datatypes.api import Float, Int, Enum, Bool
 from openmdao.main.hasparameters import HasParameters
 from openmdao.main.hasconstraints import HasEqConstraints
 from openmdao.main.interfaces import IHasParameters, IHasEqConstraints, \
                                      ISolver, implements
 from openmdao.util.decorators import add_delegate
 
+# Eisenstat-Walker (choice 2) forcing term parameters.
+_EW_ETA0 = 0.3
+_EW_ETA_MAX = 0.9
+_EW_GAMMA = 1.0
+_EW_ALPHA = (1.0 + 5.0**0.5)/2.0
+_EW_THRESHOLD = 0.1
+
 
 @add_delegate(HasParameters, HasEqConstraints)
 class NewtonSolver(Driver):
@@ -56,6 +63,26 @@ class NewtonSolver(Driver):
                   'convergence. Set to 2 to get backtracking convergence '
                   'as well.')
 
+    max_reuse = Int(0, low=0, iotype='in',
+                    desc='Maximum number of consecutive iterations that '
+                         'reuse the last linearization of the model (chord '
+                         'Newton). Set to 0 to linearize on every iteration.')
+
+    reuse_rate = Float(0.5, low=0.0, high=1.0, iotype='in',
+                       desc='The model is linearized again after an iteration '
+                            'that reduced the residual norm by less than '
+                            'this factor.')
+
+    forcing = Enum('fixed', ['fixed', 'eisenstat_walker'], iotype='in',
+                   desc="Tolerance of iterative linear solves. 'fixed' uses "
+                        "the gradient options. 'eisenstat_walker' adapts it "
+                        "to the progress of the Newton iterations (inexact "
+                        "Newton).")
+
+    warm_start = Bool(False, iotype='in',
+                      desc='Set to True to start iterative linear solves '
+                           'from the previous Newton direction.')
+
     def execute(self):
         """ General Newton's method. """
 
@@ -77,10 +104,26 @@ class NewtonSolver(Driver):
 
         itercount = 0
         alpha = self.alpha
+        f_norm_prev = f_norm
+        reuse_count = 0
+        slow = True
+        tol = guess = None
         while itercount < self.max_iteration and f_norm > self.atol and \
               f_norm/f_norm0 > self.rtol:
 
-            system.calc_newton_direction(options=options)
+            linearize = slow or reuse_count >= self.max_reuse
+            if self.forcing == 'eisenstat_walker':
+                tol = self._forcing_term(f_norm, f_norm_prev, f_norm0, tol)
+            if self.warm_start and itercount > 0:
+                guess = dfvec.array.copy()
+
+            system.calc_newton_direction(options=options, linearize=linearize,
+                                         tol=tol, guess=guess)
+            if linearize:
+                reuse_count = 0
+            else:
+                reuse_count += 1
+            f_norm_prev = f_norm
 
             #print "LS 1", uvec.array, '+', dfvec.array
             uvec.array += alpha*dfvec.array
@@ -116,6 +159,9 @@ class NewtonSolver(Driver):
             # Reset backtracking
             alpha = self.alpha
 
+            # A reused linearization is kept while it still converges fast.
+            slow = f_norm > self.reuse_rate*f_norm_prev
+
         # Need to make sure the whole workflow is executed at the final
         # point, not just evaluated.
         self.pre_iteration()
@@ -125,6 +171,25 @@ class NewtonSolver(Driver):
         if self.iprint == 1:
             print self.name, "converged"
 
+    def _forcing_term(self, f_norm, f_norm_prev, f_norm0, eta_prev):
+        """ Returns the Eisenstat-Walker relative tolerance for the next
+        linear solve, given the residual norms of the current, previous and
+        initial iterates and the previous tolerance."""
+
+        if eta_prev is None:
+            eta = _EW_ETA0
+        else:
+            eta = _EW_GAMMA*(f_norm/f_norm_prev)**_EW_ALPHA
+
+            # Safeguard against the tolerance dropping too quickly.
+            safe = _EW_GAMMA*eta_prev**_EW_ALPHA
+            if safe > _EW_THRESHOLD:
+                eta = max(eta, safe)
+
+        # No need to solve more accurately than the Newton iteration requires.
+        eta = max(eta, 0.5*max(self.atol, self.rtol*f_norm0)/f_norm)
+        return min(eta, _EW_ETA_MAX)
+
     def requires_derivs(self):
         """Newtonsolver always requires derivatives."""
         return True
@@ -170,30 +170,41 @@ class SLSQPdriver(Driver):
         evaluations.
 
         Note: m, me, la, n, f, and g are unused inputs."""
-        self.set_parameters(xnew)
-        super(SLSQPdriver, self).run_iteration()
-        f = self.eval_objective()
-
-        if isnan(f):
-            msg = "Numerical overflow in the objective."
-            self.raise_exception(msg, RuntimeError)
+        f, cons = self.eval_at(xnew, 'func', self._eval_func)
 
         # Constraints. Note that SLSQP defines positive as satisfied.
         if self.ncon > 0:
-            g = -1. * array(self.eval_constraints(self.parent))
+            g = cons
 
         if self.iprint > 0:
             pyflush(self.iout)
 
         return f, g
 
+    def _eval_func(self):
+        """ Return the objective and constraints of the current model."""
+        f = self.eval_objective()
+
+        if isnan(f):
+            msg = "Numerical overflow in the objective."
+            self.raise_exception(msg, RuntimeError)
+
+        cons = None
+        if self.ncon > 0:
+            cons = -1. * array(self.eval_constraints(self.parent))
+
+        return f, cons
+
     def _grad(self, m, me, la, n, f, g, df, dg, xnew):
         """ Return ndarrays containing the gradients of the objective
         and constraints.
 
         Note: m, me, la, n, f, and g are unused inputs."""
 
-        J = self.workflow.calc_gradient(self.inputs, self.obj + self.con)
+        J = self.eval_at(xnew, 'grad',
+                         lambda: self.workflow.calc_gradient(self.inputs,
+                                                             self.obj + self.con),
+                         rerun=False)
         #print "gradient", J
         df[0:self.nparam] = J[0, :].ravel()
 
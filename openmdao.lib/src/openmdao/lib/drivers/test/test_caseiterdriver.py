@@ -27,6 +27,8 @@ from openmdao.main.datatypes.api import Float, Bool, Array, Int, Str, \
 from openmdao.lib.casehandlers.api import ListCaseRecorder
 from openmdao.lib.drivers.api import CaseIteratorDriver, SimpleCaseIterDriver, \
                                      SLSQPdriver
+from openmdao.lib.drivers.caseiterdriver import _Case, _RETAINING, \
+                                                _release_retained
 
 from openmdao.main.case import Case, CaseTreeNode
 
@@ -238,6 +240,105 @@ class TestCase(unittest.TestCase):
         self.model.driver.extra_resources = {'allocator': name}
         self.run_cases(sequential=False)
 
+    def test_persistent(self):
+        logging.debug('')
+        logging.debug('test_persistent')
+        init_cluster(encrypted=True, allow_shell=True)
+        driver = self.model.driver
+        driver.persistent_servers = True
+        try:
+            self.run_cases(sequential=False)
+            servers = dict(driver._servers)
+            self.assertTrue(servers)
+            egg_file = driver._egg_file
+            self.assertTrue(os.path.exists(egg_file))
+
+            # Same servers and model, new cases.
+            self.generate_cases()
+            self.run_cases(sequential=False)
+            self.assertEqual(driver._egg_file, egg_file)
+            for name, server in driver._servers.items():
+                if name in servers:
+                    self.assertTrue(server is servers[name])
+        finally:
+            driver.release_servers()
+        self.assertEqual(driver._servers, {})
+        self.assertFalse(os.path.exists(egg_file))
+
+    def test_persistent_setup(self):
+        logging.debug('')
+        logging.debug('test_persistent_setup')
+        driver = self.model.driver
+        driver.sequential = False
+        driver.persistent_servers = True
+        self.model._setup()
+        try:
+            driver._setup()
+            egg_file = driver._egg_file
+            self.assertTrue('driven.sleep' in driver._model_inputs)
+            self.assertFalse('driven.x' in driver._model_inputs)
+            driver._cleanup()
+            self.assertTrue(os.path.exists(egg_file))
+
+            # Unchanged configuration reuses egg, changed inputs are tracked.
+            self.model.driven.sleep = 0.1
+            driver._setup()
+            self.assertEqual(driver._egg_file, egg_file)
+            self.assertEqual(driver._input_versions, {'driven.sleep': 1})
+            driver._cleanup()
+
+            # Configuration change requires a new egg.
+            driver.add_response('driven.sleep')
+            driver._setup()
+            self.assertNotEqual(driver._egg_file, egg_file)
+            self.assertFalse(os.path.exists(egg_file))
+            self.assertEqual(driver._input_versions, {})
+            driver._cleanup()
+        finally:
+            egg_file = driver._egg_file
+            driver.release_servers()
+        self.assertFalse(os.path.exists(egg_file))
+        self.assertFalse(driver in _RETAINING)
+
+        # Retained servers are released when the model is deleted...
+        driver._setup()
+        egg_file = driver._egg_file
+        driver._cleanup()
+        self.assertTrue(driver in _RETAINING)
+        self.model.pre_delete()
+        self.assertFalse(os.path.exists(egg_file))
+        self.assertFalse(driver in _RETAINING)
+
+        # ...or at exit.
+        driver._setup()
+        egg_file = driver._egg_file
+        driver._cleanup()
+        _release_retained()
+        self.assertFalse(os.path.exists(egg_file))
+        self.assertFalse(driver in _RETAINING)
+
+    def test_apply_known(self):
+        logging.debug('')
+        logging.debug('test_apply_known')
+        driver = self.model.driver
+        driven = self.model.driven
+        self.model._setup()
+        case = _Case(0, [('driven.x', asarray([1., 2., 3., 4.])),
+                         ('driven.sleep', 0.5)], [], [])
+        known = {}
+        case.apply_inputs(self.model, driver, known)
+        self.assertEqual(list(driven.x), [1., 2., 3., 4.])
+        self.assertEqual(sorted(known.keys()), ['driven.sleep', 'driven.x'])
+
+        # Values already known aren't set again.
+        driven.x = asarray([0., 0., 0., 0.])
+        driven.sleep = 0.
+        known['driven.sleep'] = 0.25
+        case.apply_inputs(self.model, driver, known)
+        self.assertEqual(list(driven.x), [0., 0., 0., 0.])
+        self.assertEqual(driven.sleep, 0.5)
+        self.assertEqual(known['driven.sleep'], 0.5)
+
     def run_cases(self, sequential, forced_errors=False, retry=True):
         """ Evaluate cases, either sequentially or across multiple servers. """
         driver = self.model.driver
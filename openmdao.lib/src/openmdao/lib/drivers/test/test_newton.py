@@ -268,6 +268,44 @@ class Newton_SolverTestCase(unittest.TestCase):
                                self.top.d1.y_in[1],
                                1.0e-4)
 
+    def test_newton_reuse(self):
+
+        self.top.driver.atol = 1e-10
+        self.top.run()
+        full = self.top.d1.derivative_exec_count
+        y2 = self.top.d1.y2
+
+        self.top = set_as_top(Sellar_MDA())
+        self.top.driver.atol = 1e-10
+        self.top.driver.max_reuse = 5
+        self.top.driver.reuse_rate = 0.9
+        self.top.run()
+
+        assert_rel_error(self, self.top.d1.y2, y2, 1.0e-8)
+        assert_rel_error(self, self.top.d1.y2, self.top.d2.y2, 1.0e-8)
+        self.assertTrue(self.top.d1.derivative_exec_count < full)
+
+    def test_newton_eisenstat_walker(self):
+
+        self.top = set_as_top(Scalable_MDA())
+
+        self.top.d1.x = self.top.d2.x = numpy.array([[3.0], [-1.5]])
+        self.top.d1.z = self.top.d2.z = numpy.array([[-1.3], [2.45]])
+        self.top.d1.C_y = numpy.array([[1.1, 1.3], [1.05, 1.13]])
+        self.top.d2.C_y = numpy.array([[0.95, 0.98], [0.97, 0.95]])
+
+        self.top.driver.forcing = 'eisenstat_walker'
+        self.top.driver.warm_start = True
+        self.top.driver.max_iteration = 50
+        self.top.run()
+
+        assert_rel_error(self, self.top.d2.y_out[0],
+                               self.top.d1.y_in[0],
+                               1.0e-6)
+        assert_rel_error(self, self.top.d2.y_out[1],
+                               self.top.d1.y_in[1],
+                               1.0e-6)
+
     def test_general_solver(self):
 
         a = set_as_top(Assembly())
@@ -3,13 +3,18 @@ Test the genetic optimizer driver
 """
 
 
+import sys
 import unittest
 import random
 
+from nose import SkipTest
+
 from openmdao.main.datatypes.api import Float, Array, Enum, Int, Str
 from pyevolve import Selectors
 
 from openmdao.main.api import Assembly, Component, set_as_top, Driver
+from openmdao.lib.casehandlers.api import ListCaseRecorder
+from openmdao.lib.drivers import genetic
 from openmdao.lib.drivers.genetic import Genetic
 
 # pylint: disable-msg=E1101
@@ -267,6 +272,98 @@ class TestCase(unittest.TestCase):
         else:
             self.fail("ValueError expected")
 
+    def test_cache_fitness(self):
+        self.top.add('comp', SphereFunction())
+        self.top.driver.workflow.add('comp')
+        self.top.driver.add_objective("comp.total")
+
+        self.top.driver.add_parameter('comp.y')
+        self.top.driver.add_parameter('comp.z', high=5, low=-5)
+
+        self.top.driver.generations = 5
+        self.top.driver.population_size = 20
+        self.top.driver.cache_fitness = False
+        self.top.run()
+        uncached = self.top.comp.exec_count
+        best = [x for x in self.top.driver.best_individual]
+
+        # Only 77 distinct chromosomes exist, so most are evaluated once.
+        self.top.comp.exec_count = 0
+        self.top.driver.cache_fitness = True
+        self.top.run()
+        self.assertTrue(self.top.comp.exec_count < uncached)
+        self.assertTrue(self.top.comp.exec_count <= 78)
+        self.assertEqual([x for x in self.top.driver.best_individual], best)
+
+    def test_workers(self):
+        if sys.platform == 'win32':
+            raise SkipTest('Workers require fork()')
+
+        self.top.add('comp', SphereFunction())
+        self.top.driver.workflow.add('comp')
+        self.top.driver.add_objective("comp.total")
+
+        self.top.driver.add_parameter('comp.x')
+        self.top.driver.add_parameter('comp.y')
+        self.top.driver.add_parameter('comp.z')
+
+        self.top.driver.mutation_rate = .02
+        self.top.driver.generations = 3
+        self.top.run()
+        best = [x for x in self.top.driver.best_individual]
+        score = self.top.driver.best_individual.score
+
+        # Evaluation order doesn't affect the search, and one pool of
+        # workers evaluates every generation.
+        pools = []
+
+        class CountedPool(genetic.WorkerPool):
+            def __init__(self, *args):
+                super(CountedPool, self).__init__(*args)
+                pools.append(self)
+
+        self.top.driver.n_workers = 3
+        self.top.comp.exec_count = 0
+        saved = genetic.WorkerPool
+        genetic.WorkerPool = CountedPool
+        try:
+            self.top.run()
+        finally:
+            genetic.WorkerPool = saved
+        self.assertEqual(len(pools), 1)
+        self.assertEqual(pools[0]._pool, None)
+        self.assertEqual([x for x in self.top.driver.best_individual], best)
+        self.assertAlmostEqual(self.top.driver.best_individual.score, score)
+
+        # Only the final run of the best individual happens here.
+        self.assertEqual(self.top.comp.exec_count, 1)
+        self.assertEqual(self.top.comp.total, score)
+
+    def test_workers_async_recording(self):
+        if sys.platform == 'win32':
+            raise SkipTest('Workers require fork()')
+
+        self.top.add('comp', SphereFunction())
+        self.top.driver.workflow.add('comp')
+        self.top.driver.add_objective("comp.total")
+
+        self.top.driver.add_parameter('comp.x')
+        self.top.driver.add_parameter('comp.y')
+        self.top.driver.add_parameter('comp.z')
+
+        # Workers must not block on the parent's recording queue.
+        self.top.driver.generations = 3
+        self.top.driver.n_workers = 2
+        self.top.recording_options.asynchronous = True
+        self.top.recording_options.queue_size = 2
+        recorder = ListCaseRecorder()
+        self.top.recorders = [recorder]
+        self.top.run()
+        self.assertEqual(self.top._rec_queue, None)
+
+        # Only the final run of the best individual is recorded here.
+        self.assertEqual(len(recorder), 1)
+
     def test_initial_run(self):
 
         from openmdao.main.interfaces import IHasParameters, implements
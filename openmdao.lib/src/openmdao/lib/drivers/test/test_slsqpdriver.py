@@ -122,6 +122,25 @@ class SLSPQdriverTestCase(unittest.TestCase):
         self.assertEqual(self.top.comp.result,
                          end_case.get_output('_pseudo_0'))
 
+    def test_eval_cache(self):
+        self.top.driver.add_objective('comp.result')
+        self.top.driver.add_parameter('comp.x')
+        self.top.driver.add_constraint('comp.g < 0')
+        self.top.driver.eval_cache_size = 10
+
+        self.top.run()
+
+        # pylint: disable=E1101
+        self.assertAlmostEqual(self.top.comp.opt_objective,
+                               self.top.driver.eval_objective(), places=2)
+        for i in range(4):
+            self.assertAlmostEqual(self.top.comp.opt_design_vars[i],
+                                   self.top.comp.x[i], places=1)
+
+        stats = self.top.driver.eval_cache.stats()
+        self.assertTrue(stats['misses'] > 0)
+        self.assertTrue(stats['size'] <= 10)
+
     def test_max_iter(self):
         self.top.driver.add_objective('comp.result')
         map(self.top.driver.add_parameter,
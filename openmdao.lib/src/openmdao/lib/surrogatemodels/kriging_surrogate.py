@@ -1,11 +1,10 @@
 """ Surrogate model based on Kriging. """
-from math import log, e, sqrt
-
 # pylint: disable-msg=E0611,F0401
 from numpy import array, zeros, dot, ones, eye, abs, vstack, exp, \
-                  sum, log10
-from numpy.linalg import det, linalg, lstsq
-from scipy.linalg import cho_factor, cho_solve
+                  sum, log10, newaxis, maximum, column_stack, outer, \
+                  diag_indices, log, sqrt, hstack, tril, triu, subtract
+from numpy.linalg import det, linalg, lstsq, pinv
+from scipy.linalg import cho_factor, cho_solve, cholesky, solve_triangular
 from scipy.optimize import minimize
 
 from openmdao.main.api import Container
@@ -26,6 +25,7 @@ class KrigingSurrogate(Container):
         self.n = None       # number of training points
         self.thetas = None
         self.nugget = 0     # nugget smoothing parameter from [Sasena, 2002]
+        self.refit_threshold = 3.0  # in sigmas, for update()
 
         self.R = None
         self.R_fact = None
@@ -41,55 +41,97 @@ class KrigingSurrogate(Container):
         """Calculates a predicted value of the response based on the current
         trained model for the supplied list of inputs.
         """
+        f, RMSE = KrigingSurrogate.predict_many(self,
+                                                array(new_x).reshape(1, -1))
+        return NormalDistribution(f[0], RMSE[0])
+
+    def predict_many(self, new_X):
+        """Calculates the predicted values and their root mean squared
+        errors for each row of the 2D array `new_X` in one pass. Returns a
+        tuple of two 1D arrays, (mu, RMSE).
+        """
         if self.m is None:  # untrained surrogate
             raise RuntimeError("KrigingSurrogate has not been trained, so no "
                                "prediction can be made")
-        r = zeros(self.n)
-        X, Y = self.X, self.Y
+
+        X, Y = array(self.X), array(self.Y)
+        new_X = array(new_X, ndmin=2)
         thetas = 10.**self.thetas
-        XX = array(X)
-        new_x = array(new_x)
-        for i in range(self.n):
-            r[i] = sum(thetas*(XX[i] - new_x)**2.)
-        r = exp(-r)
+
+        # Weighted squared distances from each new point to each training
+        # point, without forming the (points x n x m) difference array.
+        Xw, new_Xw = X*sqrt(thetas), new_X*sqrt(thetas)
+        dist = (new_Xw**2).sum(1)[:, newaxis] + (Xw**2).sum(1) - \
+               2.0*dot(new_Xw, Xw.T)
+        r = exp(-maximum(dist, 0.))
 
         one = ones(self.n)
+        rhs = column_stack([Y-dot(one, self.mu), one, r.T])
         if self.R_fact is not None:
             #---CHOLESKY DECOMPOSTION ---
-            #f = self.mu+dot(r,cho_solve(self.R_fact,Y-dot(one,self.mu)))
-            #term1 = dot(r,cho_solve(self.R_fact,r))
-            #term2 = (1.0-dot(one,cho_solve(self.R_fact,r)))**2./dot(one,cho_solve(self.R_fact,one))
-
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-            R_fact = (self.R_fact[0].T, not self.R_fact[1])
-            cho = cho_solve(R_fact, rhs).T
-
-            f = self.mu + dot(r, cho[0])
-            term1 = dot(r, cho[1])
-            term2 = (1.0 - dot(one, cho[1]))**2./dot(one, cho[2])
-
+            sol = cho_solve(self.R_fact, rhs)
         else:
             #-----LSTSQ-------
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-            lsq = lstsq(self.R.T, rhs)[0].T
-
-            f = self.mu + dot(r, lsq[0])
-            term1 = dot(r, lsq[1])
-            term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-            """
-      #-----LSTSQ-------
-      rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-      lsq = lstsq(self.R.T, rhs)[0].T
-
-      f = self.mu + dot(r, lsq[0])
-      term1 = dot(r, lsq[1])
-      term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-      """
+            sol = lstsq(self.R.T, rhs)[0]
+
+        f = self.mu + dot(r, sol[:, 0])
+        term1 = (r.T*sol[:, 2:]).sum(0)
+        term2 = (1.0 - sol[:, 2:].sum(0))**2./sum(sol[:, 1])
+
         MSE = self.sig2*(1.0 - term1 + term2)
         RMSE = sqrt(abs(MSE))
 
-        dist = NormalDistribution(f, RMSE)
-        return dist
+        return f, RMSE
+
+    def update(self, X, Y):
+        """Adds new training points to an already trained model. The thetas
+        are kept and the Cholesky factor of R is extended with the new rows,
+        which is O(n^2) rather than the O(n^3) of a full factorization.
+        If any of the new points is predicted worse than refit_threshold
+        standard deviations by the current model, the thetas have drifted
+        and the model is retrained from scratch, as it is when R can't be
+        Cholesky factored."""
+
+        X_new = array(X, dtype=float, ndmin=2)
+        Y_new = array(Y, dtype=float)
+        X_all = vstack([self.X, X_new])
+        Y_all = hstack([self.Y, Y_new])
+
+        if self.R_fact is None:
+            return self.train(X_all, Y_all)
+
+        mu, RMSE = KrigingSurrogate.predict_many(self, X_new)
+        if (abs(Y_new - mu) > self.refit_threshold*RMSE).any():
+            return self.train(X_all, Y_all)
+
+        n, k = self.n, len(X_new)
+
+        R = zeros((n+k, n+k))
+        R[:n, :n] = self.R
+        R[:, n:] = exp(-self._weighted_distances(X_all, X_new)) * \
+                   (1.0 - self.nugget)
+        R[n:, :n] = R[:n, n:].T
+        R[diag_indices(n+k)] = 1.0
+
+        # Extend the upper triangular factor U, where R = U^T U.
+        fact, lower = self.R_fact
+        U11 = tril(fact).T if lower else triu(fact)
+        try:
+            U12 = solve_triangular(U11, R[:n, n:], trans='T')
+            U22 = cholesky(R[n:, n:] - dot(U12.T, U12))
+        except (linalg.LinAlgError, ValueError):
+            return self.train(X_all, Y_all)
+
+        U = zeros((n+k, n+k))
+        U[:n, :n] = U11
+        U[:n, n:] = U12
+        U[n:, n:] = U22
+
+        self.X, self.Y = X_all, Y_all
+        self.n = n + k
+        self.R = R
+        self.R_fact = (U, False)
+        self._calculate_cholesky_log_likelihood()
 
     def train(self, X, Y):
         """Train the surrogate model with the given set of inputs and outputs."""
@@ -103,79 +145,106 @@ class KrigingSurrogate(Container):
                 self.Y.append(out)
             else: "duplicate training point" """
 
-        self.X = X
-        self.Y = Y
+        self.X = array(X, dtype=float)
+        self.Y = array(Y, dtype=float)
         self.m = len(X[0])
         self.n = len(X)
 
         thetas = zeros(self.m)
-        #print "initial guess", thetas
 
         def _calcll(thetas):
             ''' Callback function'''
             self.thetas = thetas
             self._calculate_log_likelihood()
-            return -self.log_likelihood
-
-        #if self.thetas == None:
-        #self.thetas = fmin(_calcll, thetas, disp=False, ftol=0.0001)
-        def lowerBound(log10t):
-            return log10t - log10(self.thetas)
+            return -self.log_likelihood, \
+                   -self._calculate_log_likelihood_gradient()
 
-        def upperBound(log10t):
-            return log10(self.thetas) - log10t
+        bounds = [(log10(1e-2), log10(3))]*self.m
+        self.thetas = minimize(_calcll, thetas, method='L-BFGS-B', jac=True,
+                               bounds=bounds, tol=1e-8).x
+        self._calculate_log_likelihood()
 
-        cons = []
-        for i in xrange(self.m):
-            cons.append({'type': 'ineq', 'fun': lambda log10t: log10t[i] - log10(1e-2)})  # min
-            cons.append({'type': 'ineq', 'fun': lambda log10t: log10(3) - log10t[i]})     # max
+    def _weighted_distances(self, A, B):
+        """Returns the matrix of theta-weighted squared distances between
+        the rows of A and the rows of B. It is accumulated one dimension at
+        a time, so nothing larger than len(A) x len(B) is ever stored."""
 
-        self.thetas = minimize(_calcll, thetas, method='COBYLA', constraints=cons, tol=1e-8).x
-        #print self.thetas
-        self._calculate_log_likelihood()
+        thetas = 10.**self.thetas
+        dist = zeros((len(A), len(B)))
+        for k in xrange(self.m):
+            dist += thetas[k]*subtract.outer(A[:, k], B[:, k])**2
+        return dist
 
     def _calculate_log_likelihood(self):
         #if self.m == None:
         #    Give error message
-        R = zeros((self.n, self.n))
-        X, Y = array(self.X), array(self.Y)
-        thetas = 10.**self.thetas
+        Y = array(self.Y)
 
         #weighted distance formula
-        for i in range(self.n):
-            R[i, i+1:self.n] = e**(-sum(thetas*(X[i] - X[i+1:self.n])**2., 1))
-
-        R = R*(1.0 - self.nugget)
-        R = R + R.T + eye(self.n)
+        R = exp(-self._weighted_distances(self.X, self.X))*(1.0 - self.nugget)
+        R[diag_indices(self.n)] = 1.0
         self.R = R
 
         one = ones(self.n)
         try:
             self.R_fact = cho_factor(R)
-            rhs = vstack([Y, one]).T
-            R_fact = (self.R_fact[0].T, not self.R_fact[1])
-            cho = cho_solve(R_fact, rhs).T
-
-            self.mu = dot(one, cho[0])/dot(one, cho[1])
-            ymdotone = Y - dot(one, self.mu)
-            self.sig2 = dot(ymdotone, cho_solve(self.R_fact,
-                                                (ymdotone)))/self.n
-            #self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log(abs(det(self.R)+1.e-16))-sum(thetas)
-            self.log_likelihood = -self.n/2.*log(self.sig2) - \
-                                  1./2.*log(abs(det(self.R) + 1.e-16))
+            self._calculate_cholesky_log_likelihood()
 
         except (linalg.LinAlgError, ValueError):
             #------LSTSQ---------
             self.R_fact = None  # reset this to none, so we know not to use cholesky
             # self.R = self.R+diag([10e-6]*self.n)  # improve conditioning[Booker et al., 1999]
+            # R is symmetric, so one least squares solve covers both terms.
             rhs = vstack([Y, one]).T
-            lsq = lstsq(self.R.T, rhs)[0].T
+            lsq = lstsq(self.R, rhs)[0].T
             self.mu = dot(one, lsq[0])/dot(one, lsq[1])
             ymdotone = Y - dot(one, self.mu)
-            self.sig2 = dot(ymdotone, lstsq(self.R, ymdotone)[0])/self.n
+            self.sig2 = dot(ymdotone, lsq[0] - self.mu*lsq[1])/self.n
             self.log_likelihood = -self.n/2.*log(self.sig2) - \
                                    1./2.*log(abs(det(self.R) + 1.e-16))
-            #print self.log_likelihood
+
+    def _calculate_cholesky_log_likelihood(self):
+        """Calculates mu, sig2 and the log likelihood from the current
+        Cholesky factor of R."""
+
+        Y = array(self.Y)
+        one = ones(self.n)
+        rhs = vstack([Y, one]).T
+        cho = cho_solve(self.R_fact, rhs).T
+
+        self.mu = dot(one, cho[0])/dot(one, cho[1])
+        ymdotone = Y - dot(one, self.mu)
+        self.sig2 = dot(ymdotone, cho_solve(self.R_fact,
+                                            (ymdotone)))/self.n
+        self.log_likelihood = -self.n/2.*log(self.sig2) - \
+                              1./2.*log(abs(det(self.R) + 1.e-16))
+
+
+    def _calculate_log_likelihood_gradient(self):
+        """Returns the gradient of the log likelihood with respect to the
+        log10 of the thetas, for the R last computed by
+        _calculate_log_likelihood."""
+
+        Y = array(self.Y)
+        ymdotone = Y - self.mu
+        if self.R_fact is not None:
+            Rinv = cho_solve(self.R_fact, eye(self.n))
+        else:
+            Rinv = pinv(self.R)
+        alpha = dot(Rinv, ymdotone)
+
+        # mu and sig2 are at their optimum, so only R's derivative counts.
+        # The log determinant term includes the same 1e-16 as the log
+        # likelihood, and dR/dlog10(theta_k) = -ln(10)*theta_k*dist_k*R.
+        detR = det(self.R)
+        W = outer(alpha, alpha)/self.sig2 - Rinv*detR/(detR + 1.e-16)
+        W *= self.R
+        thetas = 10.**self.thetas
+        X = array(self.X)
+        grad = zeros(self.m)
+        for k in xrange(self.m):
+            grad[k] = sum(W*subtract.outer(X[:, k], X[:, k])**2)
+        return -0.5*log(10.)*thetas*grad
 
 
 class FloatKrigingSurrogate(KrigingSurrogate):
@@ -186,6 +255,11 @@ class FloatKrigingSurrogate(KrigingSurrogate):
         dist = super(FloatKrigingSurrogate, self).predict(new_x)
         return dist.mu
 
+    def predict_many(self, new_X):
+        """Returns an array of the predicted values for each row of
+        `new_X`."""
+        return KrigingSurrogate.predict_many(self, new_X)[0]
+
     def get_uncertain_value(self, value):
         """Returns a float"""
         return float(value)
@@ -65,8 +65,96 @@ class KrigingSurrogateTests(unittest.TestCase):
 
         pred = krig1.predict([5., 5.])
 
-        self.assertAlmostEqual(5.79, pred.sigma, places=0)
-        self.assertAlmostEqual(25.34, pred.mu, places=1)
+        # Both thetas are within their bounds at the maximum likelihood.
+        self.assertTrue((krig1.thetas >= -2.).all())
+        self.assertAlmostEqual(14.51, pred.sigma, places=0)
+        self.assertAlmostEqual(18.76, pred.mu, places=1)
+
+    def test_predict_many(self):
+        x = array([[-2., 0.], [-0.5, 1.5], [1., 3.], [8.5, 4.5], [-3.5, 6.],
+                   [4., 7.5], [-5., 9.], [5.5, 10.5], [10., 12.]])
+        y = array([sin(case[0])*cos(case[1]) for case in x])
+
+        krig1 = KrigingSurrogate()
+        krig1.train(x, y)
+
+        new_x = array([[-2., 0.], [5., 5.], [1.5, -3.], [7., 13.5]])
+        mu, rmse = krig1.predict_many(new_x)
+        for i, case in enumerate(new_x):
+            pred = krig1.predict(case)
+            self.assertAlmostEqual(pred.mu, mu[i], places=10)
+            self.assertAlmostEqual(pred.sigma, rmse[i], places=10)
+
+        self.assertAlmostEqual(y[0], mu[0], places=6)
+
+    def test_log_likelihood_gradient(self):
+        x = array([[0.05, 0.3], [.25, 0.1], [0.61, 0.9], [0.95, 0.4],
+                   [0.4, 0.6]])
+        y = array([0.7385, -0.2104, -0.4890, 12.3033, 1.5])
+
+        krig1 = KrigingSurrogate()
+        krig1.train(x, y)
+        krig1.thetas = array([-0.5, 0.2])
+        krig1._calculate_log_likelihood()
+        grad = krig1._calculate_log_likelihood_gradient()
+
+        step = 1e-6
+        for i in range(2):
+            thetas = krig1.thetas.copy()
+            thetas[i] += step
+            krig1.thetas = thetas
+            krig1._calculate_log_likelihood()
+            ll_plus = krig1.log_likelihood
+            thetas[i] -= 2*step
+            krig1.thetas = thetas
+            krig1._calculate_log_likelihood()
+            ll_minus = krig1.log_likelihood
+            thetas[i] += step
+
+            self.assertAlmostEqual(grad[i], (ll_plus - ll_minus)/(2*step),
+                                   places=5)
+
+    def test_update(self):
+        x = array([[0.05, 0.3], [.25, 0.1], [0.61, 0.9], [0.95, 0.4],
+                   [0.4, 0.6], [0.8, 0.8], [0.1, 0.9]])
+        y = array([sin(3*a)*cos(2*b) for a, b in x])
+
+        krig1 = KrigingSurrogate()
+        krig1.refit_threshold = float('inf')
+        krig1.train(x[:4], y[:4])
+        thetas = krig1.thetas.copy()
+        krig1.update(x[4:], y[4:])
+
+        # Same thetas, full factorization.
+        krig2 = KrigingSurrogate()
+        krig2.train(x, y)
+        krig2.thetas = thetas
+        krig2._calculate_log_likelihood()
+
+        self.assertEqual(krig1.n, 7)
+        self.assertTrue((krig1.thetas == thetas).all())
+        self.assertAlmostEqual(krig1.mu, krig2.mu, places=10)
+        self.assertAlmostEqual(krig1.sig2, krig2.sig2, places=10)
+        self.assertAlmostEqual(krig1.log_likelihood, krig2.log_likelihood,
+                               places=8)
+        pred1 = krig1.predict([0.5, 0.5])
+        pred2 = krig2.predict([0.5, 0.5])
+        self.assertAlmostEqual(pred1.mu, pred2.mu, places=10)
+        self.assertAlmostEqual(pred1.sigma, pred2.sigma, places=8)
+
+        # A new point far from the prediction forces a refit.
+        trained = []
+        train = krig1.train
+        def _train(X, Y):
+            trained.append(len(X))
+            train(X, Y)
+        krig1.train = _train
+        krig1.refit_threshold = 3.0
+        krig1.update([[0.3, 0.3]], [sin(.9)*cos(.6)])
+        self.assertEqual(trained, [])
+        krig1.update([[0.5, 0.5]], [pred1.mu + 100.*pred1.sigma])
+        self.assertEqual(trained, [9])
+        self.assertEqual(krig1.n, 9)
 
     def test_get_uncertain_value(self):
         x = array([[0.05], [.25], [0.61], [0.95]])
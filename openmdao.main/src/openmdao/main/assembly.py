@@ -12,6 +12,7 @@ import traceback
 from itertools import chain
 
 from numpy import ndarray
+from ordereddict import OrderedDict
 
 # pylint: disable=E0611,F0401
 import networkx as nx
@@ -27,7 +28,7 @@ from openmdao.main.container import _copydict
 from openmdao.main.component import Component, Container
 from openmdao.main.variable import Variable
 from openmdao.main.vartree import VariableTree
-from openmdao.main.datatypes.api import List, Slot, Bool, VarTree
+from openmdao.main.datatypes.api import List, Slot, Bool, Int, VarTree
 from openmdao.main.driver import Driver
 from openmdao.main.rbac import rbac
 from openmdao.main.mp_support import is_instance
@@ -35,6 +36,7 @@ from openmdao.main.printexpr import eliminate_expr_ws
 from openmdao.main.expreval import ExprEvaluator
 from openmdao.main.exprmapper import ExprMapper
 from openmdao.main.pseudocomp import PseudoComponent, UnitConversionPComp
+from openmdao.main.recordqueue import RecordingQueue
 from openmdao.main.array_helpers import is_differentiable_var, get_val_and_index, \
                                         get_flattened_index, \
                                         get_var_shape, flattened_size
@@ -42,7 +44,8 @@ from openmdao.main.depgraph import DependencyGraph, all_comps, \
                                    list_driver_connections, \
                                    simple_node_iter, \
                                    is_boundary_node
-from openmdao.main.systems import SerialSystem, _create_simple_sys
+from openmdao.main.systems import SerialSystem, _create_simple_sys, \
+                                  close_worker_pools
 
 from openmdao.util.graph import list_deriv_vars, base_var, fix_single_tuple
 from openmdao.util.log import logger
@@ -57,6 +60,16 @@ _iodict = {'out': 'output', 'in': 'input'}
 
 _missing = object()
 
+# Attributes set by Assembly._setup() on the objects in the model tree.
+_ASM_SETUP_ATTRS = ('_var_meta', '_setup_depgraph', '_reduced_graph',
+                    'name2collapsed', '_system', '_derivs_required',
+                    '_provideJ_bounds')
+_DRV_SETUP_ATTRS = ('_reduced_graph', '_system')
+_WFLOW_SETUP_ATTRS = ('_reduced_graph', '_system', '_cycle_vars')
+
+# Number of setups kept by Assembly._setup().
+_SETUP_CACHE_SIZE = 4
+
 __has_top__ = False
 __toplock__ = threading.RLock()
 
@@ -126,6 +139,15 @@ class RecordingOptions(VariableTree):
     excludes = List([], desc='Patterns for variables to exclude from recording '
                              '(processed after includes')
 
+    asynchronous = Bool(False, desc='If True, recorded values are copied and '
+                                    'passed to the recorders by a background '
+                                    'thread, so the run only waits for '
+                                    'recorders when the queue is full or '
+                                    'at the end of the run.')
+
+    queue_size = Int(100, low=1, desc='Maximum number of cases waiting to be '
+                                      'recorded when asynchronous.')
+
 
 class Assembly(Component):
     """This is a container of Components. It understands how to connect inputs
@@ -165,6 +187,12 @@ class Assembly(Component):
         self._reduced_graph = nx.DiGraph()
         self._setup_depgraph = None
 
+        # previous setups keyed by gradient inputs/outputs, most recent last
+        self._setup_cache = OrderedDict()
+
+        # passes cases to recorders when recording asynchronously
+        self._rec_queue = None
+
         for name, trait in self.class_traits().items():
             if trait.iotype:  # input or output
                 self._depgraph.add_boundary_var(self, name, iotype=trait.iotype)
@@ -724,6 +752,7 @@ class Assembly(Component):
         self._pre_driver = None
         self.J_input_keys = self.J_output_keys = None
         self._system = None
+        self._setup_cache = OrderedDict()
 
     def _set_failed(self, path, value):
         parts = path.split('.', 1)
@@ -746,6 +775,9 @@ class Assembly(Component):
                 recording_options = self.recording_options
                 for recorder in self.recorders:
                     recorder.startup()
+                if recording_options.asynchronous:
+                    self._rec_queue = RecordingQueue(self.recorders,
+                                                     recording_options.queue_size)
             else:
                 recording_options = None
 
@@ -823,12 +855,19 @@ class Assembly(Component):
 
         return (inputs, constants)
 
+    @rbac(('owner', 'user'))
+    def _run_terminated(self):
+        """ Executed at end of top-level run. """
+        try:
+            super(Assembly, self)._run_terminated()
+        finally:
+            close_worker_pools(self)
+
     def record_configuration(self):
         """ record model configuration without running the model
         """
         self.configure_recording()
-        for recorder in self.recorders:
-            recorder.close()
+        self._run_terminated()
 
     @rbac(('owner', 'user'))
     def connected_inputs(self, name):
@@ -1429,38 +1468,143 @@ class Assembly(Component):
 
         self._system.vec['u'].set_from_scope(self)
 
+    def __getstate__(self):
+        """Return dict representing this container's state."""
+        state = super(Assembly, self).__getstate__()
+        state['_setup_cache'] = OrderedDict()
+        state['_rec_queue'] = None
+        return state
+
     def _setup(self, inputs=None, outputs=None):
         """This is called automatically on the top level Assembly
         prior to execution.  It will also be called if
         calc_gradient is called with input or output lists that
         differ from the lists of parameters or objectives/constraints
         that are inherent to the model.
+
+        Setups are cached by gradient inputs and outputs until the
+        configuration changes, so alternating between a few sets of
+        inputs and outputs doesn't repeat the whole setup each time.
         """
 
         if MPI:
             MPI.COMM_WORLD.Set_errhandler(MPI.ERRORS_ARE_FATAL)
             comm = MPI.COMM_WORLD
+            key = None  # setup is collective, don't try to reuse it
         else:
             comm = None
+            key = self._setup_key(inputs, outputs)
 
         self._var_meta = {}
 
         try:
             self.pre_setup()
-            self.setup_depgraph()
-            self.setup_reduced_graph(inputs=inputs, outputs=outputs)
-            self.setup_systems()
-            self.setup_communicators(comm)
-            self.setup_variables()
-            self.setup_sizes()
-            self.setup_vectors()
-            self.setup_scatters()
+            if key is not None and self._restore_setup(key):
+                key = None
+            else:
+                self.setup_depgraph()
+                self.setup_reduced_graph(inputs=inputs, outputs=outputs)
+                self.setup_systems()
+                self.setup_communicators(comm)
+                self.setup_variables()
+                self.setup_sizes()
+                self.setup_vectors()
+                self.setup_scatters()
         except Exception:
             if MPI:
                 mpiprint(traceback.format_exc())
             raise
         else:
             self.post_setup()
+            if key is not None:
+                self._save_setup(key)
+
+    def _setup_objects(self):
+        """Yield (object, attribute names) for everything in this Assembly
+        (and any sub-Assemblies) having state set by :meth:`_setup`.
+        """
+        yield self, _ASM_SETUP_ATTRS
+        for comp in self.get_comps():
+            if isinstance(comp, Assembly):
+                for obj, names in comp._setup_objects():
+                    yield obj, names
+            elif isinstance(comp, Driver):
+                yield comp, _DRV_SETUP_ATTRS
+                yield comp.workflow, _WFLOW_SETUP_ATTRS
+
+    def _setup_key(self, inputs, outputs):
+        """Return key for the setup resulting from the given gradient
+        inputs and outputs, those of the drivers in the model, and
+        which components are differentiable.
+        """
+        key = [_freeze_names(inputs), _freeze_names(outputs)]
+        for obj, names in self._setup_objects():
+            if isinstance(obj, Driver):
+                wflow = obj.workflow
+                key.append((obj.get_pathname(),
+                            _freeze_names(wflow._calc_gradient_inputs),
+                            _freeze_names(wflow._calc_gradient_outputs)))
+            elif isinstance(obj, Assembly):
+                for comp in obj.get_comps():
+                    if not has_interface(comp, IDriver):
+                        key.append((comp.get_pathname(),
+                                    comp.is_differentiable()))
+        return tuple(key)
+
+    def _save_setup(self, key):
+        """Cache the current setup under `key`."""
+        cache = getattr(self, '_setup_cache', None)
+        if cache is None:
+            cache = self._setup_cache = OrderedDict()
+        cache.pop(key, None)
+        cache[key] = [(obj, [(name, getattr(obj, name, None))
+                             for name in names])
+                      for obj, names in self._setup_objects()]
+        while len(cache) > _SETUP_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    def _restore_setup(self, key):
+        """Restore the setup cached under `key`.  Returns False if there
+        is no such setup or variable shapes have changed since then.
+        """
+        cache = getattr(self, '_setup_cache', None)
+        if not cache or key not in cache:
+            return False
+
+        saved = cache.pop(key)
+        for obj, attrs in saved:
+            if isinstance(obj, Assembly):
+                for name, meta in dict(attrs)['_var_meta'].items():
+                    if 'shape' in meta and isinstance(name, basestring):
+                        try:
+                            val, idx = get_val_and_index(obj, name)
+                        except Exception:
+                            return False
+                        if getattr(val, 'shape', ()) != meta['shape']:
+                            return False
+
+        systems = []
+        for obj, attrs in saved:
+            for name, value in attrs:
+                setattr(obj, name, value)
+                if name == '_system' and value is not None:
+                    systems.append(value)
+
+        # solvers are specific to the last gradient calculation, but the
+        # fd_coloring sparsity pattern on each system is still valid
+        seen = set()
+        while systems:
+            system = systems.pop()
+            if id(system) not in seen:
+                seen.add(id(system))
+                system.ln_solver = system.fd_solver = system.dfd_solver = None
+                systems.extend(system.all_subsystems())
+                inner = getattr(system, '_inner_system', None)
+                if inner is not None:
+                    systems.append(inner)
+
+        cache[key] = saved
+        return True
 
 
 def dump_iteration_tree(obj, f=sys.stdout, full=True, tabsize=4, derivs=False):
@@ -1499,6 +1643,13 @@ def dump_iteration_tree(obj, f=sys.stdout, full=True, tabsize=4, derivs=False):
 
     _dump_iteration_tree(obj, f, 0)
 
+def _freeze_names(names):
+    """Return hashable version of a list of (possibly grouped) names."""
+    if names is None:
+        return None
+    return frozenset([tuple(n) if isinstance(n, list) else n for n in names])
+
+
 def _get_scoped_inputs(comp, g, explicit_ins):
     """Return a list of input varnames scoped to the given name."""
     cnamedot = comp.name + '.'
@@ -4,8 +4,10 @@
 __all__ = ['Component', 'SimulationRoot']
 
 
+import cPickle
 import fnmatch
 import glob
+import hashlib
 import logging
 import os.path
 from os.path import isabs, isdir, dirname, exists, join, normpath, relpath
@@ -13,6 +15,8 @@ import pkg_resources
 import sys
 import weakref
 
+from numpy import ndarray, ascontiguousarray
+
 # pylint: disable=E0611,F0401
 from traits.trait_base import not_event
 from traits.api import Property
@@ -133,6 +137,14 @@ class Component(Container):
                      desc="Number of times this Component's derivative "
                           "function has been executed.")
 
+    skip_unchanged = Bool(False,
+                          desc='If True, execute() is skipped and the current '
+                               'outputs are kept when none of the inputs have '
+                               'changed since the last execution.')
+
+    skip_count = Int(0, desc='Number of times execution of this Component '
+                             'was skipped because its inputs were unchanged.')
+
     itername = Str('', iotype='out', desc='Iteration coordinates.', deriv_ignore=True,
                    framework_var=True)
 
@@ -168,6 +180,10 @@ class Component(Container):
         self._case_id = ''
         self._case_uuid = ''
 
+        # fingerprint of the inputs at the last execution (skip_unchanged)
+        self._input_hash = None
+        self._pending_hash = None
+
     @property
     def dir_context(self):
         """The :class:`DirectoryContext` for this component."""
@@ -513,20 +529,9 @@ class Component(Container):
         if self.parent is None:
             self._run_begins()
         try:
-            self._pre_execute()
-            self._set_exec_state('RUNNING')
-
-            #print '  execute: %s' % self.get_pathname()
-            # Component executes as normal
-            self.exec_count += 1
-            if tracing.TRACER is not None and \
-               not obj_has_interface(self, IDriver, IAssembly):
-                tracing.TRACER.debug(self.get_itername())
-                #tracing.TRACER.debug(self.get_itername() + '  ' + self.name)
-
-            self.execute()
-            self._post_execute()
-            self._post_run()
+            if self._run_prologue():
+                self.execute()
+                self._run_epilogue()
 
         except Exception:
             info = sys.exc_info()
@@ -539,6 +544,41 @@ class Component(Container):
             if self.directory:
                 self.pop_dir()
 
+    def _run_prologue(self):
+        """Bookkeeping done by run() before execute(). Returns False if
+        execute() should be skipped because the inputs are unchanged.
+        """
+        self._pre_execute()
+
+        if self.skip_unchanged and \
+           not obj_has_interface(self, IDriver, IAssembly):
+            input_hash = self._get_input_hash()
+            if input_hash is not None and input_hash == self._input_hash:
+                self.skip_count += 1
+                self._post_run()
+                return False
+        else:
+            input_hash = None
+        self._input_hash = None
+        self._pending_hash = input_hash
+
+        self._set_exec_state('RUNNING')
+
+        #print '  execute: %s' % self.get_pathname()
+        # Component executes as normal
+        self.exec_count += 1
+        if tracing.TRACER is not None and \
+           not obj_has_interface(self, IDriver, IAssembly):
+            tracing.TRACER.debug(self.get_itername())
+            #tracing.TRACER.debug(self.get_itername() + '  ' + self.name)
+        return True
+
+    def _run_epilogue(self):
+        """Bookkeeping done by run() after a successful execute()."""
+        self._post_execute()
+        self._input_hash = self._pending_hash
+        self._post_run()
+
     @rbac(('owner', 'user'))
     def _run_begins(self):
         """ Executed at start of top-level run. """
@@ -549,8 +589,17 @@ class Component(Container):
     def _run_terminated(self):
         """ Executed at end of top-level run. """
         if hasattr(self, 'recorders'):
-            for recorder in self.recorders:
-                recorder.close()
+            queue = getattr(self, '_rec_queue', None)
+            if queue is not None:
+                self._rec_queue = None
+                try:
+                    queue.close()
+                finally:
+                    for recorder in self.recorders:
+                        recorder.close()
+            else:
+                for recorder in self.recorders:
+                    recorder.close()
 
     def add(self, name, obj):
         """Override of base class version to force call to *check_config*
@@ -645,6 +694,20 @@ class Component(Container):
         self._container_names = None
         self._new_config = True
         self._provideJ_bounds = None
+        self._input_hash = None
+
+    def _get_input_hash(self):
+        """Return a fingerprint of the current values of our inputs (and
+        states, for implicit components), or None if some value can't be
+        fingerprinted.
+        """
+        names = self.list_inputs()
+        if hasattr(self, 'list_states'):
+            names.extend(self.list_states())
+        try:
+            return tuple([_fingerprint(getattr(self, name)) for name in names])
+        except Exception:
+            return None
 
     @rbac(('owner', 'user'))
     def list_inputs(self):
@@ -1404,3 +1467,20 @@ class Component(Container):
     @rbac(('owner', 'user'))
     def post_setup(self):
         pass
+
+
+def _fingerprint(val):
+    """Return a cheap, comparable fingerprint of the given value.
+    Arrays and unhashable values are reduced to a digest of their contents.
+    """
+    if isinstance(val, ndarray) and not val.dtype.hasobject:
+        return (val.dtype.str, val.shape,
+                hashlib.sha1(ascontiguousarray(val)).digest())
+    elif isinstance(val, VariableTree):
+        return tuple([(name, _fingerprint(getattr(val, name)))
+                           for name in sorted(val.list_vars())])
+    try:
+        hash(val)
+    except TypeError:
+        return hashlib.sha1(cPickle.dumps(val, -1)).digest()
+    return val
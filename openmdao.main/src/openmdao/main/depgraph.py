@@ -229,6 +229,7 @@ class DependencyGraph(DGraphBase):
     def config_changed(self):
         if self._allow_config_changed:
             self._component_graph = None
+            self._comp_conns = None
             self._loops = None
             self._saved_loops = None
             self._saved_comp_graph = None
@@ -242,6 +243,98 @@ class DependencyGraph(DGraphBase):
             self._indegs = {}
             self._dstvars = {}
 
+    # The following methods update the component graph in place when
+    # a single connection is added or removed instead of throwing it
+    # away and rebuilding it from scratch on the next request. This is
+    # only a partial answer to incremental maintenance: the collapsed
+    # graph, its strongly connected components and the System partitions
+    # built from it are still rebuilt in full on the next setup.
+
+    def add_node(self, n, attr_dict=None, **attr):
+        saved = None
+        if not ('comp' in attr or (attr_dict is not None and
+                                   'comp' in attr_dict) or
+                is_comp_node(self, n)):
+            saved = self._save_comp_graph()
+        super(DependencyGraph, self).add_node(n, attr_dict=attr_dict,
+                                              **attr)
+        if saved is not None:
+            self._restore_comp_graph(saved)
+
+    def add_edge(self, u, v, attr_dict=None, **attr):
+        newconn = 'conn' in attr or (attr_dict is not None and
+                                     'conn' in attr_dict)
+        if newconn and self.has_edge(u, v):
+            newconn = 'conn' not in self.edge[u][v]
+        saved = self._save_comp_graph()
+        super(DependencyGraph, self).add_edge(u, v, attr_dict=attr_dict,
+                                              **attr)
+        if saved is not None:
+            self._restore_comp_graph(saved, added=[(u, v)] if newconn else ())
+
+    def remove_edge(self, u, v):
+        conns = [(u, v)] if is_connection(self, u, v) else []
+        saved = self._save_comp_graph()
+        super(DependencyGraph, self).remove_edge(u, v)
+        if saved is not None:
+            self._restore_comp_graph(saved, removed=conns)
+
+    def remove_edges_from(self, ebunch):
+        ebunch = list(ebunch)
+        conns = set([(e[0], e[1]) for e in ebunch
+                                 if is_connection(self, e[0], e[1])])
+        saved = self._save_comp_graph()
+        super(DependencyGraph, self).remove_edges_from(ebunch)
+        if saved is not None:
+            self._restore_comp_graph(saved, removed=conns)
+
+    def remove_node(self, n):
+        if is_comp_node(self, n):
+            conns = None
+        else:
+            conns = [(u, n) for u in self.pred.get(n, ())
+                                   if 'conn' in self.edge[u][n]]
+            conns.extend([(n, v) for v in self.succ.get(n, ())
+                                   if 'conn' in self.edge[n][v]])
+        saved = self._save_comp_graph()
+        super(DependencyGraph, self).remove_node(n)
+        if saved is not None and conns is not None:
+            self._restore_comp_graph(saved, removed=conns)
+
+    def _save_comp_graph(self):
+        """Return the current component graph and its connection counts
+        if they can be updated in place, else None. Only the component
+        graph is kept; derived structures (CollapsedGraph, System
+        partitions) are still rebuilt from scratch.
+        """
+        if self._allow_config_changed and self._comp_conns is not None:
+            return (self._component_graph, self._comp_conns)
+        return None
+
+    def _restore_comp_graph(self, saved, added=(), removed=()):
+        """Reinstall a saved component graph after applying the
+        given added and removed connections to it.
+        """
+        cgraph, counts = saved
+        for src, dest in added:
+            srccomp = src.split('.', 1)[0]
+            destcomp = dest.split('.', 1)[0]
+            if srccomp in cgraph and destcomp in cgraph:
+                key = (srccomp, destcomp)
+                counts[key] = counts.get(key, 0) + 1
+                cgraph.add_edge(srccomp, destcomp)
+
+        for src, dest in removed:
+            key = (src.split('.', 1)[0], dest.split('.', 1)[0])
+            if key in counts:
+                counts[key] -= 1
+                if counts[key] == 0:
+                    del counts[key]
+                    cgraph.remove_edge(*key)
+
+        self._component_graph = cgraph
+        self._comp_conns = counts
+
     def child_config_changed(self, child, adding=True, removing=True):
         """A child has changed its input lists and/or output lists,
         so we need to update the graph.
@@ -719,6 +812,7 @@ class DependencyGraph(DGraphBase):
             compset = set(all_comps(self))
 
             g = nx.DiGraph()
+            counts = {}
 
             for comp in compset:
                 g.add_node(comp, self.node[comp].copy())
@@ -729,8 +823,11 @@ class DependencyGraph(DGraphBase):
 
                 if srccomp in compset and destcomp in compset:
                     g.add_edge(srccomp, destcomp)
+                    key = (srccomp, destcomp)
+                    counts[key] = counts.get(key, 0) + 1
 
             self._component_graph = g
+            self._comp_conns = counts
 
         return self._component_graph
 
@@ -1179,9 +1276,10 @@ class CollapsedGraph(DGraphBase):
         """
         compset = set(compnodes)
         vnodes = set()
-        edges = self.edges()
-        vnodes.update([u for u,v in edges if v in compset])
-        vnodes.update([v for u,v in edges if u in compset])
+        for comp in compset:
+            if comp in self:
+                vnodes.update(self.pred[comp])
+                vnodes.update(self.succ[comp])
         return self.subgraph(vnodes.union(compset))
 
     def component_graph(self):
@@ -1610,9 +1708,14 @@ def get_edge_boundary(g, nodes):
     where in_edges and out_edges are boundary
     edges between the nodes and the rest of the full graph.
     """
-    others = set(g.nodes_iter()).difference(nodes)
-    out_edges = nx.edge_boundary(g, nodes)
-    in_edges = nx.edge_boundary(g, others)
+    # only look at the neighbors of the given nodes so the cost is
+    # proportional to the size of the boundary rather than the size
+    # of the whole graph
+    nset = set(n for n in nodes if n in g)
+    pred = g.pred
+    succ = g.succ
+    in_edges = [(u, v) for v in nset for u in pred[v] if u not in nset]
+    out_edges = [(u, v) for u in nset for v in succ[u] if v not in nset]
 
     return in_edges, out_edges
 
@@ -1675,9 +1778,10 @@ def gsort(g, names):
     nset = set(names)
     final = list(names)
     ups = {}
+    reachable = _reachable_from(g, nset)
 
     for name in names:
-        downs = [v for u,v in nx.dfs_edges(g, name) if v in nset]
+        downs = reachable.get(name, empty)
         for d in downs:
             if d not in ups.get(name, empty):  # handle cycles
                 ups.setdefault(d, set()).add(name)
@@ -1700,6 +1804,42 @@ def gsort(g, names):
 
     return final
 
+def _reachable_from(g, nset):
+    """Return a dict mapping each node in nset to the set of other
+    nodes in nset that can be reached from it in g.  Reachability is
+    computed once over the condensation of g rather than doing a
+    separate depth first search from each node.
+    """
+    sccs = strongly_connected_components(g)
+    mapping = {}
+    for i, scc in enumerate(sccs):
+        for n in scc:
+            mapping[n] = i
+
+    cgraph = nx.DiGraph()
+    cgraph.add_nodes_from(range(len(sccs)))
+    for u, v in g.edges_iter():
+        if mapping[u] != mapping[v]:
+            cgraph.add_edge(mapping[u], mapping[v])
+
+    reach = {}
+    for i in reversed(nx.topological_sort(cgraph)):
+        r = set(n for n in sccs[i] if n in nset)
+        for j in cgraph.succ[i]:
+            r.update(reach[j])
+        reach[i] = r
+
+    result = {}
+    for name in nset:
+        if name in mapping:
+            downs = reach[mapping[name]]
+            if name in downs:
+                downs = downs.copy()
+                downs.discard(name)
+            result[name] = downs
+
+    return result
+
 def list_data_connections(graph):
     """Return all edges that are data connections"""
     return [(u,v) for u,v,data in graph.edges_iter(data=True)
@@ -1,6 +1,6 @@
 """ Some functions and objects that support the component-side derivative API.
 """
-from numpy import zeros, vstack, hstack
+from numpy import zeros, vstack, hstack, asarray, repeat, tile
 
 # pylint: disable=E0611,F0401
 from openmdao.main.array_helpers import flatten_slice, flattened_size
@@ -436,6 +436,203 @@ def applyJT(system, variables):
 
     #print 'applyJT', obj.name, arg, result
 
+def assembleJ(system, variables, rows, cols, data):
+    """Collect the entries of a component's provideJ Jacobian in the index
+    space of the top level vectors. This mirrors applyJ, but rather than
+    multiplying, it reads each argument and result view to find where it
+    lives. It expects the caller to have loaded the 'du', 'df' and 'dp'
+    vectors with the global index of each entry plus one, with zero marking
+    an entry that no scatter reached (see System.assemble_jacobian). Row, column and value arrays are appended to
+    rows, cols and data.
+
+    Components that only provide apply_deriv are probed with one call per
+    input entry. Returns False if there is nothing to assemble from (e.g., a
+    directional finite difference).
+    """
+
+    J = system.J
+    obj = system.inner()
+    scope = system.scope
+
+    is_sys = ISystem.providedBy(obj)
+
+    arg = {}
+    for item in system.list_states():
+
+        collapsed = scope.name2collapsed.get(item)
+        if collapsed not in variables:
+            continue
+
+        key = item
+        if not is_sys:
+            key = item.partition('.')[-1]
+        parent = system
+
+        while True:
+            if item in parent.vec['du']:
+                arg[key] = parent.vec['du'][item]
+                break
+            parent = parent._parent_system
+
+    for item in system.list_inputs():
+
+        collapsed = scope.name2collapsed.get(item)
+        if collapsed not in variables:
+            continue
+
+        key = item
+        if not is_sys:
+            key = item.partition('.')[-1]
+        parent = system
+
+        while True:
+            parent = parent._parent_system
+            if item in parent.vec['dp']:
+                arg[key] = parent.vec['dp'][item]
+                break
+
+    result = {}
+    for item in system.list_outputs():
+
+        collapsed = scope.name2collapsed.get(item)
+        if collapsed not in variables:
+            continue
+
+        key = item
+        if not is_sys:
+            key = item.partition('.')[-1]
+        result[key] = system.vec['df'][item]
+
+    for item in system.list_residuals():
+        key = item
+        if not is_sys:
+            key = item.partition('.')[-1]
+        result[key] = system.vec['df'][item]
+
+    # Nothing to do if this component is not connected in the graph
+    if len(arg) == 0 or len(result) == 0:
+        return True
+
+    if J is None:
+        if is_sys or not hasattr(obj, 'apply_deriv'):
+            return False
+
+        # No stored Jacobian, so probe apply_deriv one column at a time.
+        # Each call goes through the same reshaping as in applyJ.
+        argkeys = arg.keys()
+        resultkeys = result.keys()
+        argsizes = [len(arg[key]) for key in argkeys]
+        resultsizes = [len(result[key]) for key in resultkeys]
+        irow = hstack([result[key] for key in resultkeys]).astype(int) - 1
+        icols = hstack([arg[key] for key in argkeys]).astype(int) - 1
+
+        xin = zeros(sum(argsizes))
+        yout = zeros(sum(resultsizes))
+        Jlocal = zeros((len(yout), len(xin)))
+        shape_cache = {}
+
+        for icol in range(len(xin)):
+            xin[icol] = 1.0
+            yout[:] = 0.0
+
+            probe_arg = {}
+            start = 0
+            for key, size in zip(argkeys, argsizes):
+                probe_arg[key] = xin[start:start+size]
+                start += size
+
+            probe_result = {}
+            start = 0
+            for key, size in zip(resultkeys, resultsizes):
+                probe_result[key] = yout[start:start+size]
+                start += size
+
+            for key in sorted(resultkeys):
+                pre_process_dicts(obj, key, probe_result, shape_cache, scope,
+                                  is_sys)
+            for key in sorted(argkeys):
+                pre_process_dicts(obj, key, probe_arg, shape_cache, scope,
+                                  is_sys)
+
+            obj.apply_deriv(probe_arg, probe_result)
+
+            for key in reversed(sorted(resultkeys)):
+                post_process_dicts(key, probe_result)
+
+            Jlocal[:, icol] = yout
+            xin[icol] = 0.0
+
+        rows.append(repeat(irow, len(icols)))
+        cols.append(tile(icols, len(irow)))
+        data.append(Jlocal.flatten())
+        return True
+
+    if is_sys:
+        input_keys = system.list_inputs() + system.list_states()
+        output_keys = system.list_outputs() + system.list_residuals()
+    elif IAssembly.providedBy(obj):
+        input_keys = [item.partition('.')[-1] \
+                      for item in system.list_inputs()]
+        output_keys = [item.partition('.')[-1] \
+                       for item in system.list_outputs()]
+    else:
+        input_keys, output_keys = list_deriv_vars(obj)
+
+    if obj._provideJ_bounds is None:
+        obj._provideJ_bounds = get_bounds(obj, input_keys, output_keys, J)
+    ibounds, obounds = obj._provideJ_bounds
+
+    for okey in result:
+
+        odx = None
+        if okey in obounds:
+            o1, o2, osh = obounds[okey]
+        else:
+            basekey, _, odx = okey.partition('[')
+            try:
+                o1, o2, osh = obounds[basekey]
+            except KeyError:
+                if obj.missing_deriv_policy == 'error':
+                    msg = "does not provide analytical derivatives" + \
+                          " for %s" % okey
+                    obj.raise_exception(msg, KeyError)
+                continue
+
+        irow = result[okey].astype(int) - 1
+        used = set()
+        for ikey in arg:
+
+            idx = None
+            if ikey in ibounds:
+                i1, i2, ish = ibounds[ikey]
+                if (i1, i2) in used:
+                    continue
+                used.add((i1, i2))
+            else:
+                basekey, _, idx = ikey.partition('[')
+                try:
+                    i1, i2, ish = ibounds[basekey]
+                except KeyError:
+                    if obj.missing_deriv_policy == 'error':
+                        msg = "does not provide analytical derivatives" + \
+                              " for %s" % ikey
+                        obj.raise_exception(msg, KeyError)
+                    continue
+
+                if (i1, i2, idx) in used or (i1, i2) in used:
+                    continue
+                used.add((i1, i2, idx))
+
+            Jsub = asarray(reduce_jacobian(J, i1, i2, idx, ish,
+                                              o1, o2, odx, osh))
+            icol = arg[ikey].astype(int) - 1
+
+            rows.append(repeat(irow, len(icol)))
+            cols.append(tile(icol, len(irow)))
+            data.append(Jsub.reshape(len(irow), len(icol)).flatten())
+
+    return True
+
 def applyMinv(obj, inputs, shape_cache):
     """Simple wrapper around a component's applyMinv where we can reshape the
     arrays for each input and expand any needed array elements into full arrays.
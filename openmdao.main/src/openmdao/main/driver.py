@@ -5,6 +5,10 @@ __all__ = ["Driver"]
 
 # pylint: disable=E0611,F0401
 
+from copy import deepcopy
+
+import numpy
+from ordereddict import OrderedDict
 from networkx.algorithms.components import strongly_connected_components
 
 from openmdao.main.component import Component
@@ -45,6 +49,11 @@ class GradientOptions(VariableTree):
                         desc='Set to absolute, relative, '
                         'or scaled to the bounds (high-low) step sizes',
                         framework_var=True)
+    fd_workers = Int(1, low=1, desc='Number of worker processes used to '
+                     'evaluate the finite difference steps concurrently. '
+                     'Each worker runs a forked copy of the model, so this '
+                     'only pays off when the model is expensive to run.',
+                     framework_var=True)
 
     force_fd = Bool(False, desc="Set to True to force finite difference "
                                 "of this driver's entire workflow in a"
@@ -61,6 +70,14 @@ class GradientOptions(VariableTree):
                               "should be finite-differenced together.",
                               framework_var=True)
 
+    fd_coloring = Bool(False, desc="Set to True to detect the sparsity "
+                                   "pattern of the finite difference "
+                                   "Jacobian once and then perturb "
+                                   "structurally independent inputs "
+                                   "together, so that a sparse Jacobian "
+                                   "takes far fewer model evaluations.",
+                                   framework_var=True)
+
     derivative_direction = Enum('auto',
                                 ['auto', 'forward', 'adjoint'],
                                 desc="Direction for derivative calculation. "
@@ -78,10 +95,21 @@ class GradientOptions(VariableTree):
     #                          'by adding sets of component names.')
 
     # Linear Solver settings
-    lin_solver = Enum('scipy_gmres', ['scipy_gmres', 'petsc_ksp', 'linear_gs'],
-                      desc='Method to use for gradient calculation',
+    lin_solver = Enum('scipy_gmres',
+                      ['scipy_gmres', 'petsc_ksp', 'linear_gs', 'direct'],
+                      desc="Method to use for gradient calculation. 'direct' "
+                      "factors the linear system once and solves for all "
+                      "right-hand sides together (serial only).",
                       framework_var=True)
 
+    assemble_jacobian = Bool(False, desc="Set to True to assemble the "
+                             "Jacobian into a sparse matrix once per "
+                             "linearization from each component's provideJ "
+                             "(or apply_deriv), so that every linear solver iteration is a "
+                             "single sparse matrix-vector product. Not used "
+                             "by linear_gs or petsc_ksp.",
+                             framework_var=True)
+
     atol = Float(1.0e-9, desc='Absolute tolerance for the linear solver.',
                  framework_var=True)
     rtol = Float(1.0e-9, desc='Relative tolerance for the linear solver. '
@@ -90,6 +118,65 @@ class GradientOptions(VariableTree):
     maxiter = Int(100, desc='Maximum number of iterations for the linear solver.',
                   framework_var=True)
 
+
+class EvalCache(object):
+    """ Least recently used cache of values computed by a driver at points
+    in parameter space, e.g., objective, constraints, and their Jacobian.
+
+    size: int
+        Maximum number of points kept.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._points = OrderedDict()  # most recently used last
+
+    def __len__(self):
+        return len(self._points)
+
+    def clear(self):
+        """ Discard all saved values (statistics are kept). """
+        self._points.clear()
+
+    def get(self, key, name):
+        """ Return a copy of the value `name` saved for point `key`.
+        Raises KeyError if there isn't one.
+        """
+        try:
+            values = self._points.pop(key)
+        except KeyError:
+            self.misses += 1
+            raise
+        self._points[key] = values
+        try:
+            value = values[name]
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
+        return deepcopy(value)
+
+    def set(self, key, name, value):
+        """ Save a copy of the value `name` for point `key`, discarding the
+        least recently used point if the cache is full.
+        """
+        values = self._points.pop(key, None)
+        if values is None:
+            values = {}
+            while len(self._points) >= self.size:
+                self._points.popitem(last=False)
+        values[name] = deepcopy(value)
+        self._points[key] = values
+
+    def stats(self):
+        """ Return dictionary of cache statistics. """
+        total = self.hits + self.misses
+        return dict(hits=self.hits, misses=self.misses, size=len(self),
+                    hit_rate=float(self.hits) / total if total else 0.)
+
+
 @add_delegate(HasEvents)
 class Driver(Component):
     """ A Driver iterates over a workflow of Components until some condition
@@ -116,11 +203,30 @@ class Driver(Component):
                             "workflow components into a single serial or "
                             "parallel System.  Note that when not running "
                             "under MPI, this option is ignored and the "
-                            "resulting System will always be serial.",
+                            "resulting System will always be serial, "
+                            "unless system_workers is greater than 1.",
                        framework_var=True)
 
+    system_workers = Int(0, low=0,
+                         desc="Number of worker processes used to run the "
+                              "independent subsystems of a parallel System "
+                              "when not running under MPI. If less than 2, "
+                              "all subsystems are run in this process.",
+                         framework_var=True)
+
+    eval_cache_size = Int(0, low=0,
+                          desc="Maximum number of points in parameter space "
+                               "for which values computed by eval_at() are "
+                               "saved and reused rather than running the "
+                               "model again. The cache is cleared whenever "
+                               "the driver runs. Set to 0 to disable it.",
+                          framework_var=True)
+
     def __init__(self):
         self._iter = None
+        self.eval_cache = None
+        self._eval_point = None
+        self._eval_last = None
         super(Driver, self).__init__()
 
         self.workflow = Dataflow(self)
@@ -141,6 +247,14 @@ class Driver(Component):
         if newwf is not None:
             newwf.parent = self
 
+    def _system_workers_changed(self, old, new):
+        """Our Systems have to be rebuilt to take advantage of workers."""
+        self.config_changed()
+
+    def _eval_cache_size_changed(self, old, new):
+        """Replace our evaluation cache."""
+        self.eval_cache = EvalCache(new) if new > 0 else None
+
     def requires_derivs(self):
         return False
 
@@ -419,6 +533,12 @@ class Driver(Component):
 
         # Reset the workflow.
         self.workflow.reset()
+
+        # Values from a previous run may depend on things we don't vary.
+        if self.eval_cache is not None:
+            self.eval_cache.clear()
+        self._eval_point = self._eval_last = None
+
         super(Driver, self).run(case_uuid)
 
     @rbac(('owner', 'user'))
@@ -449,6 +569,7 @@ class Driver(Component):
             self.pre_iteration()
             self.run_iteration()
             self.post_iteration()
+        self.restore_eval_point()
         self.end_iteration()
 
     def stop(self):
@@ -485,8 +606,66 @@ class Driver(Component):
             self._logger.warning("'%s': workflow is empty!"
                                  % self.get_pathname())
 
+        self._eval_point = None
         wf.run()
 
+    def eval_at(self, x, name, func, rerun=True):
+        """Returns the value of ``func()`` with the model at the point `x` in
+        parameter space. Used by optimizers that request values at points
+        of their choosing.
+
+        x: array
+            Parameter values.
+
+        name: str
+            Identifies the value computed by `func`, e.g., 'func' for the
+            objective and constraints or 'grad' for their Jacobian.
+
+        func: callable
+            Computes the value from the model.
+
+        rerun: bool
+            If False, the workflow isn't re-run when the model is already at
+            `x`, e.g., for a gradient that always follows a function
+            evaluation at the same point.
+
+        If `eval_cache_size` is nonzero and the value has been computed at
+        `x` before, it is returned without touching the model. Otherwise the
+        parameters are set to `x` and the workflow is run, and `func` is
+        called. With the cache enabled, the workflow isn't re-run if the
+        model is already at `x`.
+        """
+        key = numpy.asarray(x, dtype=float).tostring()
+        if name == 'func':
+            self._eval_last = (key, numpy.array(x))
+
+        if self.eval_cache is not None:
+            try:
+                return self.eval_cache.get(key, name)
+            except KeyError:
+                pass
+
+        if self._eval_point != key or (rerun and self.eval_cache is None):
+            self.set_parameters(x)
+            Driver.run_iteration(self)
+            self._eval_point = key
+
+        value = func()
+        if self.eval_cache is not None:
+            self.eval_cache.set(key, name, value)
+        return value
+
+    def restore_eval_point(self):
+        """If values returned from the evaluation cache have left the model
+        at a point other than the last one whose 'func' value was requested
+        from :meth:`eval_at`, run the model at that point."""
+        if self.eval_cache is not None and self._eval_last is not None:
+            key, x = self._eval_last
+            if key != self._eval_point:
+                self.set_parameters(x)
+                Driver.run_iteration(self)
+                self._eval_point = key
+
     def calc_derivatives(self, first=False, second=False):
         """ Calculate derivatives and save baseline states for all components
         in this workflow."""
@@ -502,6 +681,9 @@ class Driver(Component):
         changed.
         """
         super(Driver, self).config_changed(update_parent)
+        if self.eval_cache is not None:
+            self.eval_cache.clear()
+        self._eval_point = self._eval_last = None
         self._required_compnames = None
         self._depgraph = None
         if self.workflow is not None:
@@ -527,7 +709,8 @@ class Driver(Component):
         """
         if self.name in self.parent._reduced_graph:
             self._system = self.parent._reduced_graph.node[self.name]['system']
-            return self.workflow.setup_systems(self.system_type)
+            return self.workflow.setup_systems(self.system_type,
+                                               self.system_workers)
 
 
     #### MPI related methods ####
@@ -7,10 +7,56 @@ from sys import float_info
 from openmdao.main.array_helpers import flattened_size
 from openmdao.main.interfaces import IVariableTree
 from openmdao.main.mp_support import has_interface
-from openmdao.main.mpiwrap import mpiprint
+from openmdao.main.mpiwrap import MPI, mpiprint
+from openmdao.main.workerpool import WorkerPool, workers_available
 from openmdao.util.graph import base_var
 
-from numpy import ndarray, zeros, ones, unravel_index, complex128
+from numpy import ndarray, zeros, ones, unravel_index, complex128, argsort
+from numpy.random import RandomState
+
+# Seed for the random point about which sparsity is detected.
+_SPARSITY_SEED = 1
+
+
+def _does_file_io(comp):
+    """Return True if comp reads or writes files, or contains a component
+    that does."""
+
+    # External code wrappers write their stdout and stderr files even when
+    # they declare nothing else.
+    if comp.external_files or comp.get_file_vars() or \
+       getattr(comp, 'command', None):
+        return True
+
+    if hasattr(comp, 'list_components'):
+        for name in comp.list_components():
+            if _does_file_io(getattr(comp, name)):
+                return True
+    return False
+
+
+def color_columns(pattern):
+    """Partition the columns of a boolean sparsity pattern into groups of
+    structurally orthogonal columns, i.e., no two columns in a group have a
+    nonzero in the same row. This is the Curtis-Powell-Reid greedy coloring,
+    visiting the columns in order of decreasing number of nonzeros.
+    Returns a list of lists of column indices.
+    """
+
+    groups = []
+    masks = []
+    for col in argsort(-pattern.sum(axis=0), kind='mergesort'):
+        rows = pattern[:, col]
+        for group, mask in zip(groups, masks):
+            if not (mask & rows).any():
+                group.append(col)
+                mask |= rows
+                break
+        else:
+            groups.append([col])
+            masks.append(rows.copy())
+
+    return groups
 
 
 class FiniteDifference(object):
@@ -40,6 +86,9 @@ class FiniteDifference(object):
         self.step_type = options.fd_step_type
         self.step_type_custom = {}
         self.relative_threshold = 1.0e-4
+        self.coloring = options.fd_coloring
+        self._file_io = None
+
 
         dgraph = self.scope._depgraph
         driver_params = []
@@ -170,6 +219,27 @@ class FiniteDifference(object):
         uvec.set_to_array(self.y_base,
                           self.outputs)
 
+        columns = self.get_columns()
+
+        if self.coloring or self._use_workers():
+            self._solve_points(columns, iterbase)
+        else:
+            for column in columns:
+                self._pack_column(column, self._solve_column(column, iterbase))
+
+        # Restore final inputs/outputs.
+        uvec.set_from_array(self.y_base, self.outputs)
+        uvec.set_to_scope(self.scope)
+
+        #print 'after FD', self.J
+        return self.J
+
+    def get_columns(self):
+        """Return a list of (src, i, i1, form, fd_step) tuples, one for each
+        column of the Jacobian, where `i` is the global column index and `i1`
+        is the index of the first column belonging to `src`."""
+
+        columns = []
         for j, src, in enumerate(self.inputs):
             # Users can customize the FD per variable
             if j in self.form_custom:
@@ -213,105 +283,280 @@ class FiniteDifference(object):
                     if current_val + fd_step > bound_val:
                         form = 'backward'
 
-                #--------------------
-                # Forward difference
-                #--------------------
-                if form == 'forward':
+                columns.append((src, i, i1, form, fd_step))
 
-                    # Step
-                    self.set_value(src, fd_step, i-i1)
+        return columns
 
-                    self.system.run(iterbase)
-                    self.get_outputs(self.y)
+    def _solve_column(self, column, iterbase):
+        """Return the finite difference of the outputs for one column."""
 
-                    # Forward difference
-                    Jfd = (self.y - self.y_base)/fd_step
+        src, i, i1, form, fd_step = column
 
-                    # Undo step
-                    self.set_value(src, -fd_step, i-i1)
+        #--------------------
+        # Forward difference
+        #--------------------
+        if form == 'forward':
 
-                #--------------------
-                # Backward difference
-                #--------------------
-                elif form == 'backward':
+            # Step
+            self.set_value(src, fd_step, i-i1)
 
-                    # Step
-                    self.set_value(src, -fd_step, i-i1)
+            self.system.run(iterbase)
+            self.get_outputs(self.y)
 
-                    self.system.run(iterbase)
-                    self.get_outputs(self.y)
+            # Forward difference
+            Jfd = (self.y - self.y_base)/fd_step
 
-                    # Backward difference
-                    Jfd = (self.y_base - self.y)/fd_step
+            # Undo step
+            self.set_value(src, -fd_step, i-i1)
 
-                    # Undo step
-                    self.set_value(src, fd_step, i-i1)
+        #--------------------
+        # Backward difference
+        #--------------------
+        elif form == 'backward':
 
-                #--------------------
-                # Central difference
-                #--------------------
-                elif form == 'central':
+            # Step
+            self.set_value(src, -fd_step, i-i1)
 
-                    # Forward Step
-                    self.set_value(src, fd_step, i-i1)
+            self.system.run(iterbase)
+            self.get_outputs(self.y)
 
-                    self.system.run(iterbase)
-                    self.get_outputs(self.y)
+            # Backward difference
+            Jfd = (self.y_base - self.y)/fd_step
 
-                    # Backward Step
-                    self.set_value(src, -2.0*fd_step, i-i1)
+            # Undo step
+            self.set_value(src, fd_step, i-i1)
 
-                    self.system.run(iterbase)
-                    self.get_outputs(self.y2)
+        #--------------------
+        # Central difference
+        #--------------------
+        elif form == 'central':
 
-                    # Central difference
-                    Jfd = (self.y - self.y2)/(2.0*fd_step)
+            # Forward Step
+            self.set_value(src, fd_step, i-i1)
 
-                    # Undo step
-                    self.set_value(src, fd_step, i-i1)
+            self.system.run(iterbase)
+            self.get_outputs(self.y)
 
-                #--------------------
-                # Complex Step
-                #--------------------
-                elif form == 'complex_step':
+            # Backward Step
+            self.set_value(src, -2.0*fd_step, i-i1)
 
-                    complex_step = fd_step
-                    yc = zeros(len(self.y), dtype=complex128)
-                    self.system.set_complex_step(True)
+            self.system.run(iterbase)
+            self.get_outputs(self.y2)
 
-                    # Step
-                    self.set_value_complex(src, complex_step, i-i1)
+            # Central difference
+            Jfd = (self.y - self.y2)/(2.0*fd_step)
 
-                    self.system.run(iterbase)
-                    self.get_complex_outputs(yc)
+            # Undo step
+            self.set_value(src, fd_step, i-i1)
 
-                    # Forward difference
-                    Jfd = (yc/fd_step).imag
+        #--------------------
+        # Complex Step
+        #--------------------
+        elif form == 'complex_step':
 
-                    # Undo step
-                    self.set_value_complex(src, complex_step, i-i1,
-                                           undo_complex=True)
-                    self.system.set_complex_step(False)
+            complex_step = fd_step
+            yc = zeros(len(self.y), dtype=complex128)
+            self.system.set_complex_step(True)
 
-                # Pack Jacobian in either an array or a dictionary.
-                if self.return_format == 'dict':
-                    start = end = 0
-                    for okey in self.outputs:
+            # Step
+            self.set_value_complex(src, complex_step, i-i1)
 
-                        sz = uvec[okey].size
-                        end += sz
-                        #mpiprint(Jfd, start, end, i, self.J)
-                        self.J[okey][src][:, i-i1] = Jfd[start:end]
-                        start += sz
-                else:
-                    self.J[:, i] = Jfd
+            self.system.run(iterbase)
+            self.get_complex_outputs(yc)
 
-        # Restore final inputs/outputs.
-        uvec.set_from_array(self.y_base, self.outputs)
-        uvec.set_to_scope(self.scope)
+            # Forward difference
+            Jfd = (yc/fd_step).imag
 
-        #print 'after FD', self.J
-        return self.J
+            # Undo step
+            self.set_value_complex(src, complex_step, i-i1,
+                                   undo_complex=True)
+            self.system.set_complex_step(False)
+
+        return Jfd
+
+    @property
+    def n_workers(self):
+        """The number of worker processes, read from the options on every
+        solve since we outlive changes to them."""
+        return self.system.options.fd_workers
+
+    def _use_workers(self):
+        """Return True if perturbed points should be farmed out to worker
+        processes."""
+
+        if not workers_available(self.n_workers):
+            return False
+
+        # The copies share our working directory, so components that do
+        # file I/O would clobber each other's files.
+        if self._file_io is None:
+            self._file_io = False
+            for sub in self.system.simple_subsystems():
+                comp = getattr(sub, '_comp', None)
+                if comp is not None and _does_file_io(comp):
+                    self._file_io = True
+                    break
+        return not self._file_io
+
+    def _solve_points(self, columns, iterbase):
+        """Evaluate all of the perturbed points up front, possibly in
+        worker processes, and then difference them. When coloring is on,
+        structurally orthogonal columns are perturbed together and the
+        results are decompressed using the sparsity pattern. Complex step
+        columns are solved one at a time in this process.
+        """
+
+        if self.coloring:
+            # The pattern is kept on our System rather than on us, so it
+            # survives the solver reset when a cached setup is restored.
+            pattern = self.system.fd_sparsity
+            if pattern is None or \
+               pattern.shape != (len(self.y_base), len(columns)):
+                pattern = self.detect_sparsity(columns, iterbase)
+                self.system.fd_sparsity = pattern
+        else:
+            pattern = None
+
+        groups = []
+        for form in ('forward', 'backward', 'central'):
+            idx = [k for k, col in enumerate(columns) if col[3] == form]
+            if not idx:
+                continue
+            if pattern is None:
+                groups.extend([[k] for k in idx])
+            else:
+                groups.extend([[idx[k] for k in group]
+                               for group in color_columns(pattern[:, idx])])
+
+        points = []
+        for group in groups:
+            form = columns[group[0]][3]
+            if form in ('forward', 'central'):
+                points.append([(src, i-i1, fd_step)
+                               for src, i, i1, _, fd_step in
+                               [columns[k] for k in group]])
+            if form in ('backward', 'central'):
+                points.append([(src, i-i1, -fd_step)
+                               for src, i, i1, _, fd_step in
+                               [columns[k] for k in group]])
+
+        results = self.run_points(points, iterbase)
+
+        n = 0
+        for group in groups:
+            form = columns[group[0]][3]
+
+            if form == 'forward':
+                delta = results[n] - self.y_base
+                n += 1
+            elif form == 'backward':
+                delta = self.y_base - results[n]
+                n += 1
+            else:
+                delta = results[n] - results[n+1]
+                n += 2
+
+            for k in group:
+                fd_step = columns[k][4]
+                if form == 'central':
+                    fd_step = 2.0*fd_step
+                if pattern is None:
+                    Jfd = delta/fd_step
+                else:
+                    Jfd = zeros(delta.shape)
+                    rows = pattern[:, k]
+                    Jfd[rows] = delta[rows]/fd_step
+                self._pack_column(columns[k], Jfd)
+
+        for column in columns:
+            if column[3] == 'complex_step':
+                self._pack_column(column, self._solve_column(column, iterbase))
+
+    def detect_sparsity(self, columns, iterbase):
+        """Return the boolean nonzero pattern of the Jacobian. It is taken
+        from a full forward difference about a randomly perturbed copy of the
+        current point, so that entries which happen to vanish at the current
+        point are still picked up. The perturbation uses its own seeded
+        generator, so the pattern is reproducible and the global numpy
+        random state is left alone."""
+
+        # Offsets and steps are each at most half of a step in the direction
+        # the column's form allows, so we never leave the bounds.
+        steps = []
+        for src, i, i1, form, fd_step in columns:
+            if form == 'backward':
+                fd_step = -fd_step
+            steps.append((src, i-i1, 0.5*fd_step))
+
+        rand = RandomState(_SPARSITY_SEED)
+        offsets = [(src, index, step*rand.random_sample())
+                   for src, index, step in steps]
+
+        points = [offsets]
+        for step in steps:
+            points.append(offsets + [step])
+
+        results = self.run_points(points, iterbase)
+
+        pattern = zeros((len(self.y_base), len(columns)), dtype=bool)
+        for k in range(len(columns)):
+            pattern[:, k] = results[k+1] != results[0]
+
+        return pattern
+
+    def run_point(self, point, iterbase):
+        """Run the model with a list of (src, index, step) perturbations
+        applied and return the outputs. The u vector is restored exactly
+        afterwards, so that round-off from undoing the steps can't leak into
+        later points."""
+
+        uarray = self.system.vec['u'].array
+        saved = uarray.copy()
+
+        for src, index, step in point:
+            self.set_value(src, step, index)
+
+        self.system.run(iterbase)
+        y = zeros(self.y.shape)
+        self.get_outputs(y)
+
+        uarray[:] = saved
+        return y
+
+    def run_points(self, points, iterbase):
+        """Return the outputs for each of a list of perturbed points. If we
+        have more than one worker, the points are evaluated concurrently in a
+        pool of forked worker processes, each of which owns a copy of the
+        model in its base state."""
+
+        if len(points) < 2 or not self._use_workers():
+            return [self.run_point(point, iterbase) for point in points]
+
+        pool = WorkerPool(self, 'run_point', self.scope,
+                          min(self.n_workers, len(points)))
+        try:
+            return pool.map([(point, iterbase) for point in points])
+        finally:
+            pool.close()
+
+    def _pack_column(self, column, Jfd):
+        """Pack a column into our Jacobian, which is either an array or a
+        dictionary."""
+
+        src, i, i1, form, fd_step = column
+
+        if self.return_format == 'dict':
+            uvec = self.system.vec['u']
+            start = end = 0
+            for okey in self.outputs:
+
+                sz = uvec[okey].size
+                end += sz
+                #mpiprint(Jfd, start, end, i, self.J)
+                self.J[okey][src][:, i-i1] = Jfd[start:end]
+                start += sz
+        else:
+            self.J[:, i] = Jfd
 
     def get_outputs(self, x):
         """Return matrix of flattened values from output edges."""
@@ -395,8 +395,10 @@ class ICaseRecorder(Interface):
     def record_constants(constants):
         """Record constant data."""
 
-    def record(driver, inputs, outputs, exc, case_uuid, parent_uuid):
-        """Record input and output data from `driver`."""
+    def record(driver, inputs, outputs, exc, case_uuid, parent_uuid,
+               timestamp=None):
+        """Record input and output data from `driver`. `timestamp` is the
+        time the data was taken, if not now."""
 
     def get_iterator():
         """Return an iterator that matches the format that this recorder uses."""
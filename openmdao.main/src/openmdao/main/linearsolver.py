@@ -4,7 +4,8 @@
 
 # pylint: disable=E0611, F0401
 import numpy as np
-from scipy.sparse.linalg import gmres, LinearOperator
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse.linalg import gmres, splu, LinearOperator
 
 from openmdao.main.mpiwrap import MPI
 from openmdao.util.graph import fix_single_tuple
@@ -25,6 +26,7 @@ class LinearSolver(object):
         """ Set up any LinearSolver object """
         self._system = system
         self.options = system.options
+        self._jac = None
 
     def _norm(self):
         """ Computes the norm of the linear residual """
@@ -40,6 +42,54 @@ class LinearSolver(object):
         else:
             return np.linalg.norm(system.rhs_vec.array)
 
+    def reset(self):
+        """ Called whenever the system is relinearized. Solvers that cache
+        anything derived from the linearization should discard it here."""
+        self._jac = None
+
+    def _relevant_vars(self):
+        """ Returns the variables that a matrix-vector product must touch."""
+        system = self._system
+        if system._parent_system:
+            return system._parent_system._relevant_vars
+        else:
+            return system.flat_vars.keys()
+
+    def assembled_jacobian(self):
+        """ Returns the system's linear operator as a sparse matrix if the
+        assemble_jacobian option is set. It is assembled once per
+        linearization from the components' provideJ blocks, probing those
+        that only have apply_deriv. Returns None if the option is off, or if
+        some subsystem has nothing to assemble from (e.g., a directional
+        finite difference), in which case the solver keeps using applyJ.
+        """
+        if not self.options.assemble_jacobian:
+            return None
+
+        return self._assemble()
+
+    def _assemble(self):
+        """ Assembles the operator regardless of the assemble_jacobian
+        option, caching the result until the next linearization. Returns
+        None if some subsystem has nothing to assemble from."""
+        system = self._system
+
+        if self._jac is None:
+            self._jac = system.assemble_jacobian(self._relevant_vars())
+            if self._jac is None:
+                logger.debug("'%s': can't assemble the Jacobian, so "
+                             "falling back to matrix-free products",
+                             system.name)
+                self._jac = False
+
+        if self._jac is False:
+            return None
+
+        # Adjoint mode applies the transpose.
+        if system.mode == 'adjoint':
+            return self._jac.T
+        return self._jac
+
 
 class ScipyGMRES(LinearSolver):
     """ Scipy's GMRES Solver. This is a serial solver, so
@@ -137,18 +187,24 @@ class ScipyGMRES(LinearSolver):
         #print inputs, '\n', outputs, '\n', J
         return J
 
-    def solve(self, arg):
+    def solve(self, arg, x0=None, tol=None):
         """ Solve the coupled equations for a new state vector that nulls the
-        residual. Used by the Newton solvers."""
+        residual. Used by the Newton solvers. GMRES starts from the initial
+        guess `x0` if given, and stops at relative tolerance `tol` if given
+        rather than the one in our options."""
 
         system = self._system
         options = self.options
-        A = self.A
+        A = self.assembled_jacobian()
+        if A is None:
+            A = self.A
+        if tol is None:
+            tol = options.atol
 
         #print system.name, 'Linear solution start vec', system.rhs_vec.array
         # Call GMRES to solve the linear system
-        dx, info = gmres(A, arg,
-                         tol=options.atol,
+        dx, info = gmres(A, arg, x0=x0,
+                         tol=tol,
                          maxiter=options.maxiter)
 
         if info > 0:
@@ -174,17 +230,175 @@ class ScipyGMRES(LinearSolver):
         system.rhs_vec.array[:] = 0.0
         system.clear_dp()
 
-        if system._parent_system:
-            vnames = system._parent_system._relevant_vars
-        else:
-            vnames = system.flat_vars.keys()
-        system.applyJ(vnames)
+        system.applyJ(self._relevant_vars())
 
         #print system.name, 'mult: arg, result', arg, system.rhs_vec.array[:]
         #print system.rhs_vec.keys()
         return system.rhs_vec.array[:]
 
 
+class DirectSolver(LinearSolver):
+    """ Direct solver that assembles the system's linear operator once per
+    linearization, LU-factors it, and reuses that factorization for every
+    right-hand side. All columns of the Jacobian are then obtained in a
+    single block back-substitution. The operator is a sparse matrix built
+    from the provideJ blocks, whether or not the assemble_jacobian option
+    is set. It is only probed column by column when some subsystem has
+    nothing to assemble from (e.g., a directional finite difference). This
+    is a serial solver, so it should never be used in an MPI setting.
+    """
+
+    def __init__(self, system):
+        """ Set up DirectSolver object """
+        super(DirectSolver, self).__init__(system)
+
+        n_edge = system.vec['f'].array.size
+
+        system.rhs_buf = np.zeros((n_edge, ))
+        system.sol_buf = np.zeros((n_edge, ))
+
+        self._lu = None
+        self._lu_mode = None
+
+    def reset(self):
+        """ Discard the current factorization. Called whenever the system is
+        relinearized."""
+        super(DirectSolver, self).reset()
+        self._lu = None
+        self._lu_mode = None
+
+    def _factor(self):
+        """ Assemble the operator and LU-factor it, returning a function
+        that solves against the factorization. The factorization is kept
+        until the next linearization, or until the derivative mode changes,
+        since adjoint mode applies the transpose.
+        """
+        system = self._system
+
+        if self._lu is not None and self._lu_mode == system.mode:
+            return self._lu
+
+        self._lu_mode = system.mode
+
+        jac = self._assemble()
+        if jac is not None:
+            self._lu = splu(jac.tocsc()).solve
+            return self._lu
+
+        n_edge = system.rhs_buf.size
+        A = np.zeros((n_edge, n_edge))
+        arg = np.zeros((n_edge, ))
+
+        for icol in xrange(n_edge):
+            arg[icol] = 1.0
+            A[:, icol] = self.mult(arg)
+            arg[icol] = 0.0
+
+        lu = lu_factor(A)
+        self._lu = lambda rhs: lu_solve(lu, rhs)
+        return self._lu
+
+    def calc_gradient(self, inputs, outputs, return_format='array'):
+        """ Factor the linear system once and solve for all columns of
+        the Jacobian of outputs with respect to inputs in one block.
+        """
+
+        system = self._system
+
+        # Size the problem
+        num_input = system.get_size(inputs)
+        num_output = system.get_size(outputs)
+
+        if return_format == 'dict':
+            J = {}
+            for okey in outputs:
+                J[okey] = {}
+                for ikey in inputs:
+                    if isinstance(ikey, tuple):
+                        ikey = ikey[0]
+                    J[okey][ikey] = None
+        else:
+            J = np.zeros((num_output, num_input))
+
+        if system.mode == 'adjoint':
+            outputs, inputs = inputs, outputs
+
+        # Gather every RHS column up front so that we can solve them all
+        # with one call against the factored operator.
+        in_indices = []
+        for param in inputs:
+            if isinstance(param, tuple):
+                param = param[0]
+            in_indices.append((param,
+                               system.vec['u'].indices(system.scope, param)))
+
+        n_edge = system.rhs_buf.size
+        nrhs = sum([len(idx) for _, idx in in_indices])
+        RHS = np.zeros((n_edge, nrhs))
+
+        j = 0
+        for param, idx in in_indices:
+            for irhs in idx:
+                RHS[irhs, j] = 1.0
+                j += 1
+
+        dx = self.solve(RHS)
+
+        jbase = 0
+        for param, idx in in_indices:
+            nj = len(idx)
+
+            i = 0
+            for item in outputs:
+
+                if isinstance(item, tuple):
+                    item = item[0]
+
+                out_indices = system.vec['u'].indices(system.scope, item)
+                nk = len(out_indices)
+                block = dx[out_indices, jbase:jbase+nj]
+
+                if return_format == 'dict':
+                    if system.mode == 'forward':
+                        J[item][param] = block.copy()
+                    else:
+                        J[param][item] = block.T.copy()
+
+                else:
+                    if system.mode == 'forward':
+                        J[i:i+nk, jbase:jbase+nj] = block
+                    else:
+                        J[jbase:jbase+nj, i:i+nk] = block.T
+                    i += nk
+
+            jbase += nj
+
+        return J
+
+    def solve(self, arg, x0=None, tol=None):
+        """ Solve the linear system for one right-hand side, or for a block
+        of them stored as the columns of a 2D array. Used by calc_gradient and
+        by the Newton solvers. The solve is direct, so the initial guess `x0`
+        and tolerance `tol` are ignored."""
+
+        return self._factor()(arg)
+
+    def mult(self, arg):
+        """ Applies the Jacobian matrix to a single vector. Mode is determined
+        by the system."""
+
+        system = self._system
+        system.sol_vec.array[:] = arg[:]
+
+        # Start with a clean slate
+        system.rhs_vec.array[:] = 0.0
+        system.clear_dp()
+
+        system.applyJ(self._relevant_vars())
+
+        return system.rhs_vec.array.copy()
+
+
 class PETSc_KSP(LinearSolver):
     """ PETSc's KSP solver with preconditioning. MPI is supported."""
 
@@ -440,18 +654,26 @@ class LinearGS(LinearSolver):
         #print inputs, '\n', outputs, '\n', J
         return J
 
-    def solve(self, arg):
-        """ Executes an iterative solver """
+    def solve(self, arg, x0=None, tol=None):
+        """ Executes an iterative solver. It starts from the initial guess
+        `x0` if given, and stops once the linear residual is reduced to `tol`
+        times the norm of `arg` if `tol` is given."""
         system = self._system
 
         system.rhs_buf[:] = arg[:]
+        if x0 is not None:
+            system.sol_vec.array[:] = x0
         system.sol_buf[:] = system.sol_vec.array[:]
         options = self.options
         system = self._system
 
+        atol = options.atol
+        if tol is not None:
+            atol = max(atol, tol*np.linalg.norm(arg))
+
         norm0, norm = 1.0, 1.0
         counter = 0
-        while counter < options.maxiter and norm > options.atol and \
+        while counter < options.maxiter and norm > atol and \
               norm/norm0 > options.rtol:
 
             if system.mode == 'forward':
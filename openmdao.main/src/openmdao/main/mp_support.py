@@ -61,8 +61,9 @@ if sys.platform == 'win32':  #pragma no cover
 from traits.trait_handlers import TraitDictObject
 
 from openmdao.main.interfaces import implements, obj_has_interface, IContainerProxy
-from openmdao.main.mp_util import decrypt, encrypt, is_legal_connection, \
-                                  keytype, make_typeid, public_methods, \
+from openmdao.main.mp_util import is_legal_connection, keytype, \
+                                  make_typeid, public_methods, \
+                                  receive_message, send_message, \
                                   tunnel_address, SPECIALS
 from openmdao.main.rbac import AccessController, RoleError, check_role, \
                                need_proxy, Credentials, \
@@ -387,8 +388,6 @@ class OpenMDAO_Server(Server):
         """
         self._logger.log(LOG_DEBUG2, 'starting server thread to service %r, %s',
                          threading.current_thread().name, keytype(self._authkey))
-        recv = conn.recv
-        send = conn.send
         id_to_obj = self.id_to_obj
         id_to_controller = self._id_to_controller
 
@@ -403,9 +402,10 @@ class OpenMDAO_Server(Server):
             try:
                 ident = methodname = args = kwds = credentials = None
                 obj = exposed = gettypeid = None
-                data = recv()
                 try:
-                    request = decrypt(data, session_key)
+                    request = receive_message(conn, session_key)
+                except EOFError:
+                    raise
                 except Exception as exc:
                     trace = traceback.format_exc()
                     msg = "Can't decrypt/unpack request. This could be the" \
@@ -436,78 +436,20 @@ class OpenMDAO_Server(Server):
                     self._logger.error(msg)
                     raise KeyError('%s %r: %s' % (self.host, self.name, msg))
 
-                if methodname not in exposed:
-                    # Try to raise with a useful error message.
-                    if methodname == '__getattr__':
-                        try:
-                            val = getattr(obj, args[0])
-                        except AttributeError:
-                            raise AttributeError(
-                                  'attribute %r of %r object does not exist'
-                                  % (args[0], type(obj)))
-                        if inspect.ismethod(val):
-                            methodname = args[0]
-                        else:
-                            raise AttributeError(
-                                  'attribute %r of %r is not accessible'
-                                  % (args[0], type(obj)))
-                    raise AttributeError(
-                                  'method %r of %r object is not in exposed=%r'
-                                  % (methodname, type(obj), exposed))
-
-                # Set correct credentials for function lookup.
-                set_credentials(credentials)
-                function = getattr(obj, methodname)
-
-                # Proxy pass-through only happens remotely.
-                if isinstance(obj, BaseProxy):  #pragma no cover
-                    role = None
-                    access_controller = None
-                else:
-                    # Check for allowed access.
-                    role, credentials, access_controller = \
-                        self._check_access(ident, methodname, function, args,
+                if methodname == '__batch__':
+                    # Process calls in order, stopping at the first failure.
+                    msgs = []
+                    for methodname, args, kwds in args[0]:
+                        msg = self._invoke(conn, ident, obj, exposed,
+                                           methodname, args, kwds,
                                            credentials)
-                if methodname != 'echo':
-                    # 'echo' is used for performance tests, keepalives, etc.
-                    self._logger.log(LOG_DEBUG2, "Invoke %s %s '%s'",
-                                       methodname, role, credentials)
-                    self._logger.log(LOG_DEBUG3, '       %s %s', args, kwds)
-
-                # Invoke function.
-                try:
-                    try:
-                        res = function(*args, **kwds)
-                        self._logger.log(LOG_DEBUG3, '       res %r', res)
-                    except AttributeError as exc:
-                        if isinstance(obj, BaseProxy) and \
-                           methodname == '__getattribute__':
-                            # Avoid an extra round-trip.
-                            res = obj.__getattr__(*args, **kwds)
-                        else:
-                            raise
-                except Exception as exc:
-                    self._logger.exception('%s %s %s failed:',
-                                           methodname, role, credentials)
-                    msg = ('#TRACEBACK', traceback.format_exc())
-                else:
-                    msg = self._form_reply(res, ident, methodname, function,
-                                           args, access_controller, conn)
-
-            except AttributeError:
-                # Just being defensive, this should never happen.
-                if methodname is None:  #pragma no cover
-                    msg = ('#TRACEBACK', traceback.format_exc())
+                        msgs.append(msg)
+                        if msg[0] not in ('#RETURN', '#PROXY'):
+                            break
+                    msg = ('#BATCH', msgs)
                 else:
-                    orig_traceback = traceback.format_exc()
-                    try:
-                        fallback_func = self.fallback_mapping[methodname]
-                        self._logger.log(LOG_DEBUG2, 'Fallback %s', methodname)
-                        result = fallback_func(self, conn, ident, obj,
-                                               *args, **kwds)
-                        msg = ('#RETURN', result)
-                    except Exception:
-                        msg = ('#TRACEBACK', orig_traceback)
+                    msg = self._invoke(conn, ident, obj, exposed,
+                                       methodname, args, kwds, credentials)
 
             except EOFError:
                 util.debug('got EOF -- exiting thread serving %r',
@@ -524,9 +466,10 @@ class OpenMDAO_Server(Server):
 
             try:
                 try:
-                    send(encrypt(msg, session_key))
+                    send_message(conn, msg, session_key)
                 except Exception:
-                    send(encrypt(('#UNSERIALIZABLE', repr(msg)), session_key))
+                    send_message(conn, ('#UNSERIALIZABLE', repr(msg)),
+                                 session_key)
             # Just being defensive, this should never happen.
             except Exception as exc: #pragma no cover
                 self._logger.error('exception in thread serving %r',
@@ -536,6 +479,80 @@ class OpenMDAO_Server(Server):
                 conn.close()
                 sys.exit(1)
 
+    def _invoke(self, conn, ident, obj, exposed, methodname, args, kwds,
+                credentials):
+        """ Invoke `methodname` of `obj` and return the reply message. """
+        try:
+            if methodname not in exposed:
+                # Try to raise with a useful error message.
+                if methodname == '__getattr__':
+                    try:
+                        val = getattr(obj, args[0])
+                    except AttributeError:
+                        raise AttributeError(
+                              'attribute %r of %r object does not exist'
+                              % (args[0], type(obj)))
+                    if inspect.ismethod(val):
+                        methodname = args[0]
+                    else:
+                        raise AttributeError(
+                              'attribute %r of %r is not accessible'
+                              % (args[0], type(obj)))
+                raise AttributeError(
+                              'method %r of %r object is not in exposed=%r'
+                              % (methodname, type(obj), exposed))
+
+            # Set correct credentials for function lookup.
+            set_credentials(credentials)
+            function = getattr(obj, methodname)
+
+            # Proxy pass-through only happens remotely.
+            if isinstance(obj, BaseProxy):  #pragma no cover
+                role = None
+                access_controller = None
+            else:
+                # Check for allowed access.
+                role, credentials, access_controller = \
+                    self._check_access(ident, methodname, function, args,
+                                       credentials)
+            if methodname != 'echo':
+                # 'echo' is used for performance tests, keepalives, etc.
+                self._logger.log(LOG_DEBUG2, "Invoke %s %s '%s'",
+                                   methodname, role, credentials)
+                self._logger.log(LOG_DEBUG3, '       %s %s', args, kwds)
+
+            # Invoke function.
+            try:
+                try:
+                    res = function(*args, **kwds)
+                    self._logger.log(LOG_DEBUG3, '       res %r', res)
+                except AttributeError as exc:
+                    if isinstance(obj, BaseProxy) and \
+                       methodname == '__getattribute__':
+                        # Avoid an extra round-trip.
+                        res = obj.__getattr__(*args, **kwds)
+                    else:
+                        raise
+            except Exception as exc:
+                self._logger.exception('%s %s %s failed:',
+                                       methodname, role, credentials)
+                msg = ('#TRACEBACK', traceback.format_exc())
+            else:
+                msg = self._form_reply(res, ident, methodname, function,
+                                       args, access_controller, conn)
+
+        except AttributeError:
+            orig_traceback = traceback.format_exc()
+            try:
+                fallback_func = self.fallback_mapping[methodname]
+                self._logger.log(LOG_DEBUG2, 'Fallback %s', methodname)
+                result = fallback_func(self, conn, ident, obj, *args, **kwds)
+                msg = ('#RETURN', result)
+            except Exception:
+                msg = ('#TRACEBACK', orig_traceback)
+
+        return msg
+
     def _init_session(self, conn):
         """ Receive client public key, send session key. """
         # Hard to cause exceptions to happen where we'll see them.
@@ -1246,9 +1263,45 @@ class OpenMDAO_Proxy(BaseProxy):
         This version optionally encrypts the channel and sends the current
         thread's credentials with method arguments.
         """
-        args = args or ()
-        kwds = kwds or {}
+        kind, result = self._transact(methodname, self._fix_args(args or ()),
+                                      kwds or {})
+        return self._convert_reply(kind, result)
+
+    def batch(self, calls):
+        """
+        Call several methods of the referrent in a single round trip.
+        Calls are processed in order, stopping at the first failure, which is
+        raised. Returns a list of results, one per call.
+
+        calls: list
+            Each entry is a tuple of the form ``(methodname, arg1, arg2, ...)``,
+            for example ``[('set', 'x', 1.), ('set', 'y', 2.), ('run',)]``.
+        """
+        requests = [(call[0], self._fix_args(call[1:]), {}) for call in calls]
+        kind, result = self._transact('__batch__', (requests,), {})
+        if kind != '#BATCH':
+            raise convert_to_error(kind, result)
+        return [self._convert_reply(kind, res) for kind, res in result]
+
+    @staticmethod
+    def _fix_args(args):
+        """ Return list of `args` with problematic types converted. """
+# FIXME: Bizarre problem evidenced by test_extcode.py (Python 2.6.1)
+# For some reason pickling the env_vars dictionary causes:
+#    PicklingError: Can't pickle <class 'openmdao.main.mp_support.ObjServer'>:
+#                     attribute lookup openmdao.main.mp_support.ObjServer failed
+# The reported type is not in the (current) Dict items.
+# Apparently this is some Traits 'feature'.
+        new_args = []
+        for arg in args:
+            if isinstance(arg, TraitDictObject):
+                new_args.append(dict(arg))
+            else:
+                new_args.append(arg)
+        return new_args
 
+    def _transact(self, methodname, args, kwds):
+        """ Send request to server and return ``(kind, result)`` reply. """
         try:
             conn = self._tls.connection
         except AttributeError:
@@ -1269,30 +1322,19 @@ class OpenMDAO_Proxy(BaseProxy):
 
         session_key = self._tls.session_key
 
-# FIXME: Bizarre problem evidenced by test_extcode.py (Python 2.6.1)
-# For some reason pickling the env_vars dictionary causes:
-#    PicklingError: Can't pickle <class 'openmdao.main.mp_support.ObjServer'>:
-#                     attribute lookup openmdao.main.mp_support.ObjServer failed
-# The reported type is not in the (current) Dict items.
-# Apparently this is some Traits 'feature'.
-        new_args = []
-        for arg in args:
-            if isinstance(arg, TraitDictObject):
-                new_args.append(dict(arg))
-            else:
-                new_args.append(arg)
-
         try:
-            conn.send(encrypt((self._id, methodname, new_args, kwds,
-                               get_credentials().encode()), session_key))
+            send_message(conn, (self._id, methodname, args, kwds,
+                                get_credentials().encode()), session_key)
         except IOError as exc:
             msg = "Can't send to server at %r for %r: %r" \
                   % (self._token.address, methodname, exc)
             logging.error(msg)
             raise RuntimeError(msg)
 
-        kind, result = decrypt(conn.recv(), session_key)
+        return receive_message(conn, session_key)
 
+    def _convert_reply(self, kind, result):
+        """ Return result from reply, creating a proxy if necessary. """
         if kind == '#RETURN':
             return result
 
@@ -5,6 +5,7 @@ Multiprocessing support utilities.
 import ConfigParser
 import copy
 import cPickle
+import cStringIO
 import errno
 import getpass
 import inspect
@@ -15,6 +16,8 @@ import socket
 import sys
 import time
 
+import numpy
+
 from Crypto.Cipher import AES
 
 from multiprocessing import current_process, connection
@@ -30,6 +33,10 @@ from openmdao.util.shellproc import ShellProc, STDOUT, PIPE
 SPECIALS = ('__getattribute__', '__getattr__', '__setattr__', '__delattr__')
 
 
+# Prefix of unencrypted messages sent as raw buffers by send_message().
+# Pickled messages start with the protocol 2 opcode '\x80'.
+_RAW_PREFIX = '#RAW'
+
 # Mapping from remote addresses to local tunnel addresses.
 _TUNNEL_MAP = {}
 # Log files that haven't been cleaned up yet due to Windows issue.
@@ -372,6 +379,9 @@ def encrypt(obj, session_key):
     If `session_key` is specified, returns ``(length, data)`` of encrypted,
     pickled, `obj`. Otherwise `obj` is returned.
 
+    If `obj` contains numpy arrays, they are sent as raw buffers following
+    the pickled data and ``(length, data, pickle_length)`` is returned.
+
     obj: object
         Object to be pickled and encrypted.
 
@@ -384,17 +394,61 @@ def encrypt(obj, session_key):
             session_key += '!'*16
         session_key = session_key[:16]
         encryptor = AES.new(session_key, AES.MODE_CBC, '?'*AES.block_size)
-        text = cPickle.dumps(obj, cPickle.HIGHEST_PROTOCOL)
+        text, pickle_length = _dumps(obj)
         length = len(text)
         pad = length % AES.block_size
         if pad:
             pad = AES.block_size - pad
             text += '-'*pad
         data = encryptor.encrypt(text)
+        if pickle_length is not None:
+            return (length, data, pickle_length)
         return (length, data)
     else:
         return obj
 
+def send_message(conn, obj, session_key):
+    """
+    Send `obj` on `conn`, encrypted via :func:`encrypt` if `session_key` is
+    specified. An unencrypted `obj` containing numpy arrays isn't pickled by
+    `conn`, the arrays are sent as raw buffers as they are when encrypted.
+
+    conn: :class:`multiprocessing.Connection`
+        Connection to send on.
+
+    obj: object
+        Object to be sent.
+
+    session_key: string
+        Key used for encryption.
+    """
+    if not session_key and _has_array(obj):
+        text, pickle_length = _dumps(obj)
+        conn.send_bytes(''.join((_RAW_PREFIX, '%016d' % pickle_length, text)))
+    else:
+        conn.send(encrypt(obj, session_key))
+
+
+def receive_message(conn, session_key):
+    """
+    Returns object received on `conn` which was sent by :func:`send_message`
+    (or :meth:`conn.send` if `session_key` is not specified).
+
+    conn: :class:`multiprocessing.Connection`
+        Connection to receive on.
+
+    session_key: string
+        Key used for encryption.
+    """
+    if session_key:
+        return decrypt(conn.recv(), session_key)
+    data = conn.recv_bytes()
+    if data.startswith(_RAW_PREFIX):
+        start = len(_RAW_PREFIX) + 16
+        return _loads(buffer(data, start), int(data[len(_RAW_PREFIX):start]))
+    return cPickle.loads(data)
+
+
 def decrypt(msg, session_key):
     """
     If `session_key` is specified, returns object from encrypted pickled data
@@ -408,20 +462,95 @@ def decrypt(msg, session_key):
     """
     if session_key:
         # Just being defensive, this should never happen.
-        if len(msg) != 2:  #pragma no cover
+        if len(msg) not in (2, 3):  #pragma no cover
             raise RuntimeError('_decrypt: msg not encrypted?')
         # Just being defensive, this should never happen.
         if len(session_key) < 16:  #pragma no cover
             session_key += '!'*16
         session_key = session_key[:16]
         decryptor = AES.new(session_key, AES.MODE_CBC, '?'*AES.block_size)
-        length, data = msg
+        length, data = msg[:2]
         text = decryptor.decrypt(data)
+        if len(msg) == 3:
+            return _loads(text, msg[2])
         return cPickle.loads(text[:length])
     else:
         return msg
 
 
+def _has_array(obj, depth=4):
+    """
+    Returns True if `obj` or a container within `depth` levels of `obj`
+    is a numpy array which can be sent as a raw buffer.
+    """
+    if type(obj) is numpy.ndarray:
+        return obj.dtype.fields is None and not obj.dtype.hasobject
+    if depth:
+        if isinstance(obj, (tuple, list)):
+            for item in obj:
+                if _has_array(item, depth-1):
+                    return True
+        elif isinstance(obj, dict):
+            for item in obj.itervalues():
+                if _has_array(item, depth-1):
+                    return True
+    return False
+
+
+def _dumps(obj):
+    """
+    Returns ``(text, pickle_length)`` for pickled `obj`. Numpy arrays are not
+    pickled, a reference is pickled and their raw data is appended following
+    the first `pickle_length` bytes of `text`. If there are no such arrays,
+    `pickle_length` is None.
+    """
+    if not _has_array(obj):
+        return (cPickle.dumps(obj, cPickle.HIGHEST_PROTOCOL), None)
+
+    buffers = []
+    offsets = [0]
+
+    def persistent_id(obj):
+        if type(obj) is numpy.ndarray and \
+           obj.dtype.fields is None and not obj.dtype.hasobject:
+            arr = numpy.ascontiguousarray(obj)
+            buffers.append(arr)
+            offset = offsets[0]
+            offsets[0] += arr.nbytes
+            return ('ndarray', offset, arr.dtype.str, arr.shape)
+        return None
+
+    out = cStringIO.StringIO()
+    pickler = cPickle.Pickler(out, cPickle.HIGHEST_PROTOCOL)
+    pickler.persistent_id = persistent_id
+    pickler.dump(obj)
+    pickle_length = out.tell()
+    for arr in buffers:
+        out.write(buffer(arr))
+    return (out.getvalue(), pickle_length)
+
+
+def _loads(text, pickle_length):
+    """
+    Returns object from data created by :func:`_dumps`.
+    Array data follows the first `pickle_length` bytes of `text`.
+    """
+    def persistent_load(pid):
+        tag, offset, dtype, shape = pid
+        dtype = numpy.dtype(dtype)
+        count = 1
+        for dim in shape:
+            count *= dim
+        if not count:
+            return numpy.empty(shape, dtype)
+        arr = numpy.frombuffer(text, dtype, count, pickle_length+offset)
+        return arr.reshape(shape).copy()
+
+    unpickler = cPickle.Unpickler(cStringIO.StringIO(text[:pickle_length]))
+    unpickler.persistent_load = persistent_load
+    return unpickler.load()
+
+
 def public_methods(obj):
     """
     Returns a list of names of the methods of `obj` to be exposed.
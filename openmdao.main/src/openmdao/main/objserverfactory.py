@@ -10,6 +10,7 @@ import optparse
 import os.path
 import pkg_resources
 import platform
+import re
 import shutil
 import signal
 import socket
@@ -31,7 +32,7 @@ from openmdao.main.rbac import get_credentials, set_credentials, \
                                rbac, RoleError
 from openmdao.main.releaseinfo import __version__
 
-from openmdao.util.filexfer import pack_zipfile, unpack_zipfile
+from openmdao.util.filexfer import file_digest, pack_zipfile, unpack_zipfile
 from openmdao.util.log import install_remote_handler, remove_remote_handlers, \
                               logging_port, LOG_DEBUG2
 from openmdao.util.publickey import make_private, read_authorized_keys, \
@@ -41,6 +42,12 @@ from openmdao.util.fileutil import onerror
 
 _PROXIES = {}
 
+# File cache entries are named by SHA1 hex digest.
+_DIGEST_RE = re.compile(r'^[0-9a-f]{40}$')
+
+# Default limit on the total size (bytes) of a file cache.
+_FILE_CACHE_SIZE = 4 << 30
+
 
 class ObjServerFactory(Factory):
     """
@@ -66,6 +73,11 @@ class ObjServerFactory(Factory):
 
     The environment variable ``OPENMDAO_KEEPDIRS`` can be used to avoid
     having server directory trees removed when servers are shut down.
+
+    Created servers share a per-user file cache in the ``_file_cache``
+    subdirectory of the factory's directory. This persists across server
+    allocations so that unchanged input files need not be re-sent. Least
+    recently used files are removed to keep it within its size limit.
     """
 
     # These are used to propagate selections from main().
@@ -93,6 +105,7 @@ class ObjServerFactory(Factory):
         self.version = __version__
         self.manager_class = _ServerManager
         self.server_classname = 'openmdao_main_objserverfactory_ObjServer'
+        self._cache_root = os.path.join(os.getcwd(), '_file_cache')
 
     @rbac('*', proxy_types=[object])  # ResourceAllocationManager import loop.
     def get_ram(self):
@@ -322,8 +335,11 @@ class ObjServerFactory(Factory):
             self._logger.info('    in dir %s', root_dir)
             self._logger.info('    listening on %s', manager.address)
             server_class = getattr(manager, self.server_classname)
+            cache_dir = os.path.join(self._cache_root,
+                                     re.sub(r'[^\w.@-]', '_', owner.user))
             server = server_class(name=name, allow_shell=self._allow_shell,
-                                  allowed_types=self._allowed_types)
+                                  allowed_types=self._allowed_types,
+                                  cache_dir=cache_dir)
             self._managers[server] = (manager, root_dir, owner)
 
         if typname:
@@ -362,10 +378,24 @@ class ObjServer(object):
         Names of types which may be created. If None, then allow types listed
         by :meth:`factorymanager.get_available_types`. If empty, no types are
         allowed.
+
+    cache_dir: string
+        Directory used to cache files by content digest, see
+        :meth:`restore_cached_files`. If None, then no caching is performed.
+
+    cache_size: int
+        Limit on the total size (bytes) of files in `cache_dir`. Least
+        recently used files are removed when it is exceeded. If None, then
+        a default of 4GB is used.
     """
 
-    def __init__(self, name='', allow_shell=False, allowed_types=None):
+    def __init__(self, name='', allow_shell=False, allowed_types=None,
+                 cache_dir=None, cache_size=None):
         self._allow_shell = allow_shell
+        self._cache_dir = cache_dir
+        if cache_size is None:
+            cache_size = _FILE_CACHE_SIZE
+        self._cache_size = cache_size
         if allowed_types is None:
             allowed_types = [typname for typname, version
                                       in get_available_types()]
@@ -579,6 +609,131 @@ class ObjServer(object):
         self._check_path(filename, 'unpack_zipfile')
         return unpack_zipfile(filename, self._logger, textfiles)
 
+    @rbac('owner')
+    def restore_cached_files(self, files):
+        """
+        Restore files from the file cache.
+        Returns a list of those paths in `files` which are not in the cache
+        and so must be sent, for example via :meth:`unpack_zipfile`.
+        Constant files are hard-linked from the cache (if possible),
+        others are copied. Since a hard link shares its contents with the
+        cache, a linked file is checked against its digest first, and is
+        discarded from the cache if it was modified in place.
+
+        files: dict
+            Maps from path to ``(digest, constant)``, where `digest` is
+            from :func:`file_digest` of the original file.
+        """
+        self._logger.debug('restore_cached_files %d', len(files))
+        if not self._cache_dir:
+            return sorted(files.keys())
+
+        missing = []
+        for path, (digest, constant) in sorted(files.items()):
+            self._check_path(path, 'restore_cached_files')
+            self._check_digest(digest, 'restore_cached_files')
+            cached = os.path.join(self._cache_dir, digest)
+            if not os.path.exists(cached):
+                missing.append(path)
+                continue
+            link = constant and hasattr(os, 'link')
+            if link and file_digest(cached) != digest:
+                self._logger.warning('    discarding modified %r', digest)
+                os.remove(cached)
+                missing.append(path)
+                continue
+            self._logger.debug('    restoring %r (%s)', path, digest)
+            self._mark_used(cached)
+            directory = os.path.dirname(path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            if os.path.exists(path):
+                os.remove(path)
+            if link:
+                try:
+                    os.link(cached, path)
+                    continue
+                except OSError:  # Possibly different filesystems.
+                    pass
+            shutil.copy2(cached, path)
+        return missing
+
+    @rbac('owner')
+    def cache_files(self, files):
+        """
+        Copy files into the file cache. Files whose contents don't match
+        their digest are not cached. Least recently used files are then
+        removed until the cache is within its size limit.
+
+        files: dict
+            Maps from path to ``(digest, constant)``, as for
+            :meth:`restore_cached_files`.
+        """
+        self._logger.debug('cache_files %d', len(files))
+        if not self._cache_dir:
+            return
+        if not os.path.exists(self._cache_dir):
+            try:
+                os.makedirs(self._cache_dir)
+            except OSError:  # Possibly created by another server.
+                if not os.path.isdir(self._cache_dir):
+                    raise
+
+        added = False
+        for path, (digest, constant) in sorted(files.items()):
+            self._check_path(path, 'cache_files')
+            self._check_digest(digest, 'cache_files')
+            cached = os.path.join(self._cache_dir, digest)
+            if os.path.exists(cached):
+                continue
+            self._logger.debug('    caching %r (%s)', path, digest)
+            # Rename of a private copy keeps concurrent servers consistent.
+            tmp = '%s.%d' % (cached, os.getpid())
+            shutil.copy2(path, tmp)
+            if file_digest(tmp) != digest:
+                self._logger.warning("not caching %r, digest mismatch", path)
+                os.remove(tmp)
+                continue
+            os.rename(tmp, cached)
+            self._mark_used(cached)
+            added = True
+
+        if added:
+            self._evict_cached_files()
+
+    def _mark_used(self, cached):
+        """ Record use of file cache entry `cached` in its access time. """
+        info = os.stat(cached)
+        os.utime(cached, (time.time(), info.st_mtime))
+
+    def _evict_cached_files(self):
+        """
+        Remove least recently used files from the file cache until it is
+        within its size limit.
+        """
+        entries = []
+        total = 0
+        for name in os.listdir(self._cache_dir):
+            if not _DIGEST_RE.match(name):
+                continue  # Another server's partial copy.
+            cached = os.path.join(self._cache_dir, name)
+            try:
+                info = os.stat(cached)
+            except OSError:  # Removed by another server.
+                continue
+            entries.append((info.st_atime, info.st_size, cached))
+            total += info.st_size
+
+        for atime, size, cached in sorted(entries):
+            if total <= self._cache_size:
+                break
+            self._logger.debug('    evicting %r', os.path.basename(cached))
+            try:
+                os.remove(cached)
+            except OSError:  # Removed by another server.
+                pass
+            total -= size
+
     @rbac('owner')
     def chmod(self, path, mode):
         """
@@ -697,6 +852,13 @@ class ObjServer(object):
             raise RuntimeError("Can't %s %r, not within root %s"
                                % (operation, path, self._root_dir))
 
+    def _check_digest(self, digest, operation):
+        """ Check if digest is a valid cache file name. """
+        if not isinstance(digest, basestring) or \
+           not _DIGEST_RE.match(digest):
+            raise RuntimeError("Can't %s, invalid digest %r"
+                               % (operation, digest))
+
 
 class _ServerManager(OpenMDAO_Manager):
     """
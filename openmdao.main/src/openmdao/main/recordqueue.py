@@ -0,0 +1,116 @@
+"""
+Background thread that passes recorded cases to case recorders, so that
+writing them doesn't slow down the run.
+"""
+
+import os
+import Queue
+import sys
+import threading
+import time
+from copy import deepcopy
+
+from numpy import ndarray
+
+from openmdao.main.rbac import get_credentials, set_credentials
+from openmdao.main.vartree import VariableTree
+
+__all__ = ['RecordingQueue', 'snapshot']
+
+# Maximum number of cases taken from the queue at once.
+_BATCH_SIZE = 100
+
+_STOP = object()
+
+
+def snapshot(value):
+    """ Return a copy of `value` that is unaffected by later changes to the
+    model. Immutable values are returned as is.
+    """
+    if isinstance(value, ndarray):
+        return value.copy()
+    elif isinstance(value, (float, int, long, complex, basestring, bool)) or \
+         value is None:
+        return value
+    elif isinstance(value, VariableTree):
+        return value.copy()
+    return deepcopy(value)
+
+
+class RecordingQueue(object):
+    """ Passes cases to `recorders` from a background thread. At most
+    `maxsize` cases may be waiting; :meth:`put` blocks when the queue is
+    full. Cases are taken from the queue in batches. Flushing output is up
+    to the recorders. :meth:`close` waits until all cases have been passed
+    on.
+
+    The queue is only drained in the process that created it. In a forked
+    worker process :meth:`put` and :meth:`close` do nothing, since the
+    thread doesn't exist there.
+    """
+
+    def __init__(self, recorders, maxsize=100):
+        self.recorders = list(recorders)
+        self._pid = os.getpid()
+        self._queue = Queue.Queue(maxsize)
+        self._error = None
+        self._thread = threading.Thread(target=self._run,
+                                        args=(get_credentials(),),
+                                        name='RecordingQueue')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def put(self, driver, inputs, outputs, exc, case_uuid, parent_uuid):
+        """ Queue a case for the recorders. `inputs` and `outputs` should be
+        snapshots of the values (see :func:`snapshot`). The case is
+        timestamped now rather than when it's recorded.
+        Raises any exception raised by a recorder since the last call.
+        """
+        if os.getpid() != self._pid:
+            return
+        self._check_error()
+        self._queue.put(((driver, inputs, outputs, exc, case_uuid,
+                          parent_uuid), time.time()))
+
+    def close(self):
+        """ Wait for all queued cases to be recorded and stop the thread.
+        Raises any exception raised by a recorder.
+        """
+        if os.getpid() != self._pid:
+            return
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        self._check_error()
+
+    def _check_error(self):
+        """ Raise the saved recorder exception, if any. """
+        if self._error is not None:
+            info, self._error = self._error, None
+            raise info[0], info[1], info[2]
+
+    def _run(self, credentials):
+        """ Thread loop: record cases until :meth:`close` is called. """
+        set_credentials(credentials)
+        done = False
+        while not done:
+            batch = [self._queue.get()]
+            while len(batch) < _BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except Queue.Empty:
+                    break
+
+            for case in batch:
+                if case is _STOP:
+                    done = True
+                    break
+                if self._error is None:
+                    args, timestamp = case
+                    try:
+                        for recorder in self.recorders:
+                            recorder.record(*args, timestamp=timestamp)
+                    except Exception:
+                        self._error = sys.exc_info()
+
@@ -1,28 +1,37 @@
+import multiprocessing
 import sys
+import weakref
 from StringIO import StringIO
 from collections import OrderedDict
 from itertools import chain
 
 import numpy
 import networkx as nx
+from scipy.sparse import csr_matrix
 from zope.interface import implements
 
 # pylint: disable-msg=E0611,F0401
 from openmdao.main.mpiwrap import MPI, MPI_info, mpiprint, PETSc
 from openmdao.main.exceptions import RunStopped
 from openmdao.main.finite_difference import FiniteDifference, DirectionalFD
-from openmdao.main.linearsolver import ScipyGMRES, PETSc_KSP, LinearGS
+from openmdao.main.linearsolver import ScipyGMRES, PETSc_KSP, LinearGS, \
+                                       DirectSolver
 from openmdao.main.mp_support import has_interface
 from openmdao.main.interfaces import IDriver, IAssembly, IImplicitComponent, \
                                      ISolver, IPseudoComp, IComponent, ISystem
 from openmdao.main.vecwrapper import VecWrapper, InputVecWrapper, DataTransfer, \
                                      idx_merge, petsc_linspace, _filter, _filter_subs, \
-                                     _filter_flat, _filter_ignored
+                                     _filter_flat, _filter_ignored, _index_map, \
+                                     _in_order
 from openmdao.main.depgraph import break_cycles, get_node_boundary, gsort, \
                                    collapse_nodes, simple_node_iter
-from openmdao.main.derivatives import applyJ, applyJT
+from openmdao.main.derivatives import applyJ, applyJT, assembleJ
+from openmdao.main.workerpool import WorkerPool, workers_available
 from openmdao.util.graph import base_var
 
+# ParallelSystems with a pool of worker processes.
+_POOL_SYSTEMS = weakref.WeakSet()
+
 
 class System(object):
     implements(ISystem)
@@ -99,6 +108,9 @@ class System(object):
         self.ln_solver = None
         self.fd_solver = None
         self.dfd_solver = None
+        # Boolean nonzero pattern of the finite difference Jacobian (see
+        # fd_coloring). Lives as long as we do, which is until config_changed.
+        self.fd_sparsity = None
         self.sol_buf = None
         self.rhs_buf = None
         self._parent_system = None
@@ -705,12 +717,12 @@ class System(object):
 
             solver_choice = self.options.lin_solver
 
-            # scipy_gmres not supported in MPI, so swap with
+            # scipy_gmres and direct not supported in MPI, so swap with
             # petsc KSP.
-            if MPI and solver_choice=='scipy_gmres':
-                solver_choice = 'petsc_ksp'
-                msg = "scipy_gmres optimizer not supported in MPI. " + \
+            if MPI and solver_choice in ('scipy_gmres', 'direct'):
+                msg = "%s optimizer not supported in MPI. " % solver_choice + \
                       "Using petsc_ksp instead."
+                solver_choice = 'petsc_ksp'
                 self.options.parent._logger.warning(msg)
 
             if solver_choice == 'scipy_gmres':
@@ -719,13 +731,83 @@ class System(object):
                 self.ln_solver = PETSc_KSP(self)
             elif solver_choice == 'linear_gs':
                 self.ln_solver = LinearGS(self)
+            elif solver_choice == 'direct':
+                self.ln_solver = DirectSolver(self)
 
     def linearize(self):
         """ Linearize local subsystems. """
 
+        if self.ln_solver is not None:
+            self.ln_solver.reset()
+
         for subsystem in self.local_subsystems():
             subsystem.linearize()
 
+    def assemble_jacobian(self, variables):
+        """ Returns the linear operator that applyJ applies in forward mode
+        as a scipy.sparse CSR matrix, built from the Jacobians computed in
+        the last linearize(). Components that only have apply_deriv are
+        probed over their own inputs. Returns None if some subsystem has
+        nothing to assemble from (e.g., a directional finite difference).
+        """
+        du = self.vec['du'].array
+        df = self.vec['df'].array
+        saved = [(du, du.copy()), (df, df.copy())]
+
+        # Load every entry with its own index, offset by one. After the
+        # du -> dp scatters, each view that applyJ reads from or writes to
+        # tells us where its entries live in the global vectors. The dp
+        # vectors are zeroed first, so an entry that no scatter reaches
+        # decodes to -1 and is dropped, just as it contributes nothing to
+        # applyJ after clear_dp.
+        index = numpy.arange(1, du.size + 1, dtype=float)
+        du[:] = index
+        df[:] = index
+
+        rows, cols, data = [], [], []
+        try:
+            self._scatter_index(saved)
+            success = self.assembleJ(variables, rows, cols, data)
+        finally:
+            for array, old in saved:
+                array[:] = old
+
+        if not success:
+            return None
+
+        if rows:
+            rows = numpy.concatenate(rows)
+            cols = numpy.concatenate(cols)
+            data = numpy.concatenate(data)
+            keep = numpy.logical_and(rows >= 0, cols >= 0)
+            rows, cols, data = rows[keep], cols[keep], data[keep]
+
+        # Duplicate entries are summed, just like the += in applyJ.
+        return csr_matrix((data, (rows, cols)), shape=(du.size, du.size))
+
+    def _scatter_index(self, saved):
+        """ Scatters du into dp at this level and below, without regard to
+        mode, saving the old dp contents in saved. Each dp is zeroed before
+        its scatter so that nothing left over from an earlier solve can be
+        mistaken for an index."""
+        if 'dp' in self.vec:
+            dp = self.vec['dp'].array
+            saved.append((dp, dp.copy()))
+            dp[:] = 0.0
+            if self.scatter_full is not None and \
+               self.scatter_full.scatter is not None:
+                self.scatter_full.scatter.scatter(self.vec['du'].array, dp,
+                                                  False, False)
+
+        for subsystem in self.local_subsystems():
+            subsystem._scatter_index(saved)
+
+    def assembleJ(self, variables, rows, cols, data):
+        """ Appends this system's contribution to the assembled Jacobian to
+        rows, cols and data. Returns False if it can only be applied
+        matrix-free."""
+        return False
+
     def set_complex_step(self, complex_step=False):
         """ Toggles complex_step plumbing for this system and all
         local subsystems.
@@ -786,9 +868,15 @@ class System(object):
                                               return_format)
         return self.fd_solver.solve(iterbase=iterbase)
 
-    def calc_newton_direction(self, options=None, iterbase=''):
+    def calc_newton_direction(self, options=None, iterbase='',
+                              linearize=True, tol=None, guess=None):
         """ Solves for the new state in Newton's method and leaves it in the
         df vector.
+
+        If `linearize` is False, the linearization (and any factorization
+        the linear solver derived from it) from the previous call is reused.
+        An iterative linear solver stops at relative tolerance `tol` if
+        given, starting from the Newton direction `guess` if given.
         """
 
         self.set_options('forward', options)
@@ -798,10 +886,14 @@ class System(object):
         self.vec['dp'].array[:] = 0.0
 
         self.initialize_gradient_solver()
-        self.linearize()
+        if linearize:
+            self.linearize()
+
+        x0 = None if guess is None else -guess
 
         #print 'Newton Direction', self.vec['f'].array[:]
-        self.vec['df'].array[:] = -self.ln_solver.solve(self.vec['f'].array)
+        self.vec['df'].array[:] = -self.ln_solver.solve(self.vec['f'].array,
+                                                        x0=x0, tol=tol)
         #print 'Newton Solution', self.vec['df'].array[:]
 
     def solve_linear(self, options=None):
@@ -1047,6 +1139,26 @@ class SimpleSystem(System):
 
                 vec['du'][var][:] += vec['df'][var][:]
 
+    def assembleJ(self, variables, rows, cols, data):
+        """ Entries of df = du - dGdp * dp """
+
+        vec = self.vec
+
+        start = len(data)
+        if not assembleJ(self, variables, rows, cols, data):
+            return False
+
+        for i in range(start, len(data)):
+            data[i] = -data[i]
+
+        for var in self.list_outputs():
+            irow = vec['df'][var].astype(int) - 1
+            rows.append(irow)
+            cols.append(vec['du'][var].astype(int) - 1)
+            data.append(numpy.ones(len(irow)))
+
+        return True
+
     def solve_linear(self, options=None):
         """ Single linear solve solution applied to whatever input is sitting
         in the RHS vector."""
@@ -1066,6 +1178,9 @@ class VarSystem(SimpleSystem):
     def applyJ(self, variables):
         pass
 
+    def assembleJ(self, variables, rows, cols, data):
+        return True
+
     def stop(self):
         pass
 
@@ -1096,6 +1211,20 @@ class ParamSystem(VarSystem):
         if system:
             system.rhs_vec[self.name] += system.sol_vec[self.name]
 
+    def assembleJ(self, variables, rows, cols, data):
+        """ Identity """
+        system = None
+        if self.vector_vars or self._dup_in_subdriver:
+            system = self._get_sys()
+
+        if system:
+            irow = system.vec['df'][self.name].astype(int) - 1
+            rows.append(irow)
+            cols.append(system.vec['du'][self.name].astype(int) - 1)
+            data.append(numpy.ones(len(irow)))
+
+        return True
+
     def pre_run(self):
         """ Load param value into u vector. """
         self._get_sys().vec['u'].set_from_scope(self.scope)#, [self.name])
@@ -1131,6 +1260,17 @@ class InVarSystem(VarSystem):
            self.scope.name2collapsed.get(self.name) in variables:
             self.rhs_vec[self.name] += self.sol_vec[self.name]
 
+    def assembleJ(self, variables, rows, cols, data):
+        """ Identity """
+        if self.variables and \
+           self.scope.name2collapsed.get(self.name) in variables:
+            irow = self.vec['df'][self.name].astype(int) - 1
+            rows.append(irow)
+            cols.append(self.vec['du'][self.name].astype(int) - 1)
+            data.append(numpy.ones(len(irow)))
+
+        return True
+
     def pre_run(self):
         """ Load param value into u vector. """
         #if self.name in self.vector_vars:
@@ -1260,8 +1400,15 @@ class CompoundSystem(System):
     """A System that has subsystems."""
 
     def __init__(self, scope, graph, subg, name=None):
-        super(CompoundSystem, self).__init__(scope, graph,
-                                             subg.nodes(), name)
+        # nodes for nested subsystems aren't in the graph, so use the
+        # nodes that those subsystems were built from instead.
+        nodes = []
+        for node, data in subg.nodes_iter(data=True):
+            if node in graph or 'system' not in data:
+                nodes.append(node)
+            else:
+                nodes.extend(data['system']._nodes)
+        super(CompoundSystem, self).__init__(scope, graph, nodes, name)
         self.driver = None
         self.graph = subg
         self._local_subsystems = []  # subsystems in the same process
@@ -1308,9 +1455,13 @@ class CompoundSystem(System):
         noflats.update([v for v in self._in_nodes if varmeta[v].get('noflat')])
 
         start = numpy.sum(input_sizes[:rank])
-        varkeys = self.vector_vars.keys()
+        order = _index_map(self.vector_vars)
+        # offset of each var in the distributed vector
+        offsets = numpy.concatenate(([0],
+                                     numpy.cumsum(numpy.sum(var_sizes, 0))))
 
         visited = {}
+        owned_args = set(self._owned_args)
 
         # collect all destinations from p vector
         ret = self.vec['p'].get_dests_by_comp()
@@ -1350,34 +1501,32 @@ class CompoundSystem(System):
             scatter_conns = set()
             noflat_conns = set()  # non-flattenable vars
             for sub in subsystem.simple_subsystems():
-                for node in self.vector_vars:
-                    if node in sub._in_nodes:
-                        if node not in self._owned_args or node in scatter_conns:
-                            continue
+                for node in _in_order(sub._in_nodes, order):
+                    if node not in owned_args or node in scatter_conns:
+                        continue
 
-                        isrc = varkeys.index(node)
-                        src_idxs = numpy.sum(var_sizes[:, :isrc]) + self.arg_idx[node]
+                    src_idxs = offsets[order[node]] + self.arg_idx[node]
 
-                        # FIXME: broadcast var nodes will be scattered
-                        #  more than necessary using this scheme. switch to a push
-                        #  model with one scatter per source.
-                        if node in visited:
-                            dest_idxs = visited[node]
-                        else:
-                            dest_idxs = start + self.arg_idx[node]
-                            start += len(dest_idxs)
+                    # FIXME: broadcast var nodes will be scattered
+                    #  more than necessary using this scheme. switch to a push
+                    #  model with one scatter per source.
+                    if node in visited:
+                        dest_idxs = visited[node]
+                    else:
+                        dest_idxs = start + self.arg_idx[node]
+                        start += len(dest_idxs)
 
-                            visited[node] = dest_idxs
+                        visited[node] = dest_idxs
 
-                        if node not in scatter_conns:
-                            scatter_conns.add(node)
-                            src_partial.append(src_idxs)
-                            dest_partial.append(dest_idxs)
+                    if node not in scatter_conns:
+                        scatter_conns.add(node)
+                        src_partial.append(src_idxs)
+                        dest_partial.append(dest_idxs)
 
-                        if node not in scatter_conns_full:
-                            scatter_conns_full.add(node)
-                            src_full.append(src_idxs)
-                            dest_full.append(dest_idxs)
+                    if node not in scatter_conns_full:
+                        scatter_conns_full.add(node)
+                        src_full.append(src_idxs)
+                        dest_full.append(dest_idxs)
 
                 for node in sub._in_nodes:
                     if node in noflats:
@@ -1416,6 +1565,15 @@ class CompoundSystem(System):
             if self.mode == 'adjoint':
                 self.scatter('du', 'dp')
 
+    def assembleJ(self, variables, rows, cols, data):
+        """ Delegate to subsystems """
+
+        if self.is_active():
+            for subsystem in self.local_subsystems():
+                if not subsystem.assembleJ(variables, rows, cols, data):
+                    return False
+        return True
+
     def stop(self):
         self._stop = True
         for s in self.all_subsystems():
@@ -1538,6 +1696,14 @@ class SerialSystem(CompoundSystem):
 
 class ParallelSystem(CompoundSystem):
 
+    def __init__(self, scope, graph, subg, name=None):
+        super(ParallelSystem, self).__init__(scope, graph, subg, name)
+        # number of worker processes used to run our subsystems when
+        # not running under MPI
+        self.n_workers = 0
+        self._pool = None
+        self._shared_u = self._shared_p = self._in_bounds = None
+
     def get_req_cpus(self):
         cpus = 0
         # in a parallel system, the required cpus is the sum of
@@ -1547,6 +1713,12 @@ class ParallelSystem(CompoundSystem):
         self.mpi.requested_cpus = cpus
         return cpus
 
+    def set_ordering(self, ordering, opaque_map):
+        """Our subsystems are independent, but they may contain
+        serial subsystems that need an execution order."""
+        for s in self.all_subsystems():
+            s.set_ordering(ordering, opaque_map)
+
     def run(self, iterbase, case_label='', case_uuid=None):
         # don't scatter unless we contain something that's actually
         # going to run
@@ -1555,8 +1727,11 @@ class ParallelSystem(CompoundSystem):
 
         self.scatter('u', 'p')
 
-        for sub in self.local_subsystems():
-            sub.run(iterbase, case_label=case_label, case_uuid=case_uuid)
+        if self._use_workers():
+            self._run_workers(iterbase, case_label, case_uuid)
+        else:
+            for sub in self.local_subsystems():
+                sub.run(iterbase, case_label=case_label, case_uuid=case_uuid)
 
     def evaluate(self, iterbase, case_label='', case_uuid=None):
         """ Evalutes a component's residuals without invoking its
@@ -1564,8 +1739,136 @@ class ParallelSystem(CompoundSystem):
         """
         self.run(iterbase, case_label=case_label, case_uuid=case_uuid)
 
+    def _use_workers(self):
+        """Return True if our subsystems should be run concurrently in
+        worker processes."""
+
+        # Subdrivers are kept in this process so that their iteration
+        # and case recording happen here.
+        if not workers_available(self.n_workers):
+            return False
+        subs = self.local_subsystems()
+        if len(subs) < 2:
+            return False
+        for sub in subs:
+            if _has_subdriver(sub):
+                return False
+        return True
+
+    def _run_workers(self, iterbase, case_label, case_uuid):
+        """Run each of our subsystems in our pool of worker processes.
+        The workers' copies of the model date from when the pool was
+        created, so the piece of our 'u' vector owned by each subsystem
+        and the flattened values of the subsystem's inputs (its part of the
+        'p' vector) are copied into shared memory for the workers to read.
+        Each worker copies the piece of the 'u' vector it computed back.
+        Only variables that can't be flattened are pickled. The results are
+        then copied into our 'u' vector and set into the scope.
+        """
+        subs = self.local_subsystems()
+        pool = self._get_pool(len(subs))
+
+        shared_u = numpy.frombuffer(self._shared_u)
+        shared_p = numpy.frombuffer(self._shared_p)
+        args = []
+        for i, (sub, (start, end)) in enumerate(zip(subs,
+                                                    self._sub_bounds())):
+            shared_u[start:end] = sub.vec['u'].array
+            for dests, pstart, pend in self._in_bounds[i]:
+                shared_p[pstart:pend] = \
+                    self.scope.get_flattened_value(dests[0])
+            args.append((i, _get_nonvec_values(sub), iterbase, case_label,
+                         case_uuid))
+
+        results = pool.map(args)
+
+        for (start, end), sub, outputs in zip(self._sub_bounds(), subs,
+                                              results):
+            sub.vec['u'].array[:] = shared_u[start:end]
+            sub.vec['u'].set_to_scope(self.scope)
+            for path, value in outputs:
+                self.scope.set(path, value)
+
+    def _get_pool(self, nsubs):
+        """Return our pool of worker processes, creating it (and the
+        shared memory that flattened values are passed through) the first
+        time we're run.  The workers inherit this System when they're
+        forked, so the pool is reused until the end of the top-level run
+        (see :func:`close_worker_pools`).
+        """
+        if self._pool is None:
+            self._in_bounds = []
+            size = 0
+            for sub in self.local_subsystems():
+                bounds = []
+                for dests in _in_dests(sub):
+                    end = size + \
+                          self.scope.get_flattened_value(dests[0]).size
+                    bounds.append((dests, size, end))
+                    size = end
+                self._in_bounds.append(bounds)
+            self._shared_p = multiprocessing.RawArray('d', size)
+            self._shared_u = \
+                multiprocessing.RawArray('d', self._sub_bounds()[-1][1])
+            self._pool = WorkerPool(self, '_run_in_worker', self.scope,
+                                    min(self.n_workers, nsubs))
+            _POOL_SYSTEMS.add(self)
+        return self._pool
+
+    def _close_pool(self):
+        """Terminate our pool of worker processes, if any."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+            self._shared_u = self._shared_p = self._in_bounds = None
+        _POOL_SYSTEMS.discard(self)
+
+    def _run_in_worker(self, i, values, iterbase, case_label, case_uuid):
+        """Run our i'th subsystem. This executes in a worker process."""
+
+        sub = self.local_subsystems()[i]
+        start, end = self._sub_bounds()[i]
+        shared_u = numpy.frombuffer(self._shared_u)
+        shared_p = numpy.frombuffer(self._shared_p)
+        sub.vec['u'].array[:] = shared_u[start:end]
+        sub.vec['u'].set_to_scope(self.scope)
+        for dests, pstart, pend in self._in_bounds[i]:
+            for dest in dests:
+                self.scope.set_flattened_value(dest, shared_p[pstart:pend])
+        for path, value in values:
+            self.scope.set(path, value)
+
+        sub.run(iterbase, case_label=case_label, case_uuid=case_uuid)
+
+        shared_u[start:end] = sub.vec['u'].array
+
+        # outputs that aren't in the 'u' vector are sent back by value
+        return _get_nonvec_values(sub, True)
+
+    def _sub_bounds(self):
+        """Return a list of (start, end) tuples giving the piece of
+        our 'u' vector owned by each local subsystem.
+        """
+        bounds = []
+        start = 0
+        for sub in self.local_subsystems():
+            end = start + sub.vec['u'].array.size
+            bounds.append((start, end))
+            start = end
+        return bounds
+
     def setup_communicators(self, comm):
         self.mpi.comm = comm
+
+        # workers forked before this setup have a stale copy of the model
+        self._close_pool()
+
+        if MPI is None:
+            for sub in self.all_subsystems():
+                sub._parent_system = self
+                sub.setup_communicators(comm)
+            return
+
         size = comm.size
         rank = comm.rank
 
@@ -1628,6 +1931,10 @@ class ParallelSystem(CompoundSystem):
 
     def setup_variables(self, resid_state_map=None):
         """ Determine variables from local subsystems """
+        if MPI is None:
+            # all of our subsystems are local
+            return super(ParallelSystem, self).setup_variables(resid_state_map)
+
         varmeta = self.scope._var_meta
         self.variables = OrderedDict()
         if not self.is_active():
@@ -1657,6 +1964,9 @@ class ParallelSystem(CompoundSystem):
         self._create_var_dicts(resid_state_map)
 
     def simple_subsystems(self):
+        if MPI is None:
+            return super(ParallelSystem, self).simple_subsystems()
+
         lsys = self.local_subsystems()
         if lsys:
             return lsys[0].simple_subsystems()
@@ -1862,6 +2172,26 @@ class OpaqueSystem(SimpleSystem):
                 if var in dfvec:
                     vec['du'][var][:] += dfvec[var][:]
 
+    def assembleJ(self, variables, rows, cols, data):
+        vec = self.vec
+        dfvec = vec['df']
+
+        start = len(data)
+        if not assembleJ(self, variables, rows, cols, data):
+            return False
+
+        for i in range(start, len(data)):
+            data[i] = -data[i]
+
+        for var in self.list_outputs():
+            if var in dfvec:
+                irow = dfvec[var].astype(int) - 1
+                rows.append(irow)
+                cols.append(vec['du'][var].astype(int) - 1)
+                data.append(numpy.ones(len(irow)))
+
+        return True
+
     def set_ordering(self, ordering, opaque_map):
         self._inner_system.set_ordering(ordering, opaque_map)
 
@@ -1966,6 +2296,14 @@ class TransparentDriverSystem(DriverSystem):
         if self.mode == 'adjoint':
             self.scatter('du', 'dp')
 
+    def assembleJ(self, variables, rows, cols, data):
+        """ Delegate to subsystems """
+
+        for subsystem in self.local_subsystems():
+            if not subsystem.assembleJ(variables, rows, cols, data):
+                return False
+        return True
+
     def linearize(self):
         """ Solvers must Linearize all of their subsystems. """
 
@@ -2158,6 +2496,62 @@ def get_branch(g, node, visited=None):
             branch.extend(get_branch(g, succ, visited))
     return branch
 
+def _in_dests(system):
+    """Return a list of the tuples of destinations of each of the given
+    System's inputs from outside of it.
+    """
+    return [name[1] if isinstance(name, tuple) else (name,)
+            for name in system._in_nodes]
+
+def _get_nonvec_values(system, outputs_only=False):
+    """Return a list of (path, value) tuples for the outputs, and unless
+    outputs_only is True the inputs, of the Components in the given System
+    that aren't passed via its 'u' vector or its inputs from outside.
+    """
+    invec = set()
+    for name in system.vec['u'].keys():
+        if isinstance(name, tuple):
+            invec.add(name[0])
+            invec.update(name[1])
+        else:
+            invec.add(name)
+    for dests in _in_dests(system):
+        invec.update(dests)
+
+    values = []
+    for simple in system.simple_subsystems():
+        comp = getattr(simple, '_comp', None)
+        if comp is None:
+            continue
+        names = comp.list_outputs()
+        if not outputs_only:
+            names = comp.list_inputs() + names
+        for name in names:
+            path = '.'.join((comp.name, name))
+            if path not in invec:
+                values.append((path, getattr(comp, name)))
+    return values
+
+def close_worker_pools(scope):
+    """Terminate the worker pools of the ParallelSystems whose scope is
+    `scope` or is contained in it.
+    """
+    for system in list(_POOL_SYSTEMS):
+        obj = system.scope
+        while obj is not None and obj is not scope:
+            obj = obj.parent
+        if obj is scope:
+            system._close_pool()
+
+def _has_subdriver(system):
+    """Return True if the given System contains a DriverSystem."""
+    for sub in system.simple_subsystems():
+        if isinstance(sub, DriverSystem):
+            return True
+        if isinstance(sub, OpaqueSystem) and _has_subdriver(sub._inner_system):
+            return True
+    return False
+
 def get_comm_if_active(obj, comm):
     if comm is None or comm == MPI.COMM_NULL:
         return comm
@@ -155,6 +155,33 @@ class TestCase(unittest.TestCase):
         else:
             self.fail('expected NotImplementedError')
 
+    def test_skip_unchanged(self):
+        comp = self.comp
+        comp.run()
+        comp.run()
+        self.assertEqual(comp.exec_count, 2)
+        self.assertEqual(comp.skip_count, 0)
+
+        comp.skip_unchanged = True
+        comp.run()
+        comp.run()
+        self.assertEqual(comp.exec_count, 3)
+        self.assertEqual(comp.skip_count, 1)
+
+        comp.x = 3.
+        comp.run()
+        self.assertEqual(comp.exec_count, 4)
+        self.assertEqual(comp.xout, 6.)
+
+        # modifying an array in place is detected
+        comp.areq = [1., 2.]
+        comp.run()
+        comp.areq[1] = 5.
+        comp.run()
+        comp.run()
+        self.assertEqual(comp.exec_count, 6)
+        self.assertEqual(comp.skip_count, 2)
+
     def test_get_entry_group(self):
         self.assertEqual(_get_entry_group(Component()), 'openmdao.component')
 
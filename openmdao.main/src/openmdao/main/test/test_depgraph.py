@@ -342,6 +342,28 @@ class DepGraphTestCase(unittest.TestCase):
         self.assertEqual(set(g.nodes()), set(self.comps))
         self.assertEqual(set(g.edges()), set([('B','C'),('C','D')]))
 
+    def test_component_graph_update(self):
+        g = self.dep.component_graph()
+        self.dep.connect(self.scope, 'C.c', 'D.a')
+        self.dep.connect(self.scope, 'C.d[1]', 'D.b')
+        self.assertTrue(self.dep.component_graph() is g)
+        self.assertEqual(set(g.edges()), set([('A','B'),('B','C'),('C','D')]))
+
+        # C and D are still connected through C.d[1]
+        self.dep.disconnect('C.c', 'D.a')
+        self.assertTrue(self.dep.component_graph() is g)
+        self.assertEqual(set(g.edges()), set([('A','B'),('B','C'),('C','D')]))
+
+        self.dep.disconnect('C.d[1]', 'D.b')
+        self.assertTrue(self.dep.component_graph() is g)
+        self.assertEqual(set(g.edges()), set([('A','B'),('B','C')]))
+
+        # compare to a graph built from scratch
+        self.dep.config_changed()
+        fresh = self.dep.component_graph()
+        self.assertFalse(fresh is g)
+        self.assertEqual(set(fresh.edges()), set(g.edges()))
+
     def test_comp_graph_input_as_output(self):
         dep, scope = _make_graph(comps=['A','B'],
                                  connections=[('A.in1','B.in1')],
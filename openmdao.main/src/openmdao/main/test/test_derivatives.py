@@ -750,6 +750,60 @@ class Testcase_derivatives(unittest.TestCase):
         assert_rel_error(self, J[0, 0], 5.0, 0.0001)
         assert_rel_error(self, J[0, 1], 21.0, 0.0001)
 
+    def test_setup_cache(self):
+
+        top = set_as_top(Assembly())
+        top.add('comp', Paraboloid())
+        top.add('driver', SimpleDriver())
+        top.driver.workflow.add(['comp'])
+        top.driver.add_parameter('comp.x', low=-1000, high=1000)
+        top.driver.add_parameter('comp.y', low=-1000, high=1000)
+        top.driver.add_objective('comp.f_xy')
+
+        top.comp.x = 3
+        top.comp.y = 5
+        top.run()
+
+        J = top.driver.calc_gradient(inputs=['comp.x', 'comp.y'],
+                                     outputs=['comp.f_xy'])
+        system_xy = top._system
+        assert_rel_error(self, J[0, 1], 21.0, 0.0001)
+
+        J = top.driver.calc_gradient(inputs=['comp.y'],
+                                     outputs=['comp.f_xy'], mode='adjoint')
+        system_y = top._system
+        self.assertTrue(system_y is not system_xy)
+        assert_rel_error(self, J[0, 0], 21.0, 0.0001)
+
+        # Alternating requests reuse the earlier setups.
+        top.comp.y = 6
+        top.run()
+        J = top.driver.calc_gradient(inputs=['comp.x', 'comp.y'],
+                                     outputs=['comp.f_xy'], mode='fd')
+        self.assertTrue(top._system is system_xy)
+        assert_rel_error(self, J[0, 0], 6.0, 0.0001)
+        assert_rel_error(self, J[0, 1], 23.0, 0.0001)
+
+        J = top.driver.calc_gradient(inputs=['comp.y'],
+                                     outputs=['comp.f_xy'])
+        self.assertTrue(top._system is system_y)
+        assert_rel_error(self, J[0, 0], 23.0, 0.0001)
+
+        # Differentiability is part of the setup.
+        top.comp.force_fd = True
+        J = top.driver.calc_gradient(inputs=['comp.y'],
+                                     outputs=['comp.f_xy'])
+        self.assertTrue(top._system is not system_y)
+        assert_rel_error(self, J[0, 0], 23.0, 0.0001)
+        top.comp.force_fd = False
+
+        # Configuration changes invalidate the cache.
+        top.driver.add_constraint('comp.x < 10')
+        J = top.driver.calc_gradient(inputs=['comp.y'],
+                                     outputs=['comp.f_xy'])
+        self.assertTrue(top._system is not system_y)
+        assert_rel_error(self, J[0, 0], 23.0, 0.0001)
+
     def test_multi_non_relevant_path(self):
 
         self.top = set_as_top(Assembly())
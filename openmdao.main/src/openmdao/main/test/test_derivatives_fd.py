@@ -9,6 +9,7 @@ import numpy as np
 from openmdao.main.api import Component, VariableTree, Driver, Assembly, set_as_top
 from openmdao.main.datatypes.api import Float, Array
 from openmdao.main.depgraph import simple_node_iter
+from openmdao.main.file_supp import FileMetadata
 from openmdao.main.test.test_derivatives import SimpleDriver, ArrayComp2D
 from openmdao.test.execcomp import ExecCompWithDerivatives, ExecComp
 from openmdao.util.testutil import assert_rel_error
@@ -78,6 +79,18 @@ class ArrayParaboloid(Component):
         x = self.x
         self.f_x = (x[0][0]-3.0)**2 + x[0][0]*x[0][1] + (x[0][1]+4.0)**2 - 3.0
 
+class ArrayDiagonal(Component):
+
+    x = Array(np.ones(10), iotype='in')
+    a = Float(0.0, iotype='in')
+    y = Array(np.zeros(10), iotype='out')
+    z = Float(iotype='out')
+
+    def execute(self):
+        """y is x squared elementwise, z couples a with x[0]."""
+        self.y = self.x**2
+        self.z = self.a*self.x[0]
+
 class TestFiniteDifference(unittest.TestCase):
 
     def test_fd_step(self):
@@ -200,6 +213,114 @@ class TestFiniteDifference(unittest.TestCase):
         J = model.driver.calc_gradient(outputs=['comp.y'])
         assert_rel_error(self, J[0, 0], 4.2, 0.0001)
 
+    def test_fd_workers(self):
+
+        model = set_as_top(Assembly())
+        model.add('comp', MyComp())
+        model.driver.workflow.add(['comp'])
+        model.run()
+
+        inputs = ['comp.x1', 'comp.x2', 'comp.x3', 'comp.x4', 'comp.x5']
+        J_serial = model.driver.calc_gradient(inputs=inputs,
+                                              outputs=['comp.y'])
+
+        # The perturbed points run in the workers, not in this process.
+        model.driver.gradient_options.fd_workers = 3
+        count = model.comp.exec_count
+        J = model.driver.calc_gradient(inputs=inputs, outputs=['comp.y'])
+        self.assertEqual(model.comp.exec_count, count)
+        for i in range(len(inputs)):
+            assert_rel_error(self, J[0, i], J_serial[0, i], 1e-12)
+        assert_rel_error(self, J[0, 2], 4.0, 0.0001)
+        assert_rel_error(self, J[0, 4], 4.2, 0.0001)
+        self.assertEqual(model.comp.y, 12.000002)
+
+        model.driver.gradient_options.fd_form = 'central'
+        J = model.driver.calc_gradient(inputs=inputs, outputs=['comp.y'],
+                                       return_format='dict')
+        assert_rel_error(self, J['comp.y']['comp.x2'][0][0], 4.0, 0.0001)
+        assert_rel_error(self, J['comp.y']['comp.x5'][0][0], 4.0, 0.0001)
+
+    def test_fd_workers_option(self):
+
+        model = set_as_top(Assembly())
+        model.add('comp', MyComp())
+        model.driver.workflow.add(['comp'])
+        model.run()
+
+        inputs = ['comp.x1', 'comp.x2', 'comp.x3', 'comp.x4', 'comp.x5']
+        model.driver.calc_gradient(inputs=inputs, outputs=['comp.y'])
+        workflow = model.driver.workflow
+
+        # fd_workers is read on every solve, not just when the finite
+        # difference helper is built.
+        model.driver.gradient_options.fd_workers = 3
+        count = model.comp.exec_count
+        J = workflow.calc_gradient(inputs=inputs, outputs=['comp.y'])
+        self.assertEqual(model.comp.exec_count, count)
+        assert_rel_error(self, J[0, 2], 4.0, 0.0001)
+
+        # Forked workers share our directory, so a component that does file
+        # I/O is run serially.
+        model.comp.external_files = [FileMetadata(path='comp.out',
+                                                  output=True)]
+        model.driver.gradient_options.fd_workers = 2
+        J = model.driver.calc_gradient(inputs=inputs, outputs=['comp.y'])
+        self.assertTrue(model.comp.exec_count >= count+len(inputs))
+        assert_rel_error(self, J[0, 2], 4.0, 0.0001)
+
+    def test_fd_coloring(self):
+
+        model = set_as_top(Assembly())
+        model.add('comp', ArrayDiagonal())
+        model.driver.workflow.add(['comp'])
+        model.driver.gradient_options.fd_coloring = True
+        model.comp.x = np.arange(1.0, 11.0)
+        model.run()
+
+        # Sparsity detection leaves the global random state alone.
+        np.random.seed(10)
+        state = np.random.get_state()[1].copy()
+        J = model.driver.calc_gradient(inputs=['comp.x', 'comp.a'],
+                                       outputs=['comp.y', 'comp.z'])
+        self.assertTrue(np.all(np.random.get_state()[1] == state))
+        assert_rel_error(self, np.diag(J[:10, :10]), 2.0*model.comp.x, 1e-4)
+        self.assertEqual(np.count_nonzero(J[:10, :10]), 10)
+        self.assertEqual(J[10, 0], 0.0)
+        assert_rel_error(self, J[10, 10], 1.0, 1e-4)
+
+        # The pattern is cached with the system tree, so a gradient from the
+        # workflow now costs two runs: one for x[0] and one for a and the rest
+        # of x.
+        model.comp.a = 3.0
+        model.run()
+        count = model.comp.exec_count
+        J = model.driver.workflow.calc_gradient(inputs=['comp.x', 'comp.a'],
+                                                outputs=['comp.y', 'comp.z'])
+        self.assertEqual(model.comp.exec_count - count, 2)
+        assert_rel_error(self, J[10, 0], 3.0, 1e-4)
+        assert_rel_error(self, np.diag(J[:10, :10]), 2.0*model.comp.x, 1e-4)
+
+        model.driver.gradient_options.fd_form = 'central'
+        model.driver.gradient_options.fd_workers = 2
+        J = model.driver.calc_gradient(inputs=['comp.x', 'comp.a'],
+                                       outputs=['comp.y', 'comp.z'])
+        assert_rel_error(self, np.diag(J[:10, :10]), 2.0*model.comp.x, 1e-8)
+        assert_rel_error(self, J[10, 0], 3.0, 1e-8)
+
+        # Alternating between cached setups doesn't detect the pattern again.
+        model.driver.gradient_options.fd_form = 'forward'
+        model.driver.gradient_options.fd_workers = 1
+        model.driver.calc_gradient(inputs=['comp.x'],
+                                   outputs=['comp.y', 'comp.z'])
+        for inputs, runs in ((['comp.x', 'comp.a'], 2), (['comp.x'], 1)):
+            count = model.comp.exec_count
+            J = model.driver.calc_gradient(inputs=inputs,
+                                           outputs=['comp.y', 'comp.z'])
+            self.assertEqual(model.comp.exec_count - count, runs)
+            assert_rel_error(self, np.diag(J[:10, :10]), 2.0*model.comp.x,
+                             1e-4)
+
     def test_force_fd(self):
 
         model = set_as_top(Assembly())
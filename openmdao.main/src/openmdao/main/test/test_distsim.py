@@ -388,6 +388,22 @@ class TestCase(unittest.TestCase):
         else:
             self.fail('Expected RemoteError')
 
+        # Batched calls, processing stops at first failure.
+        results = obj.batch([('set', 'radius', 3.), ('run',),
+                             ('get', 'radius'), ('get', 'surface_area')])
+        self.assertEqual(results[:3], [None, None, 3.])
+        assert_rel_error(self, results[3], 113.097335529, 0.000001)
+        try:
+            obj.batch([('set', 'radius', 4.), ('set', 'radius', -1),
+                       ('set', 'radius', 5.)])
+        except RemoteError as exc:
+            fragment = ": Variable 'radius' must be a float in the range (0.0, "
+            if fragment not in str(exc):
+                self.fail('%s not found in %s' % (fragment, exc))
+        else:
+            self.fail('Expected RemoteError')
+        self.assertEqual(obj.get('radius'), 4.)
+
         # Now a Box, accessed via attribute methods.
         obj = factory.create(_MODULE+'.Box')
         box_pid = obj.get('pid')
@@ -6,8 +6,9 @@ from traits.api import Event
 from openmdao.main.api import Assembly, Component, Driver, set_as_top, VariableTree
 from openmdao.main.container import _get_entry_group
 from openmdao.main.datatypes.api import Float, Int, VarTree
-from openmdao.main.driver import GradientOptions
+from openmdao.main.driver import EvalCache, GradientOptions
 from openmdao.main.test.test_derivatives import SimpleDriver
+from openmdao.test.execcomp import ExecComp
 
 class EventComp(Component):
     doit = Event()
@@ -65,6 +66,60 @@ class DriverTestCase(unittest.TestCase):
 
         assert(Driver().get_metadata("gradient_options")["framework_var"])
 
+    def test_eval_cache(self):
+        cache = EvalCache(2)
+        self.assertRaises(KeyError, cache.get, 'a', 'func')
+        cache.set('a', 'func', [1.])
+        cache.set('b', 'func', [2.])
+        cache.set('b', 'grad', [3.])
+
+        value = cache.get('a', 'func')
+        self.assertEqual(value, [1.])
+        value.append(0.)  # returned values are copies
+        self.assertEqual(cache.get('a', 'func'), [1.])
+        self.assertEqual(cache.get('b', 'grad'), [3.])
+
+        cache.set('c', 'func', [4.])  # 'a' is least recently used
+        self.assertRaises(KeyError, cache.get, 'a', 'func')
+        self.assertRaises(KeyError, cache.get, 'c', 'grad')
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats(), dict(hits=3, misses=3, size=2,
+                                             hit_rate=0.5))
+
+        driver = Driver()
+        self.assertEqual(driver.eval_cache, None)
+        driver.eval_cache_size = 5
+        self.assertEqual(driver.eval_cache.size, 5)
+        driver.eval_cache_size = 0
+        self.assertEqual(driver.eval_cache, None)
+
+    def test_eval_at(self):
+        top = set_as_top(Assembly())
+        top.add('comp', ExecComp(['y = 2*x']))
+        top.add('driver', SimpleDriver())
+        top.driver.workflow.add('comp')
+        top.driver.add_parameter('comp.x', low=-10., high=10.)
+        top.driver.add_objective('comp.y')
+        top.run()
+        count = top.comp.exec_count
+        func = lambda: top.comp.y
+
+        # Without the cache, every evaluation runs the model.
+        for i in range(2):
+            self.assertEqual(top.driver.eval_at([3.], 'func', func), 6.)
+        self.assertEqual(top.comp.exec_count, count+2)
+
+        # Unless told the model needn't be re-run at the current point.
+        self.assertEqual(top.driver.eval_at([3.], 'grad', func, rerun=False),
+                         6.)
+        self.assertEqual(top.comp.exec_count, count+2)
+
+        # With the cache, a repeated point doesn't.
+        top.driver.eval_cache_size = 5
+        for i in range(2):
+            self.assertEqual(top.driver.eval_at([4.], 'func', func), 8.)
+        self.assertEqual(top.comp.exec_count, count+3)
+
 class DriverTestCase2(unittest.TestCase):
 
     def test_get_req_compnames_vartree_param_obj(self):
@@ -3,14 +3,18 @@ Test mp_util.py
 """
 
 import logging
+from multiprocessing import Pipe
 import os.path
 import socket
 import sys
 import unittest
 import nose
 
+import numpy
+
 from openmdao.main.mp_util import read_server_config, read_allowed_hosts, \
-                                  is_legal_connection
+                                  is_legal_connection, encrypt, decrypt, \
+                                  send_message, receive_message
 
 from openmdao.util.publickey import make_private, HAVE_PYWIN32
 from openmdao.util.testutil import assert_raises
@@ -125,6 +129,67 @@ class TestCase(unittest.TestCase):
             finally:
                 os.remove('hosts.allow')
 
+    def test_encrypt(self):
+        logging.debug('')
+        logging.debug('test_encrypt')
+
+        key = 'x'*20
+        obj = (1, 'run', [2.5, {'a': 'b'}], {}, None)
+        self.assertEqual(encrypt(obj, ''), obj)
+        msg = encrypt(obj, key)
+        self.assertEqual(len(msg), 2)
+        self.assertEqual(decrypt(msg, key), obj)
+
+        # Arrays are sent as raw buffers.
+        arr = numpy.arange(12.).reshape((3, 4))
+        obj = ('#RETURN', [arr, arr[:, 1], numpy.array(['a', 'bc']),
+                           numpy.zeros((0, 2), dtype=int), 3])
+        msg = encrypt(obj, key)
+        self.assertEqual(len(msg), 3)
+        result = decrypt(msg, key)
+        self.assertEqual(result[0], '#RETURN')
+        arrays = result[1]
+        self.assertTrue((arrays[0] == arr).all())
+        self.assertTrue((arrays[1] == arr[:, 1]).all())
+        self.assertEqual(list(arrays[2]), ['a', 'bc'])
+        self.assertEqual(arrays[3].shape, (0, 2))
+        self.assertEqual(arrays[4], 3)
+        arrays[0][0, 0] = 42.  # Writable.
+
+        obj = numpy.zeros(0)
+        self.assertEqual(decrypt(encrypt(obj, key), key).shape, (0,))
+
+        # Object arrays are pickled.
+        obj = numpy.array([None, 'a'])
+        msg = encrypt(obj, key)
+        self.assertEqual(len(msg), 2)
+        self.assertEqual(list(decrypt(msg, key)), [None, 'a'])
+
+    def test_messages(self):
+        logging.debug('')
+        logging.debug('test_messages')
+
+        # Arrays are sent as raw buffers whether encrypted or not.
+        arr = numpy.arange(12.).reshape((3, 4))
+        reader, writer = Pipe(False)
+        for key in ('', 'x'*20):
+            for obj in (('#RETURN', [arr, numpy.array([None, 'a']), 3]),
+                        ('#RETURN', 'no arrays')):
+                send_message(writer, obj, key)
+                result = receive_message(reader, key)
+                self.assertEqual(result[0], '#RETURN')
+                if isinstance(obj[1], list):
+                    self.assertTrue((result[1][0] == arr).all())
+                    self.assertEqual(list(result[1][1]), [None, 'a'])
+                    self.assertEqual(result[1][2], 3)
+                else:
+                    self.assertEqual(result, obj)
+
+        send_message(writer, arr, '')
+        self.assertTrue(reader.recv_bytes().startswith('#RAW'))
+        send_message(writer, 'text', '')
+        self.assertEqual(reader.recv(), 'text')
+
 
 if __name__ == '__main__':
     sys.argv.append('--cover-package=openmdao.main')
@@ -18,6 +18,7 @@ from openmdao.main.objserverfactory import ObjServerFactory, ObjServer, \
                                            start_server, stop_server, \
                                            connect_to_server, _PROXIES
 from openmdao.main.resource import ResourceAllocationManager as RAM
+from openmdao.util.filexfer import file_digest
 from openmdao.util.testutil import assert_raises
 from openmdao.util.fileutil import onerror
 
@@ -288,6 +289,99 @@ class TestCase(unittest.TestCase):
             SimulationRoot.chroot('..')
             shutil.rmtree(testdir, onerror=onerror)
 
+    def test_file_cache(self):
+        logging.debug('')
+        logging.debug('test_file_cache')
+
+        testdir = 'test_file_cache'
+        if os.path.exists(testdir):
+            shutil.rmtree(testdir, onerror=onerror)
+        os.mkdir(testdir)
+        os.chdir(testdir)
+
+        try:
+            cache_dir = os.path.join(os.getcwd(), 'cache')
+            server = ObjServer(cache_dir=cache_dir)
+
+            with open('grid', 'w') as out:
+                out.write('big grid data\n')
+            with open('case', 'w') as out:
+                out.write('case data\n')
+            files = {'grid': (file_digest('grid'), True),
+                     os.path.join('sub', 'case'): (file_digest('case'), False)}
+
+            # Nothing cached yet.
+            self.assertEqual(server.restore_cached_files(files),
+                             sorted(files.keys()))
+
+            os.mkdir('sub')
+            shutil.copy('case', os.path.join('sub', 'case'))
+            server.cache_files(files)
+            self.assertEqual(sorted(os.listdir(cache_dir)),
+                             sorted(digest for digest, constant
+                                           in files.values()))
+
+            # Restore into a clean directory.
+            os.remove('grid')
+            shutil.rmtree('sub', onerror=onerror)
+            self.assertEqual(server.restore_cached_files(files), [])
+            with open('grid', 'r') as inp:
+                self.assertEqual(inp.read(), 'big grid data\n')
+            with open(os.path.join('sub', 'case'), 'r') as inp:
+                self.assertEqual(inp.read(), 'case data\n')
+
+            # A linked file modified in place is dropped from the cache.
+            grid_digest = files['grid'][0]
+            with open('grid', 'w') as out:
+                out.write('modified grid data\n')
+            self.assertEqual(server.restore_cached_files(files), ['grid'])
+            self.assertFalse(os.path.exists(os.path.join(cache_dir,
+                                                         grid_digest)))
+            with open('grid', 'w') as out:
+                out.write('big grid data\n')
+            server.cache_files(files)
+            self.assertEqual(server.restore_cached_files(files), [])
+
+            # Least recently used files are evicted to fit the size limit.
+            size = os.path.getsize('grid') + os.path.getsize('case')
+            small = ObjServer(cache_dir=cache_dir, cache_size=size)
+            with open('extra', 'w') as out:
+                out.write('extra\n')
+            os.utime(os.path.join(cache_dir, grid_digest), (0, 0))
+            small.cache_files({'extra': (file_digest('extra'), False)})
+            self.assertEqual(sorted(os.listdir(cache_dir)),
+                             sorted([files[os.path.join('sub', 'case')][0],
+                                     file_digest('extra')]))
+            server.cache_files(files)
+            self.assertEqual(len(os.listdir(cache_dir)), 3)
+
+            assert_raises(self, "server.cache_files({'../xyzzy': ('0', False)})",
+                          globals(), locals(), RuntimeError,
+                          "Can't cache_files '../xyzzy', not within root ")
+
+            # Digests must be SHA1 hex digests, and match the contents.
+            for digest in ('../../xyzzy', '0'*39, 'G'*40):
+                for method in ('cache_files', 'restore_cached_files'):
+                    assert_raises(self,
+                                  "server.%s({'grid': (%r, False)})"
+                                      % (method, digest),
+                                  globals(), locals(), RuntimeError,
+                                  "Can't %s, invalid digest %r"
+                                      % (method, digest))
+            with open('other', 'w') as out:
+                out.write('other data\n')
+            server.cache_files({'other': ('0'*40, False)})
+            self.assertFalse(os.path.exists(os.path.join(cache_dir, '0'*40)))
+            self.assertEqual(len(os.listdir(cache_dir)), 3)
+
+            # No cache directory.
+            server = ObjServer()
+            self.assertEqual(server.restore_cached_files(files),
+                             sorted(files.keys()))
+        finally:
+            SimulationRoot.chroot('..')
+            shutil.rmtree(testdir, onerror=onerror)
+
 
 if __name__ == '__main__':
     sys.argv.append('--cover-package=openmdao.main')
@@ -1,8 +1,11 @@
 
+import multiprocessing
+import sys
 import unittest
 
 import time
 from numpy import array, ones
+from nose import SkipTest
 
 from openmdao.main.api import Component, Driver, Assembly, set_as_top
 from openmdao.main.datatypes.api import Float, Array
@@ -10,6 +13,7 @@ from openmdao.main.hasparameters import HasParameters
 from openmdao.main.hasobjective import HasObjective
 from openmdao.main.hasconstraints import HasConstraints
 from openmdao.main.interfaces import IHasParameters, implements
+from openmdao.main.systems import ParallelSystem
 from openmdao.util.decorators import add_delegate
 from openmdao.util.testutil import assert_rel_error
 
@@ -129,6 +133,20 @@ class ABCDArrayComp(Component):
         self.d = self.a - self.b
 
 
+class TwiceDriver(Driver):
+    """Runs its workflow twice with different values of C1.a and C3.a,
+    saving the worker pool of the ParallelSystem (if any) used each time."""
+
+    def execute(self):
+        self.pools = []
+        for value in (3.0, 5.0):
+            self.parent.C1.a = ones(10, float) * value
+            self.parent.C3.a = ones(10, float) * (value + 1.0)
+            self.run_iteration()
+            par = self.workflow._system.all_subsystems()[1]
+            self.pools.append(getattr(par, '_pool', None))
+
+
 class TestArrayComp(unittest.TestCase):
     def test_overlap_exception(self):
         size = 20   # array var size
@@ -153,3 +171,127 @@ class TestArrayComp(unittest.TestCase):
             self.assertEqual(str(err), "Subvars ['C1.c[3::]', 'C1.c[:5:]'] share overlapping indices. Try reformulating the problem to prevent this.")
         else:
             self.fail("Exception expected")
+
+
+class TestSystemWorkers(unittest.TestCase):
+
+    def _build(self, workers, driver=None):
+        size = 10
+        top = set_as_top(Assembly())
+        if driver is not None:
+            top.add('driver', driver)
+        top.add("C1", ABCDArrayComp(size))
+        top.add("C2", ABCDArrayComp(size))
+        top.add("C3", ABCDArrayComp(size))
+        top.add("C4", ABCDArrayComp(size))
+        top.driver.workflow.add(['C1', 'C2', 'C3', 'C4'])
+        top.connect('C1.c', 'C2.a')
+        top.connect('C1.d', 'C3.b')
+        top.connect('C2.c', 'C4.a')
+        top.connect('C3.d', 'C4.b')
+        top.driver.system_workers = workers
+
+        top.C1.a = ones(size, float) * 3.0
+        top.C1.b = ones(size, float) * 7.0
+        top.C2.b = ones(size, float) * 2.0
+        return top
+
+    def test_parallel_workers(self):
+        if sys.platform == 'win32':
+            raise SkipTest('worker processes are forked')
+
+        serial = self._build(0)
+        serial.run()
+
+        top = self._build(2)
+        top.run()
+
+        # C2 and C3 were run in a ParallelSystem by worker processes
+        systems = top.driver.workflow._system.all_subsystems()
+        self.assertTrue(isinstance(systems[1], ParallelSystem))
+        self.assertEqual(systems[1].n_workers, 2)
+
+        for name in ('C2', 'C3', 'C4'):
+            for var in ('c', 'd'):
+                assert_rel_error(self, top.get(name+'.'+var)[0],
+                                 serial.get(name+'.'+var)[0], 1e-10)
+            self.assertEqual(top.get(name).exec_count, 1)
+
+        top.C1.b = ones(10, float) * 5.0
+        serial.C1.b = ones(10, float) * 5.0
+        top.run()
+        serial.run()
+        assert_rel_error(self, top.C4.c[0], serial.C4.c[0], 1e-10)
+        assert_rel_error(self, top.C4.d[0], serial.C4.d[0], 1e-10)
+        self.assertEqual(top.C3.exec_count, 2)
+
+    def test_parallel_branch(self):
+        if sys.platform == 'win32':
+            raise SkipTest('worker processes are forked')
+
+        def build(workers):
+            top = self._build(workers)
+            top.add("C5", ABCDArrayComp(10))
+            top.driver.workflow.add('C5')
+            top.disconnect('C2.c', 'C4.a')
+            top.connect('C2.c', 'C5.a')
+            top.connect('C5.c', 'C4.a')
+            top.C5.b = ones(10, float) * 4.0
+            return top
+
+        serial = build(0)
+        serial.run()
+
+        top = build(2)
+        top.run()
+
+        # C2 and C5 were run as a serial branch of the ParallelSystem
+        par = top.driver.workflow._system.all_subsystems()[1]
+        self.assertTrue(isinstance(par, ParallelSystem))
+        self.assertEqual(len(par.all_subsystems()), 2)
+        self.assertEqual(par._sub_bounds(), [(0, 10), (10, 30)])
+
+        for name in ('C2', 'C3', 'C4', 'C5'):
+            for var in ('a', 'b', 'c', 'd'):
+                assert_rel_error(self, top.get(name+'.'+var)[0],
+                                 serial.get(name+'.'+var)[0], 1e-10)
+            self.assertEqual(top.get(name).exec_count, 1)
+
+        # the pool only lasts until the end of the run
+        self.assertEqual(par._pool, None)
+        self.assertEqual(multiprocessing.active_children(), [])
+
+        # the same results without workers
+        par.n_workers = 0
+        top.C5.b = ones(10, float) * 6.0
+        serial.C5.b = ones(10, float) * 6.0
+        top.run()
+        serial.run()
+        assert_rel_error(self, top.C4.c[0], serial.C4.c[0], 1e-10)
+        self.assertEqual(top.C2.exec_count, 2)
+
+    def test_parallel_reuse(self):
+        if sys.platform == 'win32':
+            raise SkipTest('worker processes are forked')
+
+        serial = self._build(0, TwiceDriver())
+        serial.run()
+
+        top = self._build(2, TwiceDriver())
+        for i in range(2):
+            top.run()
+
+            # the workers are reused within the run, and see values
+            # changed since they started
+            pools = top.driver.pools
+            self.assertTrue(pools[0] is not None)
+            self.assertTrue(pools[1] is pools[0])
+            for name in ('C2', 'C3', 'C4'):
+                for var in ('a', 'b', 'c', 'd'):
+                    assert_rel_error(self, top.get(name+'.'+var)[0],
+                                     serial.get(name+'.'+var)[0], 1e-10)
+
+            # and terminated at the end of it, even if the System has been
+            # replaced
+            self.assertEqual(multiprocessing.active_children(), [])
+            top.driver.config_changed()
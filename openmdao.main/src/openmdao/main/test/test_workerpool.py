@@ -0,0 +1,84 @@
+"""
+Test workerpool.py
+"""
+
+import os
+import sys
+import unittest
+import nose
+
+from openmdao.main.api import Assembly, Component, set_as_top
+from openmdao.main.datatypes.api import Float
+from openmdao.main import workerpool
+from openmdao.main.workerpool import WorkerPool, workers_available
+from openmdao.lib.casehandlers.api import ListCaseRecorder
+
+
+class Doubler(Component):
+
+    x = Float(0., iotype='in')
+    y = Float(0., iotype='out')
+
+    def execute(self):
+        self.y = 2. * self.x
+
+
+class Owner(object):
+
+    def __init__(self, top):
+        self.top = top
+
+    def evaluate(self, x):
+        """Run the model in a worker."""
+        self.top.comp.x = x
+        self.top.run()
+        return (self.top.comp.y, os.getpid(), len(self.top.recorders),
+                workers_available(2))
+
+
+class TestCase(unittest.TestCase):
+    """ Test workerpool.py """
+
+    def setUp(self):
+        if not workers_available(2):
+            raise nose.SkipTest('Workers require fork() and no MPI')
+
+    def test_map(self):
+        top = set_as_top(Assembly())
+        top.add('comp', Doubler())
+        top.driver.workflow.add('comp')
+        recorder = ListCaseRecorder()
+        top.recorders = [recorder]
+        owner = Owner(top)
+
+        pool = WorkerPool(owner, 'evaluate', top, 2)
+        try:
+            first = pool.map([(x,) for x in range(4)])
+            second = pool.map([(x,) for x in range(4, 8)])
+        finally:
+            pool.close()
+        self.assertEqual(workerpool._OWNERS, {})
+
+        results = first + second
+        self.assertEqual([y for y, _, _, _ in results],
+                         [2.*x for x in range(8)])
+
+        # The pool is reused by later calls.
+        pids = set(pid for _, pid, _, _ in results)
+        self.assertTrue(os.getpid() not in pids)
+        self.assertTrue(len(pids) <= 2)
+
+        # Workers don't record and don't start workers of their own.
+        for _, _, nrecorders, available in results:
+            self.assertEqual(nrecorders, 0)
+            self.assertFalse(available)
+        self.assertEqual(top.recorders, [recorder])
+        self.assertEqual(len(recorder), 0)
+        self.assertTrue(workers_available(2))
+        self.assertFalse(workers_available(1))
+
+
+if __name__ == '__main__':
+    sys.argv.append('--cover-package=openmdao.main')
+    sys.argv.append('--cover-erase')
+    nose.runmodule()
@@ -314,12 +314,13 @@ class InputVecWrapper(VecWrapperBase):
         scope = system.scope
         varmeta = scope._var_meta
         name2collapsed = scope.name2collapsed
-        flat_ins = _filter_flat(scope, system._owned_args)
+        flat_ins = set(_filter_flat(scope, system._owned_args))
         start, end = 0, 0
         arg_idx = system.arg_idx
+        order = _index_map(system.vector_vars)
 
         for sub in system.simple_subsystems():
-            for name in [n for n in system.vector_vars if n in sub._in_nodes]:
+            for name in _in_order(sub._in_nodes, order):
                 if name in flat_ins and name not in self._info:
                     sz = len(arg_idx[name])
                     end += sz
@@ -573,5 +574,16 @@ def _filter_ignored(scope, lst):
 
     return unignored
 
+def _index_map(seq):
+    """Return a dict mapping each item of `seq` to its position."""
+    return dict((item, i) for i, item in enumerate(seq))
+
+def _in_order(lst, order):
+    """Return the items of `lst` found in the position dict `order`
+    (see :func:`_index_map`), sorted by their position. This avoids a scan
+    of the whole ordered sequence for each of many short lists.
+    """
+    return sorted([n for n in lst if n in order], key=order.get)
+
 def _filter_flat(scope, lst):
     return [n for n in lst if not scope._var_meta[n].get('noflat')]
@@ -0,0 +1,81 @@
+"""
+Pools of forked worker processes, each of which runs a method of an object
+on its own copy of the model.
+"""
+
+import multiprocessing
+import sys
+import weakref
+
+from openmdao.main.mpiwrap import MPI
+
+__all__ = ['WorkerPool', 'workers_available']
+
+# Maps the id of each pool to a weak reference to its owner and the name
+# of the method its workers run.  Workers are forked, so they inherit this,
+# including any that replace a worker that died.
+_OWNERS = {}
+
+# True in a worker process.
+_IN_WORKER = False
+
+
+def workers_available(n_workers):
+    """Return True if `n_workers` forked worker processes can be used.
+    Workers never start workers of their own.
+    """
+    return n_workers > 1 and MPI is None and sys.platform != 'win32' and \
+           not _IN_WORKER
+
+
+def _init_worker(model):
+    """Initialize a worker process.  Recorders belong to the parent
+    process, so cases aren't recorded in the worker's copy of `model`."""
+    global _IN_WORKER
+    _IN_WORKER = True
+
+    top = model
+    while top.parent is not None:
+        top = top.parent
+    if hasattr(top, 'recorders'):
+        top.recorders = []
+        top._rec_queue = None
+
+
+def _run_task(task):
+    """Run the method of a pool's owner on the worker's copy of the
+    model."""
+    pool_id, args = task
+    owner, method = _OWNERS[pool_id]
+    return getattr(owner(), method)(*args)
+
+
+class WorkerPool(object):
+    """A pool of `size` forked worker processes that run `method` of
+    `owner`.  The workers' copies of `owner` and of the model containing
+    `model` date from when the pool was created, and the pool can be
+    reused until :meth:`close` is called.
+    """
+
+    def __init__(self, owner, method, model, size):
+        _OWNERS[id(self)] = (weakref.ref(owner), method)
+        try:
+            self._pool = multiprocessing.Pool(size, _init_worker, (model,))
+        except Exception:
+            del _OWNERS[id(self)]
+            raise
+
+    def map(self, args_list):
+        """Return the results of calling the method of our owner with each
+        tuple of arguments in `args_list`."""
+        return self._pool.map(_run_task,
+                               [(id(self), args) for args in args_list],
+                               chunksize=1)
+
+    def close(self):
+        """Terminate our worker processes."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+            del _OWNERS[id(self)]
@@ -18,11 +18,13 @@ from openmdao.main.mpiwrap import MPI, MPI_info
 from openmdao.main.systems import SerialSystem, ParallelSystem, \
                                   OpaqueSystem, VarSystem, \
                                   partition_subsystems, ParamSystem, \
-                                  get_comm_if_active, collapse_to_system_node
+                                  get_comm_if_active, collapse_to_system_node, \
+                                  DriverSystem
 from openmdao.main.depgraph import _get_inner_connections, get_nondiff_groups, \
                                    collapse_nodes, simple_node_iter
 from openmdao.main.exceptions import RunStopped
 from openmdao.main.interfaces import IVariableTree, IDriver
+from openmdao.main.recordqueue import snapshot
 
 __all__ = ['Workflow']
 
@@ -608,7 +610,7 @@ class Workflow(object):
                 outputs.append(src)
 
         for comp in self.get_components():
-            for name in comp.list_outputs():
+            for name in sorted(comp.list_outputs()):
                 src = '%s.%s' % (comp.name, name)
                 path = prefix+src
                 if src not in outputs and \
@@ -707,9 +709,16 @@ class Workflow(object):
                 scope.raise_exception("Can't get '%s' for recording: %s"
                                       % (name, exc), RuntimeError)
         # Record.
-        for recorder in top.recorders:
-            recorder.record(driver, inputs, outputs, err,
-                            case_uuid, self.parent._case_uuid)
+        queue = getattr(top, '_rec_queue', None)
+        if queue is not None:
+            # Values must not change while waiting in the queue.
+            queue.put(driver, [snapshot(val) for val in inputs],
+                      [snapshot(val) for val in outputs], err,
+                      case_uuid, self.parent._case_uuid)
+        else:
+            for recorder in top.recorders:
+                recorder.record(driver, inputs, outputs, err,
+                                case_uuid, self.parent._case_uuid)
 
     def _iterbase(self):
         """ Return base for 'iteration coordinates'. """
@@ -770,10 +779,13 @@ class Workflow(object):
         for comp in self:
             comp.pre_setup()
 
-    def setup_systems(self, system_type):
+    def setup_systems(self, system_type, n_workers=0):
         """Get the subsystem for this workflow. Each
         subsystem contains a subgraph of this workflow's component
         graph, which contains components and/or other subsystems.
+        When not running under MPI and n_workers is greater than 1,
+        parallel Systems are created anyway and run their subsystems in
+        that many worker processes.
         """
 
         scope = self.scope
@@ -857,9 +869,11 @@ class Workflow(object):
 
         self._reduced_graph = reduced
 
-        if MPI and system_type == 'auto':
+        use_workers = MPI is None and n_workers > 1
+
+        if (MPI or use_workers) and system_type == 'auto':
             self._auto_setup_systems(scope, reduced, cgraph)
-        elif MPI and system_type == 'parallel':
+        elif (MPI or use_workers) and system_type == 'parallel':
             self._system = ParallelSystem(scope, reduced, cgraph,
                                           str(tuple(cgraph.nodes())))
         else:
@@ -869,6 +883,9 @@ class Workflow(object):
         self._system.set_ordering([p[0] for p in params]+
                                   [c.name for c in self], opaque_map)
 
+        if use_workers:
+            _set_workers(self._system, n_workers)
+
         self._system._parent_system = self.scope._reduced_graph.node[self.parent.name]['system']
 
         for comp in self:
@@ -983,6 +1000,17 @@ def get_cycle_vars(system):
     return cycle_vars
 
 
+def _set_workers(system, n_workers):
+    """Set the number of worker processes for the given System and any
+    ParallelSystems nested inside of it.
+    """
+    if isinstance(system, ParallelSystem):
+        system.n_workers = n_workers
+    if not isinstance(system, DriverSystem):  # subdrivers set their own
+        for sub in system.all_subsystems():
+            _set_workers(sub, n_workers)
+
+
 def _fix_tups(x):
     """Return x[0] if x is a single element tuple, else return x."""
     if isinstance(x, tuple) and len(x) == 1:
@@ -1,5 +1,6 @@
 import fnmatch
 import glob
+import hashlib
 import os
 import sys
 import zipfile
@@ -49,10 +50,8 @@ def filexfer(src_server, src_path, dst_server, dst_path, mode='',
         else:
             dst_file = dst_server.open(dst_path, 'w'+mode)
 
-        if src_server is None and dst_server is None:
-            chunk = 1 << 20  # 1MB locally.
-        else:
-            chunk = 1 << 17  # 128KB over network.
+        # Large chunks minimize round trips over network.
+        chunk = 1 << 20
 
         try:
             data = src_file.read(chunk)
@@ -75,6 +74,27 @@ def filexfer(src_server, src_path, dst_server, dst_path, mode='',
             dst_server.chmod(dst_path, mode)
 
 
+def file_digest(path, chunk=1 << 20):
+    """
+    Returns the SHA1 hex digest of the contents of `path`.
+    Used to identify files by content, for example to avoid re-sending
+    unchanged files to a remote server.
+
+    path: string
+        Path to file to digest.
+
+    chunk: int
+        Number of bytes to read at a time.
+    """
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as inp:
+        data = inp.read(chunk)
+        while data:
+            sha1.update(data)
+            data = inp.read(chunk)
+    return sha1.hexdigest()
+
+
 def pack_zipfile(patterns, filename, logger=None):
     """
     Create 'zip' file `filename` of files in `patterns`.
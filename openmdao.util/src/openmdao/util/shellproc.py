@@ -1,9 +1,15 @@
+import errno
 import os.path
+import select
 import signal
 import subprocess
 import sys
+import threading
 import time
 
+if sys.platform != 'win32':
+    import fcntl
+
 PIPE = subprocess.PIPE
 STDOUT = subprocess.STDOUT
 DEV_NULL = 'nul:' if sys.platform == 'win32' else '/dev/null'
@@ -79,6 +85,10 @@ class ShellProc(subprocess.Popen):
             self.close_files()
             raise
 
+        self._exit_fd = None
+        self._exit_lock = threading.Lock()
+        self._reaped = False
+
     def close_files(self):
         """ Closes files that were implicitly opened. """
         if isinstance(self._stdin_arg, basestring):
@@ -98,19 +108,27 @@ class ShellProc(subprocess.Popen):
             A value of zero implies an infinite maximum wait.
 
         """
-        super(ShellProc, self).terminate()
+        # Once the process has been reaped its PID may have been reused.
+        with self._exit_lock:
+            if not self._reaped and self.returncode is None:
+                super(ShellProc, self).terminate()
         if timeout is not None:
             return self.wait(timeout=timeout)
 
     def wait(self, poll_delay=0., timeout=0.):
         """
-        Polls for command completion or timeout.
+        Waits for command completion or timeout.
         Closes any files implicitly opened.
         Returns ``(return_code, error_msg)``.
 
+        On non-Windows platforms completion is detected via the child exit
+        notification (``waitpid``) rather than by polling, so there is no
+        added latency. On Windows the process is polled.
+
         poll_delay: float (seconds)
             Time to delay between polling for command completion.
             A value of zero uses an internal default.
+            Only used on Windows.
 
         timeout: float (seconds)
             Maximum time to wait for command completion.
@@ -118,30 +136,112 @@ class ShellProc(subprocess.Popen):
         """
         return_code = None
         try:
-            if poll_delay <= 0:
-                poll_delay = max(0.1, timeout/100.)
-                poll_delay = min(10., poll_delay)
-            npolls = int(timeout / poll_delay) + 1
-
-            time.sleep(poll_delay)
-            return_code = self.poll()
-            while return_code is None:
-                npolls -= 1
-                if (timeout > 0) and (npolls < 0):
-                    self.terminate()
-                    break
-                time.sleep(poll_delay)
-                return_code = self.poll()
+            if sys.platform == 'win32':
+                return_code = self._poll_wait(poll_delay, timeout)
+            elif timeout > 0:
+                return_code = self._notify_wait(timeout)
+            else:
+                return_code = self._reap()
         finally:
             self.close_files()
 
-        # self.returncode set by self.poll().
+        # self.returncode set by waitpid() or poll().
         if return_code is not None:
             self.errormsg = self.error_message(return_code)
         else:
             self.errormsg = 'Timed out'
         return (return_code, self.errormsg)
 
+    def _reap(self):
+        """ Block until the process exits, return its return code. """
+        if self._exit_fd is not None:
+            # A reaper thread owns waitpid(), just wait for it to finish.
+            self._wait_exit_fd(None)
+        return subprocess.Popen.wait(self)
+
+    def _notify_wait(self, timeout):
+        """
+        Wait up to `timeout` seconds for the process to exit.
+        A daemon thread blocks in ``waitpid`` and closes the write end of a
+        pipe when the process exits, which wakes up ``select``.
+        Returns None if the process was terminated due to timeout.
+        """
+        if self.returncode is not None:
+            return self.returncode
+
+        with self._exit_lock:
+            if self._exit_fd is None:
+                rfd, wfd = os.pipe()
+                for fd in (rfd, wfd):
+                    flags = fcntl.fcntl(fd, fcntl.F_GETFD)
+                    fcntl.fcntl(fd, fcntl.F_SETFD, flags | fcntl.FD_CLOEXEC)
+                self._exit_fd = rfd
+                reaper = threading.Thread(target=self._reaper, args=(wfd,),
+                                          name='reaper-%d' % self.pid)
+                reaper.daemon = True
+                reaper.start()
+
+        if self._wait_exit_fd(timeout):
+            return self.returncode
+        self.terminate()
+        return None
+
+    def _reaper(self, wfd):
+        """ Reap the process, then signal completion by closing `wfd`. """
+        try:
+            subprocess.Popen.wait(self)
+        finally:
+            with self._exit_lock:
+                self._reaped = True
+            os.close(wfd)
+
+    def _wait_exit_fd(self, timeout):
+        """
+        Wait for the reaper thread to signal process exit.
+        Returns True if the process exited within `timeout` seconds.
+        """
+        if timeout is not None:
+            end = time.time() + timeout
+        while True:
+            if self._exit_fd is None:
+                return True
+            remaining = None if timeout is None else max(0., end-time.time())
+            try:
+                ready = select.select([self._exit_fd], [], [], remaining)[0]
+            except select.error as exc:
+                if exc.args[0] == errno.EINTR:
+                    continue
+                raise
+            if ready:
+                with self._exit_lock:
+                    if self._exit_fd is not None:
+                        os.close(self._exit_fd)
+                        self._exit_fd = None
+                return True
+            if remaining is not None and remaining <= 0:
+                return False
+
+    def _poll_wait(self, poll_delay, timeout):
+        """
+        Poll for command completion or timeout.
+        Returns None if the process was terminated due to timeout.
+        """
+        if poll_delay <= 0:
+            poll_delay = max(0.1, timeout/100.)
+            poll_delay = min(10., poll_delay)
+        npolls = int(timeout / poll_delay) + 1
+
+        time.sleep(poll_delay)
+        return_code = self.poll()
+        while return_code is None:
+            npolls -= 1
+            if (timeout > 0) and (npolls < 0):
+                self.terminate()
+                break
+            time.sleep(poll_delay)
+            return_code = self.poll()
+        return return_code
+
     def error_message(self, return_code):
         """
         Return error message for `return_code`.
@@ -6,10 +6,11 @@ import logging
 import os.path
 import signal
 import sys
+import time
 import unittest
 
 from openmdao.util.shellproc import call, check_call, CalledProcessError, \
-                                    ShellProc
+                                    ShellProc, DEV_NULL
 
 
 class TestCase(unittest.TestCase):
@@ -80,6 +81,39 @@ class TestCase(unittest.TestCase):
         else:
             self.assertEqual(msg, ': SIGTERM')
 
+    def test_wait(self):
+        logging.debug('')
+        logging.debug('test_wait')
+
+        if sys.platform == 'win32':
+            cmd = 'dir'
+        else:
+            cmd = ['python', '-c', 'pass']
+
+        # Completion is detected without polling delay.
+        for timeout in (0., 10.):
+            proc = ShellProc(cmd, stdout=DEV_NULL,
+                             stderr=DEV_NULL)
+            return_code, error_msg = proc.wait(timeout=timeout)
+            self.assertEqual(return_code, 0)
+            self.assertEqual(error_msg, '')
+            # The process has been reaped, so this must not send a signal.
+            proc.terminate()
+
+        # Timeout.
+        cmd = ['python', '-c', 'import time; time.sleep(10)']
+        start = time.time()
+        proc = ShellProc(cmd)
+        return_code, error_msg = proc.wait(timeout=0.5)
+        et = time.time() - start
+        self.assertEqual(return_code, None)
+        self.assertEqual(error_msg, 'Timed out')
+        self.assertTrue(et < 5)
+
+        return_code, error_msg = proc.wait()
+        if sys.platform != 'win32':
+            self.assertEqual(return_code, -signal.SIGTERM)
+
 
 if __name__ == '__main__':
     import nose